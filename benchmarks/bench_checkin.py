@@ -0,0 +1,651 @@
+"""
+Load-test the cadet check-in path with a simulated PT formation surge.
+
+Usage:
+    python benchmarks/bench_checkin.py
+    python benchmarks/bench_checkin.py --cadets 300 --window 5 --history 120
+    python benchmarks/bench_checkin.py --backend mongo --mongo-uri mongodb://localhost:27017
+    python benchmarks/bench_checkin.py --path service --max-round-trips 5
+
+N cadets submit the same event code at seeded arrival times spread over
+--window seconds and each submission runs the calls the Attendance
+Submission page makes when "Report In" is pressed: --path service is the
+page on top of services.checkin, --path page the query chain it replaced. The report gives
+p50/p95/p99 latency, database round trips per check-in and throughput.
+
+The default backend is an in-memory stand-in that charges --rtt-ms per
+round trip plus --per-doc-us per returned document, so timings are stable
+from run to run and round-trip counts are exact. --backend mongo runs
+against a real mongod in a scratch database that is dropped afterwards.
+--max-p95-ms and --max-round-trips exit with status 1 when exceeded, for
+gating regressions.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from bson import ObjectId
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import utils.db as db_module
+from services.attendance import is_already_checked_in, is_within_checkin_window
+from services.cadet_attendance import load_cadet_flights
+from services.checkin import get_checkin_context, lookup_checkin_event, submit_checkin
+from services.event_codes import validate_code
+from services.event_config import get_checkin_window_minutes
+from utils.audit_log import log_checkin_attempt
+from utils.db_schema_crud import (
+    create_attendance_record,
+    get_attendance_by_cadet,
+    get_cadet_by_user_id,
+    get_event_by_id,
+    get_user_by_email,
+)
+from utils.ttl_cache import clear_cache
+
+EVENT_CODE = "482913"
+SCRATCH_DB = "rollcall_bench_checkin"
+
+_COUNTED_METHODS = {
+    "aggregate",
+    "bulk_write",
+    "count_documents",
+    "delete_many",
+    "delete_one",
+    "estimated_document_count",
+    "find",
+    "find_one",
+    "find_one_and_update",
+    "insert_many",
+    "insert_one",
+    "replace_one",
+    "update_many",
+    "update_one",
+}
+
+_round_trips = threading.local()
+
+
+def _count_round_trip() -> None:
+    _round_trips.count = getattr(_round_trips, "count", 0) + 1
+
+
+# -- Backends ----------------------------------------------------------------
+
+
+class _CountingCollection:
+    """Wrap a collection so each database call counts as one round trip."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._collection, name)
+        if name not in _COUNTED_METHODS:
+            return attr
+
+        def _counted(*args, **kwargs):
+            _count_round_trip()
+            return attr(*args, **kwargs)
+
+        return _counted
+
+
+class _CountingDatabase:
+    def __init__(self, db):
+        self._db = db
+
+    def __getitem__(self, name: str) -> _CountingCollection:
+        return _CountingCollection(self._db[name])
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._db, name)
+        if isinstance(attr, (Collection, _MemoryCollection)):
+            return _CountingCollection(attr)
+        return attr
+
+
+class _CountingClient:
+    """Stand-in for `MongoClient`; `get_db()` indexes it by database name."""
+
+    def __init__(self, db):
+        self._db = _CountingDatabase(db)
+
+    def __getitem__(self, _db_name: str) -> _CountingDatabase:
+        return self._db
+
+
+def _matches_condition(value: Any, cond: Any) -> bool:
+    if not (isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond)):
+        if isinstance(value, list) and not isinstance(cond, list):
+            return cond in value
+        return value == cond
+    for op, arg in cond.items():
+        if op == "$options":
+            continue
+        if op == "$regex":
+            flags = re.IGNORECASE if "i" in cond.get("$options", "") else 0
+            if not (isinstance(value, str) and re.search(arg, value, flags)):
+                return False
+        elif op == "$in":
+            if value not in arg:
+                return False
+        elif op == "$nin":
+            if value in arg:
+                return False
+        elif op == "$ne":
+            if value == arg:
+                return False
+        elif op == "$exists":
+            if (value is not None) != bool(arg):
+                return False
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None:
+                return False
+            if op == "$gt" and not value > arg:
+                return False
+            if op == "$gte" and not value >= arg:
+                return False
+            if op == "$lt" and not value < arg:
+                return False
+            if op == "$lte" and not value <= arg:
+                return False
+        else:
+            raise NotImplementedError(f"memory backend does not support {op}")
+    return True
+
+
+def _matches(doc: dict, filter: dict | None) -> bool:
+    return all(_matches_condition(doc.get(k), v) for k, v in (filter or {}).items())
+
+
+class _InsertResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class _MemoryCollection:
+    """In-memory collection covering the calls the check-in path makes.
+
+    Every call sleeps for `rtt` plus `per_doc` for each document it returns,
+    which stands in for network and transfer cost. Equality lookups go
+    through lazily built hash indexes so the stand-in's own scan time does
+    not swamp the numbers, and `unique` mirrors a unique compound index.
+    """
+
+    def __init__(self, rtt: float, per_doc: float, unique: tuple[str, ...] = ()):
+        self._docs: list[dict] = []
+        self._indexes: dict[str, dict[Any, list[dict]]] = {}
+        self._unique = unique
+        self._unique_keys: set[tuple] = set()
+        self._lock = threading.Lock()
+        self._rtt = rtt
+        self._per_doc = per_doc
+
+    def _charge(self, returned: int) -> None:
+        time.sleep(self._rtt + self._per_doc * returned)
+
+    def _index(self, field: str) -> dict[Any, list[dict]]:
+        index = self._indexes.get(field)
+        if index is None:
+            index = self._indexes[field] = {}
+            for doc in self._docs:
+                index.setdefault(doc.get(field), []).append(doc)
+        return index
+
+    def _candidates(self, filter: dict | None) -> list[dict]:
+        for field, cond in (filter or {}).items():
+            if isinstance(cond, (ObjectId, str, bool, int)):
+                return self._index(field).get(cond, [])
+        return self._docs
+
+    def _add(self, doc: dict) -> None:
+        doc.setdefault("_id", ObjectId())
+        if self._unique:
+            key = tuple(doc.get(f) for f in self._unique)
+            if key in self._unique_keys:
+                raise DuplicateKeyError(f"duplicate key {key}")
+            self._unique_keys.add(key)
+        stored = dict(doc)
+        self._docs.append(stored)
+        for field, index in self._indexes.items():
+            index.setdefault(stored.get(field), []).append(stored)
+
+    def find(self, filter: dict | None = None, projection: dict | None = None):
+        with self._lock:
+            docs = [dict(d) for d in self._candidates(filter) if _matches(d, filter)]
+        self._charge(len(docs))
+        return docs
+
+    def find_one(self, filter: dict | None = None, projection: dict | None = None):
+        with self._lock:
+            doc = next(
+                (dict(d) for d in self._candidates(filter) if _matches(d, filter)),
+                None,
+            )
+        self._charge(1 if doc else 0)
+        return doc
+
+    def insert_one(self, doc: dict) -> _InsertResult:
+        with self._lock:
+            self._add(doc)
+        self._charge(0)
+        return _InsertResult(doc["_id"])
+
+    def insert_many(self, docs: list[dict]) -> None:
+        with self._lock:
+            for doc in docs:
+                self._add(doc)
+        self._charge(0)
+
+    def update_many(self, filter: dict, update: dict) -> None:
+        changes = update.get("$set", {})
+        with self._lock:
+            for doc in list(self._candidates(filter)):
+                if _matches(doc, filter):
+                    doc.update(changes)
+            for field in changes:
+                self._indexes.pop(field, None)
+        self._charge(0)
+
+    def count_documents(self, filter: dict) -> int:
+        with self._lock:
+            count = sum(1 for d in self._candidates(filter) if _matches(d, filter))
+        self._charge(0)
+        return count
+
+
+class _MemoryDatabase:
+    # Mirrors the unique compound indexes in utils/create_indexes.py that
+    # the check-in path can run into.
+    _UNIQUE = {"attendance_records": ("event_id", "cadet_id")}
+
+    def __init__(self, rtt: float, per_doc: float):
+        self._collections: dict[str, _MemoryCollection] = {}
+        self._rtt = rtt
+        self._per_doc = per_doc
+
+    def __getitem__(self, name: str) -> _MemoryCollection:
+        col = self._collections.get(name)
+        if col is None:
+            col = self._collections[name] = _MemoryCollection(
+                self._rtt, self._per_doc, self._UNIQUE.get(name, ())
+            )
+        return col
+
+    def __getattr__(self, name: str) -> _MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+def _install_backend(args) -> Callable[[], None]:
+    """Point `utils.db` at the chosen backend; return a teardown callback."""
+    original_get_client = db_module.get_client
+
+    if args.backend == "memory":
+        raw_db = _MemoryDatabase(args.rtt_ms / 1000, args.per_doc_us / 1_000_000)
+        client = _CountingClient(raw_db)
+        db_module.get_client = lambda: client  # type: ignore[assignment]
+
+        def _teardown() -> None:
+            db_module.get_client = original_get_client
+
+        return _teardown
+
+    from pymongo import MongoClient
+
+    from utils.create_indexes import create_indexes
+
+    mongo = MongoClient(args.mongo_uri)
+    mongo.drop_database(SCRATCH_DB)
+    client = _CountingClient(mongo[SCRATCH_DB])
+    db_module.get_client = lambda: client  # type: ignore[assignment]
+    create_indexes()
+
+    def _teardown() -> None:
+        db_module.get_client = original_get_client
+        mongo.drop_database(SCRATCH_DB)
+        mongo.close()
+
+    return _teardown
+
+
+# -- Scenario ----------------------------------------------------------------
+
+
+def seed(n_cadets: int, history: int, rng: random.Random) -> list[str]:
+    """Seed users, cadets, flights, one live event and its code.
+
+    Each cadet also gets `history` past attendance records, the way a
+    cadet's history grows over a few semesters. Returns cadet emails.
+    """
+    db = db_module.get_db()
+    assert db is not None
+    now = datetime.now(timezone.utc)
+
+    flights = [{"_id": ObjectId(), "name": f"Flight {n}"} for n in "ABCDEF"]
+    users, cadets, emails = [], [], []
+    for i in range(n_cadets):
+        user_id = ObjectId()
+        email = f"cadet{i:04d}@bench.test"
+        emails.append(email)
+        users.append(
+            {
+                "_id": user_id,
+                "email": email,
+                "email_normalized": email,
+                "first_name": f"First{i}",
+                "last_name": f"Last{i:04d}",
+                "roles": ["cadet"],
+            }
+        )
+        cadets.append(
+            {
+                "_id": ObjectId(),
+                "user_id": user_id,
+                "rank": "C/Amn",
+                "flight_id": rng.choice(flights)["_id"],
+            }
+        )
+
+    event_id = ObjectId()
+    events = [
+        {
+            "_id": event_id,
+            "event_name": "Morning PT",
+            "event_type": "pt",
+            "start_date": now,
+            "end_date": now + timedelta(hours=1),
+        }
+    ]
+    past_events = [
+        {
+            "_id": ObjectId(),
+            "event_name": f"PT {d}",
+            "event_type": "pt",
+            "start_date": now - timedelta(days=d + 1),
+        }
+        for d in range(history)
+    ]
+    records = [
+        {
+            "_id": ObjectId(),
+            "event_id": e["_id"],
+            "cadet_id": c["_id"],
+            "status": "present" if rng.random() < 0.9 else "absent",
+            "created_at": e["start_date"],
+        }
+        for e in past_events
+        for c in cadets
+    ]
+
+    db["flights"].insert_many(flights)
+    db["users"].insert_many(users)
+    db["cadets"].insert_many(cadets)
+    db["events"].insert_many(events + past_events)
+    if records:
+        db["attendance_records"].insert_many(records)
+    db["event_codes"].insert_one(
+        {
+            "code": EVENT_CODE,
+            "event_id": event_id,
+            "event_type": "pt",
+            "active": True,
+            "expires_at": now + timedelta(hours=1),
+            "created_at": now,
+        }
+    )
+    return emails
+
+
+def page_checkin(email: str, code: str, session: dict) -> str:
+    """The page-level query chain the Attendance Submission page used to run
+    on a "Report In" rerun, before `services.checkin`."""
+    user = get_user_by_email(email)
+    if not user:
+        return "no_user"
+    cadet = get_cadet_by_user_id(user["_id"])
+    if not cadet:
+        return "no_cadet"
+    load_cadet_flights(cadet)
+
+    event_code = validate_code(code)
+    if event_code is None:
+        return "invalid_code"
+    event = get_event_by_id(event_code["event_id"])
+    if not event:
+        return "invalid_code"
+    window = get_checkin_window_minutes()
+    if not is_within_checkin_window(
+        event, datetime.now(timezone.utc), window_minutes=window
+    ):
+        return "outside_window"
+
+    # Once while rendering the form, once more in the button handler.
+    existing = get_attendance_by_cadet(cadet["_id"])
+    is_already_checked_in(str(event_code["event_id"]), str(cadet["_id"]), existing)
+    existing = get_attendance_by_cadet(cadet["_id"])
+    if is_already_checked_in(str(event_code["event_id"]), str(cadet["_id"]), existing):
+        return "duplicate"
+
+    result = create_attendance_record(
+        event_id=event_code["event_id"],
+        cadet_id=cadet["_id"],
+        status="present",
+        recorded_by_user_id=user["_id"],
+        recorded_by_roles=list(user.get("roles", [])),
+    )
+    if result is None:
+        return "db_unavailable"
+    get_event_by_id(event_code["event_id"])
+    log_checkin_attempt(
+        cadet_id=cadet["_id"],
+        outcome="success",
+        event_id=event_code["event_id"],
+        user_id=user["_id"],
+        source="attendance_submission",
+    )
+    return "success"
+
+
+def service_open_page(email: str, session: dict) -> None:
+    """Resolve the session's cadet context, as the page does on first load."""
+    get_checkin_context(email, session)
+
+
+def service_checkin(email: str, code: str, session: dict) -> str:
+    """A "Report In" rerun of the page on top of `services.checkin`."""
+    context = get_checkin_context(email, session)
+    if not context:
+        return "no_user"
+    if context["cadet"] is None:
+        return "no_cadet"
+
+    lookup = lookup_checkin_event(code, context["cadet"]["_id"])
+    if lookup["outcome"] == "already_checked_in":
+        return "duplicate"
+    if lookup["outcome"] != "ok":
+        return lookup["outcome"]
+    return submit_checkin(context, lookup["event_code"], event=lookup["event"])
+
+
+# name -> (run once per cadet before the surge, or None; one submission)
+CHECKIN_PATHS: dict[
+    str,
+    tuple[Callable[[str, dict], None] | None, Callable[[str, str, dict], str]],
+] = {
+    "page": (None, page_checkin),
+    "service": (service_open_page, service_checkin),
+}
+
+
+def _percentile(sorted_values: list[float], pct: int) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return statistics.quantiles(sorted_values, n=100, method="inclusive")[pct - 1]
+
+
+def run_surge(
+    path: str,
+    emails: list[str],
+    *,
+    window_seconds: float,
+    resubmit_rate: float,
+    workers: int,
+    rng: random.Random,
+) -> dict:
+    """Replay a seeded arrival schedule and collect per-submission samples.
+
+    Cadets open the page before the code is announced, so each path's
+    page-load step runs for every cadet before the clock starts.
+    """
+    open_page, checkin = CHECKIN_PATHS[path]
+    sessions: dict[str, dict] = {email: {} for email in emails}
+    if open_page is not None:
+        for email in emails:
+            open_page(email, sessions[email])
+
+    arrivals = [(rng.uniform(0, window_seconds), email) for email in emails]
+    arrivals += [
+        (rng.uniform(offset, window_seconds + 0.5), email)
+        for offset, email in list(arrivals)
+        if rng.random() < resubmit_rate
+    ]
+    arrivals.sort()
+
+    samples: list[tuple[float, int, str]] = []
+    samples_lock = threading.Lock()
+    started = time.perf_counter()
+
+    def _submit(offset: float, email: str) -> None:
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        _round_trips.count = 0
+        t0 = time.perf_counter()
+        try:
+            outcome = checkin(email, EVENT_CODE, sessions[email])
+        except Exception as exc:
+            # e.g. a resubmission racing the first insert into the unique
+            # (event_id, cadet_id) index.
+            outcome = f"error:{type(exc).__name__}"
+        elapsed = time.perf_counter() - t0
+        with samples_lock:
+            samples.append((elapsed, _round_trips.count, outcome))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_submit, offset, email) for offset, email in arrivals]
+        for future in futures:
+            future.result()
+    wall = time.perf_counter() - started
+
+    latencies = sorted(s[0] * 1000 for s in samples)
+    outcomes: dict[str, int] = {}
+    for _, _, outcome in samples:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return {
+        "submissions": len(samples),
+        "outcomes": outcomes,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "round_trips": statistics.fmean(s[1] for s in samples),
+        "max_round_trips": max(s[1] for s in samples),
+        "throughput": len(samples) / wall,
+        "wall_s": wall,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0] if __doc__ else None
+    )
+    parser.add_argument("--cadets", type=int, default=200)
+    parser.add_argument(
+        "--window", type=float, default=3.0, help="arrival spread in seconds"
+    )
+    parser.add_argument(
+        "--history", type=int, default=60, help="past records per cadet"
+    )
+    parser.add_argument("--resubmit-rate", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--path", choices=sorted(CHECKIN_PATHS), default="page")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", choices=["memory", "mongo"], default="memory")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--per-doc-us", type=float, default=5.0)
+    parser.add_argument("--max-p95-ms", type=float)
+    parser.add_argument("--max-round-trips", type=float)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    teardown = _install_backend(args)
+    try:
+        clear_cache()
+        emails = seed(args.cadets, args.history, rng)
+        report = run_surge(
+            args.path,
+            emails,
+            window_seconds=args.window,
+            resubmit_rate=args.resubmit_rate,
+            workers=args.workers,
+            rng=rng,
+        )
+        db = db_module.get_db()
+        assert db is not None
+        recorded = db["attendance_records"].count_documents(
+            {"created_at": {"$gte": datetime.now(timezone.utc) - timedelta(hours=1)}}
+        )
+    finally:
+        clear_cache()
+        teardown()
+
+    outcomes = ", ".join(f"{k} {v}" for k, v in sorted(report["outcomes"].items()))
+    print(
+        f"path={args.path} backend={args.backend} cadets={args.cadets}"
+        f" history={args.history} window={args.window}s workers={args.workers}"
+    )
+    print(f"submissions     {report['submissions']} ({outcomes})")
+    print(f"records written {recorded}")
+    print(
+        f"latency (ms)    p50 {report['p50_ms']:.1f}  p95 {report['p95_ms']:.1f}"
+        f"  p99 {report['p99_ms']:.1f}"
+    )
+    print(
+        f"round trips     {report['round_trips']:.1f} per check-in"
+        f" (max {report['max_round_trips']})"
+    )
+    print(
+        f"throughput      {report['throughput']:.1f} check-ins/s"
+        f" over {report['wall_s']:.2f}s"
+    )
+
+    failed = False
+    if args.max_p95_ms is not None and report["p95_ms"] > args.max_p95_ms:
+        print(f"FAIL: p95 {report['p95_ms']:.1f} ms > {args.max_p95_ms} ms")
+        failed = True
+    if (
+        args.max_round_trips is not None
+        and report["round_trips"] > args.max_round_trips
+    ):
+        print(f"FAIL: {report['round_trips']:.1f} round trips > {args.max_round_trips}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
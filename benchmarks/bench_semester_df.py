@@ -0,0 +1,182 @@
+"""
+Compare the legacy per-cell loop with the vectorized semester matrix builder.
+
+Usage:
+    python benchmarks/bench_semester_df.py
+    python benchmarks/bench_semester_df.py --cadets 100 500 2000 --events 100
+
+Data is synthetic and seeded, so no MongoDB is needed and runs are
+reproducible. Each size also asserts both paths produce identical frames.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from bson import ObjectId
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.dashboard import build_semester_df
+from utils.names import format_full_name
+
+STATUS_WEIGHTS = {"present": 85, "absent": 10, "excused": 4, "": 1}
+
+
+def legacy_semester_df(data: dict) -> pd.DataFrame:
+    """The per-cadet, per-event loop `get_semester_df` used before vectorizing."""
+    cadets = data["cadets"]
+    users = data["users"]
+    events = data["events"]
+    records = data["records"]
+    waivers = data["waivers"]
+
+    name_by_user_id = {u["_id"]: format_full_name(u, "Unknown") for u in users}
+    name_by_cadet = {
+        c["_id"]: name_by_user_id.get(c["user_id"], "Unknown") for c in cadets
+    }
+
+    status_map: dict[tuple, str] = {
+        (r["event_id"], r["cadet_id"]): (r.get("status") or "absent").lower()
+        for r in records
+    }
+    pair_to_record: dict[tuple, Any] = {
+        (r["event_id"], r["cadet_id"]): r["_id"] for r in records
+    }
+    waived_record_ids = {w["attendance_record_id"] for w in waivers}
+
+    cadets_sorted = sorted(
+        cadets, key=lambda c: name_by_cadet.get(c["_id"], "").lower()
+    )
+
+    rows = []
+    for c in cadets_sorted:
+        cid = c["_id"]
+        row: dict[str, Any] = {"Cadet": name_by_cadet.get(cid, "Unknown")}
+        pt_absences = llab_absences = approved_waivers = 0
+
+        for e in events:
+            eid = e["_id"]
+            sd = e.get("start_date")
+            col_label = f"{sd.strftime('%m/%d') if isinstance(sd, datetime) else ''} {e.get('event_type', '').upper()}".strip()
+
+            rid = pair_to_record.get((eid, cid))
+            if rid in waived_record_ids:
+                val = "Waived"
+            else:
+                raw = status_map.get((eid, cid), "absent")
+                val = {
+                    "present": "Present",
+                    "absent": "Absent",
+                    "excused": "Excused",
+                }.get(raw, "Absent")
+
+            row[col_label] = val
+
+            if val == "Absent":
+                if e.get("event_type") == "pt":
+                    pt_absences += 1
+                elif e.get("event_type") == "lab":
+                    llab_absences += 1
+
+            if rid in waived_record_ids:
+                approved_waivers += 1
+
+        row["PT Absences"] = pt_absences
+        row["LLAB Absences"] = llab_absences
+        row["Approved Waivers"] = approved_waivers
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def make_semester_data(n_cadets: int, n_events: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    users = [
+        {"_id": ObjectId(), "first_name": f"First{i}", "last_name": f"Last{i:05d}"}
+        for i in range(n_cadets)
+    ]
+    cadets = [{"_id": ObjectId(), "user_id": u["_id"]} for u in users]
+
+    start = datetime(2026, 1, 12, 6, 0, tzinfo=timezone.utc)
+    events = [
+        {
+            "_id": ObjectId(),
+            "event_type": "lab" if i % 4 == 3 else "pt",
+            "start_date": start + timedelta(days=i * 2),
+        }
+        for i in range(n_events)
+    ]
+
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    records = []
+    for e in events:
+        for c in cadets:
+            # Leave some cells without a record so the "missing -> Absent"
+            # default is exercised too.
+            if rng.random() < 0.03:
+                continue
+            records.append(
+                {
+                    "_id": ObjectId(),
+                    "event_id": e["_id"],
+                    "cadet_id": c["_id"],
+                    "status": rng.choices(statuses, weights)[0],
+                }
+            )
+
+    waivers = [
+        {"attendance_record_id": r["_id"], "status": "approved"}
+        for r in records
+        if r["status"] in ("absent", "excused") and rng.random() < 0.3
+    ]
+    return {
+        "cadets": cadets,
+        "users": users,
+        "events": events,
+        "records": records,
+        "waivers": waivers,
+    }
+
+
+def _best_of(fn, data: dict, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0] if __doc__ else None
+    )
+    parser.add_argument("--cadets", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'cadets':>8} {'cells':>9} {'legacy (s)':>11} {'vector (s)':>11} {'speedup':>8}"
+    )
+    for n_cadets in args.cadets:
+        data = make_semester_data(n_cadets, args.events)
+        pd.testing.assert_frame_equal(legacy_semester_df(data), build_semester_df(data))
+
+        legacy = _best_of(legacy_semester_df, data, args.repeat)
+        vector = _best_of(build_semester_df, data, args.repeat)
+        print(
+            f"{n_cadets:>8} {n_cadets * args.events:>9} {legacy:>11.3f}"
+            f" {vector:>11.3f} {legacy / vector:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
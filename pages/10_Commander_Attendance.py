@@ -318,7 +318,9 @@ def _render_attendance_roster() -> None:
             recorded_by_user_id=user["_id"],
             recorded_by_roles=list(user.get("roles", [])),
         )
-        if save_result["changed_count"] == 0:
+        if not save_result["ok"]:
+            _set_feedback("error", "Database unavailable. Attendance was not saved.")
+        elif save_result["changed_count"] == 0:
             _set_feedback("info", "No attendance changes to save.")
         else:
             st.session_state["_attendance_roster_drafts"] = {}
@@ -6,7 +6,12 @@ from utils.auth import get_current_user, require_role
 from utils.export import to_excel
 from utils.db import get_collection
 
-from services.at_risk_cadets import get_df, get_waiver_flag_df, WAIVER_FLAG_THRESHOLD
+from services.at_risk_cadets import (
+    build_at_risk_report,
+    get_df,
+    get_waiver_flag_df,
+    WAIVER_FLAG_THRESHOLD,
+)
 
 require_role("admin", "cadre", "flight_commander")
 
@@ -20,7 +25,7 @@ fc_flight_id = None
 if is_fc_only and current_user:
     users_col = get_collection("users")
     cadets_col = get_collection("cadets")
-    if users_col and cadets_col:
+    if users_col is not None and cadets_col is not None:
         user_doc = users_col.find_one({"email": current_user.get("email")}, {"_id": 1})
         if user_doc:
             cadet_doc = cadets_col.find_one(
@@ -29,7 +34,8 @@ if is_fc_only and current_user:
             if cadet_doc:
                 fc_flight_id = cadet_doc.get("flight_id")
 
-df = get_df(flight_id=fc_flight_id)
+report = build_at_risk_report(flight_id=fc_flight_id)
+df = get_df(report=report)
 if isinstance(df, str):
     st.info("No cadets found.")
 elif isinstance(df, pd.DataFrame):
@@ -60,7 +66,7 @@ elif isinstance(df, pd.DataFrame):
 
 st.divider()
 st.subheader(f"Waiver-Flagged Cadets ({WAIVER_FLAG_THRESHOLD}+ approved waivers)")
-waiver_df = get_waiver_flag_df()
+waiver_df = get_waiver_flag_df(report=report)
 if isinstance(waiver_df, str):
     st.info(waiver_df)
 else:
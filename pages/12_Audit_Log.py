@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+from functools import partial
 
 import pandas as pd
 import streamlit as st
@@ -9,15 +10,15 @@ from services.audit_log_viewer import (
     build_audit_detail_rows,
     build_audit_overview_row,
     build_audit_table_row,
-    export_audit_log_to_df,
+    export_audit_log,
     get_audit_activity_options,
     get_audit_detail_columns,
     query_audit_log,
 )
 from utils.auth import require_role
-from utils.export import to_excel
 from utils.pagination import (
     init_pagination_state,
+    pagination_cursor,
     render_pagination_controls,
     sync_pagination_state,
 )
@@ -87,11 +88,14 @@ result = query_audit_log(
     target_search=target_search.strip() or None,
     page=page,
     page_size=page_size,
+    cursor=pagination_cursor("audit_log"),
+    estimate_count=True,
 )
 
 sync_pagination_state("audit_log", result)
 
-st.caption(f"Showing {len(result['items'])} of {result['total_count']} total entries")
+total_label = f"{result['total_count']}{'+' if result['count_is_estimate'] else ''}"
+st.caption(f"Showing {len(result['items'])} of {total_label} total entries")
 
 # ── Table ────────────────────────────────────────────────────────────────────
 
@@ -177,31 +181,32 @@ else:
     # ── Export ───────────────────────────────────────────────────────────────
 
     st.divider()
-    export_df = export_audit_log_to_df(
-        start_date=start_dt,
-        end_date=end_dt,
-        activities=activity_filter if activity_filter else None,
-        actor_search=actor_search_filter.strip() or None,
-        target_search=target_search.strip() or None,
-    )
-
-    if export_df is not None and not export_df.empty:
+    export_filters = {
+        "start_date": start_dt,
+        "end_date": end_dt,
+        "activities": activity_filter if activity_filter else None,
+        "actor_search": actor_search_filter.strip() or None,
+        "target_search": target_search.strip() or None,
+    }
+
+    if result["total_count"]:
+        # Files are generated on click, streamed from the cursor in batches.
         c1, c2 = st.columns([1, 4])
         with c1:
             st.download_button(
                 "Export CSV",
-                export_df.to_csv(index=False).encode("utf-8"),
+                partial(export_audit_log, "csv", **export_filters),
                 "audit_log.csv",
                 "text/csv",
+                on_click="ignore",
             )
         with c2:
-            excel_bytes = to_excel(export_df)
-            if excel_bytes:
-                st.download_button(
-                    "Export Excel",
-                    excel_bytes,
-                    "audit_log.xlsx",
-                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                )
+            st.download_button(
+                "Export Excel",
+                partial(export_audit_log, "xlsx", **export_filters),
+                "audit_log.xlsx",
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                on_click="ignore",
+            )
     else:
         st.caption("No data to export.")
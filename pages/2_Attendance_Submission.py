@@ -1,30 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-
 import folium
 import streamlit as st
 from streamlit_folium import st_folium
 from streamlit_js_eval import get_geolocation
 
-from services.attendance import (
-    is_already_checked_in,
-    is_within_checkin_window,
-    is_within_geofence,
-)
-from services.event_config import get_checkin_window_minutes
-from services.cadet_attendance import get_cadet_flight_label, load_cadet_flights
-from services.event_codes import validate_code
-from utils.audit_log import log_checkin_attempt
+from services.attendance import is_within_geofence
+from services.checkin import get_checkin_context, lookup_checkin_event, submit_checkin
 from utils.auth import get_current_user, require_auth
 from utils.auth_logic import user_has_any_role
-from utils.db_schema_crud import (
-    create_attendance_record,
-    get_attendance_by_cadet,
-    get_cadet_by_user_id,
-    get_event_by_id,
-    get_user_by_email,
-)
 
 
 require_auth()
@@ -33,13 +17,15 @@ st.title("Attendance Submission")
 current_user = get_current_user()
 assert current_user is not None
 
-user = get_user_by_email(str(current_user.get("email", "") or "").strip())
-if not user:
+checkin_context = get_checkin_context(
+    str(current_user.get("email", "") or ""), st.session_state
+)
+if not checkin_context:
     st.error("Could not find your account.")
     st.stop()
-assert user is not None
+assert checkin_context is not None
 
-cadet = get_cadet_by_user_id(user["_id"])
+cadet = checkin_context["cadet"]
 if not cadet:
     if user_has_any_role(current_user, ["admin"]):
         st.info(
@@ -58,8 +44,7 @@ cadet_id = cadet["_id"]
 first = str(current_user.get("first_name", "") or "").strip()
 last = str(current_user.get("last_name", "") or "").strip()
 rank = str(cadet.get("rank", "") or "").strip()
-flights = load_cadet_flights(cadet)
-flight_label = get_cadet_flight_label(cadet, flights)
+flight_label = checkin_context["flight_label"]
 name_parts = [p for p in [rank, first, last] if p]
 st.caption(f"Checking in as **{' '.join(name_parts)}** - Flight: {flight_label}")
 st.divider()
@@ -99,71 +84,67 @@ geo_unavailable = False
 _validated_event: dict | None = None
 
 if len(code_clean) == 6:
-    event_code = validate_code(code_clean)
-    if event_code is None:
+    lookup = lookup_checkin_event(code_clean, cadet_id)
+    event_code = lookup["event_code"]
+    event = lookup["event"]
+    if lookup["outcome"] == "invalid_code":
         st.error("Invalid or expired code.")
-    else:
-        event = get_event_by_id(event_code["event_id"])
-        if event:
-            window = get_checkin_window_minutes()
-            if not is_within_checkin_window(
-                event, datetime.now(timezone.utc), window_minutes=window
-            ):
-                st.error(
-                    f"Check-in is only available within {window} minutes of the event start time."
-                )
-                event_code = None
+        event_code = None
+    elif event:
+        window = lookup["window_minutes"]
+        if lookup["outcome"] == "outside_window":
+            st.error(
+                f"Check-in is only available within {window} minutes of the event start time."
+            )
+            event_code = None
+        else:
+            _validated_event = event
+            event_name = str(event.get("event_name", "") or "Event")
+            event_type = (event.get("event_type") or "").upper()
+            start = event.get("start_date")
+            if hasattr(start, "strftime"):
+                date_str = start.strftime("%B %d, %Y")
+            elif start:
+                date_str = str(start)[:10]
             else:
-                _validated_event = event
-                event_name = str(event.get("event_name", "") or "Event")
-                event_type = (event.get("event_type") or "").upper()
-                start = event.get("start_date")
-                if hasattr(start, "strftime"):
-                    date_str = start.strftime("%B %d, %Y")
-                elif start:
-                    date_str = str(start)[:10]
-                else:
-                    date_str = ""
-
-                existing = get_attendance_by_cadet(cadet_id)
-                already_checked_in = is_already_checked_in(
-                    str(event_code["event_id"]), str(cadet_id), existing
-                )
+                date_str = ""
 
-                if already_checked_in:
-                    st.success(
-                        f"You are already checked in for **{event_name}**"
-                        + (f" ({event_type} - {date_str})" if date_str else "")
-                        + "."
-                    )
-                else:
-                    label = event_name
-                    if event_type:
-                        label += f" - {event_type}"
-                    if date_str:
-                        label += f" - {date_str}"
-                    st.info(label)
-
-                    # Geofence check
-                    if event.get("geofence_enabled"):
-                        if _has_coords:
-                            cadet_lat = _coords.get("latitude")
-                            cadet_lon = _coords.get("longitude")
-
-                        if cadet_lat is not None and cadet_lon is not None:
-                            within, warning = is_within_geofence(
-                                event, cadet_lat, cadet_lon
-                            )
-                            if not within:
-                                st.warning(
-                                    f"Location: {warning} Check-in is still allowed."
-                                )
-                                geo_outside_fence = True
-                        else:
+            already_checked_in = lookup["outcome"] == "already_checked_in"
+
+            if already_checked_in:
+                st.success(
+                    f"You are already checked in for **{event_name}**"
+                    + (f" ({event_type} - {date_str})" if date_str else "")
+                    + "."
+                )
+            else:
+                label = event_name
+                if event_type:
+                    label += f" - {event_type}"
+                if date_str:
+                    label += f" - {date_str}"
+                st.info(label)
+
+                # Geofence check
+                if event.get("geofence_enabled"):
+                    if _has_coords:
+                        cadet_lat = _coords.get("latitude")
+                        cadet_lon = _coords.get("longitude")
+
+                    if cadet_lat is not None and cadet_lon is not None:
+                        within, warning = is_within_geofence(
+                            event, cadet_lat, cadet_lon
+                        )
+                        if not within:
                             st.warning(
-                                "Could not verify your location. Check-in is still allowed."
+                                f"Location: {warning} Check-in is still allowed."
                             )
-                            geo_unavailable = True
+                            geo_outside_fence = True
+                    else:
+                        st.warning(
+                            "Could not verify your location. Check-in is still allowed."
+                        )
+                        geo_unavailable = True
 
 # ── Location map — shown whenever GPS has resolved ────────────────────────────
 
@@ -213,36 +194,24 @@ if (
     st.button("Report In", type="primary", disabled=button_disabled)
     and event_code is not None
 ):
-    existing = get_attendance_by_cadet(cadet_id)
-    if is_already_checked_in(str(event_code["event_id"]), str(cadet_id), existing):
+    outcome = submit_checkin(
+        checkin_context,
+        event_code,
+        location_lat=cadet_lat,
+        location_lon=cadet_lon,
+        location_outside_fence=geo_outside_fence,
+        location_unavailable=geo_unavailable,
+        event=_validated_event,
+    )
+    if outcome == "duplicate":
         st.info("You are already checked in for this event.")
+    elif outcome == "db_unavailable":
+        st.error("Database unavailable. Could not record attendance.")
     else:
-        result = create_attendance_record(
-            event_id=event_code["event_id"],
-            cadet_id=cadet_id,
-            status="present",
-            recorded_by_user_id=user["_id"],
-            recorded_by_roles=list(user.get("roles", [])),
-            location_lat=cadet_lat,
-            location_lon=cadet_lon,
-            location_outside_fence=geo_outside_fence,
-            location_unavailable=geo_unavailable,
+        event_name = (
+            str(_validated_event.get("event_name", "") or "the event")
+            if _validated_event
+            else "the event"
         )
-        if result is None:
-            st.error("Database unavailable. Could not record attendance.")
-        else:
-            event = get_event_by_id(event_code["event_id"])
-            event_name = (
-                str(event.get("event_name", "") or "the event")
-                if event
-                else "the event"
-            )
-            log_checkin_attempt(
-                cadet_id=cadet_id,
-                outcome="success",
-                event_id=event_code["event_id"],
-                user_id=user["_id"],
-                source="attendance_submission",
-            )
-            st.success(f"Checked in for **{event_name}**!")
-            st.balloons()
+        st.success(f"Checked in for **{event_name}**!")
+        st.balloons()
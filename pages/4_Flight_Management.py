@@ -1,19 +1,20 @@
 import streamlit as st
 from services.admin_users import confirm_destructive_action
 from utils.auth import get_current_user, require_role
-from services.cadets import build_cadet_display_map
 
 from services.flight_management import (
     assign_selected_cadets_to_flight,
     get_assignment_table,
     get_cadet_rows_by_id,
     get_commander_member_table,
+    get_commander_display_map,
     get_flight_commander_details,
     get_flight_management_cadet_rows,
     get_flight_member_table,
     get_selectable_member_ids,
     has_selected_assigned_cadets,
     get_member_selection_table,
+    get_roster_snapshot,
     get_selected_cadet_ids,
     unassign_selected_cadets,
 )
@@ -21,7 +22,6 @@ from services.flight_management import (
 from utils.db_schema_crud import (
     create_flight,
     delete_flight,
-    get_all_flights,
     unassign_all_cadets_from_flight,
 )
 
@@ -124,7 +124,8 @@ def clear_flight_table_state(flight_id: str) -> None:
 # Create Flight Section
 # ----------------------------
 
-cadet_display_map = build_cadet_display_map()
+roster = get_roster_snapshot()
+cadet_display_map = get_commander_display_map(snapshot=roster)
 
 with st.expander("Create New Flight", expanded=False):
     with st.form("create_flight_form"):
@@ -160,8 +161,8 @@ st.divider()
 # Existing Flights
 # ----------------------------
 
-flights = get_all_flights()
-cadet_rows = get_flight_management_cadet_rows()
+flights = roster["flights"]
+cadet_rows = get_flight_management_cadet_rows(snapshot=roster)
 cadet_rows_by_id = get_cadet_rows_by_id(cadet_rows)
 rendered_feedback = False
 
@@ -172,8 +173,10 @@ else:
     for flight in flights:
         flight_id = str(flight["_id"])
 
-        commander_name, commander_rank = get_flight_commander_details(flight)
-        commander_table = get_commander_member_table(flight)
+        commander_name, commander_rank = get_flight_commander_details(
+            flight, snapshot=roster
+        )
+        commander_table = get_commander_member_table(flight, snapshot=roster)
         members_table, member_cadet_ids = get_flight_member_table(cadet_rows, flight)
         cadet_count = len(get_selectable_member_ids(member_cadet_ids))
 
@@ -407,6 +407,7 @@ with st.expander("Generate Semester Schedule", expanded=False):
                 _start = require(_gen_start, "Select a valid date range first.")
                 _end = require(_gen_end, "Select a valid date range first.")
                 _gen_geo = st.session_state.get("gen_use_geofence", False)
+                _gen_progress = st.progress(0.0, text="Creating events...")
                 _created, _skipped = bulk_create_events(
                     _start,
                     _end,
@@ -435,6 +436,9 @@ with st.expander("Generate Semester Schedule", expanded=False):
                     actor_email=current_user_doc.get("email")
                     if current_user_doc
                     else None,
+                    progress=lambda done, total: _gen_progress.progress(
+                        done / total, text=f"Created {done} of {total} events..."
+                    ),
                 )
                 st.session_state.gen_preview = None
                 st.session_state.gen_preview_params = None
@@ -442,7 +446,8 @@ with st.expander("Generate Semester Schedule", expanded=False):
                 st.session_state.gen_geofence_lat = None
                 st.session_state.gen_geofence_lon = None
                 st.session_state.gen_schedule_success = (
-                    f"Created {_created} events ({_skipped} holiday dates skipped)."
+                    f"Created {_created} events ({_skipped} holiday or already "
+                    "scheduled dates skipped)."
                 )
                 st.rerun()
 
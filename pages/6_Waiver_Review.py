@@ -17,6 +17,7 @@ from utils.db_schema_crud import get_user_by_email
 from utils.export import to_excel
 from utils.pagination import (
     init_pagination_state,
+    pagination_cursor,
     render_pagination_controls,
     sync_pagination_state,
 )
@@ -84,6 +85,7 @@ paginated_rows = get_paginated_waiver_review_rows(
     viewer_roles=viewer_roles,
     page=review_page,
     page_size=review_page_size,
+    cursor=pagination_cursor("waiver_review"),
 )
 sync_pagination_state("waiver_review", paginated_rows)
 
@@ -13,14 +13,18 @@ from utils.attendance_status import NO_RECORD_STATUS_LABEL, get_attendance_statu
 from utils.datetime_utils import ensure_utc
 from utils.db_schema_crud import (
     get_all_cadets,
-    get_attendance_by_event,
     get_cadet_by_user_id,
     get_events_by_type,
     get_user_by_email,
     get_users_by_ids,
 )
 from services.events import closest_event_index
-from utils.flight_commander_view import build_checkin_view, get_active_events
+from services.live_attendance import (
+    get_live_attendance,
+    get_live_checkin_view,
+    refresh_live_attendance,
+)
+from utils.flight_commander_view import get_active_events
 
 
 def _cadet_display_name(cadet: dict[str, Any]) -> str:
@@ -169,30 +173,23 @@ def _save_status(entry: dict[str, Any], status: str) -> None:
 
     cadet_name = _cadet_display_name(entry["cadet"])
     status_label = get_attendance_status_label(status, default=status.title())
-    if result["changed_count"] == 0:
+    if not result["ok"]:
+        _set_feedback("error", "Database unavailable. Attendance was not saved.")
+    elif result["changed_count"] == 0:
         _set_feedback("info", f"{cadet_name} is already marked {status_label}.")
     else:
+        refresh_live_attendance(selected_event["_id"])
         _set_feedback("success", f"Marked {cadet_name} {status_label}.")
     st.rerun()
 
 
-@st.fragment(run_every="10s")
+@st.fragment(run_every="1s")
 def live_checkin_fragment(selected_event: dict[str, Any]) -> None:
-    attendance_records = get_attendance_by_event(selected_event["_id"])
-
-    view = build_checkin_view(
-        flight_cadets=flight_cadets,
-        attendance_records=attendance_records,
-        event=selected_event,
-    )
-
-    if view is None:
-        st.info("No active event right now.")
-        return
+    view = get_live_checkin_view(selected_event, flight_cadets, st.session_state)
 
-    event_name = str(view["event"].get("event_name", "Active Event"))
-    start = view["event"].get("start_date")
-    end = view["event"].get("end_date")
+    event_name = str(view.event.get("event_name", "Active Event"))
+    start = view.event.get("start_date")
+    end = view.event.get("end_date")
 
     st.subheader(event_name)
     if isinstance(start, datetime) and isinstance(end, datetime):
@@ -200,27 +197,18 @@ def live_checkin_fragment(selected_event: dict[str, Any]) -> None:
         end = ensure_utc(end)
         st.caption(
             f"{start.strftime('%Y-%m-%d %I:%M %p')} - "
-            f"{end.strftime('%I:%M %p')} • Refreshes every 10 seconds"
+            f"{end.strftime('%I:%M %p')} • Updates live"
         )
     else:
-        st.caption("Refreshes every 10 seconds")
+        st.caption("Updates live")
 
-    checked_in = view["checked_in"]
-    missing = view["missing"]
-
-    record_by_cadet = {
-        str(r.get("cadet_id")): r
-        for r in attendance_records
-        if str(r.get("event_id")) == str(selected_event.get("_id"))
-    }
-
-    outside_fence_count = sum(
-        1 for r in record_by_cadet.values() if r.get("location_outside_fence")
-    )
+    checked_in = view.checked_in
+    missing = view.missing
+    outside_fence_count = view.outside_fence_count
 
     top = st.columns(3)
-    top[0].metric("Checked In", len(checked_in))
-    top[1].metric("Missing", len(missing))
+    top[0].metric("Checked In", view.checked_in_count)
+    top[1].metric("Missing", view.missing_count)
     top[2].metric("Total Flight Cadets", len(flight_cadets))
 
     if outside_fence_count:
@@ -234,7 +222,7 @@ def live_checkin_fragment(selected_event: dict[str, Any]) -> None:
         st.success(f"Checked In ({len(checked_in)})")
         if checked_in:
             for cadet_doc in checked_in:
-                rec = record_by_cadet.get(str(cadet_doc.get("_id")), {})
+                rec = view.record_for(cadet_doc.get("_id")) or {}
                 if rec.get("location_outside_fence"):
                     st.write(f"✅ {_cadet_display_name(cadet_doc)} — not in region")
                 else:
@@ -255,7 +243,7 @@ def live_checkin_fragment(selected_event: dict[str, Any]) -> None:
 
 live_checkin_fragment(selected_event)
 
-attendance_records = get_attendance_by_event(selected_event["_id"])
+attendance_records = get_live_attendance(selected_event["_id"])
 roster = build_commander_roster(flight_cadets, attendance_records)
 
 st.subheader("Manual Attendance")
@@ -7,18 +7,19 @@ from utils.db_schema_crud import (
     set_at_risk_email_sent,
 )
 from services.cadet_attendance import (
-    load_attendance_db,
+    get_cadet_attendance_page,
     load_cadet_flights,
-    cadet_attendance,
-    count_absences,
-    filter_rows,
     get_cadet_flight_label,
-    get_attendance_rate,
 )
 from services.waivers import WAIVER_STATUS_BADGE
 from utils.at_risk_email import PT_ABSENCE_THRESHOLD, LLAB_ABSENCE_THRESHOLD
 from utils.auth_logic import user_has_any_role
 from utils.at_risk_email import send_to_student
+from utils.pagination import (
+    init_pagination_state,
+    render_pagination_controls,
+    sync_pagination_state,
+)
 from utils.st_helpers import require
 from scripts.demo_admin import get_temp_cadet
 
@@ -77,16 +78,16 @@ def show_risk_banner(cadet_id: str, email: str, pt_absences: int, llab_absences:
             st.success("Attendance is within acceptable limits.")
 
 
-def show_absence_summary(rows: list[dict]):
-    pt_absences = count_absences(rows, "pt")
-    llab_absences = count_absences(rows, "lab")
+def show_absence_summary(summary: dict):
+    pt_absences = summary["pt_absences"]
+    llab_absences = summary["llab_absences"]
 
-    attendance_rate_pt = get_attendance_rate(rows, "PT")
-    attendance_rate_llab = get_attendance_rate(rows, "LAB")
+    attendance_rate_pt = summary["pt_rate"]
+    attendance_rate_llab = summary["llab_rate"]
 
     col1, col2, col3, col4, col5 = st.columns(5)
 
-    col1.metric("Total Events", len(rows))
+    col1.metric("Total Events", summary["total_events"])
 
     col2.metric("PT Attendance Rate", f"{attendance_rate_pt}%")
     pt_remaining = PT_ABSENCE_THRESHOLD - pt_absences
@@ -110,7 +111,7 @@ def show_absence_summary(rows: list[dict]):
     st.divider()
 
 
-def show_attendance_table(rows: list[dict]):
+def show_attendance_table(cadet_id, user_id) -> dict:
     col1, col2 = st.columns(2)
     with col1:
         filter_status = st.selectbox(
@@ -123,10 +124,24 @@ def show_attendance_table(rows: list[dict]):
             ["All", "PT", "LLAB"],
         )
 
-    filtered = filter_rows(rows, filter_status, filter_type)
+    page, page_size = init_pagination_state(
+        "cadet_attendance",
+        reset_token=f"{filter_status}|{filter_type}",
+    )
+    history = get_cadet_attendance_page(
+        cadet_id,
+        user_id,
+        filter_status=filter_status,
+        filter_type=filter_type,
+        page=page,
+        page_size=page_size,
+    )
+    sync_pagination_state("cadet_attendance", history)
+
+    filtered = history["items"]
     if not filtered:
         st.info("No records to match the current filter.")
-        return
+        return history
 
     table_rows: list[dict[str, str]] = []
     eligible: list[dict] = []
@@ -161,6 +176,7 @@ def show_attendance_table(rows: list[dict]):
         columns=pd.Index(["Event", "Date", "Type", "Status", "Waiver"]),
     )
     st.dataframe(df, hide_index=True, width="stretch")
+    render_pagination_controls("cadet_attendance", history)
 
     st.divider()
 
@@ -197,6 +213,7 @@ def show_attendance_table(rows: list[dict]):
             st.switch_page("pages/5_Waivers.py")
     else:
         st.caption("No eligible absent records for waiver request in the current view.")
+    return history
 
 
 def show_header(cadet: dict, current_user: dict):
@@ -225,15 +242,14 @@ if not cadet:
         st.stop()
     cadet = get_temp_cadet()
 
-records, events, waivers, standing_waivers = load_attendance_db(
-    cadet["_id"], user["_id"]
-)
-rows = cadet_attendance(records, events, waivers, standing_waivers)
-
 show_header(cadet, current_user)
 
 st.subheader("Absence Summary")
-show_absence_summary(rows)
+# Filled once the history query below has run; it also returns the totals.
+summary_container = st.container()
 
 st.subheader("Attendance Records")
-show_attendance_table(rows)
+history = show_attendance_table(cadet["_id"], user["_id"])
+
+with summary_container:
+    show_absence_summary(history["summary"])
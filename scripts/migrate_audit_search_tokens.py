@@ -0,0 +1,34 @@
+"""
+Backfill audit_log search tokens and build their indexes.
+
+Usage:
+    python scripts/migrate_audit_search_tokens.py
+
+New audit entries get actor_search_tokens / target_search_tokens when they
+are written; entries from before then only show up in Audit Log actor and
+target searches once this has run. Safe to re-run.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.audit_log import backfill_audit_search_tokens
+from utils.create_indexes import create_indexes
+from utils.db import get_db
+
+
+def migrate() -> int:
+    count = backfill_audit_search_tokens()
+    print(f"Backfilled search tokens on {count} audit entries.")
+    create_indexes()
+    print("Ensured audit_log search token indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    if get_db() is None:
+        print("ERROR: Could not connect to MongoDB. Check MONGODB_URI in .env")
+        sys.exit(1)
+    sys.exit(migrate())
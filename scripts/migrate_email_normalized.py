@@ -0,0 +1,46 @@
+"""
+Backfill users.email_normalized and build its unique index.
+
+Usage:
+    python scripts/migrate_email_normalized.py
+
+Safe to re-run. Users whose emails differ only by case are reported and
+left without email_normalized (so they cannot be found by email lookups)
+until an admin renames or removes the duplicates; the script exits with
+status 1 while any remain.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.create_indexes import create_indexes
+from utils.db import get_db
+from utils.db_schema_crud import (
+    backfill_email_normalized,
+    find_email_normalized_conflicts,
+)
+
+
+def migrate() -> int:
+    count = backfill_email_normalized()
+    print(f"Backfilled email_normalized on {count} user(s).")
+    create_indexes()
+    print("Ensured email_normalized_unique index.")
+
+    conflicts = find_email_normalized_conflicts()
+    if not conflicts:
+        return 0
+    print(f"{len(conflicts)} email(s) shared by several users ignoring case:")
+    for c in conflicts:
+        ids = ", ".join(str(uid) for uid in c["user_ids"])
+        print(f"  {c['email_normalized']}: {ids}")
+    return 1
+
+
+if __name__ == "__main__":
+    if get_db() is None:
+        print("ERROR: Could not connect to MongoDB. Check MONGODB_URI in .env")
+        sys.exit(1)
+    sys.exit(migrate())
@@ -0,0 +1,58 @@
+"""
+Rebuild or verify the materialized cadet_attendance_stats collection.
+
+Usage:
+    python scripts/rebuild_attendance_stats.py           # recompute from scratch
+    python scripts/rebuild_attendance_stats.py --verify  # report drift only
+
+--verify exits with status 1 if any stored row disagrees with a fresh
+aggregation over attendance_records, events and waivers.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.db import get_db
+from utils.db_schema_crud import (
+    rebuild_cadet_attendance_stats,
+    verify_cadet_attendance_stats,
+)
+
+
+def _fmt_counts(row: dict | None) -> str:
+    if row is None:
+        return "missing"
+    return (
+        f"PT {row.get('pt_absences', 0)}, LLAB {row.get('llab_absences', 0)}, "
+        f"pending {row.get('pending_waivers', 0)}"
+    )
+
+
+def verify() -> int:
+    mismatches = verify_cadet_attendance_stats()
+    if not mismatches:
+        print("cadet_attendance_stats is up to date.")
+        return 0
+
+    print(f"{len(mismatches)} cadet(s) out of date:")
+    for m in mismatches:
+        print(
+            f"  {m['cadet_id']}: stored {_fmt_counts(m['stored'])}"
+            f" / expected {_fmt_counts(m['expected'])}"
+        )
+    return 1
+
+
+def rebuild() -> int:
+    count = rebuild_cadet_attendance_stats()
+    print(f"Rebuilt cadet_attendance_stats: {count} cadet(s) with absences.")
+    return 0
+
+
+if __name__ == "__main__":
+    if get_db() is None:
+        print("ERROR: Could not connect to MongoDB. Check MONGODB_URI in .env")
+        sys.exit(1)
+    sys.exit(verify() if "--verify" in sys.argv[1:] else rebuild())
@@ -0,0 +1,34 @@
+"""
+Rebuild the materialized waiver_review_view collection and its indexes.
+
+Usage:
+    python scripts/rebuild_waiver_review_view.py
+
+The app keeps the view current through its own write paths and builds it
+the first time it is read empty; run this after editing waivers, cadets,
+users, flights or events directly in MongoDB. Safe to re-run.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.create_indexes import create_indexes
+from utils.db import get_db
+from utils.waiver_review_view import rebuild_waiver_review_view
+
+
+def rebuild() -> int:
+    count = rebuild_waiver_review_view()
+    print(f"Rebuilt waiver_review_view: {count} waiver(s).")
+    create_indexes()
+    print("Ensured waiver_review_view indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    if get_db() is None:
+        print("ERROR: Could not connect to MongoDB. Check MONGODB_URI in .env")
+        sys.exit(1)
+    sys.exit(rebuild())
@@ -13,8 +13,6 @@ import sys
 from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
 
-import bcrypt
-
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from services.cadets import RANK_TO_LEVEL
@@ -25,6 +23,10 @@ from utils.audit_log import (
 )
 from utils.create_indexes import create_indexes
 from utils.db import get_db
+from utils.db_schema_crud import rebuild_cadet_attendance_stats
+from utils.password import hash_password
+from utils.validators import normalize_email
+from utils.waiver_review_view import rebuild_waiver_review_view
 
 rng = random.Random(42)
 
@@ -33,11 +35,7 @@ TODAY = date.today()
 SEMESTER_START = date(2026, 1, 12)
 
 
-def _hash(plain: str) -> str:
-    return bcrypt.hashpw(plain.encode(), bcrypt.gensalt(rounds=12)).decode()
-
-
-PASSWORD = _hash("password")
+PASSWORD = hash_password("password")
 
 ADMIN_USERS = [
     ("admin", "Command", "Admin", "admin@rollcall.local", ["admin"], None),
@@ -864,7 +862,7 @@ def _seed_audit_log(
     reset_target = user_doc_by_key["fc.bravo"]
     reset_after = {
         **reset_target,
-        "password_hash": _hash("temporary-demo-password"),
+        "password_hash": hash_password("temporary-demo-password"),
         "updated_at": NOW - timedelta(days=9),
     }
     log_data_change(
@@ -1142,8 +1140,10 @@ def populate() -> None:
         "events",
         "event_assignments",
         "attendance_records",
+        "cadet_attendance_stats",
         "waivers",
         "waiver_approvals",
+        "waiver_review_view",
         "flights",
     ]:
         db.drop_collection(col_name)
@@ -1175,6 +1175,7 @@ def populate() -> None:
             "last_name": last,
             "name": f"{first} {last}",
             "email": email,
+            "email_normalized": normalize_email(email),
             "password": PASSWORD,
             "password_hash": PASSWORD,
             "roles": roles,
@@ -1465,6 +1466,14 @@ def populate() -> None:
     )
     print(f"Inserted {audit_count} audit log entries.")
 
+    # Records above bypass the write helpers that keep the stats table and
+    # the waiver review view current, and the startup builds already ran
+    # against the empty database.
+    stats_count = rebuild_cadet_attendance_stats()
+    print(f"Built attendance stats for {stats_count} cadet(s) with absences.")
+    view_count = rebuild_waiver_review_view()
+    print(f"Built waiver review view with {view_count} waiver(s).")
+
     create_indexes()
     print("Indexes created.")
 
@@ -11,20 +11,18 @@ import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-import bcrypt
-
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from utils.create_indexes import create_indexes
 from utils.db import get_db
+from utils.db_schema_crud import rebuild_cadet_attendance_stats
+from utils.password import hash_password
+from utils.validators import normalize_email
+from utils.waiver_review_view import rebuild_waiver_review_view
 from services.cadets import RANK_TO_LEVEL
 
 
-def _hash(plain: str) -> str:
-    return bcrypt.hashpw(plain.encode(), bcrypt.gensalt(rounds=12)).decode()
-
-
-PASSWORD = _hash("password")
+PASSWORD = hash_password("password")
 
 
 USERS = [
@@ -127,8 +125,10 @@ def populate():
         "events",
         "event_assignments",
         "attendance_records",
+        "cadet_attendance_stats",
         "waivers",
         "waiver_approvals",
+        "waiver_review_view",
         "flights",
     ]:
         db.drop_collection(col_name)
@@ -144,6 +144,7 @@ def populate():
             "last_name": last,
             "name": full_name,
             "email": email,
+            "email_normalized": normalize_email(email),
             "password": PASSWORD,
             "password_hash": PASSWORD,
             "role": role,
@@ -272,6 +273,14 @@ def populate():
 
     print("Inserted at-risk test data.")
 
+    # Records above bypass the write helpers that keep the stats table and
+    # the waiver review view current, and the startup builds already ran
+    # against the empty database.
+    stats_count = rebuild_cadet_attendance_stats()
+    print(f"Built attendance stats for {stats_count} cadet(s) with absences.")
+    view_count = rebuild_waiver_review_view()
+    print(f"Built waiver review view with {view_count} waiver(s).")
+
     create_indexes()
     print("Recreated indexes.")
     print()
@@ -1,32 +1,90 @@
+from typing import Any, Iterable
+
 import pandas as pd
 
 from utils.at_risk_email import get_at_risk_cadets
 from utils.db_schema_crud import (
-    get_all_cadets,
-    get_approved_waivers_by_user,
-    get_user_by_id,
+    count_approved_waivers_by_submitter,
+    get_cadets_by_user_ids_map,
+    get_users_by_ids,
 )
 
 WAIVER_FLAG_THRESHOLD = 3
 
+_NAME_PROJECTION = {"first_name": 1, "last_name": 1}
 
-def get_waiver_flagged_cadets() -> list[dict]:
-    """Return cadets with WAIVER_FLAG_THRESHOLD or more approved waivers."""
+
+def _users_by_id(user_ids: Iterable[Any]) -> dict[Any, dict]:
+    wanted = list({u_id for u_id in user_ids if u_id is not None})
+    if not wanted:
+        return {}
+    return {
+        user["_id"]: user
+        for user in get_users_by_ids(wanted, projection=_NAME_PROJECTION)
+    }
+
+
+def _waiver_flag_entries(
+    counts: dict[Any, int],
+    cadets_by_user: dict[str, dict],
+    users_by_id: dict[Any, dict],
+) -> list[dict]:
     flagged = []
-    for cadet in get_all_cadets():
-        user_id = cadet.get("user_id")
-        if user_id is None:
+    for user_id, count in counts.items():
+        cadet = cadets_by_user.get(str(user_id))
+        if cadet is None:
             continue
-        approved = get_approved_waivers_by_user(user_id)
-        count = len(approved)
-        if count >= WAIVER_FLAG_THRESHOLD:
-            user = get_user_by_id(user_id)
-            flagged.append({"cadet": cadet, "user": user, "waiver_count": count})
+        flagged.append(
+            {
+                "cadet": cadet,
+                "user": users_by_id.get(cadet["user_id"]),
+                "waiver_count": count,
+            }
+        )
     return sorted(flagged, key=lambda x: x["waiver_count"], reverse=True)
 
 
-def get_waiver_flag_df() -> pd.DataFrame | str:
-    flagged = get_waiver_flagged_cadets()
+def _flagged_submitters() -> tuple[dict[Any, int], dict[str, dict]]:
+    counts = count_approved_waivers_by_submitter(min_count=WAIVER_FLAG_THRESHOLD)
+    cadets_by_user = get_cadets_by_user_ids_map(list(counts)) if counts else {}
+    return counts, cadets_by_user
+
+
+def get_waiver_flagged_cadets() -> list[dict]:
+    """Return cadets with WAIVER_FLAG_THRESHOLD or more approved waivers."""
+    counts, cadets_by_user = _flagged_submitters()
+    users_by_id = _users_by_id(c["user_id"] for c in cadets_by_user.values())
+    return _waiver_flag_entries(counts, cadets_by_user, users_by_id)
+
+
+def build_at_risk_report(flight_id=None) -> dict:
+    """Gather the absence and waiver-flag tables of the At-Risk report.
+
+    Uses a fixed number of queries whatever the roster size: the absence
+    stats and cadets behind `get_at_risk_cadets`, one `$group` for approved
+    waiver counts, one `$in` for the flagged cadets and one `$in` for every
+    user named in either table.
+    """
+    at_risk = filter_cadets(flight_id=flight_id)
+    counts, cadets_by_user = _flagged_submitters()
+    users_by_id = _users_by_id(
+        [
+            *(c["cadet"].get("user_id") for c in at_risk),
+            *(c["user_id"] for c in cadets_by_user.values()),
+        ]
+    )
+    return {
+        "at_risk": at_risk,
+        "waiver_flagged": _waiver_flag_entries(counts, cadets_by_user, users_by_id),
+        "users_by_id": users_by_id,
+    }
+
+
+def get_waiver_flag_df(*, report: dict | None = None) -> pd.DataFrame | str:
+    if report is None:
+        flagged = get_waiver_flagged_cadets()
+    else:
+        flagged = report["waiver_flagged"]
     if not flagged:
         return "No cadets flagged."
     rows = []
@@ -55,21 +113,20 @@ def filter_cadets(flight_id=None) -> list[dict]:
     )
 
 
-def get_df(flight_id=None) -> pd.DataFrame | str:
-    cadets = filter_cadets(flight_id=flight_id)
+def get_df(flight_id=None, *, report: dict | None = None) -> pd.DataFrame | str:
+    if report is None:
+        cadets = filter_cadets(flight_id=flight_id)
+        users_by_id = _users_by_id(c["cadet"].get("user_id") for c in cadets)
+    else:
+        cadets = report["at_risk"]
+        users_by_id = report["users_by_id"]
     if not cadets:
         return "No cadets found."
 
     rows: list[dict[str, str | int]] = []
     for i, cadet in enumerate(cadets):
         cadet_doc = cadet.get("cadet") or {}
-        user = None
-        user_id = cadet_doc.get("user_id")
-        if user_id is not None:
-            try:
-                user = get_user_by_id(user_id)
-            except Exception:
-                user = None
+        user = users_by_id.get(cadet_doc.get("user_id"))
 
         first = str((user or cadet_doc).get("first_name", "") or "")
         last = str((user or cadet_doc).get("last_name", "") or "")
@@ -13,9 +13,13 @@ from utils.attendance_status import (
     get_attendance_status_cell_style,
     get_attendance_status_label,
 )
-from utils.audit_log import log_attendance_modification
+from utils.audit_log import (
+    log_attendance_modification,
+    log_attendance_modifications,
+)
 from utils.db import get_collection
 from utils.db_schema_crud import (
+    bulk_set_attendance_states,
     delete_attendance_record,
     get_attendance_record_by_event_cadet,
     get_cadets_by_ids,
@@ -275,40 +279,49 @@ def apply_bulk_attendance_changes(
     entry_by_cadet = {str(entry["cadet"]["_id"]): entry for entry in roster}
     batch_id = uuid4().hex
 
+    new_status_by_cadet = {
+        ObjectId(op["cadet_id"]): _normalize_status(op.get("status")) for op in upserts
+    }
+    after_by_cadet = bulk_set_attendance_states(
+        event_id,
+        new_status_by_cadet,
+        recorded_by_user_id,
+        recorded_by_roles,
+    )
+    if after_by_cadet is None:
+        return {"ok": False, "changed_count": 0, "batch_id": None}
+
+    audit_entries: list[dict[str, Any]] = []
     for op in upserts:
         cadet_id = op["cadet_id"]
         entry = entry_by_cadet[str(cadet_id)]
         before_record = entry.get("record")
-        old_status = _normalize_status(entry.get("current_status"))
-        new_status = _normalize_status(op.get("status"))
-
-        _, after_record = _set_attendance_state(
-            event_id=event_id,
-            cadet_id=cadet_id,
-            status=new_status,
-            recorded_by_user_id=recorded_by_user_id,
-            recorded_by_roles=recorded_by_roles,
-        )
-
-        log_attendance_modification(
-            event_id=event_id,
-            cadet_id=cadet_id,
-            user_id=recorded_by_user_id,
-            outcome="applied",
-            old_status=old_status,
-            new_status=new_status,
-            metadata={
-                "batch_id": batch_id,
-                "record_operation": _record_operation(before_record, after_record),
-                "old_record_id": str(before_record.get("_id", ""))
-                if before_record
-                else None,
-                "new_record_id": str(after_record.get("_id", ""))
-                if after_record
-                else None,
-                "recorded_by_roles": list(recorded_by_roles or []),
-            },
+        after_record = after_by_cadet.get(ObjectId(cadet_id))
+        audit_entries.append(
+            {
+                "event_id": event_id,
+                "cadet_id": cadet_id,
+                "user_id": recorded_by_user_id,
+                "outcome": "applied",
+                "old_status": _normalize_status(entry.get("current_status")),
+                "new_status": new_status_by_cadet[ObjectId(cadet_id)],
+                "metadata": {
+                    "batch_id": batch_id,
+                    "record_operation": _record_operation(before_record, after_record),
+                    "old_record_id": str(before_record.get("_id", ""))
+                    if before_record
+                    else None,
+                    "new_record_id": str(after_record.get("_id", ""))
+                    if after_record
+                    else None,
+                    "recorded_by_roles": list(recorded_by_roles or []),
+                },
+            }
         )
+    log_attendance_modifications(
+        audit_entries,
+        search_docs=[entry["cadet"] for entry in roster],
+    )
 
     return {"ok": True, "changed_count": len(upserts), "batch_id": batch_id}
 
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import re
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
+from itertools import islice
 from typing import Any
 
 from bson import ObjectId
@@ -10,10 +14,27 @@ from utils.attendance_status import (
     NO_RECORD_STATUS_LABEL,
     get_attendance_status_label,
 )
+from utils.audit_log import (
+    ACTOR_SEARCH_TOKENS_FIELD,
+    TARGET_SEARCH_TOKENS_FIELD,
+    search_tokens,
+)
 from utils.db import get_collection
 from utils.db_schema_crud import get_users_by_ids, get_cadets_by_ids
-from utils.pagination import build_pagination_metadata
+from utils.export import write_csv_rows, write_excel_rows
+from utils.pagination import (
+    ESTIMATED_COUNT_LIMIT,
+    build_keyset_page,
+    coerce_page_size,
+    decode_cursor,
+    keyset_match,
+    keyset_sort,
+)
 
+AUDIT_EXPORT_COLUMNS = ["Timestamp", "Actor", "Activity", "Target", "Cadet", "Summary"]
+EXPORT_BATCH_SIZE = 500
+# Per-collection cap on names remembered across export batches.
+EXPORT_LOOKUP_CACHE_SIZE = 5000
 
 _AUDIT_SOURCE_LABELS: dict[str, str] = {
     "user_management": "User Management",
@@ -281,147 +302,29 @@ def _combine_query_clauses(clauses: list[dict[str, Any]]) -> dict[str, Any]:
     return {"$and": clauses}
 
 
-def _safe_object_id(value: Any) -> ObjectId | None:
-    try:
-        return ObjectId(value)
-    except Exception:
-        return None
-
-
-def _person_search_query(search: str) -> dict[str, Any]:
-    escaped = re.escape(search.strip())
-    if not escaped:
-        return {}
+def _token_search_query(field: str, search: str | None) -> dict[str, Any]:
+    """Match entries whose `field` tokens start with every word of `search`.
 
-    predicates: list[dict[str, Any]] = [
-        {"email": {"$regex": escaped, "$options": "i"}},
-        {"first_name": {"$regex": escaped, "$options": "i"}},
-        {"last_name": {"$regex": escaped, "$options": "i"}},
-        {"name": {"$regex": escaped, "$options": "i"}},
+    Anchored prefix regexes on the multikey token index are served as index
+    range scans, so no users/cadets/events lookups are needed first.
+    """
+    clauses = [
+        {field: {"$regex": f"^{re.escape(token)}"}}
+        for token in search_tokens(search or "")
     ]
-    tokens = search.split(maxsplit=1)
-    if len(tokens) == 2:
-        predicates.append(
-            {
-                "$and": [
-                    {"first_name": {"$regex": re.escape(tokens[0]), "$options": "i"}},
-                    {"last_name": {"$regex": re.escape(tokens[1]), "$options": "i"}},
-                ]
-            }
-        )
-    return {"$or": predicates}
-
-
-def _ids_for_person_search(collection_name: str, search: str) -> list[ObjectId]:
-    col = get_collection(collection_name)
-    query = _person_search_query(search)
-    if col is None or not query:
-        return []
-
-    try:
-        return [doc["_id"] for doc in col.find(query, {"_id": 1}) if doc.get("_id")]
-    except Exception:
-        return []
-
-
-def _actor_user_ids_for_search(search: str) -> list[ObjectId]:
-    return _ids_for_person_search("users", search)
-
-
-def _actor_search_query(actor_search: str | None) -> dict[str, Any]:
-    if not actor_search:
-        return {}
-
-    search = actor_search.strip()
-    if not search:
+    if not clauses:
         return {}
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
 
-    escaped = re.escape(search)
-    predicates: list[dict[str, Any]] = [
-        {"actor_email": {"$regex": escaped, "$options": "i"}},
-        {"actor_user_id_raw": {"$regex": escaped, "$options": "i"}},
-        {"user_id_raw": {"$regex": escaped, "$options": "i"}},
-    ]
-
-    actor_ids = _actor_user_ids_for_search(search)
-    exact_id = _safe_object_id(search)
-    if exact_id is not None:
-        actor_ids.append(exact_id)
-
-    if actor_ids:
-        predicates.extend(
-            [
-                {"actor_user_id": {"$in": actor_ids}},
-                {"user_id": {"$in": actor_ids}},
-            ]
-        )
-
-    return {"$or": predicates}
-
-
-def _cadet_ids_for_search(search: str) -> list[ObjectId]:
-    return _ids_for_person_search("cadets", search)
-
-
-def _event_ids_for_search(search: str) -> list[ObjectId]:
-    events_col = get_collection("events")
-    if events_col is None:
-        return []
-
-    escaped = re.escape(search.strip())
-    if not escaped:
-        return []
 
-    try:
-        return [
-            event["_id"]
-            for event in events_col.find(
-                {"event_name": {"$regex": escaped, "$options": "i"}},
-                {"_id": 1},
-            )
-            if event.get("_id")
-        ]
-    except Exception:
-        return []
+def _actor_search_query(actor_search: str | None) -> dict[str, Any]:
+    return _token_search_query(ACTOR_SEARCH_TOKENS_FIELD, actor_search)
 
 
 def _target_search_query(target_search: str | None) -> dict[str, Any]:
-    if not target_search:
-        return {}
-
-    search = target_search.strip()
-    if not search:
-        return {}
-
-    escaped = re.escape(search)
-    predicates: list[dict[str, Any]] = [
-        {"target_label": {"$regex": escaped, "$options": "i"}},
-        {"target_id": {"$regex": escaped, "$options": "i"}},
-    ]
-
-    cadet_ids = _cadet_ids_for_search(search)
-    event_ids = _event_ids_for_search(search)
-    exact_id = _safe_object_id(search)
-    if exact_id is not None:
-        cadet_ids.append(exact_id)
-        event_ids.append(exact_id)
-
-    if cadet_ids:
-        predicates.extend(
-            [
-                {"cadet_id": {"$in": cadet_ids}},
-                {"target_collection": "cadets", "target_id": {"$in": cadet_ids}},
-            ]
-        )
-    if event_ids:
-        predicates.extend(
-            [
-                {"event_id": {"$in": event_ids}},
-                {"target_collection": "events", "target_id": {"$in": event_ids}},
-            ]
-        )
-
-    return {"$or": predicates}
+    return _token_search_query(TARGET_SEARCH_TOKENS_FIELD, target_search)
 
 
 def build_audit_overview_row(row: dict[str, Any]) -> dict[str, str]:
@@ -605,42 +508,107 @@ def _collect_ids_for_hydration(rows: list[dict[str, Any]]) -> dict[str, set[Any]
     return {"user_ids": user_ids, "event_ids": event_ids, "cadet_ids": cadet_ids}
 
 
-def _hydrate_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Batch-fetch names and enrich rows in-place."""
+def _users_by_id(user_ids: Iterable[Any]) -> dict[Any, dict[str, Any]]:
+    return {
+        user["_id"]: user
+        for user in get_users_by_ids(list(user_ids))
+        if user.get("_id") is not None
+    }
+
+
+def _events_by_id(event_ids: Iterable[Any]) -> dict[Any, dict[str, Any]]:
+    events_col = get_collection("events")
+    if events_col is None:
+        return {}
+    object_ids = []
+    for eid in event_ids:
+        try:
+            object_ids.append(ObjectId(eid))
+        except Exception:
+            object_ids.append(eid)
+    cursor = events_col.find({"_id": {"$in": object_ids}}, {"event_name": 1})
+    return {event["_id"]: event for event in cursor if event.get("_id") is not None}
+
+
+def _cadets_by_id(cadet_ids: Iterable[Any]) -> dict[Any, dict[str, Any]]:
+    return {
+        cadet["_id"]: cadet
+        for cadet in get_cadets_by_ids(list(cadet_ids))
+        if cadet.get("_id") is not None
+    }
+
+
+class _RecentLookups:
+    """Bounded LRU of id -> document, shared across export batches.
+
+    Misses are remembered too, so a deleted user is not re-queried on every
+    batch that mentions them.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._docs: OrderedDict[Any, dict[str, Any] | None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def resolve(
+        self,
+        ids: set[Any],
+        fetch: Callable[[Iterable[Any]], dict[Any, dict[str, Any]]],
+    ) -> dict[Any, dict[str, Any]]:
+        found: dict[Any, dict[str, Any]] = {}
+        missing: set[Any] = set()
+        for key in ids:
+            if key in self._docs:
+                self._docs.move_to_end(key)
+                doc = self._docs[key]
+                if doc is not None:
+                    found[key] = doc
+            else:
+                missing.add(key)
+
+        if missing:
+            fetched = fetch(missing)
+            for key in missing:
+                doc = fetched.get(key)
+                self._docs[key] = doc
+                if doc is not None:
+                    found[key] = doc
+            while len(self._docs) > self._max_size:
+                self._docs.popitem(last=False)
+        return found
+
+
+def _hydrate_rows(
+    rows: list[dict[str, Any]],
+    *,
+    lookups: dict[str, _RecentLookups] | None = None,
+) -> list[dict[str, Any]]:
+    """Batch-fetch names and enrich rows in-place.
+
+    With `lookups` (keyed "users", "events", "cadets"), ids already seen in
+    an earlier batch are served from those caches instead of re-fetched.
+    """
     if not rows:
         return rows
 
     ids = _collect_ids_for_hydration(rows)
 
-    # Fetch users
-    user_by_id: dict[Any, dict[str, Any]] = {}
-    if ids["user_ids"]:
-        for user in get_users_by_ids(list(ids["user_ids"])):
-            if user.get("_id") is not None:
-                user_by_id[user["_id"]] = user
-
-    # Fetch events
-    event_by_id: dict[Any, dict[str, Any]] = {}
-    if ids["event_ids"]:
-        events_col = get_collection("events")
-        if events_col is not None:
-            object_ids = []
-            for eid in ids["event_ids"]:
-                try:
-                    object_ids.append(ObjectId(eid))
-                except Exception:
-                    object_ids.append(eid)
-            cursor = events_col.find({"_id": {"$in": object_ids}}, {"event_name": 1})
-            for event in cursor:
-                if event.get("_id") is not None:
-                    event_by_id[event["_id"]] = event
-
-    # Fetch cadets
-    cadet_by_id: dict[Any, dict[str, Any]] = {}
-    if ids["cadet_ids"]:
-        for cadet in get_cadets_by_ids(list(ids["cadet_ids"])):
-            if cadet.get("_id") is not None:
-                cadet_by_id[cadet["_id"]] = cadet
+    def _resolve(
+        kind: str,
+        wanted: set[Any],
+        fetch: Callable[[Iterable[Any]], dict[Any, dict[str, Any]]],
+    ) -> dict[Any, dict[str, Any]]:
+        if not wanted:
+            return {}
+        if lookups is None:
+            return fetch(wanted)
+        return lookups[kind].resolve(wanted, fetch)
+
+    user_by_id = _resolve("users", ids["user_ids"], _users_by_id)
+    event_by_id = _resolve("events", ids["event_ids"], _events_by_id)
+    cadet_by_id = _resolve("cadets", ids["cadet_ids"], _cadets_by_id)
 
     # Enrich rows
     for row in rows:
@@ -713,6 +681,17 @@ def _build_mongo_query(
     return _combine_query_clauses(clauses)
 
 
+def _count_audit_entries(col: Any, query: dict[str, Any], *, estimate: bool) -> int:
+    try:
+        if not estimate:
+            return int(col.count_documents(query))
+        if not query:
+            return int(col.estimated_document_count())
+        return int(col.count_documents(query, limit=ESTIMATED_COUNT_LIMIT))
+    except Exception:
+        return 0
+
+
 def query_audit_log(
     *,
     start_date: datetime | None = None,
@@ -722,14 +701,21 @@ def query_audit_log(
     target_search: str | None = None,
     page: int = 1,
     page_size: int = 25,
+    cursor: str | None = None,
+    estimate_count: bool = False,
 ) -> dict[str, Any]:
-    """Query and paginate audit log entries with hydrated names."""
+    """Query one page of audit log entries, newest first, with hydrated names.
+
+    Pages are keyset-paginated on `(created_at, _id)`: pass the previous
+    result's `next_cursor` or `prev_cursor` as `cursor`, and `page` only as
+    the page number to report. With `estimate_count` the total stops at
+    `ESTIMATED_COUNT_LIMIT` (flagged by `count_is_estimate`) instead of
+    counting every match.
+    """
+    page_size = coerce_page_size(page_size)
     col = get_collection("audit_log")
     if col is None:
-        return {
-            "items": [],
-            **build_pagination_metadata(page=page, page_size=page_size, total_count=0),
-        }
+        return build_keyset_page([], cursor=None, page=1, page_size=page_size)
 
     query = _build_mongo_query(
         start_date=start_date,
@@ -739,72 +725,131 @@ def query_audit_log(
         target_search=target_search,
     )
 
-    # Count
-    try:
-        total_count = int(col.count_documents(query))
-    except Exception:
-        total_count = 0
+    total_count = _count_audit_entries(col, query, estimate=estimate_count)
 
-    pagination = build_pagination_metadata(
+    decoded = decode_cursor(cursor)
+    page_query = _combine_query_clauses([query, keyset_match(decoded)])
+    docs = list(
+        col.find(page_query)
+        .sort(list(keyset_sort(decoded).items()))
+        .limit(page_size + 1)
+    )
+    result = build_keyset_page(
+        docs,
+        cursor=decoded,
         page=page,
         page_size=page_size,
         total_count=total_count,
+        count_is_estimate=estimate_count and total_count >= ESTIMATED_COUNT_LIMIT,
     )
+    result["items"] = _hydrate_rows(
+        [_normalize_audit_entry(doc) for doc in result["items"]]
+    )
+    return result
 
-    # Fetch page
-    cursor = col.find(query).sort("created_at", -1)
-    if pagination["skip"] > 0:
-        cursor = cursor.skip(pagination["skip"])
-    if pagination["page_size"] > 0:
-        cursor = cursor.limit(pagination["page_size"])
 
-    docs = list(cursor)
-    rows = [_normalize_audit_entry(doc) for doc in docs]
-    rows = _hydrate_rows(rows)
+def iter_audit_export_rows(
+    *,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    activities: list[str] | None = None,
+    actor_search: str | None = None,
+    target_search: str | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """Yield every matching audit row for export, newest first.
+
+    The cursor is walked `batch_size` documents at a time; each batch is
+    normalized and hydrated on its own, with names kept in bounded LRU
+    caches, so memory stays flat however wide the range is.
+    """
+    col = get_collection("audit_log")
+    if col is None:
+        return
 
-    return {
-        "items": rows,
-        "page": pagination["page"],
-        "page_size": pagination["page_size"],
-        "total_count": pagination["total_count"],
-        "total_pages": pagination["total_pages"],
-        "skip": pagination["skip"],
+    query = _build_mongo_query(
+        start_date=start_date,
+        end_date=end_date,
+        activities=activities,
+        actor_search=actor_search,
+        target_search=target_search,
+    )
+    cursor = (
+        col.find(query, {ACTOR_SEARCH_TOKENS_FIELD: 0, TARGET_SEARCH_TOKENS_FIELD: 0})
+        .sort([("created_at", -1), ("_id", -1)])
+        .batch_size(batch_size)
+    )
+    lookups = {
+        kind: _RecentLookups(EXPORT_LOOKUP_CACHE_SIZE)
+        for kind in ("users", "events", "cadets")
     }
 
+    docs = iter(cursor)
+    while batch := list(islice(docs, batch_size)):
+        rows = _hydrate_rows(
+            [_normalize_audit_entry(doc) for doc in batch], lookups=lookups
+        )
+        for row in rows:
+            yield build_audit_table_row(row, formatted_timestamp=False)
+
 
-def export_audit_log_to_df(
+def export_audit_log(
+    file_format: str,
     *,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
     activities: list[str] | None = None,
     actor_search: str | None = None,
     target_search: str | None = None,
-) -> Any:
-    """Return all matching audit rows as a pandas DataFrame (no pagination)."""
-    try:
-        import pandas as pd
-    except ImportError:
-        return None
+) -> bytes:
+    """Stream matching audit rows into a "csv" or "xlsx" file and return it.
 
-    col = get_collection("audit_log")
-    if col is None:
-        return pd.DataFrame()
+    Rows go through a temporary file rather than an in-memory table, so only
+    the finished file is ever held in memory.
+    """
+    if file_format not in ("csv", "xlsx"):
+        raise ValueError(f"Unsupported export format: {file_format}")
 
-    query = _build_mongo_query(
+    rows = iter_audit_export_rows(
         start_date=start_date,
         end_date=end_date,
         activities=activities,
         actor_search=actor_search,
         target_search=target_search,
     )
+    write = write_csv_rows if file_format == "csv" else write_excel_rows
+    with tempfile.TemporaryFile() as out:
+        write(rows, AUDIT_EXPORT_COLUMNS, out)
+        out.seek(0)
+        return out.read()
 
-    docs = list(col.find(query).sort("created_at", -1))
-    if not docs:
-        return pd.DataFrame()
 
-    rows = [_normalize_audit_entry(doc) for doc in docs]
-    rows = _hydrate_rows(rows)
+def export_audit_log_to_df(
+    *,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    activities: list[str] | None = None,
+    actor_search: str | None = None,
+    target_search: str | None = None,
+) -> Any:
+    """Return all matching audit rows as a pandas DataFrame (no pagination).
+
+    Builds the whole table in memory; use `export_audit_log` for downloads.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
 
-    return pd.DataFrame(
-        [build_audit_table_row(row, formatted_timestamp=False) for row in rows]
+    rows = list(
+        iter_audit_export_rows(
+            start_date=start_date,
+            end_date=end_date,
+            activities=activities,
+            actor_search=actor_search,
+            target_search=target_search,
+        )
     )
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows, columns=pd.Index(AUDIT_EXPORT_COLUMNS))
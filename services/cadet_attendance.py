@@ -1,6 +1,11 @@
+from bisect import bisect_right
 from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from bson import ObjectId
 
 from utils.datetime_utils import ensure_utc
+from utils.db import get_collection
 from utils.db_schema_crud import (
     get_attendance_by_cadet,
     get_events_by_ids,
@@ -9,8 +14,16 @@ from utils.db_schema_crud import (
     get_waivers_by_attendance_records,
 )
 from utils.attendance_status import get_effective_attendance_status
+from utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    build_pagination_metadata,
+    coerce_page_size,
+    normalize_page,
+)
 from services.attendance_merge import merge_attendance_records
 
+ATTENDED_STATUSES = ("present", "excused", "waived")
+
 
 def load_attendance_db(
     cadet_id: str, user_id=None
@@ -31,28 +44,114 @@ def load_attendance_db(
     return records, events, waivers, standing_waivers
 
 
-def _covering_standing_waiver(event: dict, standing_waivers: list[dict]) -> dict | None:
-    """Return the approved standing waiver that covers this event, if any."""
-    start = event.get("start_date")
-    if not isinstance(start, datetime):
-        return None
-    start = ensure_utc(start)
-    event_type = (event.get("event_type") or "").lower()
+class StandingWaiverIndex:
+    """Approved standing waivers as sorted, pre-normalized intervals per event type.
 
-    for waiver in standing_waivers:
-        if (waiver.get("status") or "").lower() != "approved":
-            continue
-        w_start = waiver.get("start_date")
-        w_end = waiver.get("end_date")
-        if not (isinstance(w_start, datetime) and isinstance(w_end, datetime)):
-            continue
-        if not (ensure_utc(w_start) <= start <= ensure_utc(w_end)):
-            continue
-        types = {t.lower() for t in (waiver.get("event_types") or ["pt", "lab"])}
-        if event_type and event_type not in types:
-            continue
-        return waiver
-    return None
+    Each event type keeps its waivers sorted by start with the running
+    latest end, so an event is covered when the waiver reaching furthest
+    among those starting at or before it is still running. Events without
+    a type match any waiver, like a waiver without `event_types` matches PT
+    and LLAB.
+    """
+
+    _ANY_TYPE = ""
+
+    def __init__(self, standing_waivers: Iterable[dict]) -> None:
+        intervals: dict[str, list[tuple[datetime, datetime, dict]]] = {}
+        # (start, end, event types) per approved waiver, for query building.
+        self._spans: list[tuple[datetime, datetime, frozenset[str]]] = []
+        for waiver in standing_waivers:
+            if (waiver.get("status") or "").lower() != "approved":
+                continue
+            w_start = waiver.get("start_date")
+            w_end = waiver.get("end_date")
+            if not (isinstance(w_start, datetime) and isinstance(w_end, datetime)):
+                continue
+            interval = (ensure_utc(w_start), ensure_utc(w_end), waiver)
+            types = {t.lower() for t in (waiver.get("event_types") or ["pt", "lab"])}
+            self._spans.append((interval[0], interval[1], frozenset(types)))
+            for event_type in types | {self._ANY_TYPE}:
+                intervals.setdefault(event_type, []).append(interval)
+
+        # event type -> (sorted starts, [(latest end so far, its waiver)])
+        self._by_type: dict[
+            str, tuple[list[datetime], list[tuple[datetime, dict]]]
+        ] = {}
+        for event_type, spans in intervals.items():
+            spans.sort(key=lambda span: span[0])
+            reach: list[tuple[datetime, dict]] = []
+            for _, w_end, waiver in spans:
+                if not reach or w_end > reach[-1][0]:
+                    reach.append((w_end, waiver))
+                else:
+                    reach.append(reach[-1])
+            self._by_type[event_type] = ([span[0] for span in spans], reach)
+
+    def __bool__(self) -> bool:
+        return bool(self._by_type)
+
+    @staticmethod
+    def _event_key(event: dict) -> tuple[datetime, str] | None:
+        start = event.get("start_date")
+        if not isinstance(start, datetime):
+            return None
+        return ensure_utc(start), (event.get("event_type") or "").lower()
+
+    def covering(self, event: dict) -> dict | None:
+        """Return an approved standing waiver covering this event, if any."""
+        key = self._event_key(event)
+        if key is None or key[1] not in self._by_type:
+            return None
+        start, event_type = key
+        starts, reach = self._by_type[event_type]
+        i = bisect_right(starts, start) - 1
+        if i < 0 or reach[i][0] < start:
+            return None
+        return reach[i][1]
+
+    def resolve(self, events: Iterable[dict]) -> dict[Any, dict]:
+        """Map each covered event's `_id` to its covering waiver.
+
+        Events are visited in start order while one cursor per event type
+        walks forward through the sorted waivers, so a whole history costs a
+        sort plus one pass.
+        """
+        keyed = []
+        for event in events:
+            key = self._event_key(event)
+            if key is not None and key[1] in self._by_type:
+                keyed.append((key, event))
+        keyed.sort(key=lambda item: item[0][0])
+
+        cursors: dict[str, int] = {}
+        covered: dict[Any, dict] = {}
+        for (start, event_type), event in keyed:
+            starts, reach = self._by_type[event_type]
+            i = cursors.get(event_type, -1)
+            while i + 1 < len(starts) and starts[i + 1] <= start:
+                i += 1
+            cursors[event_type] = i
+            if i >= 0 and reach[i][0] >= start:
+                covered[event.get("_id")] = reach[i][1]
+        return covered
+
+    def coverage_expr(self, start_expr: Any, type_expr: Any) -> dict | bool:
+        """Aggregation expression that is true where an approved waiver covers
+        an event with the given start and lowercased type expressions."""
+        if not self._spans:
+            return False
+        return {
+            "$or": [
+                {
+                    "$and": [
+                        {"$gte": [start_expr, w_start]},
+                        {"$lte": [start_expr, w_end]},
+                        {"$in": [type_expr, [self._ANY_TYPE, *sorted(types)]]},
+                    ]
+                }
+                for w_start, w_end, types in self._spans
+            ]
+        }
 
 
 def load_cadet_flights(cadet: dict) -> list[dict]:
@@ -84,7 +183,8 @@ def cadet_attendance(
     records = merge_attendance_records(records, key_fields=("event_id", "cadet_id"))
     event_map = {e["_id"]: e for e in events}
     waiver_map = {w["attendance_record_id"]: w for w in waivers}
-    standing = standing_waivers or []
+    standing = StandingWaiverIndex(standing_waivers or [])
+    covered_event_ids = standing.resolve(event_map.values()) if standing else {}
 
     rows = []
     for record in records:
@@ -95,10 +195,8 @@ def cadet_attendance(
             continue
 
         waiver_status = (waiver.get("status") or "").lower() if waiver else None
-        if waiver_status is None and standing:
-            covering = _covering_standing_waiver(event, standing)
-            if covering is not None:
-                waiver_status = "approved"
+        if waiver_status is None and event["_id"] in covered_event_ids:
+            waiver_status = "approved"
         status = get_effective_attendance_status(
             record.get("status") or "—",
             waiver_status,
@@ -165,14 +263,226 @@ def get_attendance_rate(rows: list[dict], event_type: str) -> int:
     attended_llab = sum(
         1
         for r in rows
-        if (
-            r["status"] in ("present", "excused", "waived")
-            and r["event_type"] == event_type
-        )
+        if r["status"] in ATTENDED_STATUSES and r["event_type"] == event_type
     )
     llab_records = sum(1 for r in rows if r["event_type"] == event_type)
-    attendance_rate_llab = (
-        round(attended_llab / llab_records * 100) if llab_records else 0
-    )
+    return _rate(attended_llab, llab_records)
+
+
+def _history_filter(filter_status: str, filter_type: str) -> dict:
+    """`$match` on history rows equivalent to `filter_rows`."""
+    match: dict[str, Any] = {}
+    if filter_status != "All":
+        wanted = filter_status.lower()
+        match["status"] = (
+            {"$in": ["excused", "waived"]} if wanted == "excused" else wanted
+        )
+    if filter_type != "All":
+        match["event_type"] = "LAB" if filter_type == "LLAB" else filter_type
+    return match
+
+
+def cadet_history_pipeline(cadet_id: Any, standing: StandingWaiverIndex) -> list[dict]:
+    """Aggregation over a cadet's attendance records that yields the rows of
+    `cadet_attendance`, with `_id` in place of `record_id`.
 
-    return attendance_rate_llab
+    Each record is joined to its event and its latest direct waiver; events
+    without a direct waiver fall back to standing-waiver coverage.
+    """
+    event_type = {"$toLower": {"$ifNull": ["$event.event_type", ""]}}
+    record_status = {"$trim": {"input": {"$toLower": {"$ifNull": ["$status", ""]}}}}
+    return [
+        {"$match": {"cadet_id": ObjectId(cadet_id)}},
+        {
+            "$lookup": {
+                "from": "events",
+                "localField": "event_id",
+                "foreignField": "_id",
+                "as": "event",
+            }
+        },
+        {"$unwind": "$event"},
+        {
+            "$lookup": {
+                "from": "waivers",
+                "let": {"record_id": "$_id"},
+                "pipeline": [
+                    {
+                        "$match": {
+                            "$expr": {"$eq": ["$attendance_record_id", "$$record_id"]}
+                        }
+                    },
+                    {"$sort": {"_id": -1}},
+                    {"$limit": 1},
+                    {"$project": {"status": 1}},
+                ],
+                "as": "waiver",
+            }
+        },
+        {
+            "$addFields": {
+                "_event_type": event_type,
+                "_record_status": record_status,
+                "waiver_status": {
+                    "$cond": [
+                        {"$gt": [{"$size": "$waiver"}, 0]},
+                        {
+                            "$toLower": {
+                                "$ifNull": [{"$arrayElemAt": ["$waiver.status", 0]}, ""]
+                            }
+                        },
+                        {
+                            "$cond": [
+                                standing.coverage_expr("$event.start_date", event_type),
+                                "approved",
+                                None,
+                            ]
+                        },
+                    ]
+                },
+            }
+        },
+        {
+            "$project": {
+                "_id": 1,
+                "event_name": {"$ifNull": ["$event.event_name", "—"]},
+                "event_type": {
+                    "$cond": [
+                        {"$eq": ["$_event_type", ""]},
+                        "—",
+                        {"$toUpper": "$_event_type"},
+                    ]
+                },
+                "start_date": "$event.start_date",
+                "status": {
+                    "$switch": {
+                        "branches": [
+                            {"case": {"$eq": ["$_record_status", ""]}, "then": "—"},
+                            {
+                                "case": {
+                                    "$and": [
+                                        {"$eq": ["$_record_status", "absent"]},
+                                        {"$eq": ["$waiver_status", "approved"]},
+                                    ]
+                                },
+                                "then": "waived",
+                            },
+                        ],
+                        "default": "$_record_status",
+                    }
+                },
+                "waiver_status": 1,
+                "waiver_eligible": {"$in": ["$_event_type", ["pt", "lab"]]},
+            }
+        },
+    ]
+
+
+def _history_summary_stage() -> dict:
+    def _count(*conditions: dict) -> dict:
+        return {"$sum": {"$cond": [{"$and": list(conditions)}, 1, 0]}}
+
+    fields: dict[str, Any] = {"_id": None, "total_events": {"$sum": 1}}
+    for prefix, event_type in (("pt", "PT"), ("llab", "LAB")):
+        is_type = {"$eq": ["$event_type", event_type]}
+        fields[f"{prefix}_events"] = _count(is_type)
+        fields[f"{prefix}_attended"] = _count(
+            is_type, {"$in": ["$status", list(ATTENDED_STATUSES)]}
+        )
+        fields[f"{prefix}_absences"] = _count(is_type, {"$eq": ["$status", "absent"]})
+    return {"$group": fields}
+
+
+def _rate(attended: int, total: int) -> int:
+    return round(attended / total * 100) if total else 0
+
+
+def _run_history_facet(
+    col, base: list[dict], match: dict, *, skip: int, limit: int
+) -> dict:
+    pipeline = base + [
+        {
+            "$facet": {
+                "items": [
+                    {"$match": match},
+                    {"$sort": {"start_date": -1, "_id": -1}},
+                    {"$skip": skip},
+                    {"$limit": limit},
+                ],
+                "filtered": [{"$match": match}, {"$count": "total_count"}],
+                "summary": [_history_summary_stage()],
+            }
+        }
+    ]
+    results = list(col.aggregate(pipeline))
+    return results[0] if results else {}
+
+
+def _history_page(result: dict, pagination: dict[str, int]) -> dict[str, Any]:
+    totals = (result.get("summary") or [{}])[0]
+    items = []
+    for doc in result.get("items") or []:
+        row = {key: value for key, value in doc.items() if key != "_id"}
+        items.append({"record_id": str(doc.get("_id", "")), **row})
+
+    return {
+        "items": items,
+        "page": pagination["page"],
+        "page_size": pagination["page_size"],
+        "total_count": pagination["total_count"],
+        "total_pages": pagination["total_pages"],
+        "summary": {
+            "total_events": int(totals.get("total_events", 0)),
+            "pt_absences": int(totals.get("pt_absences", 0)),
+            "llab_absences": int(totals.get("llab_absences", 0)),
+            "pt_rate": _rate(totals.get("pt_attended", 0), totals.get("pt_events", 0)),
+            "llab_rate": _rate(
+                totals.get("llab_attended", 0), totals.get("llab_events", 0)
+            ),
+        },
+    }
+
+
+def get_cadet_attendance_page(
+    cadet_id: Any,
+    user_id: Any = None,
+    *,
+    filter_status: str = "All",
+    filter_type: str = "All",
+    page: int = 1,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> dict[str, Any]:
+    """One page of a cadet's attendance history, newest first.
+
+    Filtering, sorting, paging and the summary totals run in a single
+    aggregation, so only the requested page of rows leaves the database.
+    The summary always covers the whole history, regardless of filters.
+    """
+    page = normalize_page(page)
+    page_size = coerce_page_size(page_size)
+    col = get_collection("attendance_records")
+    if col is None:
+        return _history_page(
+            {},
+            build_pagination_metadata(page=page, page_size=page_size, total_count=0),
+        )
+
+    standing_waivers = (
+        get_standing_waivers_by_user(user_id) if user_id is not None else []
+    )
+    base = cadet_history_pipeline(cadet_id, StandingWaiverIndex(standing_waivers))
+    match = _history_filter(filter_status, filter_type)
+    skip = (page - 1) * page_size
+    result = _run_history_facet(col, base, match, skip=skip, limit=page_size)
+    filtered = result.get("filtered") or [{}]
+    pagination = build_pagination_metadata(
+        page=page,
+        page_size=page_size,
+        total_count=filtered[0].get("total_count", 0),
+    )
+    if pagination["skip"] != skip:
+        # The requested page is past the end; fetch the last one instead.
+        result = _run_history_facet(
+            col, base, match, skip=pagination["skip"], limit=page_size
+        )
+    return _history_page(result, pagination)
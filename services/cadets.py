@@ -1,28 +1,36 @@
 from bson import ObjectId
 import secrets
-from typing import Any
+from typing import Any, Iterator
 
+import openpyxl
 import pandas as pd
 from pymongo.errors import DuplicateKeyError
 
-from utils.audit_log import log_data_change, serialize_doc_for_audit
+from utils.audit_log import log_data_changes, serialize_doc_for_audit
 from utils.db import get_collection
 from utils.db_schema_crud import (
     assign_cadet_to_flight as db_assign_cadet_to_flight,
+    build_cadet_doc,
+    build_user_doc,
+    bulk_insert_cadets,
+    bulk_insert_users,
+    bulk_update_cadets,
+    bulk_update_users,
     create_cadet,
+    get_cadets_by_ids,
     get_cadet_by_id,
     get_cadet_by_user_id,
     get_user_by_email,
     get_user_by_id,
     get_all_cadets,
-    update_user,
-    update_cadet,
     get_users_by_emails,
     get_users_by_names,
     get_cadets_by_user_ids_map,
+    get_users_by_ids,
 )
 from utils.names import format_full_name
-from utils.validators import is_valid_email, is_valid_name
+from utils.password import hash_passwords
+from utils.validators import is_valid_email, is_valid_name, normalize_email
 from utils.password_reset_email import send_temporary_password_email
 from services.email_templates import get_email_template, get_content
 
@@ -160,40 +168,65 @@ def get_cadet_export_df() -> pd.DataFrame | str:
     )
 
 
+ROSTER_SHEET_NAME = "Roster"
+ROSTER_HEADER_ROW = 3
+
+
+def _iter_roster_sheet_rows(file) -> Iterator[dict[str, str]]:
+    """Stream the Roster sheet as {header: cell text} dicts.
+
+    The workbook is opened read-only, so rows are parsed as they are read
+    instead of loading the whole sheet first.
+    """
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook[ROSTER_SHEET_NAME].iter_rows(
+            min_row=ROSTER_HEADER_ROW, values_only=True
+        )
+        header = [str(cell or "").strip() for cell in next(rows, ())]
+        for values in rows:
+            yield {
+                column: str(value if value is not None else "").strip()
+                for column, value in zip(header, values)
+                if column
+            }
+    finally:
+        workbook.close()
+
+
 def parse_roster_xlsx(file) -> tuple[list[dict], list[str]]:
+    cadets = []
+    errors = []
     try:
-        df = pd.read_excel(file, sheet_name="Roster", header=2)
+        for row in _iter_roster_sheet_rows(file):
+            first_name = row.get("First Name", "")
+            last_name = row.get("Last Name", "")
+            kent_email = row.get("Kent Email", "")
+            crosstown_email = row.get("Crosstown Email", "")
+            class_level = row.get("Class", "").upper()
+            if not first_name or first_name.lower() in ("nan", "first name"):
+                continue
+            if not last_name or last_name.lower() in ("nan", "last name"):
+                continue
+            email = (
+                kent_email
+                if kent_email and kent_email.lower() != "nan"
+                else crosstown_email
+            )
+            if not email or email.lower() == "nan" or not is_valid_email(email):
+                errors.append(f"{first_name} {last_name}: no valid email, skipping.")
+                continue
+            rank = CLASS_TO_RANK.get(class_level, "100/150 (freshman)")
+            cadets.append(
+                {
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "email": email,
+                    "rank": rank,
+                }
+            )
     except Exception as e:
         return [], [f"Failed to read Excel file: {e}"]
-    cadets = []
-    errors = []
-    for _, row in df.iterrows():
-        first_name = str(row.get("First Name", "") or "").strip()
-        last_name = str(row.get("Last Name", "") or "").strip()
-        kent_email = str(row.get("Kent Email", "") or "").strip()
-        crosstown_email = str(row.get("Crosstown Email", "") or "").strip()
-        class_level = str(row.get("Class", "") or "").strip().upper()
-        if not first_name or first_name.lower() in ("nan", "first name"):
-            continue
-        if not last_name or last_name.lower() in ("nan", "last name"):
-            continue
-        email = (
-            kent_email
-            if kent_email and kent_email.lower() != "nan"
-            else crosstown_email
-        )
-        if not email or email.lower() == "nan" or not is_valid_email(email):
-            errors.append(f"{first_name} {last_name}: no valid email, skipping.")
-            continue
-        rank = CLASS_TO_RANK.get(class_level, "100/150 (freshman)")
-        cadets.append(
-            {
-                "first_name": first_name,
-                "last_name": last_name,
-                "email": email,
-                "rank": rank,
-            }
-        )
     return cadets, errors
 
 
@@ -310,7 +343,7 @@ VALID_ROSTER_IMPORT_ACTIONS = {
 }
 
 
-def _log_roster_import_change(
+def _roster_import_audit_entry(
     *,
     action: str,
     target_collection: str,
@@ -319,22 +352,26 @@ def _log_roster_import_change(
     before: dict[str, Any] | None,
     after: dict[str, Any] | None,
     actor_user: dict[str, Any] | None,
-) -> None:
-    log_data_change(
-        source="cadet_management",
-        action=action,
-        target_collection=target_collection,
-        target_id=target_id,
-        actor_user_id=actor_user.get("_id") if actor_user else None,
-        actor_email=str(actor_user.get("email", "") or "").strip() or None
+) -> dict[str, Any]:
+    return {
+        "source": "cadet_management",
+        "action": action,
+        "target_collection": target_collection,
+        "target_id": target_id,
+        "actor_user_id": actor_user.get("_id") if actor_user else None,
+        "actor_email": str(actor_user.get("email", "") or "").strip() or None
         if actor_user
         else None,
-        actor_roles=list(actor_user.get("roles", [])) if actor_user else [],
-        target_label=target_label,
-        before=serialize_doc_for_audit(before),
-        after=serialize_doc_for_audit(after),
-        metadata={"workflow": "roster_import"},
-    )
+        "actor_roles": list(actor_user.get("roles", [])) if actor_user else [],
+        "target_label": target_label,
+        "before": serialize_doc_for_audit(before),
+        "after": serialize_doc_for_audit(after),
+        "metadata": {"workflow": "roster_import"},
+    }
+
+
+def _roster_report_row(cadet: dict, **fields: Any) -> dict:
+    return {"name": format_full_name(cadet), "email": cadet["email"], **fields}
 
 
 def import_cadets_from_roster(
@@ -344,63 +381,49 @@ def import_cadets_from_roster(
     actor_user: dict[str, Any] | None = None,
     email_temp_passwords: bool = False,
 ) -> dict:
-    from utils.db_schema_crud import create_user
+    """Apply each roster row's action using batched reads and writes.
 
-    created: list[dict] = []
-    updated: list[dict] = []
-    skipped: list[dict] = []
-    errors: list[dict] = []
-    email_failures: list[dict] = []
+    Existing accounts are looked up with `$in` queries, temporary passwords
+    are hashed in parallel with `hash_passwords`, and users, cadets and
+    audit entries are each written with one bulk call. A rejected write only
+    fails its own row. Report lists keep roster order.
+    """
+    outcomes: dict[int, tuple[str, dict]] = {}
+    audit_entries: dict[int, list[dict]] = {}
+    temp_passwords: dict[int, str] = {}
+    to_update: list[tuple[int, dict]] = []
+    to_create: list[tuple[int, dict]] = []
+    # (row, cadet, kind, user_id) for cadet documents still to insert
+    new_cadets: list[tuple[int, dict, str, Any]] = []
+
+    # Rows without analysis keep the old behavior: skip users that already
+    # have a cadet, add a cadet to users that don't, create everyone else.
+    legacy_users = get_users_by_emails(
+        [c["email"] for c in cadets_data if "conflict_type" not in c]
+    )
+    legacy_cadets = get_cadets_by_user_ids_map(
+        [user["_id"] for user in legacy_users.values()]
+    )
 
     for i, cadet in enumerate(cadets_data):
-        # Backward-compatible: raw dicts without analysis get the old behavior
         if "conflict_type" not in cadet:
-            from utils.db_schema_crud import (
-                get_cadet_by_user_id as _get_cadet_by_user_id,
-            )
-
-            email = cadet["email"]
-            first_name = cadet["first_name"]
-            last_name = cadet["last_name"]
-            rank = cadet["rank"]
-            existing_user = get_user_by_email(email)
-            full_name = format_full_name(cadet)
-            if existing_user:
-                existing_cadet = _get_cadet_by_user_id(existing_user["_id"])
-                if existing_cadet:
-                    skipped.append(
-                        {
-                            "name": full_name,
-                            "email": email,
-                            "reason": "User already exists",
-                        }
-                    )
-                    continue
-                try:
-                    create_cadet(
-                        existing_user["_id"], rank, first_name, last_name, email
-                    )
-                    created.append(
-                        {
-                            "name": full_name,
-                            "email": email,
-                            "rank": rank,
-                            "temp_password": "(existing account)",
-                        }
-                    )
-                except Exception as e:
-                    errors.append(
-                        {
-                            "name": full_name,
-                            "email": email,
-                            "reason": str(e),
-                        }
-                    )
+            existing_user = legacy_users.get(normalize_email(cadet["email"]))
+            if existing_user is None:
+                cadet = {
+                    **cadet,
+                    "conflict_type": "none",
+                    "existing_user": None,
+                    "existing_cadet": None,
+                }
+            elif str(existing_user["_id"]) in legacy_cadets:
+                outcomes[i] = (
+                    "skipped",
+                    _roster_report_row(cadet, reason="User already exists"),
+                )
+                continue
+            else:
+                new_cadets.append((i, cadet, "legacy", existing_user["_id"]))
                 continue
-            # No existing user - fall through to normal creation below
-            cadet["existing_user"] = None
-            cadet["existing_cadet"] = None
-            cadet["conflict_type"] = "none"
 
         conflict = cadet.get("conflict_type", "none")
         action = (
@@ -411,204 +434,300 @@ def import_cadets_from_roster(
         if action not in _VALID_ACTIONS.get(conflict, ["Skip"]):
             action = _DEFAULT_ACTION.get(conflict, "Skip")
 
-        email = cadet["email"]
-        first_name = cadet["first_name"]
-        last_name = cadet["last_name"]
-        full_name = format_full_name(cadet)
-        rank = cadet["rank"]
-        existing_user = cadet.get("existing_user")
-        existing_cadet = cadet.get("existing_cadet")
-
         if action == "Skip":
-            skipped.append(
+            outcomes[i] = (
+                "skipped",
+                _roster_report_row(cadet, reason="Skipped by user"),
+            )
+        elif action == "Update" and cadet.get("existing_user") is not None:
+            to_update.append((i, cadet))
+        else:
+            to_create.append((i, cadet))
+
+    # --- Update existing records ---
+    if to_update:
+        before_users = {
+            user["_id"]: user
+            for user in get_users_by_ids(
+                [cadet["existing_user"]["_id"] for _, cadet in to_update]
+            )
+        }
+        before_cadets = {
+            doc["_id"]: doc
+            for doc in get_cadets_by_ids(
+                [
+                    cadet["existing_cadet"]["_id"]
+                    for _, cadet in to_update
+                    if cadet.get("existing_cadet")
+                ]
+            )
+        }
+        user_updates = [
+            (
+                ObjectId(cadet["existing_user"]["_id"]),
                 {
-                    "name": full_name,
-                    "email": email,
-                    "reason": "Skipped by user",
-                }
+                    "first_name": cadet["first_name"],
+                    "last_name": cadet["last_name"],
+                    "name": format_full_name(cadet),
+                    "email": cadet["email"],
+                },
             )
-            continue
-
-        # --- Update existing record ---
-        if action == "Update" and existing_user is not None:
-            try:
-                before_user = get_user_by_id(existing_user["_id"])
-                update_user(
-                    existing_user["_id"],
-                    {
-                        "first_name": first_name,
-                        "last_name": last_name,
-                        "name": format_full_name(cadet),
-                        "email": email,
-                    },
+            for _, cadet in to_update
+        ]
+        user_failures = bulk_update_users(user_updates)
+        cadet_updates: list[tuple[int, dict, ObjectId, dict]] = []
+        for k, (i, cadet) in enumerate(to_update):
+            if user_failures is None or k in user_failures:
+                reason = (
+                    "Database unavailable"
+                    if user_failures is None
+                    else user_failures[k]
+                )
+                outcomes[i] = (
+                    "errors",
+                    _roster_report_row(
+                        cadet, reason=f"Failed to update account: {reason}"
+                    ),
                 )
-                after_user = get_user_by_id(existing_user["_id"])
-                target_label = format_full_name(cadet, default=email)
-                _log_roster_import_change(
+                continue
+            user_id, fields = user_updates[k]
+            before_user = before_users.get(user_id)
+            after_user = (
+                {
+                    **before_user,
+                    **fields,
+                    "email_normalized": normalize_email(fields["email"]),
+                }
+                if before_user
+                else None
+            )
+            audit_entries.setdefault(i, []).append(
+                _roster_import_audit_entry(
                     action="update",
                     target_collection="users",
-                    target_id=existing_user["_id"],
-                    target_label=target_label,
+                    target_id=user_id,
+                    target_label=format_full_name(cadet, default=cadet["email"]),
                     before=before_user,
                     after=after_user,
                     actor_user=actor_user,
                 )
-                if existing_cadet:
-                    before_cadet = get_cadet_by_id(existing_cadet["_id"])
-                    update_cadet(
-                        existing_cadet["_id"],
+            )
+            if cadet.get("existing_cadet"):
+                cadet_updates.append(
+                    (
+                        i,
+                        cadet,
+                        ObjectId(cadet["existing_cadet"]["_id"]),
                         {
-                            "first_name": first_name,
-                            "last_name": last_name,
-                            "email": email,
-                            "rank": rank,
+                            "first_name": cadet["first_name"],
+                            "last_name": cadet["last_name"],
+                            "email": cadet["email"],
+                            "rank": cadet["rank"],
                         },
                     )
-                    after_cadet = get_cadet_by_id(existing_cadet["_id"])
-                    _log_roster_import_change(
-                        action="update",
-                        target_collection="cadets",
-                        target_id=existing_cadet["_id"],
-                        target_label=target_label,
-                        before=before_cadet,
-                        after=after_cadet,
-                        actor_user=actor_user,
-                    )
-                else:
-                    cadet_result = create_cadet(
-                        existing_user["_id"], rank, first_name, last_name, email
-                    )
-                    created_cadet = (
-                        get_cadet_by_id(cadet_result.inserted_id)
-                        if cadet_result is not None
-                        else None
-                    )
-                    _log_roster_import_change(
-                        action="create",
-                        target_collection="cadets",
-                        target_id=created_cadet.get("_id") if created_cadet else None,
-                        target_label=target_label,
-                        before=None,
-                        after=created_cadet,
-                        actor_user=actor_user,
-                    )
-                updated.append(
-                    {
-                        "name": full_name,
-                        "email": email,
-                        "rank": rank,
-                    }
                 )
-            except Exception as e:
-                errors.append(
-                    {
-                        "name": full_name,
-                        "email": email,
-                        "reason": f"Failed to update account: {e}",
-                    }
+            else:
+                new_cadets.append((i, cadet, "update", user_id))
+
+        cadet_failures = (
+            bulk_update_cadets(
+                [(cadet_id, fields) for _, _, cadet_id, fields in cadet_updates]
+            )
+            if cadet_updates
+            else {}
+        )
+        for k, (i, cadet, cadet_id, fields) in enumerate(cadet_updates):
+            if cadet_failures is None or k in cadet_failures:
+                reason = (
+                    "Database unavailable"
+                    if cadet_failures is None
+                    else cadet_failures[k]
                 )
-            continue
+                outcomes[i] = (
+                    "errors",
+                    _roster_report_row(
+                        cadet, reason=f"Failed to update account: {reason}"
+                    ),
+                )
+                continue
+            before_cadet = before_cadets.get(cadet_id)
+            audit_entries[i].append(
+                _roster_import_audit_entry(
+                    action="update",
+                    target_collection="cadets",
+                    target_id=cadet_id,
+                    target_label=format_full_name(cadet, default=cadet["email"]),
+                    before=before_cadet,
+                    after={**before_cadet, **fields} if before_cadet else None,
+                    actor_user=actor_user,
+                )
+            )
+            outcomes[i] = (
+                "updated",
+                _roster_report_row(cadet, rank=cadet["rank"]),
+            )
 
-        # --- Create as New ---
-        if existing_user and get_user_by_email(email):
-            errors.append(
-                {
-                    "name": full_name,
-                    "email": email,
-                    "reason": "Email already in use — cannot create a new account with this email.",
-                }
+    # --- Create new accounts ---
+    emails_in_use = get_users_by_emails(
+        [cadet["email"] for _, cadet in to_create if cadet.get("existing_user")]
+    )
+    creatable = []
+    for i, cadet in to_create:
+        if (
+            cadet.get("existing_user")
+            and normalize_email(cadet["email"]) in emails_in_use
+        ):
+            outcomes[i] = (
+                "errors",
+                _roster_report_row(
+                    cadet,
+                    reason="Email already in use — cannot create a new account with this email.",
+                ),
+            )
+        else:
+            creatable.append((i, cadet))
+
+    passwords = [secrets.token_urlsafe(10) for _ in creatable]
+    user_docs = [
+        {
+            "_id": ObjectId(),
+            **build_user_doc(
+                cadet["first_name"],
+                cadet["last_name"],
+                cadet["email"],
+                password_hash,
+                ["cadet"],
+            ),
+            "force_password_change": True,
+        }
+        for (_, cadet), password_hash in zip(creatable, hash_passwords(passwords))
+    ]
+    user_failures = bulk_insert_users(user_docs) if user_docs else {}
+    for k, ((i, cadet), user_doc) in enumerate(zip(creatable, user_docs)):
+        if user_failures is None:
+            outcomes[i] = (
+                "errors",
+                _roster_report_row(cadet, reason="Database error creating user"),
             )
             continue
-
-        temp_password = secrets.token_urlsafe(10)
-        try:
-            user_result = create_user(
-                first_name, last_name, email, temp_password, ["cadet"]
+        if k in user_failures:
+            outcomes[i] = (
+                "errors",
+                _roster_report_row(
+                    cadet, reason=f"Failed to create account: {user_failures[k]}"
+                ),
             )
-            if user_result is None:
-                errors.append(
-                    {
-                        "name": f"{first_name} {last_name}",
-                        "email": email,
-                        "reason": "Database error creating user",
-                    }
-                )
-                continue
-            update_user(user_result.inserted_id, {"force_password_change": True})
-            created_user = get_user_by_id(user_result.inserted_id)
-            target_label = format_full_name(cadet, default=email)
-            _log_roster_import_change(
+            continue
+        temp_passwords[i] = passwords[k]
+        audit_entries.setdefault(i, []).append(
+            _roster_import_audit_entry(
                 action="create",
                 target_collection="users",
-                target_id=user_result.inserted_id,
-                target_label=target_label,
+                target_id=user_doc["_id"],
+                target_label=format_full_name(cadet, default=cadet["email"]),
                 before=None,
-                after=created_user,
+                after=user_doc,
                 actor_user=actor_user,
             )
-            cadet_result = create_cadet(
-                user_result.inserted_id, rank, first_name, last_name, email
+        )
+        new_cadets.append((i, cadet, "create", user_doc["_id"]))
+
+    # --- Cadet documents for new and cadet-less accounts ---
+    cadet_docs = [
+        {
+            "_id": ObjectId(),
+            **build_cadet_doc(
+                user_id,
+                cadet["rank"],
+                cadet["first_name"],
+                cadet["last_name"],
+                cadet["email"],
+            ),
+        }
+        for _, cadet, _, user_id in new_cadets
+    ]
+    cadet_failures = bulk_insert_cadets(cadet_docs) if cadet_docs else {}
+    for k, ((i, cadet, kind, _), cadet_doc) in enumerate(zip(new_cadets, cadet_docs)):
+        if cadet_failures is None or k in cadet_failures:
+            reason = (
+                "Database unavailable" if cadet_failures is None else cadet_failures[k]
             )
-            created_cadet = (
-                get_cadet_by_id(cadet_result.inserted_id)
-                if cadet_result is not None
-                else None
+            if kind == "update":
+                reason = f"Failed to update account: {reason}"
+            elif kind == "create":
+                reason = f"Failed to create account: {reason}"
+            outcomes[i] = ("errors", _roster_report_row(cadet, reason=reason))
+            continue
+        if kind == "legacy":
+            outcomes[i] = (
+                "created",
+                _roster_report_row(
+                    cadet, rank=cadet["rank"], temp_password="(existing account)"
+                ),
             )
-            _log_roster_import_change(
+            continue
+        audit_entries.setdefault(i, []).append(
+            _roster_import_audit_entry(
                 action="create",
                 target_collection="cadets",
-                target_id=created_cadet.get("_id") if created_cadet else None,
-                target_label=target_label,
+                target_id=cadet_doc["_id"],
+                target_label=format_full_name(cadet, default=cadet["email"]),
                 before=None,
-                after=created_cadet,
+                after=cadet_doc,
                 actor_user=actor_user,
             )
-            created.append(
-                {
-                    "name": full_name,
-                    "email": email,
-                    "rank": rank,
-                    "temp_password": temp_password,
-                    "emailed": False,
-                }
-            )
-            if email_temp_passwords:
-                template = get_email_template("roster_temp_password")
-                subject, body = get_content(
-                    template, temporary_password=temp_password
-                )
-                sent = send_temporary_password_email(
-                    to_email=email,
-                    temporary_password=temp_password,
-                    subject=subject,
-                    body=body,
-                )
-                if sent:
-                    created[-1]["emailed"] = True
-                else:
-                    email_failures.append(
-                        {
-                            "name": full_name,
-                            "email": email,
-                            "reason": "Failed to send temporary password email",
-                        }
-                    )
-        except Exception as e:
-            errors.append(
-                {
-                    "name": full_name,
-                    "email": email,
-                    "reason": f"Failed to create account: {e}",
-                }
+        )
+        if kind == "update":
+            outcomes[i] = ("updated", _roster_report_row(cadet, rank=cadet["rank"]))
+        else:
+            outcomes[i] = (
+                "created",
+                _roster_report_row(
+                    cadet,
+                    rank=cadet["rank"],
+                    temp_password=temp_passwords[i],
+                    emailed=False,
+                ),
             )
 
-    return {
-        "created": created,
-        "updated": updated,
-        "skipped": skipped,
-        "errors": errors,
-        "email_failures": email_failures,
+    log_data_changes(
+        [entry for i in sorted(audit_entries) for entry in audit_entries[i]]
+    )
+
+    report: dict[str, list[dict]] = {
+        "created": [],
+        "updated": [],
+        "skipped": [],
+        "errors": [],
+        "email_failures": [],
     }
+    for i in sorted(outcomes):
+        key, entry = outcomes[i]
+        report[key].append(entry)
+
+    if email_temp_passwords:
+        template = get_email_template("roster_temp_password")
+        for i in sorted(temp_passwords):
+            key, entry = outcomes[i]
+            if key != "created":
+                continue
+            subject, body = get_content(template, temporary_password=temp_passwords[i])
+            if send_temporary_password_email(
+                to_email=entry["email"],
+                temporary_password=temp_passwords[i],
+                subject=subject,
+                body=body,
+            ):
+                entry["emailed"] = True
+            else:
+                report["email_failures"].append(
+                    {
+                        "name": entry["name"],
+                        "email": entry["email"],
+                        "reason": "Failed to send temporary password email",
+                    }
+                )
+    return report
 
 
 def send_temp_passwords_to_created_cadets(
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from services.attendance import is_within_checkin_window
+from services.cadet_attendance import get_cadet_flight_label, load_cadet_flights
+from services.event_codes import validate_code
+from services.event_config import get_checkin_window_minutes
+from utils.audit_log import log_checkin_attempt
+from utils.db_schema_crud import (
+    create_attendance_record,
+    get_attendance_record_by_event_cadet,
+    get_cadet_by_user_id,
+    get_event_by_id,
+    get_user_by_email,
+)
+from utils.st_helpers import SessionStore
+
+CHECKIN_CONTEXT_SESSION_KEY = "_checkin_context"
+
+
+def resolve_checkin_context(email: str) -> dict[str, Any] | None:
+    """Look up the user, cadet profile and flight behind a login email.
+
+    Returns None when no user matches. `cadet` is None for accounts without
+    a cadet profile (e.g. admins).
+    """
+    email = str(email or "").strip()
+    user = get_user_by_email(email)
+    if not user:
+        return None
+
+    cadet = get_cadet_by_user_id(user["_id"])
+    flights = load_cadet_flights(cadet) if cadet else []
+    return {
+        "email": email,
+        "user": user,
+        "cadet": cadet,
+        "flights": flights,
+        "flight_label": get_cadet_flight_label(cadet, flights) if cadet else "—",
+    }
+
+
+def get_checkin_context(email: str, session: SessionStore) -> dict[str, Any] | None:
+    """Return the check-in context for `email`, resolving it once per session.
+
+    `session` is normally `st.session_state`. Only contexts with a cadet
+    profile are kept, so a profile created mid-session is picked up on the
+    next rerun.
+    """
+    email = str(email or "").strip()
+    cached = session.get(CHECKIN_CONTEXT_SESSION_KEY)
+    if cached is not None and cached.get("email") == email:
+        return cached
+
+    context = resolve_checkin_context(email)
+    if context is not None and context["cadet"] is not None:
+        session[CHECKIN_CONTEXT_SESSION_KEY] = context
+    return context
+
+
+def lookup_checkin_event(
+    code: str,
+    cadet_id: str | ObjectId,
+    *,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    """Validate `code` and check whether the cadet may still check in.
+
+    Returns a dict with `outcome` set to "invalid_code", "outside_window",
+    "already_checked_in" or "ok", plus `event_code`, `event` and
+    `window_minutes` where known. The duplicate check is one lookup on the
+    `(event_id, cadet_id)` unique index rather than a scan of the cadet's
+    history.
+    """
+    result: dict[str, Any] = {
+        "outcome": "invalid_code",
+        "event_code": None,
+        "event": None,
+        "window_minutes": None,
+    }
+    event_code = validate_code(code)
+    if event_code is None:
+        return result
+    event = get_event_by_id(event_code["event_id"])
+    if not event:
+        return result
+    result.update(event_code=event_code, event=event)
+
+    window = get_checkin_window_minutes()
+    result["window_minutes"] = window
+    if not is_within_checkin_window(
+        event, now or datetime.now(timezone.utc), window_minutes=window
+    ):
+        result["outcome"] = "outside_window"
+        return result
+
+    existing = get_attendance_record_by_event_cadet(event_code["event_id"], cadet_id)
+    result["outcome"] = "ok" if existing is None else "already_checked_in"
+    return result
+
+
+def submit_checkin(
+    context: dict[str, Any],
+    event_code: dict[str, Any],
+    *,
+    location_lat: float | None = None,
+    location_lon: float | None = None,
+    location_outside_fence: bool = False,
+    location_unavailable: bool = False,
+    source: str = "attendance_submission",
+    event: dict[str, Any] | None = None,
+) -> str:
+    """Record a present check-in and its audit entry.
+
+    Returns "success", "duplicate" or "db_unavailable". Duplicates are
+    caught by the `(event_id, cadet_id)` unique index, so a double submit
+    that races the first insert is reported rather than raised. Passing the
+    `event` from `lookup_checkin_event` lets the audit entry be named
+    without reading it again.
+    """
+    user = context["user"]
+    cadet_id = context["cadet"]["_id"]
+    event_id = event_code["event_id"]
+
+    try:
+        result = create_attendance_record(
+            event_id=event_id,
+            cadet_id=cadet_id,
+            status="present",
+            recorded_by_user_id=user["_id"],
+            recorded_by_roles=list(user.get("roles", [])),
+            location_lat=location_lat,
+            location_lon=location_lon,
+            location_outside_fence=location_outside_fence,
+            location_unavailable=location_unavailable,
+        )
+    except DuplicateKeyError:
+        return "duplicate"
+    if result is None:
+        return "db_unavailable"
+
+    log_checkin_attempt(
+        cadet_id=cadet_id,
+        outcome="success",
+        event_id=event_id,
+        user_id=user["_id"],
+        source=source,
+        search_docs=(user, context["cadet"], event),
+    )
+    return "success"
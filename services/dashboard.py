@@ -1,47 +1,83 @@
 from datetime import datetime, timezone
 from typing import Any
+
+import numpy as np
 import pandas as pd
 
+from services.cadet_attendance import StandingWaiverIndex
 from utils.db_schema_crud import (
     get_all_cadets,
-    get_attendance_by_events,
-    get_events_by_type,
+    get_approved_standing_waivers,
+    get_events_by_date_range,
     get_users_by_ids,
     get_waivers_by_attendance_records,
+    iter_attendance_batches_by_events,
 )
-from utils.datetime_utils import ensure_utc
 from utils.names import format_full_name
 
 
-def get_semester_data() -> dict | None:
-    cadets = get_all_cadets()
+_EVENT_TYPE_ORDER = {"pt": 0, "lab": 1}
+
+
+def get_semester_data(year: int | None = None) -> dict | None:
+    """Load the current year's PT/LLAB matrix inputs with projected queries.
+
+    Events are filtered by year and type in MongoDB, and attendance records
+    and their approved waivers are fetched a batch of events at a time, so
+    the cost follows the size of one year rather than the whole history.
+    Approved standing waivers overlapping the year come from one query.
+    """
+    cadets = get_all_cadets(projection={"user_id": 1})
     if not cadets:
         return None
 
-    user_ids = [c["user_id"] for c in cadets]
-    users = get_users_by_ids(user_ids)
+    users = get_users_by_ids(
+        [c["user_id"] for c in cadets],
+        projection={"first_name": 1, "last_name": 1},
+    )
 
-    year = datetime.now(timezone.utc).year
+    year = year or datetime.now(timezone.utc).year
     start = datetime(year, 1, 1, tzinfo=timezone.utc)
     end = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
 
-    all_events = get_events_by_type("pt") + get_events_by_type("lab")
-    events = [
-        e
-        for e in all_events
-        if isinstance(e.get("start_date"), datetime)
-        and start <= ensure_utc(e["start_date"]) <= end
-    ]
+    events = get_events_by_date_range(
+        start,
+        end,
+        event_types=list(_EVENT_TYPE_ORDER),
+        projection={"event_type": 1, "start_date": 1},
+    )
     if not events:
         return None
-
-    records = get_attendance_by_events([e["_id"] for e in events])
-
-    waivers = [
-        w
-        for w in get_waivers_by_attendance_records([r["_id"] for r in records])
-        if w.get("status") == "approved"
-    ]
+    # Keep the PT columns ahead of the LLAB columns; the sort is stable so
+    # each group stays in date order.
+    events.sort(key=lambda e: _EVENT_TYPE_ORDER.get(e.get("event_type"), 2))
+
+    records: list[dict] = []
+    waivers: list[dict] = []
+    for batch in iter_attendance_batches_by_events(
+        [e["_id"] for e in events],
+        projection={"event_id": 1, "cadet_id": 1, "status": 1},
+    ):
+        records.extend(batch)
+        waivers.extend(
+            get_waivers_by_attendance_records(
+                [r["_id"] for r in batch],
+                status="approved",
+                projection={"attendance_record_id": 1},
+            )
+        )
+
+    standing_waivers = get_approved_standing_waivers(
+        start,
+        end,
+        projection={
+            "submitted_by_user_id": 1,
+            "status": 1,
+            "start_date": 1,
+            "end_date": 1,
+            "event_types": 1,
+        },
+    )
 
     return {
         "cadets": cadets,
@@ -49,74 +85,114 @@ def get_semester_data() -> dict | None:
         "events": events,
         "records": records,
         "waivers": waivers,
+        "standing_waivers": standing_waivers,
     }
 
 
-def get_semester_df() -> pd.DataFrame | str:
-    data = get_semester_data()
-    if data is None:
-        return "No data found."
-
+_STATUS_LABELS = np.array(["Absent", "Present", "Excused", "Waived"], dtype=object)
+_STATUS_CODES = {"absent": 0, "present": 1, "excused": 2}
+_ABSENT = 0
+_WAIVED = 3
+
+
+def _event_column_label(event: dict) -> str:
+    sd = event.get("start_date")
+    date_label = sd.strftime("%m/%d") if isinstance(sd, datetime) else ""
+    return f"{date_label} {event.get('event_type', '').upper()}".strip()
+
+
+def _standing_covered_pairs(
+    cadets: list[dict], events: list[dict], standing_waivers: list[dict]
+) -> set[tuple[Any, Any]]:
+    """Return the (cadet_id, event_id) pairs an approved standing waiver covers."""
+    waivers_by_user: dict[Any, list[dict]] = {}
+    for waiver in standing_waivers:
+        waivers_by_user.setdefault(waiver.get("submitted_by_user_id"), []).append(
+            waiver
+        )
+    covered: set[tuple[Any, Any]] = set()
+    for cadet in cadets:
+        waivers = waivers_by_user.get(cadet.get("user_id"))
+        if waivers:
+            index = StandingWaiverIndex(waivers)
+            covered.update(
+                (cadet["_id"], event_id) for event_id in index.resolve(events)
+            )
+    return covered
+
+
+def build_semester_df(data: dict) -> pd.DataFrame:
+    """Build the cadet x event attendance matrix from `get_semester_data` output.
+
+    Statuses are scattered into an int8 code matrix with one dict lookup per
+    record; labels and absence totals are then computed column-wise in numpy
+    rather than in a Python loop per cell. Events sharing a column label
+    collapse into one column holding the last event's value, but every event
+    still counts towards the absence totals. An absence covered by one of the
+    cadet's approved standing waivers is waived, as on the cadet's own page.
+    """
     cadets = data["cadets"]
-    users = data["users"]
     events = data["events"]
     records = data["records"]
-    waivers = data["waivers"]
-
-    name_by_user_id = {u["_id"]: format_full_name(u, "Unknown") for u in users}
-    name_by_cadet = {
-        c["_id"]: name_by_user_id.get(c["user_id"], "Unknown") for c in cadets
-    }
+    waived_record_ids = {w["attendance_record_id"] for w in data["waivers"]}
+    standing_covered = _standing_covered_pairs(
+        cadets, events, data.get("standing_waivers", [])
+    )
 
-    status_map: dict[tuple, str] = {
-        (r["event_id"], r["cadet_id"]): (r.get("status") or "absent").lower()
-        for r in records
-    }
-    pair_to_record: dict[tuple, Any] = {
-        (r["event_id"], r["cadet_id"]): r["_id"] for r in records
-    }
-    waived_record_ids = {w["attendance_record_id"] for w in waivers}
+    def _record_code(record: dict) -> int:
+        if record["_id"] in waived_record_ids:
+            return _WAIVED
+        code = _STATUS_CODES.get((record.get("status") or "absent").lower(), _ABSENT)
+        pair = (record["cadet_id"], record["event_id"])
+        if code == _ABSENT and pair in standing_covered:
+            return _WAIVED
+        return code
+
+    name_by_user_id = {u["_id"]: format_full_name(u, "Unknown") for u in data["users"]}
+    names = [name_by_user_id.get(c["user_id"], "Unknown") for c in cadets]
+    order = sorted(range(len(cadets)), key=lambda i: names[i].lower())
+
+    row_by_cadet = {cadets[i]["_id"]: row for row, i in enumerate(order)}
+    col_by_event = {e["_id"]: col for col, e in enumerate(events)}
+    event_types = np.array([e.get("event_type") for e in events], dtype=object)
+
+    codes = np.full((len(cadets), len(events)), _ABSENT, dtype=np.int8)
+    if records:
+        count = len(records)
+        rows = np.fromiter(
+            (row_by_cadet.get(r["cadet_id"], -1) for r in records), np.intp, count
+        )
+        cols = np.fromiter(
+            (col_by_event.get(r["event_id"], -1) for r in records), np.intp, count
+        )
+        record_codes = np.fromiter((_record_code(r) for r in records), np.int8, count)
+        known = (rows >= 0) & (cols >= 0)
+        rows, cols, record_codes = rows[known], cols[known], record_codes[known]
+
+        # Duplicate (event, cadet) records resolve to the last one, matching
+        # a dict keyed by the pair.
+        flat = rows * len(events) + cols
+        _, last_from_end = np.unique(flat[::-1], return_index=True)
+        last = len(flat) - 1 - last_from_end
+        codes[rows[last], cols[last]] = record_codes[last]
+
+    last_col_by_label: dict[str, int] = {}
+    for j, event in enumerate(events):
+        last_col_by_label[_event_column_label(event)] = j
+
+    absent = codes == _ABSENT
+    columns: dict[str, Any] = {"Cadet": [names[i] for i in order]}
+    for label, j in last_col_by_label.items():
+        columns[label] = _STATUS_LABELS[codes[:, j]]
+    columns["PT Absences"] = absent[:, event_types == "pt"].sum(axis=1)
+    columns["LLAB Absences"] = absent[:, event_types == "lab"].sum(axis=1)
+    columns["Approved Waivers"] = (codes == _WAIVED).sum(axis=1)
+
+    return pd.DataFrame(columns)
 
-    cadets_sorted = sorted(
-        cadets, key=lambda c: name_by_cadet.get(c["_id"], "").lower()
-    )
 
-    rows = []
-    for c in cadets_sorted:
-        cid = c["_id"]
-        row: dict[str, Any] = {"Cadet": name_by_cadet.get(cid, "Unknown")}
-        pt_absences = llab_absences = approved_waivers = 0
-
-        for e in events:
-            eid = e["_id"]
-            sd = e.get("start_date")
-            col_label = f"{sd.strftime('%m/%d') if isinstance(sd, datetime) else ''} {e.get('event_type', '').upper()}".strip()
-
-            rid = pair_to_record.get((eid, cid))
-            if rid in waived_record_ids:
-                val = "Waived"
-            else:
-                raw = status_map.get((eid, cid), "absent")
-                val = {
-                    "present": "Present",
-                    "absent": "Absent",
-                    "excused": "Excused",
-                }.get(raw, "Absent")
-
-            row[col_label] = val
-
-            if val == "Absent":
-                if e.get("event_type") == "pt":
-                    pt_absences += 1
-                elif e.get("event_type") == "lab":
-                    llab_absences += 1
-
-            if rid in waived_record_ids:
-                approved_waivers += 1
-
-        row["PT Absences"] = pt_absences
-        row["LLAB Absences"] = llab_absences
-        row["Approved Waivers"] = approved_waivers
-        rows.append(row)
-
-    return pd.DataFrame(rows)
+def get_semester_df() -> pd.DataFrame | str:
+    data = get_semester_data()
+    if data is None:
+        return "No data found."
+    return build_semester_df(data)
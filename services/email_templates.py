@@ -1,3 +1,4 @@
+from services.event_config import get_event_config, invalidate_event_config_cache
 from utils.db import get_db
 
 
@@ -30,13 +31,15 @@ _DEFAULT_TEMPLATES = {
 
 
 def get_email_template(key: str) -> dict:
-    db = get_db()
-    if db is not None:
-        config = db.event_config.find_one({})
-        if config:
-            templates = config.get("email_templates", {})
-            if key in templates:
-                return templates[key]
+    """Return the saved template for `key`, or the built-in default.
+
+    Reads the cached event_config document, so rendering a batch of emails
+    costs at most one database read.
+    """
+    config = get_event_config() or {}
+    templates = config.get("email_templates", {})
+    if key in templates:
+        return templates[key]
     return _DEFAULT_TEMPLATES[key]
 
 
@@ -54,4 +57,5 @@ def save_email_template(key: str, subject: str, body: str) -> bool:
         {},
         {"$set": {f"email_templates.{key}": {"subject": subject, "body": body}}},
     )
+    invalidate_event_config_cache()
     return True
@@ -13,12 +13,26 @@ from utils.db_schema_crud import (
     deactivate_event_code,
     find_active_event_code_by_value,
     get_active_event_code,
+    get_active_event_codes,
     get_event_by_id,
 )
+from utils.ttl_cache import get_or_load, invalidate
 
 EVENT_CODE_VALID_AFTER_START_MINUTES = 10
 EVENT_CODE_EXPIRY_STEP_MINUTES = 5
 
+ACTIVE_CODES_CACHE_KEY = "active_event_codes"
+# Bounds how long another process's create/expire can go unnoticed here;
+# this process invalidates immediately.
+ACTIVE_CODES_CACHE_TTL_SECONDS = 30
+
+# event id -> active code (or None) behind the per-second display fragment.
+# A cached code is re-read once it expires; otherwise only create/expire
+# here or the TTL (a code regenerated by another process) send it back to
+# the database.
+ACTIVE_CODE_DISPLAY_CACHE_KEY = "active_event_code_display"
+ACTIVE_CODE_DISPLAY_CACHE_TTL_SECONDS = 300
+
 
 def generate_code() -> str:
     """Generate a random 6-digit numeric code."""
@@ -86,7 +100,9 @@ def latest_allowed_expiry(event_start: datetime | None) -> datetime | None:
     """Codes must expire shortly after the event start time."""
     if event_start is None:
         return None
-    return ensure_utc(event_start) + timedelta(minutes=EVENT_CODE_VALID_AFTER_START_MINUTES)
+    return ensure_utc(event_start) + timedelta(
+        minutes=EVENT_CODE_VALID_AFTER_START_MINUTES
+    )
 
 
 def is_expiry_valid(
@@ -122,6 +138,8 @@ def create_code(
     )
     if result is None:
         return None
+    invalidate(ACTIVE_CODES_CACHE_KEY)
+    invalidate(ACTIVE_CODE_DISPLAY_CACHE_KEY)
 
     event = get_event_by_id(event_id)
     event_name = event.get("event_name", "Unknown Event") if event else "Unknown Event"
@@ -148,8 +166,30 @@ def create_code(
     }
 
 
+def _is_expired(doc: dict, now: datetime) -> bool:
+    expires_at = doc.get("expires_at")
+    return isinstance(expires_at, datetime) and ensure_utc(expires_at) <= now
+
+
 def get_active_code(event_id: str | ObjectId) -> dict | None:
-    return get_active_event_code(event_id)
+    """Return the active code of an event for display.
+
+    Served from a process-wide table so a code left up on a screen costs no
+    query per refresh; the caller computes the countdown from `expires_at`.
+    """
+    codes_by_event = get_or_load(
+        ACTIVE_CODE_DISPLAY_CACHE_KEY,
+        dict,
+        ttl_seconds=ACTIVE_CODE_DISPLAY_CACHE_TTL_SECONDS,
+    )
+    key = str(event_id)
+    if key in codes_by_event:
+        doc = codes_by_event[key]
+        if doc is None or not _is_expired(doc, datetime.now(timezone.utc)):
+            return doc
+    doc = get_active_event_code(event_id)
+    codes_by_event[key] = doc
+    return doc
 
 
 def expire_code(
@@ -161,6 +201,8 @@ def expire_code(
     """Manually deactivate a code. Returns True on success."""
     result = deactivate_event_code(code_id)
     success = result is not None and result.modified_count == 1
+    invalidate(ACTIVE_CODES_CACHE_KEY)
+    invalidate(ACTIVE_CODE_DISPLAY_CACHE_KEY)
 
     if success:
         log_data_change(
@@ -176,9 +218,38 @@ def expire_code(
     return success
 
 
+def _load_active_codes_by_value() -> dict[str, dict]:
+    return {doc["code"]: doc for doc in get_active_event_codes()}
+
+
 def validate_code(code: str) -> dict | None:
+    """Return the active event code document for `code`, or None.
+
+    Check-in bursts are answered from a process-wide table of active codes
+    that is loaded in one query and dropped whenever a code is created or
+    expired. `expires_at` is re-checked on every hit. Codes missing from the
+    table, such as one created by another process, fall back to an indexed
+    database lookup.
+    """
     code = code.replace(" ", "")
-    return find_active_event_code_by_value(code)
+    active_codes = get_or_load(
+        ACTIVE_CODES_CACHE_KEY,
+        _load_active_codes_by_value,
+        ttl_seconds=ACTIVE_CODES_CACHE_TTL_SECONDS,
+    )
+    doc = active_codes.get(code)
+    if doc is not None:
+        expires_at = doc.get("expires_at")
+        if isinstance(expires_at, datetime) and ensure_utc(expires_at) > datetime.now(
+            timezone.utc
+        ):
+            return dict(doc)
+        return None
+
+    doc = find_active_event_code_by_value(code)
+    if doc is not None:
+        invalidate(ACTIVE_CODES_CACHE_KEY)
+    return doc
 
 
 def expires_at_from_preset(preset: str) -> datetime:
@@ -1,5 +1,8 @@
+import copy
+
 from utils.audit_log import log_data_change
 from utils.db import get_db
+from utils.ttl_cache import cache_stats, get_or_load, invalidate
 
 DEFAULT_PT_DAYS = ["Monday", "Tuesday", "Thursday"]
 DEFAULT_LLAB_DAYS = ["Friday"]
@@ -10,37 +13,12 @@ DEFAULT_WAIVER_REMINDER_DAYS = 3
 DEFAULT_EMAIL_ENABLED = True
 DEFAULT_TIMEZONE = "America/New_York"
 
+EVENT_CONFIG_CACHE_KEY = "event_config"
+EVENT_CONFIG_CACHE_TTL_SECONDS = 30
 
-def get_event_config() -> dict | None:
-    """Return the event schedule config, creating a default one if it doesn't exist."""
-    db = get_db()
-    if db is None:
-        return {
-            "pt_days": DEFAULT_PT_DAYS,
-            "llab_days": DEFAULT_LLAB_DAYS,
-            "pt_threshold": DEFAULT_PT_THRESHOLD,
-            "llab_threshold": DEFAULT_LLAB_THRESHOLD,
-            "checkin_window": DEFAULT_CHECKIN_WINDOW_MINUTES,
-            "waiver_reminder_days": DEFAULT_WAIVER_REMINDER_DAYS,
-            "email_enabled": DEFAULT_EMAIL_ENABLED,
-        }
 
-    config = db.event_config.find_one({})
-    if not config:
-        db.event_config.insert_one(
-            {
-                "pt_days": DEFAULT_PT_DAYS,
-                "llab_days": DEFAULT_LLAB_DAYS,
-                "pt_threshold": DEFAULT_PT_THRESHOLD,
-                "llab_threshold": DEFAULT_LLAB_THRESHOLD,
-                "checkin_window": DEFAULT_CHECKIN_WINDOW_MINUTES,
-                "waiver_reminder_days": DEFAULT_WAIVER_REMINDER_DAYS,
-                "email_enabled": DEFAULT_EMAIL_ENABLED,
-            }
-        )
-        config = db.event_config.find_one({})
-
-    return config or {
+def _default_event_config() -> dict:
+    return {
         "pt_days": DEFAULT_PT_DAYS,
         "llab_days": DEFAULT_LLAB_DAYS,
         "pt_threshold": DEFAULT_PT_THRESHOLD,
@@ -51,6 +29,41 @@ def get_event_config() -> dict | None:
     }
 
 
+def _load_event_config(db) -> dict:
+    config = db.event_config.find_one({})
+    if not config:
+        db.event_config.insert_one(_default_event_config())
+        config = db.event_config.find_one({})
+    return config or _default_event_config()
+
+
+def get_event_config() -> dict | None:
+    """Return the event schedule config, creating a default one if it doesn't exist.
+
+    The document is cached process-wide for EVENT_CONFIG_CACHE_TTL_SECONDS and
+    dropped on save, so the per-setting getters below and email rendering
+    share one read. Callers get their own copy and may mutate it.
+    """
+    db = get_db()
+    if db is None:
+        return _default_event_config()
+
+    config = get_or_load(
+        EVENT_CONFIG_CACHE_KEY,
+        lambda: _load_event_config(db),
+        ttl_seconds=EVENT_CONFIG_CACHE_TTL_SECONDS,
+    )
+    return copy.deepcopy(config)
+
+
+def invalidate_event_config_cache() -> None:
+    invalidate(EVENT_CONFIG_CACHE_KEY)
+
+
+def get_event_config_cache_stats() -> dict[str, int]:
+    return cache_stats(EVENT_CONFIG_CACHE_KEY)
+
+
 def get_default_timezone() -> str:
     config = get_event_config()
     if config is None:
@@ -94,6 +107,7 @@ def save_event_config(
         },
     )
     after = db.event_config.find_one({})
+    invalidate_event_config_cache()
 
     log_data_change(
         source="event_config",
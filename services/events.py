@@ -1,15 +1,26 @@
-from datetime import date, datetime, time, timedelta, timezone
+from collections.abc import Callable
+from datetime import date, datetime, time, timezone
 from typing import Any
 from zoneinfo import ZoneInfo, available_timezones
 
 from bson import ObjectId
 
-from utils.audit_log import log_data_change, serialize_doc_for_audit
+from utils.audit_log import log_data_change, log_data_changes, serialize_doc_for_audit
 from utils.date_range import expand_event_dates
 from utils.db import get_db
 from utils.datetime_utils import ensure_utc
+from utils.db_schema_crud import (
+    get_attendance_by_event,
+    refresh_cadet_attendance_stats,
+)
+from utils.waiver_review_view import refresh_waiver_review_view
 
 
+EVENT_INSERT_BATCH_SIZE = 200
+
+# preview_semester_schedule type -> (stored event_type, name prefix)
+_GENERATED_EVENT_TYPES = {"PT": ("pt", "PT"), "LLAB": ("lab", "LLAB")}
+
 _PREFERRED_TIMEZONES = [
     "America/New_York",
     "America/Chicago",
@@ -159,6 +170,36 @@ def get_all_events(*, include_archived: bool = False) -> list[dict]:
     return events
 
 
+def _new_event_doc(
+    name: str,
+    event_type: str,
+    start_dt: datetime,
+    end_dt: datetime,
+    tz_name: str,
+    created_by_user_id: str,
+    *,
+    geofence_enabled: bool,
+    geofence_lat: float | None,
+    geofence_lon: float | None,
+    geofence_radius_meters: int,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    return {
+        "event_name": name,
+        "event_type": event_type,
+        "start_date": start_dt,
+        "end_date": end_dt,
+        "timezone_name": tz_name,
+        "created_by_user_id": _coerce_object_id_or_raw(created_by_user_id),
+        "archived": False,
+        "created_at": now or datetime.now(timezone.utc),
+        "geofence_enabled": geofence_enabled,
+        "geofence_lat": geofence_lat if geofence_enabled else None,
+        "geofence_lon": geofence_lon if geofence_enabled else None,
+        "geofence_radius_meters": geofence_radius_meters if geofence_enabled else None,
+    }
+
+
 def create_event(
     name: str,
     event_type: str,
@@ -185,20 +226,18 @@ def create_event(
     start_dt, end_dt = build_event_bounds(
         start_date, end_date, tz_name, start_time, end_time
     )
-    event_doc = {
-        "event_name": name,
-        "event_type": event_type,
-        "start_date": start_dt,
-        "end_date": end_dt,
-        "timezone_name": tz_name,
-        "created_by_user_id": _coerce_object_id_or_raw(created_by_user_id),
-        "archived": False,
-        "created_at": datetime.now(timezone.utc),
-        "geofence_enabled": geofence_enabled,
-        "geofence_lat": geofence_lat if geofence_enabled else None,
-        "geofence_lon": geofence_lon if geofence_enabled else None,
-        "geofence_radius_meters": geofence_radius_meters if geofence_enabled else None,
-    }
+    event_doc = _new_event_doc(
+        name,
+        event_type,
+        start_dt,
+        end_dt,
+        tz_name,
+        created_by_user_id,
+        geofence_enabled=geofence_enabled,
+        geofence_lat=geofence_lat,
+        geofence_lon=geofence_lon,
+        geofence_radius_meters=geofence_radius_meters,
+    )
     result = db.events.insert_one(event_doc)
     inserted = db.events.find_one({"_id": result.inserted_id})
     log_data_change(
@@ -216,6 +255,22 @@ def create_event(
     return True
 
 
+def _existing_event_starts(db, docs: list[dict]) -> set[tuple[str, datetime]]:
+    """Return (event_type, start) pairs of active events that match `docs`,
+    found with one range query over the docs' start dates."""
+    if not docs:
+        return set()
+    starts = [doc["start_date"] for doc in docs]
+    query = _active_event_query(include_archived=False)
+    query["event_type"] = {"$in": sorted({doc["event_type"] for doc in docs})}
+    query["start_date"] = {"$gte": min(starts), "$lte": max(starts)}
+    return {
+        (existing.get("event_type"), ensure_utc(existing["start_date"]))
+        for existing in db.events.find(query, {"event_type": 1, "start_date": 1})
+        if isinstance(existing.get("start_date"), datetime)
+    }
+
+
 def bulk_create_events(
     semester_start: date,
     semester_end: date,
@@ -235,64 +290,88 @@ def bulk_create_events(
     geofence_radius_meters: int = 150,
     actor_user_id: str | ObjectId | None = None,
     actor_email: str | None = None,
+    progress: Callable[[int, int], None] | None = None,
 ) -> tuple[int, int]:
     """Bulk-create PT and LLAB events for a semester date range.
 
-    Returns (created_count, skipped_count).
+    The schedule is computed up front from `preview_semester_schedule`.
+    Days that already have an active event of the same type and start time
+    are left alone. New events are inserted and audited
+    `EVENT_INSERT_BATCH_SIZE` at a time; `progress(done, total)` is called
+    after each batch.
+
+    Returns (created_count, skipped_count), where skipped counts holidays
+    and days that were already scheduled.
     """
+    db = get_db()
+    if db is None:
+        return 0, 0
+
     skip_set = set(skip_dates)
+    times = {
+        "PT": (pt_start_time, pt_end_time),
+        "LLAB": (llab_start_time, llab_end_time),
+    }
+    now = datetime.now(timezone.utc)
+    holidays = 0
+    docs: list[dict] = []
+    for entry in preview_semester_schedule(
+        semester_start, semester_end, pt_days, llab_days, []
+    ):
+        day = entry["date"]
+        if day in skip_set:
+            holidays += 1
+            continue
+        event_type, prefix = _GENERATED_EVENT_TYPES[entry["type"]]
+        start_time, end_time = times[entry["type"]]
+        start_dt, end_dt = build_event_bounds(day, day, tz_name, start_time, end_time)
+        docs.append(
+            _new_event_doc(
+                f"{prefix} {day.strftime('%a %b %d %Y')}",
+                event_type,
+                start_dt,
+                end_dt,
+                tz_name,
+                created_by_user_id,
+                geofence_enabled=geofence_enabled,
+                geofence_lat=geofence_lat,
+                geofence_lon=geofence_lon,
+                geofence_radius_meters=geofence_radius_meters,
+                now=now,
+            )
+        )
+
+    existing = _existing_event_starts(db, docs)
+    new_docs = [
+        doc for doc in docs if (doc["event_type"], doc["start_date"]) not in existing
+    ]
+    skipped = holidays + len(docs) - len(new_docs)
+
     created = 0
-    skipped = 0
-    current = semester_start
-    while current <= semester_end:
-        day_name = current.strftime("%A")
-        if day_name in pt_days:
-            if current in skip_set:
-                skipped += 1
-            else:
-                label = current.strftime("%a %b %d %Y")
-                ok = create_event(
-                    f"PT {label}",
-                    "pt",
-                    current,
-                    current,
-                    created_by_user_id,
-                    tz_name,
-                    geofence_enabled,
-                    geofence_lat,
-                    geofence_lon,
-                    geofence_radius_meters,
-                    start_time=pt_start_time,
-                    end_time=pt_end_time,
-                    actor_user_id=actor_user_id,
-                    actor_email=actor_email,
-                )
-                if ok:
-                    created += 1
-        elif day_name in llab_days:
-            if current in skip_set:
-                skipped += 1
-            else:
-                label = current.strftime("%a %b %d %Y")
-                ok = create_event(
-                    f"LLAB {label}",
-                    "lab",
-                    current,
-                    current,
-                    created_by_user_id,
-                    tz_name,
-                    geofence_enabled,
-                    geofence_lat,
-                    geofence_lon,
-                    geofence_radius_meters,
-                    start_time=llab_start_time,
-                    end_time=llab_end_time,
-                    actor_user_id=actor_user_id,
-                    actor_email=actor_email,
-                )
-                if ok:
-                    created += 1
-        current += timedelta(days=1)
+    for offset in range(0, len(new_docs), EVENT_INSERT_BATCH_SIZE):
+        batch = new_docs[offset : offset + EVENT_INSERT_BATCH_SIZE]
+        result = db.events.insert_many(batch, ordered=True)
+        log_data_changes(
+            [
+                {
+                    "source": "event_management",
+                    "action": "create",
+                    "target_collection": "events",
+                    "target_id": inserted_id,
+                    "actor_user_id": actor_user_id,
+                    "actor_email": actor_email,
+                    "target_label": doc["event_name"],
+                    "before": None,
+                    "after": serialize_doc_for_audit({**doc, "_id": inserted_id}),
+                    "metadata": {"event_type": doc["event_type"]},
+                }
+                for doc, inserted_id in zip(batch, result.inserted_ids)
+            ],
+            now=now,
+        )
+        created += len(batch)
+        if progress is not None:
+            progress(created, len(new_docs))
     return created, skipped
 
 
@@ -456,4 +535,10 @@ def update_event(
             before=serialize_doc_for_audit(before),
             after=serialize_doc_for_audit(after),
         )
+        if before.get("event_type") != event_type:
+            # The stats table splits absences into PT and LLAB.
+            refresh_cadet_attendance_stats(
+                [r["cadet_id"] for r in get_attendance_by_event(object_id)]
+            )
+        refresh_waiver_review_view(event_ids=[object_id])
     return result.matched_count == 1
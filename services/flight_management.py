@@ -5,48 +5,110 @@ from bson import ObjectId
 
 from services.cadets import assign_cadet_to_flight, get_all_cadets
 from utils.audit_log import log_data_change
-from utils.db import get_collection
 from utils.db_schema_crud import (
+    ROSTER_SNAPSHOT_CACHE_KEY,
     get_all_flights,
-    get_cadet_by_id,
     get_flight_by_id,
-    get_user_by_id,
+    get_users_by_ids,
     unassign_cadet_from_flight,
 )
 from utils.names import format_full_name
+from utils.ttl_cache import get_or_load
 
+# The snapshot is also dropped by every cadet, user and flight write in
+# utils.db_schema_crud, so the TTL only bounds drift from direct DB edits.
+ROSTER_SNAPSHOT_TTL_SECONDS = 30
 
-def get_flight_commander_details(flight: dict) -> tuple[str, str]:
+_ROSTER_CADET_PROJECTION = {"user_id": 1, "rank": 1, "flight_id": 1}
+_ROSTER_USER_PROJECTION = {"first_name": 1, "last_name": 1, "email": 1}
+
+
+def build_roster_snapshot(
+    cadets: list[dict], users: list[dict], flights: list[dict]
+) -> dict[str, Any]:
+    """Index raw cadet, user and flight documents for the page's tables."""
+    return {
+        "cadets": cadets,
+        "cadets_by_id": {str(cadet["_id"]): cadet for cadet in cadets},
+        "users_by_id": {user["_id"]: user for user in users},
+        "flights": flights,
+    }
+
+
+def load_roster_snapshot() -> dict[str, Any]:
+    """Fetch cadets, their users and flights in three queries."""
+    cadets = get_all_cadets(projection=_ROSTER_CADET_PROJECTION)
+    user_ids = list({c["user_id"] for c in cadets if c.get("user_id") is not None})
+    users = (
+        get_users_by_ids(user_ids, projection=_ROSTER_USER_PROJECTION)
+        if user_ids
+        else []
+    )
+    return build_roster_snapshot(cadets, users, get_all_flights())
+
+
+def get_roster_snapshot() -> dict[str, Any]:
+    """Return the shared roster snapshot, loading it at most once per TTL.
+
+    Every table on the Flight Management page is built from this, so a
+    rerun costs no more than the three queries in `load_roster_snapshot`.
+    Callers must treat it as read-only.
+    """
+    return get_or_load(
+        ROSTER_SNAPSHOT_CACHE_KEY,
+        load_roster_snapshot,
+        ttl_seconds=ROSTER_SNAPSHOT_TTL_SECONDS,
+    )
+
+
+def _commander_and_user(
+    flight: dict, snapshot: dict[str, Any]
+) -> tuple[dict | None, dict | None]:
     commander_cadet_id = flight.get("commander_cadet_id")
     if not commander_cadet_id:
-        return "-", ""
+        return None, None
+    commander = snapshot["cadets_by_id"].get(str(commander_cadet_id))
+    if commander is None:
+        return None, None
+    return commander, snapshot["users_by_id"].get(commander.get("user_id"))
 
-    commander = get_cadet_by_id(commander_cadet_id)
+
+def get_flight_commander_details(
+    flight: dict, *, snapshot: dict[str, Any] | None = None
+) -> tuple[str, str]:
+    snapshot = snapshot if snapshot is not None else get_roster_snapshot()
+    commander, user = _commander_and_user(flight, snapshot)
     if commander is None:
         return "-", ""
-
-    user = get_user_by_id(commander["user_id"])
     if user is None:
         return "-", commander.get("rank", "")
 
     return format_full_name(user), commander.get("rank", "")
 
 
-def get_flight_management_cadet_rows() -> list[dict[str, str | bool]]:
-    commander_cadet_ids = _get_commander_cadet_ids()
+def get_flight_management_cadet_rows(
+    *, snapshot: dict[str, Any] | None = None
+) -> list[dict[str, str | bool]]:
+    snapshot = snapshot if snapshot is not None else get_roster_snapshot()
+    commander_cadet_ids = {
+        str(flight["commander_cadet_id"])
+        for flight in snapshot["flights"]
+        if flight.get("commander_cadet_id")
+    }
     flight_name_by_id = {
         str(flight["_id"]): flight.get("name", "Unnamed flight")
-        for flight in get_all_flights()
+        for flight in snapshot["flights"]
         if flight.get("_id")
     }
+    users_by_id = snapshot["users_by_id"]
     rows = []
 
-    for cadet in get_all_cadets():
+    for cadet in snapshot["cadets"]:
         cadet_id = str(cadet["_id"])
         if cadet_id in commander_cadet_ids:
             continue
 
-        user = get_user_by_id(cadet["user_id"])
+        user = users_by_id.get(cadet.get("user_id"))
         if user is None:
             continue
 
@@ -68,6 +130,21 @@ def get_flight_management_cadet_rows() -> list[dict[str, str | bool]]:
     return sorted(rows, key=lambda row: (row["name"], row["rank"], row["email"]))
 
 
+def get_commander_display_map(
+    *, snapshot: dict[str, Any] | None = None
+) -> dict[str, str]:
+    """Returns {"First Last (rank)": "cadet_id_string", ...} for the commander picker."""
+    snapshot = snapshot if snapshot is not None else get_roster_snapshot()
+    display_map = {}
+    for cadet in snapshot["cadets"]:
+        user = snapshot["users_by_id"].get(cadet.get("user_id"))
+        if user:
+            name = format_full_name(user)
+            rank = cadet.get("rank", "")
+            display_map[f"{name} ({rank})"] = str(cadet["_id"])
+    return display_map
+
+
 def get_cadet_rows_by_id(
     cadet_rows: list[dict[str, str | bool]],
 ) -> dict[str, dict[str, str | bool]]:
@@ -146,8 +223,10 @@ def get_flight_member_table(
     return _build_member_table(rows, set()), [str(row["cadet_id"]) for row in rows]
 
 
-def get_commander_member_table(flight: dict) -> pd.DataFrame:
-    commander_row = _get_commander_member_row(flight)
+def get_commander_member_table(
+    flight: dict, *, snapshot: dict[str, Any] | None = None
+) -> pd.DataFrame:
+    commander_row = _get_commander_member_row(flight, snapshot=snapshot)
     if commander_row is None:
         return _build_member_table([], set())
 
@@ -320,18 +399,6 @@ def get_selectable_member_ids(member_cadet_ids: list[str]) -> list[str]:
     return member_cadet_ids
 
 
-def _get_commander_cadet_ids() -> set[str]:
-    flights_col = get_collection("flights")
-    if flights_col is None:
-        return set()
-
-    return {
-        str(flight["commander_cadet_id"])
-        for flight in flights_col.find({}, {"commander_cadet_id": 1})
-        if flight.get("commander_cadet_id")
-    }
-
-
 def _build_cadet_table(
     rows: list[dict[str, str | bool]],
     selected_cadet_ids: set[str],
@@ -378,17 +445,12 @@ def _build_member_table(
     )
 
 
-def _get_commander_member_row(flight: dict) -> dict[str, str | bool] | None:
-    commander_cadet_id = flight.get("commander_cadet_id")
-    if not commander_cadet_id:
-        return None
-
-    commander = get_cadet_by_id(commander_cadet_id)
-    if commander is None:
-        return None
-
-    user = get_user_by_id(commander["user_id"])
-    if user is None:
+def _get_commander_member_row(
+    flight: dict, *, snapshot: dict[str, Any] | None = None
+) -> dict[str, str | bool] | None:
+    snapshot = snapshot if snapshot is not None else get_roster_snapshot()
+    commander, user = _commander_and_user(flight, snapshot)
+    if commander is None or user is None:
         return None
 
     return {
@@ -0,0 +1,373 @@
+"""Process-wide live attendance hub behind the Flight Commander Live View.
+
+One background watcher per event being viewed keeps that event's attendance
+records in memory, so every viewer's refresh reads the shared map instead of
+scanning the event in the database. The watcher follows a MongoDB change
+stream when the deployment supports one, and otherwise polls for records
+whose `updated_at` moved past its watermark, with a periodic full resync to
+pick up deletes. A watcher retires once nobody has read its event for
+`LIVE_ATTENDANCE_IDLE_SECONDS`.
+
+Every change to the map is also versioned, so a session's `CheckinView` is
+caught up from the changes since its last refresh instead of rebuilt.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+
+from utils.datetime_utils import ensure_utc
+from utils.db import get_collection
+from utils.db_schema_crud import get_attendance_by_event
+from utils.flight_commander_view import CheckinView
+from utils.st_helpers import SessionStore
+
+LIVE_ATTENDANCE_POLL_SECONDS = 1.0
+LIVE_ATTENDANCE_RESYNC_SECONDS = 30.0
+LIVE_ATTENDANCE_IDLE_SECONDS = 120.0
+LIVE_ATTENDANCE_READY_TIMEOUT_SECONDS = 5.0
+# Re-read a little behind the watermark so writes stamped by an app server
+# with a slightly slower clock are not skipped.
+LIVE_ATTENDANCE_LOOKBACK = timedelta(seconds=5)
+# Changes kept per event for `get_live_attendance_changes`; a reader further
+# behind than this gets the full record list instead.
+LIVE_ATTENDANCE_CHANGE_LOG_SIZE = 2000
+LIVE_CHECKIN_VIEW_SESSION_KEY = "_live_checkin_view"
+
+_feeds: dict[ObjectId, _EventFeed] = {}
+_registry_lock = threading.Lock()
+# Versions are unique across feeds, so a version handed out by a retired
+# watcher is never mistaken for one of its replacement.
+_versions = itertools.count(1)
+
+
+def _updated_at(record: dict[str, Any]) -> datetime:
+    dt = record.get("updated_at") or record.get("created_at")
+    if isinstance(dt, datetime):
+        return ensure_utc(dt)
+    return datetime.min.replace(tzinfo=timezone.utc)
+
+
+class _EventFeed:
+    """In-memory attendance records of one event, kept current by a watcher."""
+
+    def __init__(self, event_id: ObjectId) -> None:
+        self.event_id = event_id
+        self.last_read = time.monotonic()
+        self.mode = "starting"
+        self._records: dict[Any, dict[str, Any]] = {}
+        self._version = 0
+        self._floor = 0
+        self._changes: deque[tuple[int, str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._loaded = False
+        self._stop = threading.Event()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._records.values())
+
+    def _log_locked(self, kind: str, payload: Any) -> None:
+        self._version = next(_versions)
+        self._changes.append((self._version, kind, payload))
+        while len(self._changes) > LIVE_ATTENDANCE_CHANGE_LOG_SIZE:
+            self._floor = self._changes.popleft()[0]
+
+    def _upsert_locked(self, record: dict[str, Any]) -> None:
+        current = self._records.get(record["_id"])
+        if current is not None and _updated_at(record) < _updated_at(current):
+            return
+        self._records[record["_id"]] = record
+        self._log_locked("inserted" if current is None else "updated", record)
+
+    def _delete_locked(self, record_id: Any) -> None:
+        if self._records.pop(record_id, None) is not None:
+            self._log_locked("deleted", record_id)
+
+    def changes_since(
+        self, since: int | None
+    ) -> tuple[int, dict[str, list[Any]] | None, list[dict[str, Any]]]:
+        """Return (version, delta, records) for the changes after `since`.
+
+        The delta is None when `since` is None or older than the change log,
+        and `records` then holds the full map at `version` to start over from.
+        """
+        with self._lock:
+            if since is None or since < self._floor or since > self._version:
+                return self._version, None, list(self._records.values())
+            state: dict[Any, tuple[str, Any]] = {}
+            for version, kind, payload in self._changes:
+                if version <= since:
+                    continue
+                record_id = payload if kind == "deleted" else payload["_id"]
+                first_kind = state[record_id][0] if record_id in state else kind
+                state[record_id] = (first_kind, None if kind == "deleted" else payload)
+            version = self._version
+
+        delta: dict[str, list[Any]] = {"inserted": [], "updated": [], "deleted": []}
+        for record_id, (first_kind, record) in state.items():
+            if record is None:
+                if first_kind != "inserted":
+                    delta["deleted"].append(record_id)
+            elif first_kind == "inserted":
+                delta["inserted"].append(record)
+            else:
+                delta["updated"].append(record)
+        return version, delta, []
+
+    def wait_ready(self, timeout: float) -> bool:
+        self._ready.wait(timeout)
+        return self._loaded
+
+    def load(self, col) -> datetime:
+        """Replace the map with a full read of the event. Returns the watermark."""
+        started = datetime.now(timezone.utc)
+        records = {r["_id"]: r for r in col.find({"event_id": self.event_id})}
+        with self._lock:
+            if not self._loaded:
+                self._records = records
+                self._version = self._floor = next(_versions)
+            else:
+                for record_id in set(self._records) - set(records):
+                    self._delete_locked(record_id)
+                for record in records.values():
+                    if self._records.get(record["_id"]) != record:
+                        self._upsert_locked(record)
+        self._loaded = True
+        self._ready.set()
+        return started
+
+    def poll(self, col, since: datetime) -> datetime:
+        """Apply records updated since `since`. Returns the next watermark."""
+        started = datetime.now(timezone.utc)
+        self.apply_records(
+            col.find(
+                {
+                    "event_id": self.event_id,
+                    "updated_at": {"$gte": since - LIVE_ATTENDANCE_LOOKBACK},
+                }
+            )
+        )
+        return started
+
+    def apply_records(self, records: Iterable[dict[str, Any]]) -> None:
+        with self._lock:
+            for record in records:
+                if self._records.get(record["_id"]) != record:
+                    self._upsert_locked(record)
+
+    def apply_change(self, change: dict[str, Any]) -> None:
+        operation = change.get("operationType")
+        if operation == "delete":
+            record_id = (change.get("documentKey") or {}).get("_id")
+            with self._lock:
+                self._delete_locked(record_id)
+            return
+        record = change.get("fullDocument")
+        if record is None:
+            return
+        if record.get("event_id") != self.event_id:
+            # The record was moved to another event.
+            with self._lock:
+                self._delete_locked(record["_id"])
+            return
+        self.apply_records([record])
+
+    def _should_stop(self) -> bool:
+        with _registry_lock:
+            idle = time.monotonic() - self.last_read > LIVE_ATTENDANCE_IDLE_SECONDS
+            if self._stop.is_set() or idle:
+                self._retire_locked()
+                return True
+            return False
+
+    def _retire_locked(self) -> None:
+        self._stop.set()
+        if _feeds.get(self.event_id) is self:
+            del _feeds[self.event_id]
+        # Wake readers still waiting on a watcher that never loaded.
+        self._ready.set()
+
+    def _follow_change_stream(self, col) -> None:
+        pipeline = [
+            {
+                "$match": {
+                    "$or": [
+                        {"fullDocument.event_id": self.event_id},
+                        {"operationType": "delete"},
+                    ]
+                }
+            }
+        ]
+        with col.watch(
+            pipeline,
+            full_document="updateLookup",
+            max_await_time_ms=int(LIVE_ATTENDANCE_POLL_SECONDS * 1000),
+        ) as stream:
+            # Opened before the initial read so no change falls in between.
+            self.mode = "change_stream"
+            self.load(col)
+            while not self._should_stop():
+                change = stream.try_next()
+                if change is not None:
+                    self.apply_change(change)
+
+    def _poll_until_stopped(self, col) -> None:
+        self.mode = "poll"
+        watermark = self.load(col)
+        last_resync = time.monotonic()
+        while True:
+            self._stop.wait(LIVE_ATTENDANCE_POLL_SECONDS)
+            if self._should_stop():
+                return
+            try:
+                if time.monotonic() - last_resync >= LIVE_ATTENDANCE_RESYNC_SECONDS:
+                    watermark = self.load(col)
+                    last_resync = time.monotonic()
+                else:
+                    watermark = self.poll(col, watermark)
+            except PyMongoError as exc:
+                logging.warning(
+                    "Live attendance poll failed for event %s: %s", self.event_id, exc
+                )
+
+    def run(self) -> None:
+        col = get_collection("attendance_records")
+        try:
+            if col is None:
+                return
+            try:
+                self._follow_change_stream(col)
+            except PyMongoError as exc:
+                logging.info(
+                    "Change stream unavailable for event %s (%s); polling instead",
+                    self.event_id,
+                    exc,
+                )
+                self._poll_until_stopped(col)
+        except Exception:
+            logging.exception("Live attendance watcher for %s failed", self.event_id)
+        finally:
+            with _registry_lock:
+                self._retire_locked()
+
+
+def _feed_for(event_id: ObjectId) -> _EventFeed:
+    with _registry_lock:
+        feed = _feeds.get(event_id)
+        if feed is None:
+            feed = _feeds[event_id] = _EventFeed(event_id)
+            threading.Thread(
+                target=feed.run,
+                name=f"live-attendance-{event_id}",
+                daemon=True,
+            ).start()
+        feed.last_read = time.monotonic()
+        return feed
+
+
+def get_live_attendance(event_id: str | ObjectId) -> list[dict[str, Any]]:
+    """Return the attendance records of an event from the shared live map.
+
+    The first read of an event starts its watcher and waits for the initial
+    load; if that does not finish in time the records are read directly.
+    Returned records are shared between viewers and must not be mutated.
+    """
+    if get_collection("attendance_records") is None:
+        return []
+    event_object_id = ObjectId(event_id)
+    feed = _feed_for(event_object_id)
+    if not feed.wait_ready(LIVE_ATTENDANCE_READY_TIMEOUT_SECONDS):
+        return get_attendance_by_event(event_object_id)
+    return feed.snapshot()
+
+
+def get_live_attendance_changes(
+    event_id: str | ObjectId, since: int | None
+) -> tuple[int | None, dict[str, list[Any]] | None, list[dict[str, Any]]]:
+    """Return what changed in an event's live map since version `since`.
+
+    Returns `(version, delta, records)`. `delta` holds the `inserted` and
+    `updated` records and the `deleted` record ids after `since`; when the
+    caller has no version yet or has fallen behind the change log, `delta`
+    is None and `records` is the full list to rebuild from. `version` is
+    None when the records were read without the hub.
+    """
+    if get_collection("attendance_records") is None:
+        return None, None, []
+    event_object_id = ObjectId(event_id)
+    feed = _feed_for(event_object_id)
+    if not feed.wait_ready(LIVE_ATTENDANCE_READY_TIMEOUT_SECONDS):
+        return None, None, get_attendance_by_event(event_object_id)
+    return feed.changes_since(since)
+
+
+def get_live_checkin_view(
+    event: dict[str, Any],
+    flight_cadets: list[dict[str, Any]],
+    session: SessionStore,
+) -> CheckinView:
+    """Return the session's check-in view of `event`, caught up with the hub.
+
+    `session` is normally `st.session_state`. The view is built once per
+    event and roster and then only fed the changes since its last refresh.
+    """
+    cadet_ids = [cadet.get("_id") for cadet in flight_cadets]
+    cached: dict[str, Any] | None = session.get(LIVE_CHECKIN_VIEW_SESSION_KEY)
+    if (
+        cached is None
+        or cached["event_id"] != event.get("_id")
+        or cached["cadet_ids"] != cadet_ids
+    ):
+        cached = {
+            "event_id": event.get("_id"),
+            "cadet_ids": cadet_ids,
+            "version": None,
+            "view": None,
+        }
+
+    version, delta, records = get_live_attendance_changes(
+        event["_id"], cached["version"]
+    )
+    if delta is None or cached["view"] is None:
+        cached["view"] = CheckinView(flight_cadets, event, records)
+    else:
+        cached["view"].apply(**delta)
+    cached["version"] = version
+    session[LIVE_CHECKIN_VIEW_SESSION_KEY] = cached
+    return cached["view"]
+
+
+def refresh_live_attendance(event_id: str | ObjectId) -> None:
+    """Pull the event's latest writes into its live map right away.
+
+    Called after this process writes attendance so the writer's next render
+    sees the change without waiting for the watcher.
+    """
+    col = get_collection("attendance_records")
+    with _registry_lock:
+        feed = _feeds.get(ObjectId(event_id))
+    if col is None or feed is None or not feed.wait_ready(0):
+        return
+    try:
+        feed.poll(col, datetime.now(timezone.utc))
+    except PyMongoError as exc:
+        logging.warning("Live attendance refresh failed for %s: %s", event_id, exc)
+
+
+def stop_live_attendance() -> None:
+    """Stop every watcher. Intended for tests and shutdown."""
+    with _registry_lock:
+        feeds = list(_feeds.values())
+        for feed in feeds:
+            feed._retire_locked()
@@ -1,6 +1,5 @@
 from __future__ import annotations
 from datetime import datetime
-import re
 
 from bson import ObjectId
 import pandas as pd
@@ -23,8 +22,20 @@ from utils.db_schema_crud import (
 from services.waivers import distribute_excused_status, revert_excused_status
 from utils.audit_log import log_data_change
 from utils.names import format_full_name
-from utils.pagination import build_pagination_metadata, paginate_list
+from utils.pagination import (
+    ESTIMATED_COUNT_LIMIT,
+    build_keyset_page,
+    coerce_page_size,
+    decode_cursor,
+    keyset_match,
+    keyset_sort,
+    paginate_list,
+)
 from utils.waiver_email import send_waiver_decision_email
+from utils.waiver_review_view import (
+    WAIVER_REVIEW_VIEW_COLLECTION,
+    waiver_review_search_query,
+)
 
 
 def _fmt_date(dt: object) -> str:
@@ -71,223 +82,39 @@ def _waiver_review_match_stage(
     return match_stage
 
 
-def _waiver_review_base_pipeline(
+def _waiver_review_view_query(
     *,
     status_filter: str,
     flight_filter: str,
     cadet_search: str,
     viewer_roles: list[str] | None,
-) -> list[dict]:
-    search_regex = re.escape(cadet_search.strip()) if cadet_search.strip() else ""
-    pipeline: list[dict] = []
-    match_stage = _waiver_review_match_stage(status_filter, viewer_roles)
-    if match_stage:
-        pipeline.append({"$match": match_stage})
-
-    pipeline.extend(
-        [
-            {
-                "$lookup": {
-                    "from": "attendance_records",
-                    "localField": "attendance_record_id",
-                    "foreignField": "_id",
-                    "as": "attendance_record",
-                }
-            },
-            {
-                "$unwind": {
-                    "path": "$attendance_record",
-                    "preserveNullAndEmptyArrays": True,
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "cadets",
-                    "localField": "attendance_record.cadet_id",
-                    "foreignField": "_id",
-                    "as": "cadet_via_record",
-                }
-            },
-            {
-                "$unwind": {
-                    "path": "$cadet_via_record",
-                    "preserveNullAndEmptyArrays": True,
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "cadets",
-                    "localField": "submitted_by_user_id",
-                    "foreignField": "user_id",
-                    "as": "cadet_via_submitter",
-                }
-            },
-            {
-                "$unwind": {
-                    "path": "$cadet_via_submitter",
-                    "preserveNullAndEmptyArrays": True,
-                }
-            },
-            {
-                "$addFields": {
-                    "cadet": {"$ifNull": ["$cadet_via_record", "$cadet_via_submitter"]}
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "users",
-                    "localField": "cadet.user_id",
-                    "foreignField": "_id",
-                    "as": "cadet_user",
-                }
-            },
-            {
-                "$unwind": {
-                    "path": "$cadet_user",
-                    "preserveNullAndEmptyArrays": True,
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "flights",
-                    "localField": "cadet.flight_id",
-                    "foreignField": "_id",
-                    "as": "flight",
-                }
-            },
-            {
-                "$unwind": {
-                    "path": "$flight",
-                    "preserveNullAndEmptyArrays": True,
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "events",
-                    "localField": "attendance_record.event_id",
-                    "foreignField": "_id",
-                    "as": "event",
-                }
-            },
-            {
-                "$unwind": {
-                    "path": "$event",
-                    "preserveNullAndEmptyArrays": True,
-                }
-            },
-            {
-                "$addFields": {
-                    "cadet_name_search": {
-                        "$trim": {
-                            "input": {
-                                "$concat": [
-                                    {
-                                        "$ifNull": [
-                                            "$cadet_user.first_name",
-                                            "$cadet.first_name",
-                                        ]
-                                    },
-                                    " ",
-                                    {
-                                        "$ifNull": [
-                                            "$cadet_user.last_name",
-                                            "$cadet.last_name",
-                                        ]
-                                    },
-                                ]
-                            }
-                        }
-                    },
-                    "cadet_email_search": {
-                        "$ifNull": ["$cadet_user.email", "$cadet.email"]
-                    },
-                }
-            },
-        ]
-    )
-
+) -> dict:
+    query = _waiver_review_match_stage(status_filter, viewer_roles)
     if flight_filter != "All flights":
-        pipeline.append({"$match": {"flight.name": flight_filter}})
-
-    if search_regex:
-        pipeline.append(
-            {
-                "$match": {
-                    "$or": [
-                        {
-                            "cadet_name_search": {
-                                "$regex": search_regex,
-                                "$options": "i",
-                            }
-                        },
-                        {
-                            "cadet_email_search": {
-                                "$regex": search_regex,
-                                "$options": "i",
-                            }
-                        },
-                    ]
-                }
-            }
-        )
-
-    return pipeline
-
-
-def _standing_event_label(doc: dict) -> tuple[str, str, str]:
-    """Return (event_name, event_date, event_type) for a standing waiver row."""
-    types = doc.get("event_types") or ["pt", "lab"]
-    type_label = "/".join(t.upper() if t == "pt" else "LLAB" for t in types)
-    start = doc.get("start_date")
-    end = doc.get("end_date")
-    start_str = _fmt_date(start)
-    end_str = _fmt_date(end)
-    return (
-        f"Standing waiver ({type_label})",
-        f"{start_str} → {end_str}",
-        "standing",
-    )
-
-
-def _waiver_review_rows_from_docs(docs: list[dict]) -> list[dict]:
-    rows: list[dict] = []
-    for doc in docs:
-        cadet_user = doc.get("cadet_user") or {}
-        cadet = doc.get("cadet") or {}
-        event = doc.get("event") or {}
-        flight = doc.get("flight") or {}
-
-        cadet_name = format_full_name(cadet_user)
-        if not cadet_name:
-            first = str(cadet.get("first_name", "") or "").strip()
-            last = str(cadet.get("last_name", "") or "").strip()
-            cadet_name = f"{first} {last}".strip() or "Unknown cadet"
-
-        if doc.get("is_standing"):
-            event_name, event_date, event_type = _standing_event_label(doc)
-        else:
-            event_name = str(event.get("event_name") or "Unknown event")
-            event_date = _fmt_date(event.get("start_date"))
-            event_type = (event.get("event_type") or "") or "unknown"
-
-        rows.append(
-            {
-                "waiver_id": doc.get("_id"),
-                "waiver_status": str(doc.get("status") or "pending").lower(),
-                "waiver_type": doc.get("waiver_type") or "non-medical",
-                "attachments": doc.get("attachments") or [],
-                "reason": doc.get("reason", ""),
-                "cadet_name": cadet_name,
-                "cadet_email": str(cadet_user.get("email") or cadet.get("email") or ""),
-                "flight_name": str(flight.get("name") or "Unassigned"),
-                "event_name": event_name,
-                "event_date": event_date,
-                "event_type": event_type,
-                "cadre_only": bool(doc.get("cadre_only", False)),
-                "is_standing": bool(doc.get("is_standing", False)),
-            }
-        )
-    return rows
+        query["flight_name"] = flight_filter
+    query.update(waiver_review_search_query(cadet_search))
+    return query
+
+
+def _waiver_review_rows_from_view(docs: list[dict]) -> list[dict]:
+    return [
+        {
+            "waiver_id": doc.get("_id"),
+            "waiver_status": str(doc.get("status") or "pending").lower(),
+            "waiver_type": doc.get("waiver_type") or "non-medical",
+            "attachments": doc.get("attachments") or [],
+            "reason": doc.get("reason", ""),
+            "cadet_name": doc.get("cadet_name") or "Unknown cadet",
+            "cadet_email": doc.get("cadet_email") or "",
+            "flight_name": doc.get("flight_name") or "Unassigned",
+            "event_name": doc.get("event_name") or "Unknown event",
+            "event_date": doc.get("event_date") or "Unknown date",
+            "event_type": doc.get("event_type") or "unknown",
+            "cadre_only": bool(doc.get("cadre_only", False)),
+            "is_standing": bool(doc.get("is_standing", False)),
+        }
+        for doc in docs
+    ]
 
 
 def _fallback_waiver_review_rows(
@@ -345,8 +172,8 @@ def get_waiver_review_rows(
     cadet_search: str,
     viewer_roles: list[str] | None = None,
 ) -> list[dict]:
-    col = get_collection("waivers")
-    if col is None or not hasattr(col, "aggregate"):
+    view = get_collection(WAIVER_REVIEW_VIEW_COLLECTION)
+    if view is None:
         return _fallback_waiver_review_rows(
             status_filter=status_filter,
             flight_filter=flight_filter,
@@ -354,14 +181,14 @@ def get_waiver_review_rows(
             viewer_roles=viewer_roles,
         )
 
-    pipeline = _waiver_review_base_pipeline(
+    query = _waiver_review_view_query(
         status_filter=status_filter,
         flight_filter=flight_filter,
         cadet_search=cadet_search,
         viewer_roles=viewer_roles,
     )
-    docs = list(col.aggregate(pipeline + [{"$sort": {"created_at": -1, "_id": -1}}]))
-    return _waiver_review_rows_from_docs(docs)
+    docs = list(view.find(query).sort([("created_at", -1), ("_id", -1)]))
+    return _waiver_review_rows_from_view(docs)
 
 
 def get_paginated_waiver_review_rows(
@@ -372,9 +199,17 @@ def get_paginated_waiver_review_rows(
     viewer_roles: list[str] | None = None,
     page: int = 1,
     page_size: int = 25,
+    cursor: str | None = None,
+    estimate_count: bool = False,
 ) -> dict[str, object]:
-    col = get_collection("waivers")
-    if col is None or not hasattr(col, "aggregate"):
+    """Return one page of waiver review rows, newest first.
+
+    Reads the `waiver_review_view` read model, keyset-paginated on
+    `(created_at, _id)` like `query_audit_log`, so each page is one indexed
+    find whatever the status, flight and cadet filters.
+    """
+    view = get_collection(WAIVER_REVIEW_VIEW_COLLECTION)
+    if view is None:
         paginated = paginate_list(
             get_waiver_review_rows(
                 status_filter=status_filter,
@@ -387,30 +222,34 @@ def get_paginated_waiver_review_rows(
         )
         return paginated
 
-    base_pipeline = _waiver_review_base_pipeline(
+    page_size = coerce_page_size(page_size)
+    query = _waiver_review_view_query(
         status_filter=status_filter,
         flight_filter=flight_filter,
         cadet_search=cadet_search,
         viewer_roles=viewer_roles,
     )
-    count_docs = list(col.aggregate(base_pipeline + [{"$count": "total_count"}]))
-    total_count = int(count_docs[0]["total_count"]) if count_docs else 0
-    pagination = build_pagination_metadata(
+    if estimate_count:
+        total_count = int(view.count_documents(query, limit=ESTIMATED_COUNT_LIMIT))
+    else:
+        total_count = int(view.count_documents(query))
+
+    decoded = decode_cursor(cursor)
+    docs = list(
+        view.find({**query, **keyset_match(decoded)})
+        .sort(list(keyset_sort(decoded).items()))
+        .limit(page_size + 1)
+    )
+    result = build_keyset_page(
+        docs,
+        cursor=decoded,
         page=page,
         page_size=page_size,
         total_count=total_count,
+        count_is_estimate=estimate_count and total_count >= ESTIMATED_COUNT_LIMIT,
     )
-    docs = list(
-        col.aggregate(
-            base_pipeline
-            + [
-                {"$sort": {"created_at": -1, "_id": -1}},
-                {"$skip": pagination["skip"]},
-                {"$limit": pagination["page_size"]},
-            ]
-        )
-    )
-    return {**pagination, "items": _waiver_review_rows_from_docs(docs)}
+    result["items"] = _waiver_review_rows_from_view(result["items"])
+    return result
 
 
 def _flight_name_for_cadet(cadet: dict | None) -> str:
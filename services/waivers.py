@@ -2,6 +2,7 @@ from datetime import date, datetime, timedelta, timezone
 
 from bson import ObjectId
 
+from services.cadet_attendance import StandingWaiverIndex
 from services.event_config import get_event_config
 from utils.audit_log import log_attendance_modification
 from utils.date_range import expand_event_dates
@@ -14,6 +15,7 @@ from utils.db_schema_crud import (
     get_cadet_by_user_id,
     get_events_by_date_range,
     get_sickness_waivers_by_user,
+    get_standing_waivers_by_user,
     get_waiver_by_id,
     update_waiver,
     upsert_attendance_record,
@@ -430,8 +432,13 @@ def _bulk_transition_standing(
     from_status: str,
     to_status: str,
     audit_reason: str,
+    keep_other_standing_coverage: bool = False,
 ) -> int:
-    """Shared bulk path: fetch all records once, write all transitions once."""
+    """Shared bulk path: fetch all records once, write all transitions once.
+
+    With `keep_other_standing_coverage`, records of events that another
+    approved standing waiver of the same cadet still covers are left alone.
+    """
     target = _resolve_standing_target(waiver)
     if target is None:
         return 0
@@ -447,6 +454,14 @@ def _bulk_transition_standing(
     transitions = [
         r for r in records if (r.get("status") or "").lower() == from_status
     ]
+    if transitions and keep_other_standing_coverage:
+        others = StandingWaiverIndex(
+            w
+            for w in get_standing_waivers_by_user(waiver["submitted_by_user_id"])
+            if w.get("_id") != waiver_id
+        )
+        still_covered = others.resolve(events) if others else {}
+        transitions = [r for r in transitions if r["event_id"] not in still_covered]
     if not transitions:
         return 0
 
@@ -496,4 +511,5 @@ def _revert_standing(waiver: dict, actor_user_id: str | ObjectId) -> int:
         from_status="excused",
         to_status="absent",
         audit_reason="waiver_denied",
+        keep_other_standing_coverage=True,
     )
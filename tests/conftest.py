@@ -3,8 +3,20 @@ import sys
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
 _client_patcher = patch("utils.db.get_client", return_value=None)
 _client_patcher.start()
+
+from utils.ttl_cache import clear_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_ttl_cache():
+    # Process-wide caches would otherwise leak DB mocks between tests.
+    clear_cache()
+    yield
+    clear_cache()
@@ -5,6 +5,7 @@ from bson import ObjectId
 
 from services.at_risk_cadets import (
     WAIVER_FLAG_THRESHOLD,
+    build_at_risk_report,
     filter_cadets,
     get_df,
     get_waiver_flag_df,
@@ -128,11 +129,14 @@ def test_get_df_contains_cadet_name():
     with (
         patch("services.at_risk_cadets.get_at_risk_cadets", return_value=[CADET_A]),
         patch(
-            "services.at_risk_cadets.get_user_by_id",
-            return_value={"_id": "u1", "first_name": "Tyler", "last_name": "Brooks"},
-        ),
+            "services.at_risk_cadets.get_users_by_ids",
+            return_value=[{"_id": "u1", "first_name": "Tyler", "last_name": "Brooks"}],
+        ) as users_by_ids,
     ):
         result = get_df()
+        users_by_ids.assert_called_once_with(
+            ["u1"], projection={"first_name": 1, "last_name": 1}
+        )
         assert isinstance(result, pd.DataFrame)
         assert result["First Name"].iloc[0] == "Tyler"
         assert result["Last Name"].iloc[0] == "Brooks"
@@ -150,82 +154,70 @@ def test_get_df_contains_absence_counts():
 
 CADET_DOC = {"_id": "c1", "user_id": "u1", "first_name": "Tyler", "last_name": "Brooks"}
 USER_DOC = {"_id": "u1", "first_name": "Tyler", "last_name": "Brooks"}
-APPROVED_WAIVER = {"_id": "w1", "status": "approved", "submitted_by_user_id": "u1"}
 
 
-def test_get_waiver_flagged_cadets_flags_at_threshold():
-    waivers = [APPROVED_WAIVER] * WAIVER_FLAG_THRESHOLD
-    with (
-        patch("services.at_risk_cadets.get_all_cadets", return_value=[CADET_DOC]),
+def _patch_waiver_flags(counts, cadets=(CADET_DOC,), users=(USER_DOC,)):
+    return (
         patch(
-            "services.at_risk_cadets.get_approved_waivers_by_user", return_value=waivers
+            "services.at_risk_cadets.count_approved_waivers_by_submitter",
+            return_value=counts,
         ),
-        patch("services.at_risk_cadets.get_user_by_id", return_value=USER_DOC),
-    ):
-        result = get_waiver_flagged_cadets()
-    assert len(result) == 1
-    assert result[0]["waiver_count"] == WAIVER_FLAG_THRESHOLD
-
-
-def test_get_waiver_flagged_cadets_not_flagged_below_threshold():
-    waivers = [APPROVED_WAIVER] * (WAIVER_FLAG_THRESHOLD - 1)
-    with (
-        patch("services.at_risk_cadets.get_all_cadets", return_value=[CADET_DOC]),
         patch(
-            "services.at_risk_cadets.get_approved_waivers_by_user", return_value=waivers
+            "services.at_risk_cadets.get_cadets_by_user_ids_map",
+            return_value={c["user_id"]: c for c in cadets},
         ),
-        patch("services.at_risk_cadets.get_user_by_id", return_value=USER_DOC),
-    ):
+        patch("services.at_risk_cadets.get_users_by_ids", return_value=list(users)),
+    )
+
+
+def test_get_waiver_flagged_cadets_uses_grouped_counts():
+    counts_patch, cadets_patch, users_patch = _patch_waiver_flags(
+        {"u1": WAIVER_FLAG_THRESHOLD}
+    )
+    with counts_patch as counts, cadets_patch as cadets_map, users_patch as users:
         result = get_waiver_flagged_cadets()
-    assert result == []
 
+    counts.assert_called_once_with(min_count=WAIVER_FLAG_THRESHOLD)
+    cadets_map.assert_called_once_with(["u1"])
+    users.assert_called_once()
+    assert len(result) == 1
+    assert result[0]["cadet"] is CADET_DOC
+    assert result[0]["user"] == USER_DOC
+    assert result[0]["waiver_count"] == WAIVER_FLAG_THRESHOLD
 
-def test_get_waiver_flagged_cadets_empty_when_no_cadets():
-    with (
-        patch("services.at_risk_cadets.get_all_cadets", return_value=[]),
-    ):
+
+def test_get_waiver_flagged_cadets_skips_submitters_without_cadet():
+    counts_patch, cadets_patch, users_patch = _patch_waiver_flags({"u9": 4}, cadets=())
+    with counts_patch, cadets_patch, users_patch:
         result = get_waiver_flagged_cadets()
     assert result == []
 
 
-def test_get_waiver_flagged_cadets_skips_cadet_without_user_id():
-    cadet_no_user = {**CADET_DOC, "user_id": None}
-    with (
-        patch("services.at_risk_cadets.get_all_cadets", return_value=[cadet_no_user]),
-    ):
+def test_get_waiver_flagged_cadets_empty_without_lookups():
+    counts_patch, cadets_patch, users_patch = _patch_waiver_flags({})
+    with counts_patch, cadets_patch as cadets_map, users_patch as users:
         result = get_waiver_flagged_cadets()
     assert result == []
+    cadets_map.assert_not_called()
+    users.assert_not_called()
 
 
 def test_get_waiver_flagged_cadets_sorted_most_waivers_first():
     cadet2 = {**CADET_DOC, "_id": "c2", "user_id": "u2"}
-    with (
-        patch(
-            "services.at_risk_cadets.get_all_cadets", return_value=[CADET_DOC, cadet2]
-        ),
-        patch(
-            "services.at_risk_cadets.get_approved_waivers_by_user",
-            side_effect=[
-                [APPROVED_WAIVER] * 3,
-                [APPROVED_WAIVER] * 5,
-            ],
-        ),
-        patch("services.at_risk_cadets.get_user_by_id", return_value=USER_DOC),
-    ):
+    counts_patch, cadets_patch, users_patch = _patch_waiver_flags(
+        {"u1": 3, "u2": 5}, cadets=(CADET_DOC, cadet2)
+    )
+    with counts_patch, cadets_patch, users_patch:
         result = get_waiver_flagged_cadets()
     assert result[0]["waiver_count"] == 5
     assert result[1]["waiver_count"] == 3
 
 
 def test_get_waiver_flag_df_returns_dataframe():
-    waivers = [APPROVED_WAIVER] * WAIVER_FLAG_THRESHOLD
-    with (
-        patch("services.at_risk_cadets.get_all_cadets", return_value=[CADET_DOC]),
-        patch(
-            "services.at_risk_cadets.get_approved_waivers_by_user", return_value=waivers
-        ),
-        patch("services.at_risk_cadets.get_user_by_id", return_value=USER_DOC),
-    ):
+    counts_patch, cadets_patch, users_patch = _patch_waiver_flags(
+        {"u1": WAIVER_FLAG_THRESHOLD}
+    )
+    with counts_patch, cadets_patch, users_patch:
         result = get_waiver_flag_df()
     assert isinstance(result, pd.DataFrame)
     assert list(result.columns) == [
@@ -234,16 +226,42 @@ def test_get_waiver_flag_df_returns_dataframe():
         "Last Name",
         "Approved Waivers",
     ]
+    assert result["First Name"].iloc[0] == "Tyler"
 
 
 def test_get_waiver_flag_df_returns_str_when_empty():
-    with (
-        patch("services.at_risk_cadets.get_all_cadets", return_value=[]),
-    ):
+    counts_patch, cadets_patch, users_patch = _patch_waiver_flags({})
+    with counts_patch, cadets_patch, users_patch:
         result = get_waiver_flag_df()
     assert isinstance(result, str)
 
 
+def test_report_loads_users_for_both_tables_in_one_query():
+    counts_patch, cadets_patch, users_patch = _patch_waiver_flags(
+        {"u1": WAIVER_FLAG_THRESHOLD},
+        users=(USER_DOC, {"_id": "u2", "first_name": "Morgan", "last_name": "Lake"}),
+    )
+    with (
+        patch(
+            "services.at_risk_cadets.get_at_risk_cadets",
+            return_value=[CADET_A, CADET_B],
+        ),
+        counts_patch,
+        cadets_patch,
+        users_patch as users,
+    ):
+        report = build_at_risk_report()
+        absence_df = get_df(report=report)
+        flag_df = get_waiver_flag_df(report=report)
+
+    users.assert_called_once()
+    assert set(users.call_args[0][0]) == {"u1", "u2"}
+    assert isinstance(absence_df, pd.DataFrame)
+    assert list(absence_df["First Name"]) == ["Tyler", "Morgan"]
+    assert isinstance(flag_df, pd.DataFrame)
+    assert flag_df["Approved Waivers"].iloc[0] == WAIVER_FLAG_THRESHOLD
+
+
 def test_get_df_sorted_worst_first():
     with patch(
         "services.at_risk_cadets.get_at_risk_cadets",
@@ -22,6 +22,26 @@ from utils.at_risk_email import (
 )
 
 
+def _batch_result(sent):
+    def _send_batch(sender_email, sender_password, messages, **kwargs):
+        return [
+            {"to": to, "sent": sent, "attempts": 1, "error": None if sent else "x"}
+            for to, _ in messages
+        ]
+
+    return _send_batch
+
+
+@pytest.fixture
+def credentials():
+    with (
+        patch("utils.at_risk_email.SENDER_EMAIL", "test@gmail.com"),
+        patch("utils.at_risk_email.SENDER_PASSWORD", "testpassword"),
+        patch("utils.at_risk_email.is_email_enabled", return_value=True),
+    ):
+        yield
+
+
 @pytest.fixture(autouse=True)
 def mock_templates():
     with patch(
@@ -402,28 +422,28 @@ def test_send_email_returns_true_on_success():
 # ----------------- test send_to_cadre -------------------
 
 
-def test_send_to_cadre_success():
+def test_send_to_cadre_success(credentials):
     at_risk = [make_at_risk()]
     cadre = [{"email": "cadre@rollcall.local", "first_name": "Cadre"}]
 
     with (
         patch("utils.at_risk_email.get_users_by_role", return_value=cadre),
         patch("utils.at_risk_email.get_flight_by_id", return_value={"name": "Alpha"}),
-        patch("utils.at_risk_email.send_email", return_value=True),
+        patch("utils.at_risk_email.send_batch", side_effect=_batch_result(True)),
     ):
         sent, failed = send_to_cadre(at_risk, 0, 0)
         assert sent == 1
         assert failed == 0
 
 
-def test_send_to_cadre_failure():
+def test_send_to_cadre_failure(credentials):
     at_risk = [make_at_risk()]
     cadre = [{"email": "cadre@rollcall.local", "first_name": "Cadre"}]
 
     with (
         patch("utils.at_risk_email.get_users_by_role", return_value=cadre),
         patch("utils.at_risk_email.get_flight_by_id", return_value={"name": "Alpha"}),
-        patch("utils.at_risk_email.send_email", return_value=False),
+        patch("utils.at_risk_email.send_batch", side_effect=_batch_result(False)),
     ):
         sent, failed = send_to_cadre(at_risk, 0, 0)
         assert sent == 0
@@ -443,7 +463,7 @@ def test_send_to_cadre_skips_missing_email():
 # ----------------- test send_to_flight_commander -------------------
 
 
-def test_send_to_flight_commander_success():
+def test_send_to_flight_commander_success(credentials):
     at_risk = [make_at_risk(cadet=cadet)]
     fc = [{"_id": "user_fc1", "email": "fc1@rollcall.local", "first_name": "Brent"}]
 
@@ -454,14 +474,14 @@ def test_send_to_flight_commander_success():
             return_value=("fc1@rollcall.local", at_risk),
         ),
         patch("utils.at_risk_email.get_flight_by_id", return_value={"name": "Alpha"}),
-        patch("utils.at_risk_email.send_email", return_value=True),
+        patch("utils.at_risk_email.send_batch", side_effect=_batch_result(True)),
     ):
         sent, failed = send_to_flight_commander(at_risk, 0, 0)
         assert sent == 1
         assert failed == 0
 
 
-def test_send_to_flight_commander_failure():
+def test_send_to_flight_commander_failure(credentials):
     at_risk = [make_at_risk(cadet=cadet)]
     fc = [{"_id": "user_fc1", "email": "fc1@rollcall.local", "first_name": "Elijah"}]
 
@@ -472,7 +492,7 @@ def test_send_to_flight_commander_failure():
             return_value=("fc1@rollcall.local", at_risk),
         ),
         patch("utils.at_risk_email.get_flight_by_id", return_value={"name": "Alpha"}),
-        patch("utils.at_risk_email.send_email", return_value=False),
+        patch("utils.at_risk_email.send_batch", side_effect=_batch_result(False)),
     ):
         sent, failed = send_to_flight_commander(at_risk, 0, 0)
         assert sent == 0
@@ -517,21 +537,78 @@ def test_send_at_risk_emails_no_at_risk():
         assert failed == 0
 
 
-def test_send_at_risk_emails_call_both_functions():
-    at_risk = [make_at_risk()]
+def test_send_at_risk_emails_sends_one_batch(credentials):
+    cadet = create_cadet()
+    cadet["_id"] = "cadet1"
+    at_risk = [make_at_risk(cadet=cadet)]
+    cadre = [{"email": "cadre@rollcall.local", "first_name": "Cadre"}]
+    fc = [{"_id": "user_fc1", "email": "fc1@rollcall.local", "first_name": "Brent"}]
 
     with (
         patch("utils.at_risk_email.get_at_risk_cadets", return_value=at_risk),
-        patch("utils.at_risk_email.send_to_cadre", return_value=(1, 0)) as mock_cadre,
         patch(
-            "utils.at_risk_email.send_to_flight_commander", return_value=(2, 0)
-        ) as mock_fc,
+            "utils.at_risk_email.get_users_by_role",
+            side_effect=lambda role: cadre if role == "cadre" else fc,
+        ),
+        patch(
+            "utils.at_risk_email.get_fc_flight_cadets",
+            return_value=("fc1@rollcall.local", at_risk),
+        ),
+        patch(
+            "utils.at_risk_email.get_users_by_ids",
+            return_value=[{"_id": "user_cadet10", "email": "cadet@rollcall.local"}],
+        ) as mock_users,
+        patch("utils.at_risk_email.get_flight_by_id", return_value={"name": "Alpha"}),
+        patch("utils.at_risk_email.get_user_by_id", return_value=None),
+        patch(
+            "utils.at_risk_email.send_batch", side_effect=_batch_result(True)
+        ) as mock_batch,
+        patch("utils.at_risk_email.set_at_risk_email_sent") as mock_mark,
     ):
         sent, failed = send_at_risk_emails()
-        assert sent == 2
-        assert failed == 0
-        mock_cadre.assert_called_once()
-        mock_fc.assert_called_once()
+
+    assert (sent, failed) == (3, 0)
+    mock_batch.assert_called_once()
+    recipients = [to for to, _ in mock_batch.call_args.args[2]]
+    assert recipients == [
+        "cadre@rollcall.local",
+        "fc1@rollcall.local",
+        "cadet@rollcall.local",
+    ]
+    mock_users.assert_called_once()
+    mock_mark.assert_called_once_with("cadet1", 9, 0)
+
+
+def test_dispatch_at_risk_emails_tags_outcomes_and_skips_unsent(credentials):
+    cadet = create_cadet()
+    cadet["_id"] = "cadet1"
+    at_risk = [make_at_risk(cadet=cadet)]
+
+    with (
+        patch("utils.at_risk_email.get_at_risk_cadets", return_value=at_risk),
+        patch("utils.at_risk_email.get_users_by_role", return_value=[]),
+        patch(
+            "utils.at_risk_email.get_users_by_ids",
+            return_value=[{"_id": "user_cadet10", "email": "cadet@rollcall.local"}],
+        ),
+        patch("utils.at_risk_email.send_batch", side_effect=_batch_result(False)),
+        patch("utils.at_risk_email.set_at_risk_email_sent") as mock_mark,
+    ):
+        outcomes = m.dispatch_at_risk_emails()
+
+    assert [o["recipient_type"] for o in outcomes] == ["student"]
+    assert outcomes[0]["sent"] is False
+    mock_mark.assert_not_called()
+
+
+def test_build_student_messages_skips_already_notified_counts():
+    cadet = create_cadet()
+    cadet.update(_id="cadet1", at_risk_email_last_pt=9, at_risk_email_last_llab=0)
+    at_risk = [make_at_risk(cadet=cadet)]
+
+    with patch("utils.at_risk_email.get_users_by_ids", return_value=[]) as mock_users:
+        assert m.build_student_messages(at_risk) == []
+    mock_users.assert_called_once_with([], projection={"email": 1})
 
 
 # ----------------- test build_email_for_student -------------------
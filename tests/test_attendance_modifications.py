@@ -38,26 +38,27 @@ def _matches(doc: dict, query: dict) -> bool:
 
 
 def test_apply_bulk_attendance_changes_logs_saved_rows(monkeypatch):
-    log_calls: list[dict] = []
+    log_calls: list[list[dict]] = []
     record_id = ObjectId()
+    cadet_id = ObjectId()
 
     monkeypatch.setattr(
         modifications,
-        "_set_attendance_state",
-        lambda **kwargs: (
-            {"_id": record_id, "status": "present"},
-            {"_id": record_id, "status": kwargs["status"]},
-        ),
+        "bulk_set_attendance_states",
+        lambda event_id, statuses, *args: {
+            c_id: {"_id": record_id, "cadet_id": c_id, "status": status}
+            for c_id, status in statuses.items()
+        },
     )
     monkeypatch.setattr(
         modifications,
-        "log_attendance_modification",
-        lambda **kwargs: log_calls.append(kwargs),
+        "log_attendance_modifications",
+        lambda entries, **kwargs: log_calls.append(entries),
     )
 
     roster = [
         {
-            "cadet": {"_id": "c1"},
+            "cadet": {"_id": cadet_id},
             "record": {"_id": record_id, "status": "present"},
             "current_status": "present",
         }
@@ -66,18 +67,84 @@ def test_apply_bulk_attendance_changes_logs_saved_rows(monkeypatch):
     result = modifications.apply_bulk_attendance_changes(
         event_id=ObjectId(),
         roster=roster,
-        new_statuses={"c1": "absent"},
+        new_statuses={str(cadet_id): "absent"},
         recorded_by_user_id=ObjectId(),
         recorded_by_roles=["cadre"],
     )
 
     assert result["changed_count"] == 1
     assert len(log_calls) == 1
-    assert log_calls[0]["outcome"] == "applied"
-    assert log_calls[0]["old_status"] == "present"
-    assert log_calls[0]["new_status"] == "absent"
-    assert log_calls[0]["metadata"]["record_operation"] == "update"
-    assert log_calls[0]["metadata"]["batch_id"]
+    (entry,) = log_calls[0]
+    assert entry["outcome"] == "applied"
+    assert entry["old_status"] == "present"
+    assert entry["new_status"] == "absent"
+    assert entry["metadata"]["record_operation"] == "update"
+    assert entry["metadata"]["batch_id"] == result["batch_id"]
+
+
+def test_apply_bulk_attendance_changes_batches_writes_and_audit(monkeypatch):
+    bulk_calls: list[dict] = []
+    log_calls: list[list[dict]] = []
+    existing_id = ObjectId()
+    created_id = ObjectId()
+    c1, c2 = ObjectId(), ObjectId()
+
+    def _bulk(event_id, statuses, recorded_by_user_id, recorded_by_roles):
+        bulk_calls.append(dict(statuses))
+        return {
+            c1: {"_id": existing_id, "cadet_id": c1, "status": "absent"},
+            c2: {"_id": created_id, "cadet_id": c2, "status": "present"},
+        }
+
+    monkeypatch.setattr(modifications, "bulk_set_attendance_states", _bulk)
+    monkeypatch.setattr(
+        modifications,
+        "log_attendance_modifications",
+        lambda entries, **kwargs: log_calls.append(entries),
+    )
+
+    roster = [
+        {
+            "cadet": {"_id": c1},
+            "record": {"_id": existing_id, "status": "present"},
+            "current_status": "present",
+        },
+        {"cadet": {"_id": c2}, "record": None, "current_status": None},
+    ]
+
+    result = modifications.apply_bulk_attendance_changes(
+        event_id=ObjectId(),
+        roster=roster,
+        new_statuses={str(c1): "absent", str(c2): "present"},
+        recorded_by_user_id=ObjectId(),
+        recorded_by_roles=["cadre"],
+    )
+
+    assert result["changed_count"] == 2
+    assert bulk_calls == [{c1: "absent", c2: "present"}]
+    assert len(log_calls) == 1
+    entries = log_calls[0]
+    assert [e["metadata"]["record_operation"] for e in entries] == [
+        "update",
+        "create",
+    ]
+    assert entries[1]["metadata"]["new_record_id"] == str(created_id)
+    assert {e["metadata"]["batch_id"] for e in entries} == {result["batch_id"]}
+
+
+def test_apply_bulk_attendance_changes_reports_db_unavailable(monkeypatch):
+    monkeypatch.setattr(modifications, "bulk_set_attendance_states", lambda *args: None)
+    cadet_id = ObjectId()
+
+    result = modifications.apply_bulk_attendance_changes(
+        event_id=ObjectId(),
+        roster=[{"cadet": {"_id": cadet_id}, "record": None, "current_status": None}],
+        new_statuses={str(cadet_id): "present"},
+        recorded_by_user_id=ObjectId(),
+        recorded_by_roles=["cadre"],
+    )
+
+    assert result == {"ok": False, "changed_count": 0, "batch_id": None}
 
 
 def test_get_event_change_history_paginates_results(monkeypatch):
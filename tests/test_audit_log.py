@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 from bson import ObjectId
 
@@ -16,6 +17,13 @@ class _FakeCollection:
         self.inserted.append(doc)
         return SimpleNamespace(inserted_id=ObjectId())
 
+    def find(self, query: dict, projection: dict | None = None):
+        return []
+
+    def insert_many(self, docs: list[dict], ordered: bool = True):
+        self.inserted.extend(docs)
+        return SimpleNamespace(inserted_ids=[ObjectId() for _ in docs])
+
 
 def test_log_checkin_attempt_returns_none_when_db_unavailable(monkeypatch):
     monkeypatch.setattr(audit_log, "get_collection", lambda name: None)
@@ -110,6 +118,82 @@ def test_log_attendance_modification_writes_expected_fields(monkeypatch):
     assert "reverts_audit_id" in doc["metadata"]
 
 
+def test_log_attendance_modifications_writes_one_batch(monkeypatch):
+    fake = _FakeCollection()
+    monkeypatch.setattr(audit_log, "get_collection", lambda name: fake)
+
+    event_id = ObjectId()
+    user_id = ObjectId()
+    cadet_ids = [ObjectId(), ObjectId()]
+    now = datetime(2026, 4, 22, 15, 30, 0, tzinfo=timezone.utc)
+
+    audit_log.log_attendance_modifications(
+        [
+            {
+                "event_id": event_id,
+                "cadet_id": cadet_id,
+                "user_id": user_id,
+                "outcome": "applied",
+                "old_status": None,
+                "new_status": "present",
+                "metadata": {"batch_id": "b1"},
+            }
+            for cadet_id in cadet_ids
+        ],
+        now=now,
+    )
+
+    assert [doc["cadet_id"] for doc in fake.inserted] == cadet_ids
+    for doc in fake.inserted:
+        assert doc["created_at"] == now
+        assert doc["source"] == "attendance_modification"
+        assert doc["metadata"] == {
+            "old_status": None,
+            "new_status": "present",
+            "batch_id": "b1",
+        }
+
+
+def test_log_attendance_modifications_skips_empty_batch(monkeypatch):
+    fake = _FakeCollection()
+    monkeypatch.setattr(audit_log, "get_collection", lambda name: fake)
+
+    assert audit_log.log_attendance_modifications([]) is None
+    assert fake.inserted == []
+
+
+def test_log_data_changes_writes_one_redacted_batch(monkeypatch):
+    fake = _FakeCollection()
+    monkeypatch.setattr(audit_log, "get_collection", lambda name: fake)
+
+    target_ids = [ObjectId(), ObjectId()]
+    now = datetime(2026, 4, 22, 15, 30, 0, tzinfo=timezone.utc)
+
+    result = audit_log.log_data_changes(
+        [
+            {
+                "source": "event_management",
+                "action": "create",
+                "target_collection": "events",
+                "target_id": target_id,
+                "actor_email": "cadre@example.com",
+                "after": {"_id": target_id, "password_hash": "hash"},
+            }
+            for target_id in target_ids
+        ],
+        now=now,
+    )
+
+    assert result is not None
+    assert len(result.inserted_ids) == 2
+    assert [doc["target_id"] for doc in fake.inserted] == target_ids
+    for doc in fake.inserted:
+        assert doc["created_at"] == now
+        assert doc["action"] == "create"
+        assert doc["after"]["password_hash"] == "[REDACTED]"
+    assert audit_log.log_data_changes([]) is None
+
+
 def test_redact_audit_document_redacts_sensitive_fields():
     redacted = audit_log.redact_audit_document(
         {
@@ -222,3 +306,115 @@ def test_log_data_change_returns_none_when_db_unavailable(monkeypatch):
     )
 
     assert result is None
+
+
+class _LookupCollection:
+    def __init__(self, docs: list[dict]) -> None:
+        self.docs = docs
+        self.queries: list[dict] = []
+
+    def find(self, query: dict, projection: dict | None = None):
+        self.queries.append(query)
+        wanted = query["_id"]["$in"]
+        return [dict(doc) for doc in self.docs if doc["_id"] in wanted]
+
+
+def test_search_tokens_lowercases_and_dedupes():
+    event_id = ObjectId()
+
+    assert audit_log.search_tokens("Ada O'Neil", "ada@Example.com", None) == [
+        "ada",
+        "o",
+        "neil",
+        "example",
+        "com",
+    ]
+    assert audit_log.search_tokens(event_id) == [str(event_id)]
+
+
+def test_log_checkin_attempt_tokens_use_passed_docs(monkeypatch):
+    fake = _FakeCollection()
+    lookups = _LookupCollection([])
+    monkeypatch.setattr(
+        audit_log,
+        "get_collection",
+        lambda name: fake if name == "audit_log" else lookups,
+    )
+    user = {"_id": ObjectId(), "first_name": "Ada", "email": "ada@example.com"}
+    cadet = {"_id": ObjectId(), "first_name": "Ada", "last_name": "Lovelace"}
+    event = {"_id": ObjectId(), "event_name": "Week 3 PT"}
+
+    audit_log.log_checkin_attempt(
+        cadet_id=cadet["_id"],
+        outcome="success",
+        event_id=event["_id"],
+        user_id=user["_id"],
+        search_docs=(user, cadet, event),
+    )
+
+    doc = fake.inserted[0]
+    assert lookups.queries == []
+    assert {"ada", "example"} <= set(doc["actor_search_tokens"])
+    assert {"lovelace", "week", "3", "pt", str(event["_id"])} <= set(
+        doc["target_search_tokens"]
+    )
+
+
+def test_log_data_change_looks_up_actor_and_target_names(monkeypatch):
+    fake = _FakeCollection()
+    actor_id, target_id = ObjectId(), ObjectId()
+    users = _LookupCollection(
+        [
+            {"_id": actor_id, "first_name": "Grace", "last_name": "Hopper"},
+            {"_id": target_id, "first_name": "Alan", "last_name": "Turing"},
+        ]
+    )
+    monkeypatch.setattr(
+        audit_log,
+        "get_collection",
+        lambda name: {"audit_log": fake, "users": users}.get(name),
+    )
+
+    audit_log.log_data_change(
+        source="user_management",
+        action="update",
+        target_collection="users",
+        target_id=target_id,
+        actor_user_id=actor_id,
+        actor_email="grace@example.com",
+        target_label="alan@example.com",
+    )
+
+    doc = fake.inserted[0]
+    assert len(users.queries) == 1
+    assert {"grace", "hopper"} <= set(doc["actor_search_tokens"])
+    assert {"alan", "turing", "example"} <= set(doc["target_search_tokens"])
+
+
+def test_backfill_audit_search_tokens_updates_entries_in_batches(monkeypatch):
+    cadet = {"_id": ObjectId(), "first_name": "Ada", "last_name": "Lovelace"}
+    entries = [
+        {"_id": ObjectId(), "cadet_id": cadet["_id"], "outcome": "success"}
+        for _ in range(3)
+    ]
+    audit = MagicMock()
+    audit.find.return_value.sort.return_value.limit.side_effect = [
+        entries[:2],
+        entries[2:],
+        [],
+    ]
+    cadets = _LookupCollection([cadet])
+    monkeypatch.setattr(
+        audit_log,
+        "get_collection",
+        lambda name: {"audit_log": audit, "cadets": cadets}.get(name),
+    )
+
+    assert audit_log.backfill_audit_search_tokens(batch_size=2) == 3
+
+    assert audit.bulk_write.call_count == 2
+    assert len(cadets.queries) == 2
+    second_query = audit.find.call_args_list[1][0][0]
+    assert second_query["_id"] == {"$gt": entries[1]["_id"]}
+    update = audit.bulk_write.call_args_list[0][0][0][0]._doc["$set"]
+    assert "lovelace" in update["target_search_tokens"]
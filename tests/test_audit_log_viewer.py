@@ -6,14 +6,19 @@ from typing import Any
 from bson import ObjectId
 
 import services.audit_log_viewer as viewer
+from utils.audit_log import build_search_tokens
 
 
 class _FakeCollection:
     def __init__(self, docs: list[dict[str, Any]]):
         self.docs = [dict(d) for d in docs]
 
-    def count_documents(self, query: dict):
-        return len(list(self.find(query)))
+    def count_documents(self, query: dict, limit: int | None = None):
+        count = len(list(self.find(query)))
+        return min(count, limit) if limit else count
+
+    def estimated_document_count(self):
+        return len(self.docs)
 
     def find(self, query: dict | None = None, projection: dict | None = None):
         if query is None:
@@ -44,6 +49,10 @@ class _FakeCollection:
             if isinstance(expected, dict):
                 if "$gte" in expected and (actual is None or actual < expected["$gte"]):
                     return False
+                if "$gt" in expected and (actual is None or actual <= expected["$gt"]):
+                    return False
+                if "$lt" in expected and (actual is None or actual >= expected["$lt"]):
+                    return False
                 if "$lte" in expected and (actual is None or actual > expected["$lte"]):
                     return False
                 if "$in" in expected and actual not in expected["$in"]:
@@ -55,7 +64,10 @@ class _FakeCollection:
                         expected["$regex"],
                         re.I if expected.get("$options") == "i" else 0,
                     )
-                    if actual is None or not pattern.search(str(actual)):
+                    values = actual if isinstance(actual, list) else [actual]
+                    if not any(
+                        v is not None and pattern.search(str(v)) for v in values
+                    ):
                         return False
                 continue
             if actual != expected:
@@ -66,13 +78,13 @@ class _FakeCollection:
 class _FakeCursor:
     def __init__(self, docs: list[dict[str, Any]]):
         self._docs = docs
-        self._sort_key: str | None = None
-        self._sort_dir: int = 1
 
-    def sort(self, key: str, direction: int):
-        self._sort_key = key
-        self._sort_dir = direction
-        return self
+    def sort(self, key: str | list[tuple[str, int]], direction: int = 1):
+        keys = [(key, direction)] if isinstance(key, str) else list(key)
+        docs = list(self._docs)
+        for field, field_dir in reversed(keys):
+            docs.sort(key=lambda d: d.get(field, "") or "", reverse=field_dir == -1)
+        return _FakeCursor(docs)
 
     def skip(self, n: int):
         return _FakeCursor(self._docs[n:])
@@ -80,12 +92,11 @@ class _FakeCursor:
     def limit(self, n: int):
         return _FakeCursor(self._docs[:n])
 
+    def batch_size(self, n: int):
+        return self
+
     def __iter__(self):
-        docs = list(self._docs)
-        if self._sort_key:
-            reverse = self._sort_dir == -1
-            docs.sort(key=lambda d: d.get(self._sort_key, "") or "", reverse=reverse)
-        return iter(docs)
+        return iter(list(self._docs))
 
 
 def _patch_collections(
@@ -96,6 +107,9 @@ def _patch_collections(
     events: list[dict[str, Any]] | None = None,
     cadets: list[dict[str, Any]] | None = None,
 ) -> dict[str, _FakeCollection]:
+    # Stored entries carry search tokens (written by utils.audit_log).
+    refs = {d["_id"]: d for d in [*(users or []), *(events or []), *(cadets or [])]}
+    audit_docs = [{**doc, **build_search_tokens(doc, refs)} for doc in audit_docs]
     collections = {
         "audit_log": _FakeCollection(audit_docs),
         "users": _FakeCollection(users or []),
@@ -222,6 +236,52 @@ def test_query_returns_paginated_results(monkeypatch):
     assert result["items"][0]["action"] == "create"
 
 
+def test_query_walks_pages_with_cursors(monkeypatch):
+    same_time = datetime(2026, 4, 20, 12, 0, 0, tzinfo=timezone.utc)
+    docs = [
+        _make_audit_doc(
+            action=f"a{index}",
+            created_at=datetime(2026, 4, 24 - index, 12, 0, 0, tzinfo=timezone.utc),
+        )
+        for index in range(4)
+    ]
+    # Ties on created_at are broken by _id.
+    docs += [
+        _make_audit_doc(action=f"t{index}", created_at=same_time) for index in range(2)
+    ]
+    _patch_collections(monkeypatch, docs)
+
+    first = viewer.query_audit_log(page_size=2)
+    second = viewer.query_audit_log(page=2, page_size=2, cursor=first["next_cursor"])
+    third = viewer.query_audit_log(page=3, page_size=2, cursor=second["next_cursor"])
+    back = viewer.query_audit_log(page=2, page_size=2, cursor=third["prev_cursor"])
+
+    assert [r["action"] for r in first["items"]] == ["a0", "a1"]
+    assert [r["action"] for r in second["items"]] == ["a2", "a3"]
+    assert [r["action"] for r in third["items"]] == ["t1", "t0"]
+    assert [r["action"] for r in back["items"]] == ["a2", "a3"]
+    assert first["prev_cursor"] is None
+    assert third["next_cursor"] is None
+    assert back["page"] == 2
+    assert back["prev_cursor"] is not None
+
+
+def test_query_estimated_count_is_capped(monkeypatch):
+    monkeypatch.setattr(viewer, "ESTIMATED_COUNT_LIMIT", 2)
+    docs = [_make_audit_doc(source="user_management") for _ in range(3)]
+    _patch_collections(monkeypatch, docs)
+
+    filtered = viewer.query_audit_log(
+        activities=["Password resets", "Users created or updated"],
+        estimate_count=True,
+    )
+    unfiltered = viewer.query_audit_log(estimate_count=True)
+
+    assert filtered["total_count"] == 2
+    assert filtered["count_is_estimate"] is True
+    assert unfiltered["total_count"] == 3
+
+
 def test_query_filters_by_activity(monkeypatch):
     docs = [
         _make_audit_doc(source="user_management"),
@@ -679,9 +739,103 @@ def test_export_returns_dataframe(monkeypatch):
     assert "Source" not in df.columns
 
 
+def test_export_rows_hydrate_per_batch_and_reuse_names(monkeypatch):
+    actor_id = ObjectId()
+    docs = [
+        _make_audit_doc(
+            action="update",
+            actor_user_id=actor_id,
+            target_collection="cadets",
+            created_at=datetime(2026, 4, 24, 12, i, tzinfo=timezone.utc),
+        )
+        for i in range(5)
+    ]
+    collections = _patch_collections(
+        monkeypatch, docs, users=[_person_doc(actor_id, "Dana", "Reyes")]
+    )
+    user_lookups: list[set[Any]] = []
+    monkeypatch.setattr(
+        viewer,
+        "get_users_by_ids",
+        lambda ids: (
+            user_lookups.append(set(ids))
+            or [u for u in collections["users"].docs if u["_id"] in ids]
+        ),
+    )
+
+    rows = list(viewer.iter_audit_export_rows(batch_size=2))
+
+    assert len(rows) == 5
+    assert {row["Actor"] for row in rows} == {"Dana Reyes"}
+    assert list(rows[0]) == viewer.AUDIT_EXPORT_COLUMNS
+    assert user_lookups == [{actor_id}]
+
+
+def test_recent_lookups_evict_least_recently_used():
+    lookups = viewer._RecentLookups(2)
+    fetched: list[set[str]] = []
+
+    def _fetch(ids):
+        fetched.append(set(ids))
+        return {key: {"_id": key} for key in ids if key != "gone"}
+
+    lookups.resolve({"a", "b"}, _fetch)
+    lookups.resolve({"a"}, _fetch)
+    found = lookups.resolve({"c"}, _fetch)
+    lookups.resolve({"a"}, _fetch)
+    lookups.resolve({"b"}, _fetch)
+
+    assert found == {"c": {"_id": "c"}}
+    assert len(lookups) == 2
+    assert fetched == [{"a", "b"}, {"c"}, {"b"}]
+    assert lookups.resolve({"gone"}, _fetch) == {}
+    assert lookups.resolve({"gone"}, _fetch) == {}
+    assert fetched[-1] == {"gone"}
+    assert len(fetched) == 4
+
+
+def test_export_audit_log_writes_csv_and_excel(monkeypatch):
+    import csv
+    import io
+
+    from openpyxl import load_workbook
+
+    docs = [_make_audit_doc(action="create"), _make_audit_doc(action="update")]
+    _patch_collections(monkeypatch, docs)
+
+    csv_rows = list(csv.reader(io.StringIO(viewer.export_audit_log("csv").decode())))
+    workbook = load_workbook(io.BytesIO(viewer.export_audit_log("xlsx")))
+    sheet_rows = list(workbook.active.iter_rows(values_only=True))
+
+    assert csv_rows[0] == viewer.AUDIT_EXPORT_COLUMNS
+    assert len(csv_rows) == 3
+    assert list(sheet_rows[0]) == viewer.AUDIT_EXPORT_COLUMNS
+    assert len(sheet_rows) == 3
+    assert isinstance(sheet_rows[1][0], datetime)
+
+
 def test_activity_options_are_human_readable():
     options = viewer.get_audit_activity_options()
 
     assert "Attendance changes" in options
     assert "Waivers approved or denied" in options
     assert all("_" not in option for option in options)
+
+
+def test_search_queries_use_token_prefixes_without_lookups(monkeypatch):
+    monkeypatch.setattr(
+        viewer,
+        "get_collection",
+        lambda name: (_ for _ in ()).throw(AssertionError(name)),
+    )
+
+    assert viewer._actor_search_query("Admin Us") == {
+        "$and": [
+            {"actor_search_tokens": {"$regex": "^admin"}},
+            {"actor_search_tokens": {"$regex": "^us"}},
+        ]
+    }
+    assert viewer._target_search_query("week") == {
+        "target_search_tokens": {"$regex": "^week"}
+    }
+    assert viewer._target_search_query("  ") == {}
@@ -0,0 +1,111 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import utils.auth as auth
+from utils.db_schema_crud import create_user, delete_user, update_user
+
+_USER_DOCS = [
+    {
+        "email": "Alice@Example.com",
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "password_hash": "$2b$12$alice",
+        "roles": ["cadet"],
+    },
+    {
+        "email": "bob@example.com",
+        "first_name": "Bob",
+        "last_name": "Jones",
+        "password_hash": "$2b$12$bob",
+        "roles": ["admin"],
+    },
+]
+
+
+@pytest.fixture
+def users_col():
+    col = MagicMock()
+    col.find.side_effect = lambda *a, **kw: [dict(d) for d in _USER_DOCS]
+    with (
+        patch("utils.auth.get_collection", return_value=col),
+        patch("utils.db_schema_crud.get_collection", return_value=col),
+        patch("utils.auth.AUTH_COOKIE_KEY", "test-secret-key"),
+    ):
+        yield col
+
+
+def test_load_credentials_reads_users_once_across_calls(users_col):
+    first_credentials, first_raw = auth._load_credentials()
+    second_credentials, _ = auth._load_credentials()
+
+    assert users_col.find.call_count == 1
+    assert set(first_credentials["usernames"]) == {
+        "alice@example.com",
+        "bob@example.com",
+    }
+    assert first_raw["usernames"]["bob@example.com"]["roles"] == ["admin"]
+    assert second_credentials == first_credentials
+
+
+def test_load_credentials_hands_out_independent_copies(users_col):
+    credentials, raw = auth._load_credentials()
+    credentials["usernames"]["bob@example.com"]["password"] = "changed"
+    raw["usernames"].pop("alice@example.com")
+
+    credentials, raw = auth._load_credentials()
+
+    assert credentials["usernames"]["bob@example.com"]["password"] == "$2b$12$bob"
+    assert "alice@example.com" in raw["usernames"]
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda: create_user("Carol", "White", "carol@example.com", "pw", ["cadet"]),
+        lambda: update_user("a" * 24, {"first_name": "Al"}),
+        lambda: delete_user("a" * 24),
+    ],
+    ids=["create_user", "update_user", "delete_user"],
+)
+def test_user_writes_invalidate_credentials(users_col, write):
+    users_col.find_one.return_value = None
+    auth._load_credentials()
+
+    with (
+        patch("utils.db_schema_crud.hash_password", lambda password: "hashed"),
+        patch("utils.db_schema_crud.get_cadet_by_user_id", return_value=None),
+    ):
+        write()
+    auth._load_credentials()
+
+    assert users_col.find.call_count == 2
+
+
+def test_authenticator_is_reused_until_credentials_change(users_col):
+    session: dict = {}
+    with (
+        patch("streamlit.session_state", session),
+        patch("utils.auth.stauth.Authenticate") as mock_authenticate,
+    ):
+        first = auth._get_or_create_authenticator()
+        session["_raw_users"]["usernames"]["bob@example.com"]["first_name"] = "Rob"
+        again = auth._get_or_create_authenticator()
+
+        assert again is first
+        assert mock_authenticate.call_count == 1
+        assert session["_raw_users"]["usernames"]["bob@example.com"]["first_name"] == (
+            "Rob"
+        )
+
+        update_user("a" * 24, {"first_name": "Robert"})
+        refreshed = auth._get_or_create_authenticator()
+
+    assert refreshed is first
+    assert users_col.find.call_count == 2
+    assert session["_raw_users"]["usernames"]["bob@example.com"]["first_name"] == "Bob"
+    constructed = mock_authenticate.call_args[0][0]
+    assert set(constructed["usernames"]) == {
+        "alice@example.com",
+        "bob@example.com",
+    }
@@ -1,6 +1,13 @@
 from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
 
+from bson import ObjectId
+
+import services.cadet_attendance as cadet_attendance_mod
 from services.cadet_attendance import (
+    StandingWaiverIndex,
+    cadet_history_pipeline,
+    get_cadet_attendance_page,
     cadet_attendance,
     count_absences,
     filter_rows,
@@ -385,3 +392,141 @@ def test_singular_waiver_takes_precedence_over_standing():
     rows = cadet_attendance(records, events, waivers, standing_waivers=standing)
 
     assert rows[0]["waiver_status"] == "denied"
+
+
+def _window(wid, start, end, event_types=None, status="approved"):
+    return {
+        "_id": wid,
+        "status": status,
+        "start_date": start,
+        "end_date": end,
+        "event_types": event_types,
+    }
+
+
+def test_standing_waiver_index_handles_nested_and_naive_intervals():
+    jan = datetime(2026, 1, 1)
+    long_window = _window("long", jan, jan + timedelta(days=30))
+    short_window = _window(
+        "short",
+        datetime(2026, 1, 5, tzinfo=timezone.utc),
+        datetime(2026, 1, 6, tzinfo=timezone.utc),
+        event_types=["pt"],
+    )
+    lab_only = _window(
+        "lab", jan + timedelta(days=60), jan + timedelta(days=61), event_types=["LAB"]
+    )
+    index = StandingWaiverIndex(
+        [long_window, short_window, lab_only, _window("p", jan, jan, status="pending")]
+    )
+
+    def _event(eid, days, event_type="pt"):
+        start = datetime(2026, 1, 1, 6, tzinfo=timezone.utc) + timedelta(days=days)
+        return {"_id": eid, "start_date": start, "event_type": event_type}
+
+    events = [
+        _event("after-short", 10),
+        _event("before", -1),
+        _event("lab-end", 60, "lab"),
+        _event("pt-in-lab-window", 60),
+        _event("untyped", 20, ""),
+        {"_id": "no-date", "event_type": "pt"},
+    ]
+
+    covered = index.resolve(events)
+
+    assert covered == {
+        "after-short": long_window,
+        "lab-end": lab_only,
+        "untyped": long_window,
+    }
+    assert {e["_id"]: index.covering(e) for e in events if e["_id"] in covered} == (
+        covered
+    )
+    assert index.covering(_event("before", -1)) is None
+    assert not StandingWaiverIndex([_window("p", jan, jan, status="denied")])
+
+
+# ------------- test get_cadet_attendance_page ----------------
+
+
+def test_history_pipeline_folds_in_standing_coverage():
+    index = StandingWaiverIndex([_standing_waiver(30, -30, ["lab"])])
+
+    pipeline = cadet_history_pipeline(ObjectId(), index)
+    waiver_status = pipeline[4]["$addFields"]["waiver_status"]["$cond"][2]["$cond"]
+    (clause,) = waiver_status[0]["$or"]
+
+    assert clause["$and"][2]["$in"][1] == ["", "lab"]
+    assert StandingWaiverIndex([]).coverage_expr("$start", "$type") is False
+
+
+def _facet_result(items, filtered_count, **summary):
+    return [
+        {
+            "items": items,
+            "filtered": [{"total_count": filtered_count}] if filtered_count else [],
+            "summary": [summary] if summary else [],
+        }
+    ]
+
+
+def test_cadet_attendance_page_pushes_filters_and_paging_into_facet():
+    record_id = ObjectId()
+    col = MagicMock()
+    col.aggregate.return_value = _facet_result(
+        [{"_id": record_id, "event_type": "LAB", "status": "waived"}],
+        26,
+        total_events=40,
+        pt_events=3,
+        pt_attended=2,
+        pt_absences=1,
+        llab_events=0,
+    )
+
+    with patch.object(cadet_attendance_mod, "get_collection", return_value=col):
+        page = get_cadet_attendance_page(
+            ObjectId(),
+            filter_status="Excused",
+            filter_type="LLAB",
+            page=2,
+            page_size=25,
+        )
+
+    facet = col.aggregate.call_args[0][0][-1]["$facet"]
+    assert facet["items"][0] == {
+        "$match": {"status": {"$in": ["excused", "waived"]}, "event_type": "LAB"}
+    }
+    assert facet["items"][2:] == [{"$skip": 25}, {"$limit": 25}]
+    assert page["items"] == [
+        {"record_id": str(record_id), "event_type": "LAB", "status": "waived"}
+    ]
+    assert (page["page"], page["total_pages"], page["total_count"]) == (2, 2, 26)
+    assert page["summary"] == {
+        "total_events": 40,
+        "pt_absences": 1,
+        "llab_absences": 0,
+        "pt_rate": 67,
+        "llab_rate": 0,
+    }
+
+
+def test_cadet_attendance_page_past_the_end_refetches_last_page():
+    col = MagicMock()
+    col.aggregate.side_effect = [_facet_result([], 3), _facet_result([], 3)]
+
+    with patch.object(cadet_attendance_mod, "get_collection", return_value=col):
+        page = get_cadet_attendance_page(ObjectId(), page=4, page_size=25)
+
+    last_facet = col.aggregate.call_args[0][0][-1]["$facet"]
+    assert last_facet["items"][2] == {"$skip": 0}
+    assert page["page"] == 1
+    assert page["summary"]["total_events"] == 0
+
+
+def test_cadet_attendance_page_without_database_is_empty():
+    page = get_cadet_attendance_page(ObjectId(), page=3)
+
+    assert page["items"] == []
+    assert (page["page"], page["total_count"], page["total_pages"]) == (1, 0, 1)
+    assert page["summary"]["total_events"] == 0
@@ -0,0 +1,267 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pandas as pd
+from bson import ObjectId
+
+from services.dashboard import build_semester_df, get_semester_data, get_semester_df
+
+
+def _user(first, last):
+    return {"_id": ObjectId(), "first_name": first, "last_name": last}
+
+
+def _cadet(user):
+    return {"_id": ObjectId(), "user_id": user["_id"]}
+
+
+def _event(event_type, month, day):
+    return {
+        "_id": ObjectId(),
+        "event_type": event_type,
+        "start_date": datetime(2026, month, day, 6, tzinfo=timezone.utc),
+    }
+
+
+def _record(event, cadet, status):
+    return {
+        "_id": ObjectId(),
+        "event_id": event["_id"],
+        "cadet_id": cadet["_id"],
+        "status": status,
+    }
+
+
+def _data(cadets, users, events, records, waivers=None):
+    return {
+        "cadets": cadets,
+        "users": users,
+        "events": events,
+        "records": records,
+        "waivers": waivers or [],
+    }
+
+
+class TestBuildSemesterDf:
+    def test_rows_sorted_by_name_with_status_labels(self):
+        zed, amy = _user("Zed", "Young"), _user("amy", "Adams")
+        c_zed, c_amy = _cadet(zed), _cadet(amy)
+        pt, lab = _event("pt", 1, 12), _event("lab", 1, 16)
+        records = [
+            _record(pt, c_zed, "present"),
+            _record(lab, c_zed, "EXCUSED"),
+            _record(pt, c_amy, "absent"),
+        ]
+
+        df = build_semester_df(_data([c_zed, c_amy], [zed, amy], [pt, lab], records))
+
+        assert list(df.columns) == [
+            "Cadet",
+            "01/12 PT",
+            "01/16 LAB",
+            "PT Absences",
+            "LLAB Absences",
+            "Approved Waivers",
+        ]
+        assert list(df["Cadet"]) == ["amy Adams", "Zed Young"]
+        assert list(df["01/12 PT"]) == ["Absent", "Present"]
+        assert list(df["01/16 LAB"]) == ["Absent", "Excused"]
+        assert list(df["PT Absences"]) == [1, 0]
+        assert list(df["LLAB Absences"]) == [1, 0]
+
+    def test_missing_record_and_unknown_status_count_as_absent(self):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        pt1, pt2 = _event("pt", 2, 2), _event("pt", 2, 3)
+
+        df = build_semester_df(
+            _data([cadet], [user], [pt1, pt2], [_record(pt1, cadet, "tardy")])
+        )
+
+        assert df.loc[0, "02/02 PT"] == "Absent"
+        assert df.loc[0, "02/03 PT"] == "Absent"
+        assert df.loc[0, "PT Absences"] == 2
+
+    def test_approved_waiver_marks_waived_and_is_not_an_absence(self):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        lab = _event("lab", 3, 6)
+        record = _record(lab, cadet, "absent")
+
+        df = build_semester_df(
+            _data(
+                [cadet],
+                [user],
+                [lab],
+                [record],
+                [{"attendance_record_id": record["_id"], "status": "approved"}],
+            )
+        )
+
+        assert df.loc[0, "03/06 LAB"] == "Waived"
+        assert df.loc[0, "LLAB Absences"] == 0
+        assert df.loc[0, "Approved Waivers"] == 1
+
+    def test_standing_waiver_waives_covered_absences_only(self):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        pt, lab = _event("pt", 3, 6), _event("lab", 3, 7)
+        data = _data(
+            [cadet],
+            [user],
+            [pt, lab],
+            [_record(pt, cadet, "absent"), _record(lab, cadet, "present")],
+        )
+        data["standing_waivers"] = [
+            {
+                "submitted_by_user_id": user["_id"],
+                "status": "approved",
+                "start_date": datetime(2026, 3, 1, tzinfo=timezone.utc),
+                "end_date": datetime(2026, 3, 31, tzinfo=timezone.utc),
+            }
+        ]
+
+        df = build_semester_df(data)
+
+        assert df.loc[0, "03/06 PT"] == "Waived"
+        assert df.loc[0, "03/07 LAB"] == "Present"
+        assert df.loc[0, "PT Absences"] == 0
+        assert df.loc[0, "Approved Waivers"] == 1
+
+    def test_duplicate_pair_uses_last_record(self):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        pt = _event("pt", 4, 1)
+        records = [_record(pt, cadet, "absent"), _record(pt, cadet, "present")]
+
+        df = build_semester_df(_data([cadet], [user], [pt], records))
+
+        assert df.loc[0, "04/01 PT"] == "Present"
+        assert df.loc[0, "PT Absences"] == 0
+
+    def test_events_sharing_a_label_collapse_but_both_count(self):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        first, second = _event("pt", 5, 4), _event("pt", 5, 4)
+        records = [_record(first, cadet, "absent"), _record(second, cadet, "present")]
+
+        df = build_semester_df(_data([cadet], [user], [first, second], records))
+
+        assert list(df.columns).count("05/04 PT") == 1
+        assert df.loc[0, "05/04 PT"] == "Present"
+        assert df.loc[0, "PT Absences"] == 1
+
+    def test_records_for_unknown_cadets_or_events_are_ignored(self):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        pt = _event("pt", 6, 1)
+        stranger = {"_id": ObjectId(), "user_id": ObjectId()}
+        records = [
+            _record(pt, stranger, "present"),
+            _record(_event("pt", 6, 2), cadet, "present"),
+        ]
+
+        df = build_semester_df(_data([cadet], [user], [pt], records))
+
+        assert len(df) == 1
+        assert df.loc[0, "06/01 PT"] == "Absent"
+
+    def test_missing_user_falls_back_to_unknown(self):
+        cadet = {"_id": ObjectId(), "user_id": ObjectId()}
+        pt = _event("pt", 7, 1)
+
+        df = build_semester_df(_data([cadet], [], [pt], []))
+
+        assert df.loc[0, "Cadet"] == "Unknown"
+
+
+class TestGetSemesterDf:
+    @patch("services.dashboard.get_semester_data", return_value=None)
+    def test_no_data_returns_message(self, _):
+        assert get_semester_df() == "No data found."
+
+    @patch("services.dashboard.get_semester_data")
+    def test_returns_dataframe(self, mock_data):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        mock_data.return_value = _data([cadet], [user], [_event("pt", 1, 5)], [])
+
+        assert isinstance(get_semester_df(), pd.DataFrame)
+
+
+class TestGetSemesterData:
+    def _patches(self, cadets, users, events, batches, waivers_by_call):
+        return (
+            patch("services.dashboard.get_all_cadets", return_value=cadets),
+            patch("services.dashboard.get_users_by_ids", return_value=users),
+            patch("services.dashboard.get_events_by_date_range", return_value=events),
+            patch(
+                "services.dashboard.iter_attendance_batches_by_events",
+                return_value=iter(batches),
+            ),
+            patch(
+                "services.dashboard.get_waivers_by_attendance_records",
+                side_effect=waivers_by_call,
+            ),
+        )
+
+    def test_filters_year_and_type_in_query_with_projections(self):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        pt = _event("pt", 1, 12)
+        p_cadets, p_users, p_events, p_batches, p_waivers = self._patches(
+            [cadet], [user], [pt], [], []
+        )
+        with p_cadets as m_cadets, p_users as m_users, p_events as m_events:
+            with p_batches, p_waivers:
+                get_semester_data(2026)
+
+        assert "projection" in m_cadets.call_args.kwargs
+        assert "password_hash" not in m_users.call_args.kwargs["projection"]
+        start, end = m_events.call_args.args
+        assert start == datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert end.year == 2026 and end.month == 12 and end.day == 31
+        assert m_events.call_args.kwargs["event_types"] == ["pt", "lab"]
+
+    def test_collects_records_and_approved_waivers_per_batch(self):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        pt, lab = _event("pt", 1, 12), _event("lab", 1, 16)
+        r1, r2 = _record(pt, cadet, "absent"), _record(lab, cadet, "absent")
+        waiver = {"attendance_record_id": r2["_id"]}
+        p_cadets, p_users, p_events, p_batches, p_waivers = self._patches(
+            [cadet], [user], [pt, lab], [[r1], [r2]], [[], [waiver]]
+        )
+        with p_cadets, p_users, p_events, p_batches, p_waivers as m_waivers:
+            data = get_semester_data(2026)
+
+        assert data is not None
+        assert data["records"] == [r1, r2]
+        assert data["waivers"] == [waiver]
+        assert m_waivers.call_count == 2
+        assert m_waivers.call_args.kwargs["status"] == "approved"
+
+    def test_pt_columns_come_before_lab_columns(self):
+        user = _user("Ann", "Lee")
+        cadet = _cadet(user)
+        lab, pt = _event("lab", 1, 9), _event("pt", 1, 12)
+        p_cadets, p_users, p_events, p_batches, p_waivers = self._patches(
+            [cadet], [user], [lab, pt], [], []
+        )
+        with p_cadets, p_users, p_events, p_batches, p_waivers:
+            data = get_semester_data(2026)
+
+        assert data is not None
+        assert [e["event_type"] for e in data["events"]] == ["pt", "lab"]
+
+    def test_no_events_returns_none(self):
+        user = _user("Ann", "Lee")
+        p_cadets, p_users, p_events, p_batches, p_waivers = self._patches(
+            [_cadet(user)], [user], [], [], []
+        )
+        with p_cadets, p_users, p_events, p_batches, p_waivers:
+            assert get_semester_data(2026) is None
+
+    @patch("services.dashboard.get_all_cadets", return_value=[])
+    def test_no_cadets_returns_none(self, _):
+        assert get_semester_data(2026) is None
@@ -1,13 +1,31 @@
+import pytest
 from bson import ObjectId
 from unittest.mock import patch, MagicMock
 
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+
 from utils.db_schema_crud import (
+    compute_cadet_absence_stats,
+    count_approved_waivers_by_submitter,
     delete_cadet,
     delete_user,
     get_cadet_absence_stats,
+    refresh_cadet_attendance_stats,
+    run_migration_once,
+    verify_cadet_attendance_stats,
+    backfill_email_normalized,
+    create_user,
+    find_email_normalized_conflicts,
+    get_user_by_email,
+    update_user,
     get_users_by_emails,
     get_users_by_names,
     get_cadets_by_user_ids_map,
+    iter_attendance_batches_by_events,
+    bulk_set_attendance_states,
+    bulk_insert_cadets,
+    bulk_update_users,
 )
 
 
@@ -57,16 +75,21 @@ class TestGetUsersByEmails:
         assert result == {}
 
     @patch("utils.db_schema_crud.get_collection")
-    def test_builds_or_regex_query(self, mock_get_col):
+    def test_builds_exact_in_query_on_normalized_email(self, mock_get_col):
         mock_col = MagicMock()
         mock_get_col.return_value = mock_col
         mock_col.find.return_value = []
 
-        get_users_by_emails(["alice@example.com", "bob@example.com"])
+        get_users_by_emails(
+            [" Alice@Example.com", "bob@example.com", "ALICE@example.com"]
+        )
 
         query = mock_col.find.call_args[0][0]
-        assert "$or" in query
-        assert len(query["$or"]) == 2
+        assert set(query) == {"email_normalized"}
+        assert sorted(query["email_normalized"]["$in"]) == [
+            "alice@example.com",
+            "bob@example.com",
+        ]
 
     @patch("utils.db_schema_crud.get_collection")
     def test_no_matching_users_returns_empty(self, mock_get_col):
@@ -79,6 +102,99 @@ class TestGetUsersByEmails:
         assert result == {}
 
 
+class TestNormalizedEmail:
+    @patch("utils.db_schema_crud.get_collection")
+    def test_get_user_by_email_is_an_exact_normalized_match(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+
+        get_user_by_email("  Alice@Example.COM ")
+
+        mock_col.find_one.assert_called_once_with(
+            {"email_normalized": "alice@example.com"}
+        )
+
+    @patch("utils.db_schema_crud.hash_password", lambda password: "hashed")
+    @patch("utils.db_schema_crud.get_collection")
+    def test_create_user_stores_normalized_email(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+
+        create_user("Alice", "Smith", "Alice@Example.com", "pw", ["cadet"])
+
+        doc = mock_col.insert_one.call_args[0][0]
+        assert doc["email"] == "Alice@Example.com"
+        assert doc["email_normalized"] == "alice@example.com"
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_update_user_keeps_normalized_email_in_sync(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        user_id = ObjectId()
+        updates = {"email": " New@Example.com"}
+
+        update_user(user_id, updates)
+
+        mock_col.update_one.assert_called_once_with(
+            {"_id": user_id},
+            {
+                "$set": {
+                    "email": " New@Example.com",
+                    "email_normalized": "new@example.com",
+                }
+            },
+        )
+        assert updates == {"email": " New@Example.com"}
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_update_user_without_email_leaves_normalized_email(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+
+        update_user(ObjectId(), {"first_name": "Al"})
+
+        assert mock_col.update_one.call_args[0][1] == {"$set": {"first_name": "Al"}}
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_find_conflicts_groups_by_normalized_email(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        conflict = {"email_normalized": "a@b.com", "user_ids": [ObjectId()] * 2}
+        mock_col.aggregate.return_value = [conflict]
+
+        assert find_email_normalized_conflicts() == [conflict]
+        pipeline = mock_col.aggregate.call_args[0][0]
+        assert pipeline[1] == {"$match": {"user_ids.1": {"$exists": True}}}
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_backfill_skips_conflicting_emails(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        mock_col.aggregate.return_value = [
+            {"email_normalized": "dup@example.com", "user_ids": []}
+        ]
+        mock_col.update_many.return_value.modified_count = 7
+
+        assert backfill_email_normalized() == 7
+
+        query, update = mock_col.update_many.call_args[0]
+        assert query["email_normalized"] == {"$exists": False}
+        assert query["$expr"]["$not"][0]["$in"][1] == ["dup@example.com"]
+        assert list(update[0]["$set"]) == ["email_normalized"]
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_backfill_without_conflicts_updates_all_missing(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        mock_col.aggregate.return_value = []
+        mock_col.update_many.return_value.modified_count = 0
+
+        backfill_email_normalized()
+
+        query, _ = mock_col.update_many.call_args[0]
+        assert query == {"email_normalized": {"$exists": False}}
+
+
 class TestGetUsersByNames:
     @patch("utils.db_schema_crud.get_collection")
     def test_returns_matching_users_keyed_by_name_tuple(self, mock_get_col):
@@ -198,7 +314,7 @@ class TestGetCadetAbsenceStats:
         mock_get_col.return_value = mock_col
         mock_col.aggregate.return_value = []
 
-        get_cadet_absence_stats()
+        compute_cadet_absence_stats()
 
         pipeline = mock_col.aggregate.call_args[0][0]
         group_index = next(
@@ -212,6 +328,161 @@ class TestGetCadetAbsenceStats:
             for stage in pre_group_stages
         )
 
+    @patch("utils.db_schema_crud.get_collection")
+    def test_pipeline_scoped_to_requested_cadets(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        mock_col.aggregate.return_value = []
+        cadet_id = ObjectId()
+
+        compute_cadet_absence_stats([str(cadet_id)])
+
+        first_stage = mock_col.aggregate.call_args[0][0][0]
+        assert first_stage["$match"]["cadet_id"] == {"$in": [cadet_id]}
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_reads_materialized_stats_with_single_find(self, mock_get_col):
+        stats_col = MagicMock()
+        records_col = MagicMock()
+        mock_get_col.side_effect = lambda name: {
+            "cadet_attendance_stats": stats_col,
+            "attendance_records": records_col,
+        }[name]
+        row = {"cadet_id": ObjectId(), "pt_absences": 3, "llab_absences": 1}
+        stats_col.find.return_value.sort.return_value = [row]
+
+        result = get_cadet_absence_stats()
+
+        assert result == [row]
+        assert stats_col.find.call_args[0][0] == {"total_absences": {"$gt": 0}}
+        records_col.aggregate.assert_not_called()
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_partial_stats_table_is_not_rebuilt_on_read(self, mock_get_col):
+        stats_col = MagicMock()
+        records_col = MagicMock()
+        mock_get_col.side_effect = lambda name: {
+            "cadet_attendance_stats": stats_col,
+            "attendance_records": records_col,
+        }[name]
+        stats_col.find.return_value.sort.return_value = []
+
+        get_cadet_absence_stats()
+
+        records_col.aggregate.assert_not_called()
+        stats_col.bulk_write.assert_not_called()
+
+
+class TestRunMigrationOnce:
+    @patch("utils.db_schema_crud.get_collection")
+    def test_runs_and_records_marker(self, mock_get_col):
+        col = MagicMock()
+        mock_get_col.return_value = col
+        col.find_one.return_value = None
+        migrate = MagicMock()
+
+        assert run_migration_once("stats_built", migrate) is True
+
+        migrate.assert_called_once_with()
+        assert col.update_one.call_args[0][0] == {"_id": "stats_built"}
+        assert col.update_one.call_args[1] == {"upsert": True}
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_skips_completed_migration(self, mock_get_col):
+        col = MagicMock()
+        mock_get_col.return_value = col
+        col.find_one.return_value = {"_id": "stats_built"}
+        migrate = MagicMock()
+
+        assert run_migration_once("stats_built", migrate) is False
+
+        migrate.assert_not_called()
+        col.update_one.assert_not_called()
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_failed_migration_leaves_no_marker(self, mock_get_col):
+        col = MagicMock()
+        mock_get_col.return_value = col
+        col.find_one.return_value = None
+        migrate = MagicMock(side_effect=AutoReconnect("lost connection"))
+
+        with pytest.raises(AutoReconnect):
+            run_migration_once("stats_built", migrate)
+
+        col.update_one.assert_not_called()
+
+
+class TestRefreshCadetAttendanceStats:
+    @patch("utils.db_schema_crud.get_collection")
+    def test_cadet_without_absences_gets_zeroed_row(self, mock_get_col):
+        stats_col = MagicMock()
+        records_col = MagicMock()
+        mock_get_col.side_effect = lambda name: {
+            "cadet_attendance_stats": stats_col,
+            "attendance_records": records_col,
+        }[name]
+        absent_id = ObjectId()
+        clean_id = ObjectId()
+        records_col.aggregate.return_value = [
+            {
+                "cadet_id": absent_id,
+                "pt_absences": 2,
+                "llab_absences": 1,
+                "total_absences": 3,
+                "approved_waivers": 0,
+                "pending_waivers": 1,
+            }
+        ]
+
+        refresh_cadet_attendance_stats([absent_id, str(clean_id)])
+
+        ops = stats_col.bulk_write.call_args[0][0]
+        rows = {op._filter["cadet_id"]: op._doc for op in ops}
+        assert rows[absent_id]["total_absences"] == 3
+        assert rows[clean_id]["total_absences"] == 0
+        assert all(op._upsert for op in ops)
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_empty_cadet_list_is_noop(self, mock_get_col):
+        refresh_cadet_attendance_stats([])
+        mock_get_col.assert_not_called()
+
+
+class TestVerifyCadetAttendanceStats:
+    @patch("utils.db_schema_crud.get_collection")
+    def test_reports_drifted_and_missing_rows(self, mock_get_col):
+        stats_col = MagicMock()
+        records_col = MagicMock()
+        mock_get_col.side_effect = lambda name: {
+            "cadet_attendance_stats": stats_col,
+            "attendance_records": records_col,
+        }[name]
+        ok_id, drifted_id, missing_id = ObjectId(), ObjectId(), ObjectId()
+
+        def _row(cadet_id, pt):
+            return {
+                "cadet_id": cadet_id,
+                "pt_absences": pt,
+                "llab_absences": 0,
+                "total_absences": pt,
+                "approved_waivers": 0,
+                "pending_waivers": 0,
+            }
+
+        records_col.aggregate.return_value = [
+            _row(ok_id, 1),
+            _row(drifted_id, 4),
+            _row(missing_id, 2),
+        ]
+        stats_col.find.return_value = [_row(ok_id, 1), _row(drifted_id, 3)]
+
+        mismatches = verify_cadet_attendance_stats()
+
+        by_cadet = {m["cadet_id"]: m for m in mismatches}
+        assert set(by_cadet) == {drifted_id, missing_id}
+        assert by_cadet[drifted_id]["stored"]["pt_absences"] == 3
+        assert by_cadet[missing_id]["stored"] is None
+
 
 class TestDeleteUserCascade:
     @patch("utils.db_schema_crud.get_collection")
@@ -272,3 +543,125 @@ class TestDeleteCadetCascade:
             {"$unset": {"commander_cadet_id": ""}},
         )
         cadets_col.delete_one.assert_called_once_with({"_id": cadet_id})
+
+
+class TestIterAttendanceBatchesByEvents:
+    @patch("utils.db_schema_crud.get_collection")
+    def test_splits_event_ids_into_bounded_in_queries(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        mock_col.find.side_effect = lambda query, projection: [
+            {"event_id": e_id} for e_id in query["event_id"]["$in"]
+        ]
+        event_ids = [ObjectId() for _ in range(5)]
+
+        batches = list(
+            iter_attendance_batches_by_events(
+                event_ids, events_per_query=2, projection={"status": 1}
+            )
+        )
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert mock_col.find.call_count == 3
+        assert mock_col.find.call_args[0][1] == {"status": 1}
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_empty_event_ids_yields_nothing(self, mock_get_col):
+        mock_get_col.return_value = MagicMock()
+
+        assert list(iter_attendance_batches_by_events([])) == []
+
+
+class TestBulkSetAttendanceStates:
+    @patch("utils.db_schema_crud.refresh_cadet_attendance_stats")
+    @patch("utils.db_schema_crud.get_collection")
+    def test_one_ordered_bulk_write_and_one_read_back(self, mock_get_col, mock_refresh):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        event_id, kept, removed = ObjectId(), ObjectId(), ObjectId()
+        record = {"_id": ObjectId(), "cadet_id": kept, "status": "present"}
+        mock_col.find.return_value = [record]
+
+        result = bulk_set_attendance_states(
+            event_id, {kept: "present", removed: None}, ObjectId(), ["cadre"]
+        )
+
+        assert result == {kept: record}
+        mock_col.bulk_write.assert_called_once()
+        ops = mock_col.bulk_write.call_args[0][0]
+        assert mock_col.bulk_write.call_args[1] == {"ordered": True}
+        assert isinstance(ops[0], UpdateOne)
+        assert isinstance(ops[1], DeleteOne)
+        mock_col.find.assert_called_once_with(
+            {"event_id": event_id, "cadet_id": {"$in": [kept, removed]}}
+        )
+        mock_refresh.assert_called_once_with([kept, removed])
+
+    @patch("utils.db_schema_crud.get_collection")
+    def test_none_collection_returns_none(self, mock_get_col):
+        mock_get_col.return_value = None
+
+        assert bulk_set_attendance_states(ObjectId(), {}, ObjectId()) is None
+
+
+class TestCountApprovedWaiversBySubmitter:
+    @patch("utils.db_schema_crud.get_collection")
+    def test_groups_approved_waivers_in_one_aggregate(self, mock_get_col):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        uid = ObjectId()
+        mock_col.aggregate.return_value = [{"_id": uid, "count": 4}]
+
+        result = count_approved_waivers_by_submitter(min_count=3)
+
+        assert result == {uid: 4}
+        pipeline = mock_col.aggregate.call_args[0][0]
+        assert pipeline[0] == {"$match": {"status": "approved"}}
+        assert pipeline[1]["$group"]["_id"] == "$submitted_by_user_id"
+        assert pipeline[2]["$match"]["count"] == {"$gte": 3}
+        mock_col.aggregate.assert_called_once()
+
+    @patch("utils.db_schema_crud.get_collection", return_value=None)
+    def test_none_collection_returns_empty(self, _):
+        assert count_approved_waivers_by_submitter() == {}
+
+
+class TestRosterBulkWrites:
+    @patch("utils.db_schema_crud.refresh_waiver_review_view")
+    @patch("utils.db_schema_crud.get_collection")
+    def test_insert_reports_rejected_documents_by_index(
+        self, mock_get_col, mock_refresh
+    ):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        docs = [{"_id": ObjectId(), "user_id": ObjectId()} for _ in range(3)]
+        mock_col.bulk_write.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "E11000 dup"}]}
+        )
+
+        assert bulk_insert_cadets(docs) == {1: "E11000 dup"}
+        ops = mock_col.bulk_write.call_args[0][0]
+        assert all(isinstance(op, InsertOne) for op in ops)
+        assert mock_col.bulk_write.call_args[1] == {"ordered": False}
+        mock_refresh.assert_called_once_with(
+            user_ids=[docs[0]["user_id"], docs[2]["user_id"]]
+        )
+
+    @patch("utils.db_schema_crud.refresh_waiver_review_view")
+    @patch("utils.db_schema_crud.get_collection")
+    def test_update_fails_every_row_on_connection_error(
+        self, mock_get_col, mock_refresh
+    ):
+        mock_col = MagicMock()
+        mock_get_col.return_value = mock_col
+        mock_col.bulk_write.side_effect = AutoReconnect("lost")
+        updates = [(ObjectId(), {"email": "A@x.com"}), (ObjectId(), {"rank": "200"})]
+
+        assert bulk_update_users(updates) == {0: "lost", 1: "lost"}
+        first = mock_col.bulk_write.call_args[0][0][0]
+        assert first._doc["$set"]["email_normalized"] == "a@x.com"
+        mock_refresh.assert_not_called()
+
+    @patch("utils.db_schema_crud.get_collection", return_value=None)
+    def test_none_collection_returns_none(self, _):
+        assert bulk_insert_cadets([{"user_id": ObjectId()}]) is None
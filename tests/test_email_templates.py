@@ -1,6 +1,10 @@
+from unittest.mock import MagicMock, patch
+
 from services.email_templates import (
     _DEFAULT_TEMPLATES,
     get_content,
+    get_email_template,
+    save_email_template,
 )
 
 
@@ -17,3 +21,42 @@ def test_get_content_substitutes_temporary_password():
     assert "abc123" in body
     assert "{temporary_password}" not in body
     assert "{temporary_password}" not in subject
+
+
+def test_get_email_template_prefers_saved_template():
+    saved = {"subject": "S", "body": "B"}
+    mock_db = MagicMock()
+    mock_db.event_config.find_one.return_value = {
+        "email_templates": {"test_email": saved}
+    }
+    with patch("services.event_config.get_db", return_value=mock_db):
+        assert get_email_template("test_email") == saved
+        assert (
+            get_email_template("at_risk_student")
+            == (_DEFAULT_TEMPLATES["at_risk_student"])
+        )
+
+
+def test_email_batch_reads_config_once():
+    mock_db = MagicMock()
+    mock_db.event_config.find_one.return_value = {"email_templates": {}}
+    with patch("services.event_config.get_db", return_value=mock_db):
+        for _ in range(300):
+            get_email_template("at_risk_student")
+
+    mock_db.event_config.find_one.assert_called_once()
+
+
+def test_save_email_template_invalidates_cached_config():
+    mock_db = MagicMock()
+    mock_db.event_config.find_one.return_value = {"email_templates": {}}
+    with (
+        patch("services.event_config.get_db", return_value=mock_db),
+        patch("services.email_templates.get_db", return_value=mock_db),
+    ):
+        get_email_template("test_email")
+        save_email_template("test_email", "New", "Body")
+        mock_db.event_config.find_one.return_value = {
+            "email_templates": {"test_email": {"subject": "New", "body": "Body"}}
+        }
+        assert get_email_template("test_email")["subject"] == "New"
@@ -0,0 +1,109 @@
+import smtplib
+from email.mime.multipart import MIMEMultipart
+from unittest.mock import MagicMock, patch
+
+from utils.email_utils import send_batch
+
+
+def _messages(*recipients):
+    messages = []
+    for to_email in recipients:
+        msg = MIMEMultipart()
+        msg["To"] = to_email
+        messages.append((to_email, msg))
+    return messages
+
+
+def _server(sendmail_side_effect=None):
+    server = MagicMock()
+    server.has_extn.return_value = True
+    if sendmail_side_effect is not None:
+        server.sendmail.side_effect = sendmail_side_effect
+    return server
+
+
+def test_send_batch_reuses_one_connection_per_worker():
+    server = _server()
+    with patch("utils.email_utils.smtplib.SMTP_SSL", return_value=server) as smtp:
+        outcomes = send_batch(
+            "from@example.com",
+            "pw",
+            _messages("a@example.com", "b@example.com", "c@example.com"),
+            max_workers=1,
+        )
+
+    assert smtp.call_count == 1
+    server.login.assert_called_once_with("from@example.com", "pw")
+    assert server.sendmail.call_count == 3
+    server.quit.assert_called_once()
+    assert [o["to"] for o in outcomes] == [
+        "a@example.com",
+        "b@example.com",
+        "c@example.com",
+    ]
+    assert all(o["sent"] and o["attempts"] == 1 for o in outcomes)
+
+
+def test_send_batch_retries_on_a_fresh_connection():
+    broken = _server(smtplib.SMTPServerDisconnected("gone"))
+    healthy = _server()
+    with (
+        patch(
+            "utils.email_utils.smtplib.SMTP_SSL", side_effect=[broken, healthy]
+        ) as smtp,
+        patch("utils.email_utils.time.sleep") as sleep,
+    ):
+        outcomes = send_batch(
+            "from@example.com", "pw", _messages("a@example.com"), max_workers=1
+        )
+
+    assert smtp.call_count == 2
+    sleep.assert_called_once_with(1.0)
+    assert outcomes[0]["sent"] is True
+    assert outcomes[0]["attempts"] == 2
+    assert outcomes[0]["error"] is None
+
+
+def test_send_batch_does_not_retry_refused_recipient():
+    refused = smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"no")})
+    server = _server([refused, None])
+    with (
+        patch("utils.email_utils.smtplib.SMTP_SSL", return_value=server) as smtp,
+        patch("utils.email_utils.time.sleep") as sleep,
+    ):
+        outcomes = send_batch(
+            "from@example.com",
+            "pw",
+            _messages("bad@example.com", "ok@example.com"),
+            max_workers=1,
+        )
+
+    assert smtp.call_count == 1
+    sleep.assert_not_called()
+    assert outcomes[0]["sent"] is False
+    assert outcomes[0]["attempts"] == 1
+    assert "refused" in outcomes[0]["error"]
+    assert outcomes[1]["sent"] is True
+
+
+def test_send_batch_stops_after_authentication_failure():
+    server = _server()
+    server.login.side_effect = smtplib.SMTPAuthenticationError(535, b"bad creds")
+    with patch("utils.email_utils.smtplib.SMTP_SSL", return_value=server) as smtp:
+        outcomes = send_batch(
+            "from@example.com",
+            "pw",
+            _messages("a@example.com", "b@example.com"),
+            max_workers=1,
+        )
+
+    assert smtp.call_count == 1
+    server.sendmail.assert_not_called()
+    assert not any(o["sent"] for o in outcomes)
+    assert outcomes[1]["attempts"] == 0
+
+
+def test_send_batch_empty():
+    with patch("utils.email_utils.smtplib.SMTP_SSL") as smtp:
+        assert send_batch("from@example.com", "pw", []) == []
+    smtp.assert_not_called()
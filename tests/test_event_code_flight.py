@@ -272,6 +272,44 @@ def test_service_get_active_code_returns_none_when_no_active(monkeypatch):
     assert result is None
 
 
+def test_service_get_active_code_serves_display_refreshes_from_cache(monkeypatch):
+    event_id = ObjectId()
+    code = {
+        "_id": ObjectId(),
+        "code": "777777",
+        "expires_at": datetime.now(timezone.utc) + timedelta(minutes=90),
+    }
+    reads = []
+    monkeypatch.setattr(
+        event_codes_svc,
+        "get_active_event_code",
+        lambda eid: reads.append(eid) or code,
+    )
+    monkeypatch.setattr(event_codes_svc, "deactivate_event_code", lambda cid: None)
+
+    for _ in range(5):
+        assert event_codes_svc.get_active_code(event_id) == code
+    assert len(reads) == 1
+
+    event_codes_svc.expire_code(code["_id"])
+    event_codes_svc.get_active_code(event_id)
+    assert len(reads) == 2
+
+
+def test_service_get_active_code_rereads_once_the_code_expires(monkeypatch):
+    expired = {"code": "111111", "expires_at": datetime.now(timezone.utc)}
+    docs = [expired, None]
+    monkeypatch.setattr(
+        event_codes_svc, "get_active_event_code", lambda eid: docs.pop(0)
+    )
+    event_id = ObjectId()
+
+    assert event_codes_svc.get_active_code(event_id) is expired
+    assert event_codes_svc.get_active_code(event_id) is None
+    assert event_codes_svc.get_active_code(event_id) is None
+    assert docs == []
+
+
 def test_build_expires_at_returns_utc():
     result = build_expires_at(date(2026, 4, 12), time(16, 0), "America/New_York")
     assert result.tzinfo == timezone.utc
@@ -403,6 +441,130 @@ def test_validate_code_returns_none_for_wrong_code(monkeypatch):
     assert event_codes_svc.validate_code("000000") is None
 
 
+def _fail_db_lookup(code):
+    raise AssertionError("validate_code should have answered from memory")
+
+
+def test_validate_code_answers_from_active_code_table(monkeypatch):
+    now = datetime.now(timezone.utc)
+    doc = {
+        "_id": ObjectId(),
+        "code": "246810",
+        "active": True,
+        "expires_at": now + timedelta(minutes=30),
+        "event_id": ObjectId(),
+    }
+    loads = []
+
+    def _load():
+        loads.append(1)
+        return [doc]
+
+    monkeypatch.setattr(event_codes_svc, "get_active_event_codes", _load)
+    monkeypatch.setattr(
+        event_codes_svc, "find_active_event_code_by_value", _fail_db_lookup
+    )
+
+    for _ in range(5):
+        assert event_codes_svc.validate_code("246 810") == doc
+    assert len(loads) == 1
+
+
+def test_validate_code_rejects_cached_code_past_expiry(monkeypatch):
+    now = datetime.now(timezone.utc)
+    doc = {
+        "_id": ObjectId(),
+        "code": "135791",
+        "active": True,
+        # Stored naive, the way pymongo returns datetimes by default.
+        "expires_at": (now - timedelta(seconds=1)).replace(tzinfo=None),
+        "event_id": ObjectId(),
+    }
+    monkeypatch.setattr(event_codes_svc, "get_active_event_codes", lambda: [doc])
+    monkeypatch.setattr(
+        event_codes_svc, "find_active_event_code_by_value", _fail_db_lookup
+    )
+
+    assert event_codes_svc.validate_code("135791") is None
+
+
+def test_create_and_expire_code_refresh_active_code_table(monkeypatch):
+    now = datetime.now(timezone.utc)
+    table: list[dict] = []
+    monkeypatch.setattr(event_codes_svc, "get_active_event_codes", lambda: list(table))
+    monkeypatch.setattr(
+        event_codes_svc, "find_active_event_code_by_value", lambda code: None
+    )
+    monkeypatch.setattr(
+        event_codes_svc, "create_event_code", lambda **kw: _FakeInsertResult()
+    )
+    monkeypatch.setattr(event_codes_svc, "get_event_by_id", lambda eid: None)
+    monkeypatch.setattr(event_codes_svc, "log_data_change", lambda **kw: None)
+
+    created = event_codes_svc.create_code(
+        ObjectId(), "pt", "2026-01-15", ObjectId(), now + timedelta(minutes=15)
+    )
+    assert created is not None
+    assert event_codes_svc.validate_code(created["code"]) is None
+
+    doc = {**created, "active": True, "event_id": ObjectId()}
+    table.append(doc)
+    event_codes_svc.create_code(
+        ObjectId(), "pt", "2026-01-15", ObjectId(), now + timedelta(minutes=15)
+    )
+    assert event_codes_svc.validate_code(created["code"]) == doc
+
+    class _Result:
+        modified_count = 1
+
+    monkeypatch.setattr(event_codes_svc, "deactivate_event_code", lambda cid: _Result())
+    table.clear()
+    assert event_codes_svc.expire_code(created["_id"]) is True
+    assert event_codes_svc.validate_code(created["code"]) is None
+
+
+def test_validate_code_falls_back_to_db_for_codes_missing_from_table(monkeypatch):
+    now = datetime.now(timezone.utc)
+    doc = {
+        "code": "864200",
+        "active": True,
+        "expires_at": now + timedelta(minutes=10),
+        "event_id": ObjectId(),
+    }
+    table: list[dict] = []
+    monkeypatch.setattr(event_codes_svc, "get_active_event_codes", lambda: list(table))
+    monkeypatch.setattr(
+        event_codes_svc,
+        "find_active_event_code_by_value",
+        lambda code: doc if code == "864200" else None,
+    )
+
+    event_codes_svc.validate_code("000000")
+    # Created by another process after this one loaded its table.
+    table.append(doc)
+    assert event_codes_svc.validate_code("864200") == doc
+
+    monkeypatch.setattr(
+        event_codes_svc, "find_active_event_code_by_value", _fail_db_lookup
+    )
+    assert event_codes_svc.validate_code("864200") == doc
+
+
+def test_get_active_event_codes_filters_active_unexpired(monkeypatch):
+    captured = {}
+
+    class _Col:
+        def find(self, filter):
+            captured["filter"] = filter
+            return iter([{"code": "123123"}])
+
+    monkeypatch.setattr(crud, "get_collection", lambda name: _Col())
+
+    assert crud.get_active_event_codes() == [{"code": "123123"}]
+    assert captured["filter"]["active"] is True
+    assert "$gt" in captured["filter"]["expires_at"]
+
+
 def test_find_active_event_code_by_value_matches(monkeypatch):
     col = _FakeCollection()
     now = datetime.now(timezone.utc)
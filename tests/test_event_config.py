@@ -4,6 +4,7 @@ from services.event_config import (
     DEFAULT_TIMEZONE,
     get_default_timezone,
     get_event_config,
+    get_event_config_cache_stats,
     save_event_config,
     get_absence_thresholds,
     get_checkin_window_minutes,
@@ -248,3 +249,59 @@ def test_save_event_config_default_timezone_is_eastern_if_omitted():
         save_event_config(["Monday"], ["Friday"], 9, 2, 10, 3, True)
     args = mock_db.event_config.update_one.call_args[0][1]["$set"]
     assert args["default_timezone"] == DEFAULT_TIMEZONE
+
+
+# --------------------- test event_config cache --------------------
+
+
+def test_getters_share_one_config_read():
+    mock_db = MagicMock()
+    mock_db.event_config.find_one.return_value = {
+        "pt_threshold": 5,
+        "llab_threshold": 1,
+        "checkin_window": 15,
+        "email_enabled": False,
+    }
+    with patch("services.event_config.get_db", return_value=mock_db):
+        assert get_checkin_window_minutes() == 15
+        assert get_absence_thresholds() == (5, 1)
+        assert is_email_enabled() is False
+        assert get_waiver_reminder() == DEFAULT_WAIVER_REMINDER_DAYS
+        assert get_default_timezone() == DEFAULT_TIMEZONE
+
+    mock_db.event_config.find_one.assert_called_once()
+    assert get_event_config_cache_stats() == {
+        "hits": 4,
+        "misses": 1,
+        "invalidations": 0,
+    }
+
+
+def test_cached_config_is_copied_per_caller():
+    mock_db = MagicMock()
+    mock_db.event_config.find_one.return_value = {"pt_days": ["Monday"]}
+    with patch("services.event_config.get_db", return_value=mock_db):
+        config = get_event_config()
+        assert config is not None
+        config["pt_days"].append("Friday")
+        config = get_event_config()
+        assert config is not None
+        assert config["pt_days"] == ["Monday"]
+
+
+def test_save_event_config_invalidates_cache():
+    mock_db = MagicMock()
+    mock_db.event_config.find_one.return_value = {"pt_threshold": 5}
+    with patch("services.event_config.get_db", return_value=mock_db):
+        get_event_config()
+        save_event_config(["Monday"], ["Friday"], 7, 1, 15, 7, True)
+        mock_db.event_config.find_one.return_value = {"pt_threshold": 7}
+        config = get_event_config()
+        assert config is not None
+        assert config["pt_threshold"] == 7
+
+
+def test_defaults_without_db_are_not_cached():
+    with patch("services.event_config.get_db", return_value=None):
+        get_event_config()
+    assert get_event_config_cache_stats()["misses"] == 0
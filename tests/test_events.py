@@ -136,6 +136,11 @@ class _FakeInsertResult:
         self.inserted_id = inserted_id
 
 
+class _FakeInsertManyResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+
 class _FakeUpdateResult:
     def __init__(self, matched_count: int, modified_count: int):
         self.matched_count = matched_count
@@ -166,6 +171,14 @@ def _matches(doc: dict, query: dict) -> bool:
             if actual == expected["$ne"]:
                 return False
             continue
+        if isinstance(expected, dict) and expected.keys() <= {"$in", "$gte", "$lte"}:
+            if "$in" in expected and actual not in expected["$in"]:
+                return False
+            if "$gte" in expected and not actual >= expected["$gte"]:
+                return False
+            if "$lte" in expected and not actual <= expected["$lte"]:
+                return False
+            continue
         if actual != expected:
             return False
     return True
@@ -175,7 +188,7 @@ class _FakeEventsCollection:
     def __init__(self, docs: list[dict]):
         self.docs = [dict(doc) for doc in docs]
 
-    def find(self, query: dict):
+    def find(self, query: dict, projection: dict | None = None):
         return _FakeCursor([dict(doc) for doc in self.docs if _matches(doc, query)])
 
     def find_one(self, query: dict):
@@ -191,6 +204,10 @@ class _FakeEventsCollection:
         self.docs.append(stored)
         return _FakeInsertResult(inserted_id)
 
+    def insert_many(self, docs: list[dict], ordered: bool = True):
+        self.insert_many_calls = getattr(self, "insert_many_calls", 0) + 1
+        return _FakeInsertManyResult([self.insert_one(doc).inserted_id for doc in docs])
+
     def update_one(self, query: dict, update: dict):
         for index, doc in enumerate(self.docs):
             if not _matches(doc, query):
@@ -566,6 +583,36 @@ def test_update_event_stores_custom_times(monkeypatch) -> None:
     assert stored["end_date"] == datetime(2026, 5, 1, 7, 30, tzinfo=timezone.utc)
 
 
+def test_update_event_type_change_refreshes_attendee_stats(monkeypatch) -> None:
+    event_id = ObjectId()
+    cadet_ids = [ObjectId(), ObjectId()]
+    fake_db = _FakeDb([_event_doc(event_id)])
+    refreshed: list[list] = []
+    monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
+    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(
+        events_service,
+        "get_attendance_by_event",
+        lambda eid: [{"event_id": eid, "cadet_id": c_id} for c_id in cadet_ids],
+    )
+    monkeypatch.setattr(
+        events_service, "refresh_cadet_attendance_stats", refreshed.append
+    )
+
+    for event_type in ("LLAB", "LLAB"):
+        update_event(
+            str(event_id),
+            name="Test PT",
+            event_type=event_type,
+            start_date=date(2026, 5, 1),
+            end_date=date(2026, 5, 1),
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+        )
+
+    assert refreshed == [cadet_ids]
+
+
 # ── get_all_events: _display_start and _display_end ──────────────────────────
 
 
@@ -814,7 +861,7 @@ def _make_bulk_fake_db() -> _FakeDb:
 def test_bulk_create_one_week_returns_four_created(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     created, skipped = bulk_create_events(
         _MON,
@@ -837,7 +884,7 @@ def test_bulk_create_one_week_returns_four_created(monkeypatch) -> None:
 def test_bulk_create_no_matching_days_returns_zero(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     created, skipped = bulk_create_events(
         _SAT,
@@ -860,7 +907,7 @@ def test_bulk_create_no_matching_days_returns_zero(monkeypatch) -> None:
 def test_bulk_create_holiday_on_pt_day_increments_skipped(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     created, skipped = bulk_create_events(
         _MON,
@@ -885,7 +932,7 @@ def test_bulk_create_holiday_on_non_scheduled_day_not_counted_as_skipped(
 ) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     created, skipped = bulk_create_events(
         _MON,
@@ -908,7 +955,7 @@ def test_bulk_create_holiday_on_non_scheduled_day_not_counted_as_skipped(
 def test_bulk_create_multiple_holidays_all_counted(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     created, skipped = bulk_create_events(
         _MON,
@@ -931,7 +978,7 @@ def test_bulk_create_multiple_holidays_all_counted(monkeypatch) -> None:
 def test_bulk_create_pt_event_name_format(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _MON,
@@ -953,7 +1000,7 @@ def test_bulk_create_pt_event_name_format(monkeypatch) -> None:
 def test_bulk_create_llab_event_name_format(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _FRI,
@@ -975,7 +1022,7 @@ def test_bulk_create_llab_event_name_format(monkeypatch) -> None:
 def test_bulk_create_pt_event_type_is_pt(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _MON,
@@ -997,7 +1044,7 @@ def test_bulk_create_pt_event_type_is_pt(monkeypatch) -> None:
 def test_bulk_create_llab_event_type_is_lab(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _FRI,
@@ -1019,7 +1066,7 @@ def test_bulk_create_llab_event_type_is_lab(monkeypatch) -> None:
 def test_bulk_create_pt_times_stored_correctly(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _MON,
@@ -1043,7 +1090,7 @@ def test_bulk_create_pt_times_stored_correctly(monkeypatch) -> None:
 def test_bulk_create_llab_times_stored_correctly(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _FRI,
@@ -1067,7 +1114,7 @@ def test_bulk_create_llab_times_stored_correctly(monkeypatch) -> None:
 def test_bulk_create_timezone_applied_to_times(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _MON,
@@ -1092,7 +1139,7 @@ def test_bulk_create_timezone_applied_to_times(monkeypatch) -> None:
 def test_bulk_create_timezone_name_stored_on_event(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _MON,
@@ -1116,7 +1163,9 @@ def test_bulk_create_logs_audit_for_each_created_event(monkeypatch) -> None:
     logged: list[dict] = []
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
     monkeypatch.setattr(
-        events_service, "log_data_change", lambda **kw: logged.append(kw)
+        events_service,
+        "log_data_changes",
+        lambda entries, **kw: logged.extend(entries),
     )
 
     bulk_create_events(
@@ -1161,7 +1210,7 @@ def test_bulk_create_returns_zero_when_db_unavailable(monkeypatch) -> None:
 def test_bulk_create_single_monday_creates_one_pt_event(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     created, skipped = bulk_create_events(
         _MON,
@@ -1185,7 +1234,7 @@ def test_bulk_create_single_monday_creates_one_pt_event(monkeypatch) -> None:
 def test_bulk_create_single_friday_creates_one_llab_event(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     created, skipped = bulk_create_events(
         _FRI,
@@ -1209,7 +1258,7 @@ def test_bulk_create_single_friday_creates_one_llab_event(monkeypatch) -> None:
 def test_bulk_create_wednesday_only_creates_nothing(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     created, skipped = bulk_create_events(
         _WED,
@@ -1233,7 +1282,7 @@ def test_bulk_create_wednesday_only_creates_nothing(monkeypatch) -> None:
 def test_bulk_create_correct_number_of_docs_inserted(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _MON,
@@ -1255,7 +1304,7 @@ def test_bulk_create_correct_number_of_docs_inserted(monkeypatch) -> None:
 def test_bulk_create_events_have_archived_false(monkeypatch) -> None:
     fake_db = _make_bulk_fake_db()
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
-    monkeypatch.setattr(events_service, "log_data_change", lambda **kw: None)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
 
     bulk_create_events(
         _MON,
@@ -1279,7 +1328,9 @@ def test_bulk_create_actor_info_forwarded_to_audit(monkeypatch) -> None:
     logged: list[dict] = []
     monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
     monkeypatch.setattr(
-        events_service, "log_data_change", lambda **kw: logged.append(kw)
+        events_service,
+        "log_data_changes",
+        lambda entries, **kw: logged.extend(entries),
     )
 
     bulk_create_events(
@@ -1298,3 +1349,106 @@ def test_bulk_create_actor_info_forwarded_to_audit(monkeypatch) -> None:
     )
 
     assert logged[0]["actor_email"] == "cadre@example.com"
+
+
+def test_bulk_create_inserts_and_audits_in_one_batch(monkeypatch) -> None:
+    fake_db = _make_bulk_fake_db()
+    batches: list[list[dict]] = []
+    monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
+    monkeypatch.setattr(
+        events_service,
+        "log_data_changes",
+        lambda entries, **kw: batches.append(entries),
+    )
+
+    bulk_create_events(
+        _MON,
+        _SUN,
+        _PT_DAYS,
+        _LLAB_DAYS,
+        time(6, 0),
+        time(7, 0),
+        time(6, 0),
+        time(9, 0),
+        "UTC",
+        [],
+        "000000000000000000000001",
+    )
+
+    assert fake_db.events.insert_many_calls == 1
+    assert len(batches) == 1
+    assert [entry["target_id"] for entry in batches[0]] == [
+        doc["_id"] for doc in fake_db.events.docs
+    ]
+    assert batches[0][0]["after"]["event_name"] == "PT Mon Apr 27 2026"
+
+
+def test_bulk_create_skips_days_already_scheduled(monkeypatch) -> None:
+    fake_db = _FakeDb(
+        [
+            {
+                "_id": ObjectId(),
+                "event_name": "PT Mon Apr 27 2026",
+                "event_type": "pt",
+                "start_date": datetime(2026, 4, 27, 6, 0, tzinfo=timezone.utc),
+                "archived": False,
+            },
+            {
+                "_id": ObjectId(),
+                "event_name": "LLAB Fri May 01 2026",
+                "event_type": "lab",
+                "start_date": datetime(2026, 5, 1, 6, 0, tzinfo=timezone.utc),
+                "archived": True,
+            },
+        ]
+    )
+    monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
+
+    created, skipped = bulk_create_events(
+        _MON,
+        _SUN,
+        _PT_DAYS,
+        _LLAB_DAYS,
+        time(6, 0),
+        time(7, 0),
+        time(6, 0),
+        time(9, 0),
+        "UTC",
+        [_TUE],
+        "000000000000000000000001",
+    )
+
+    assert created == 2
+    assert skipped == 2
+    assert sorted(doc["event_name"] for doc in fake_db.events.docs[2:]) == [
+        "LLAB Fri May 01 2026",
+        "PT Thu Apr 30 2026",
+    ]
+
+
+def test_bulk_create_reports_progress_per_batch(monkeypatch) -> None:
+    fake_db = _make_bulk_fake_db()
+    progress: list[tuple[int, int]] = []
+    monkeypatch.setattr(events_service, "get_db", lambda: fake_db)
+    monkeypatch.setattr(events_service, "log_data_changes", lambda entries, **kw: None)
+    monkeypatch.setattr(events_service, "EVENT_INSERT_BATCH_SIZE", 3)
+
+    created, _ = bulk_create_events(
+        _MON,
+        _SUN,
+        _PT_DAYS,
+        _LLAB_DAYS,
+        time(6, 0),
+        time(7, 0),
+        time(6, 0),
+        time(9, 0),
+        "UTC",
+        [],
+        "000000000000000000000001",
+        progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert created == 4
+    assert fake_db.events.insert_many_calls == 2
+    assert progress == [(3, 4), (4, 4)]
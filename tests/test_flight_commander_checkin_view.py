@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta, timezone
 
 from utils.flight_commander_view import (
+    CheckinView,
     build_checkin_view,
     get_active_events,
 )
@@ -438,3 +439,83 @@ def test_selected_event_changes_output():
 
     assert [c["_id"] for c in result2["checked_in"]] == ["cadet2"]
     assert [c["_id"] for c in result2["missing"]] == ["cadet1"]
+
+
+def _ids(cadets):
+    return [c["_id"] for c in cadets]
+
+
+def test_checkin_view_applies_deltas_in_roster_order():
+    flight_cadets = [{"_id": f"cadet{i}"} for i in range(1, 4)]
+    event = {"_id": "event1", "event_name": "PT Session"}
+    first = {
+        "_id": "r1",
+        "event_id": "event1",
+        "cadet_id": "cadet3",
+        "status": "present",
+    }
+    other_event = {"_id": "r9", "event_id": "event2", "cadet_id": "cadet1"}
+
+    view = CheckinView(flight_cadets, event, [first, other_event])
+
+    assert (view.checked_in_count, view.missing_count) == (1, 2)
+    assert _ids(view.checked_in) == ["cadet3"]
+
+    view.apply(
+        inserted=[
+            {
+                "_id": "r2",
+                "event_id": "event1",
+                "cadet_id": "cadet1",
+                "status": "excused",
+            }
+        ],
+        updated=[{**first, "status": "absent"}],
+    )
+
+    assert _ids(view.checked_in) == ["cadet1"]
+    assert _ids(view.missing) == ["cadet2", "cadet3"]
+    record = view.record_for("cadet3")
+    assert record is not None and record["status"] == "absent"
+
+    view.apply(deleted=["r2", "unknown"])
+
+    assert view.checked_in_count == 0
+    assert view.record_for("cadet1") is None
+
+
+def test_checkin_view_merges_duplicate_records_like_full_rebuild():
+    now = datetime.now(timezone.utc)
+    flight_cadets = [{"_id": "cadet1"}, {"_id": "cadet2"}]
+    event = {"_id": "event1"}
+    self_checkin = {
+        "_id": "r1",
+        "event_id": "event1",
+        "cadet_id": "cadet1",
+        "status": "present",
+        "recorded_by_roles": ["cadet"],
+        "created_at": now,
+        "location_outside_fence": True,
+    }
+    override = {
+        "_id": "r2",
+        "event_id": "event1",
+        "cadet_id": "cadet1",
+        "status": "absent",
+        "recorded_by_roles": ["flight_commander"],
+        "created_at": now - timedelta(minutes=5),
+    }
+
+    view = CheckinView(flight_cadets, event, [self_checkin])
+    assert view.outside_fence_count == 1
+    view.apply(inserted=[override])
+
+    rebuilt = build_checkin_view(
+        flight_cadets=flight_cadets,
+        event=event,
+        attendance_records=[self_checkin, override],
+    )
+    assert rebuilt is not None
+    assert _ids(view.checked_in) == _ids(rebuilt["checked_in"]) == []
+    assert view.record_for("cadet1") is override
+    assert view.outside_fence_count == 0
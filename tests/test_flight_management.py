@@ -7,16 +7,20 @@ from bson import ObjectId
 from services.cadets import assign_cadet_to_flight as assign_cadet_to_flight_service
 from services.flight_management import (
     assign_selected_cadets_to_flight,
+    build_roster_snapshot,
     get_assignment_table,
     get_cadet_rows_by_id,
+    get_commander_display_map,
     get_commander_member_table,
     get_flight_commander_details,
     get_flight_management_cadet_rows,
     get_flight_member_table,
     get_member_selection_table,
+    get_roster_snapshot,
     get_selectable_member_ids,
     get_selected_cadet_ids,
     has_selected_assigned_cadets,
+    load_roster_snapshot,
     unassign_selected_cadets,
 )
 from utils.db_schema_crud import (
@@ -318,26 +322,18 @@ def test_assign_cadet_to_flight_service_calls_db_for_new_assignment(
     mock_db_assign_cadet_to_flight.assert_called_once_with(cadet_id, new_flight_id)
 
 
-@patch("services.flight_management.get_user_by_id")
-@patch("services.flight_management.get_cadet_by_id")
-def test_get_flight_commander_details_returns_name_and_rank(
-    mock_get_cadet_by_id,
-    mock_get_user_by_id,
-):
+def test_get_flight_commander_details_returns_name_and_rank():
     commander_id = ObjectId()
     user_id = ObjectId()
+    snapshot = build_roster_snapshot(
+        [{"_id": commander_id, "user_id": user_id, "rank": "300"}],
+        [{"_id": user_id, "first_name": "Taylor", "last_name": "Smith"}],
+        [],
+    )
 
-    mock_get_cadet_by_id.return_value = {
-        "_id": commander_id,
-        "user_id": user_id,
-        "rank": "300",
-    }
-    mock_get_user_by_id.return_value = {
-        "first_name": "Taylor",
-        "last_name": "Smith",
-    }
-
-    name, rank = get_flight_commander_details({"commander_cadet_id": commander_id})
+    name, rank = get_flight_commander_details(
+        {"commander_cadet_id": commander_id}, snapshot=snapshot
+    )
 
     assert name == "Taylor Smith"
     assert rank == "300"
@@ -350,47 +346,53 @@ def test_get_flight_commander_details_handles_missing_commander():
     assert rank == ""
 
 
-@patch("services.flight_management.get_user_by_id")
-@patch("services.flight_management.get_all_cadets")
-@patch("services.flight_management.get_all_flights")
-@patch("services.flight_management.get_collection")
-def test_get_flight_management_cadet_rows_excludes_commanders_and_adds_flight_info(
-    mock_get_collection,
-    mock_get_all_flights,
-    mock_get_all_cadets,
-    mock_get_user_by_id,
-):
+def test_get_flight_management_cadet_rows_excludes_commanders_and_adds_flight_info():
     commander_id = ObjectId()
     assigned_cadet_id = ObjectId()
     unassigned_cadet_id = ObjectId()
     assigned_flight_id = ObjectId()
+    assigned_user_id = ObjectId()
+    unassigned_user_id = ObjectId()
 
-    flights_collection = MagicMock()
-    flights_collection.find.return_value = [{"commander_cadet_id": commander_id}]
-    mock_get_collection.return_value = flights_collection
-    mock_get_all_flights.return_value = [
-        {"_id": assigned_flight_id, "name": "Bravo Flight"}
-    ]
-    mock_get_all_cadets.return_value = [
-        {"_id": commander_id, "user_id": ObjectId(), "rank": "300"},
-        {
-            "_id": assigned_cadet_id,
-            "user_id": ObjectId(),
-            "rank": "200",
-            "flight_id": assigned_flight_id,
-        },
-        {
-            "_id": unassigned_cadet_id,
-            "user_id": ObjectId(),
-            "rank": "100",
-        },
-    ]
-    mock_get_user_by_id.side_effect = [
-        {"first_name": "Taylor", "last_name": "Smith", "email": "tsmith@test.local"},
-        {"first_name": "Jordan", "last_name": "Lee", "email": "jlee@test.local"},
-    ]
+    snapshot = build_roster_snapshot(
+        [
+            {"_id": commander_id, "user_id": ObjectId(), "rank": "300"},
+            {
+                "_id": assigned_cadet_id,
+                "user_id": assigned_user_id,
+                "rank": "200",
+                "flight_id": assigned_flight_id,
+            },
+            {
+                "_id": unassigned_cadet_id,
+                "user_id": unassigned_user_id,
+                "rank": "100",
+            },
+        ],
+        [
+            {
+                "_id": assigned_user_id,
+                "first_name": "Taylor",
+                "last_name": "Smith",
+                "email": "tsmith@test.local",
+            },
+            {
+                "_id": unassigned_user_id,
+                "first_name": "Jordan",
+                "last_name": "Lee",
+                "email": "jlee@test.local",
+            },
+        ],
+        [
+            {
+                "_id": assigned_flight_id,
+                "name": "Bravo Flight",
+                "commander_cadet_id": commander_id,
+            }
+        ],
+    )
 
-    rows = get_flight_management_cadet_rows()
+    rows = get_flight_management_cadet_rows(snapshot=snapshot)
 
     assert rows == [
         {
@@ -611,29 +613,34 @@ def test_get_flight_member_table_builds_member_rows_without_commander():
     ]
 
 
-@patch("services.flight_management.get_user_by_id")
-@patch("services.flight_management.get_cadet_by_id")
-def test_get_commander_member_table_builds_commander_row(
-    mock_get_cadet_by_id,
-    mock_get_user_by_id,
-):
-    mock_get_cadet_by_id.return_value = {
-        "_id": ObjectId("000000000000000000000001"),
-        "user_id": ObjectId(),
-        "rank": "300",
-    }
-    mock_get_user_by_id.return_value = {
-        "first_name": "Commander",
-        "last_name": "One",
-        "email": "commander@test.local",
-    }
+def test_get_commander_member_table_builds_commander_row():
+    user_id = ObjectId()
+    snapshot = build_roster_snapshot(
+        [
+            {
+                "_id": ObjectId("000000000000000000000001"),
+                "user_id": user_id,
+                "rank": "300",
+            }
+        ],
+        [
+            {
+                "_id": user_id,
+                "first_name": "Commander",
+                "last_name": "One",
+                "email": "commander@test.local",
+            }
+        ],
+        [],
+    )
 
     table = get_commander_member_table(
         {
             "_id": "flight-alpha",
             "name": "Alpha Flight",
             "commander_cadet_id": "000000000000000000000001",
-        }
+        },
+        snapshot=snapshot,
     )
 
     assert table.to_dict("records") == [
@@ -746,3 +753,60 @@ def test_unassign_selected_cadets_returns_success(
     mock_unassign_cadet_from_flight.assert_called_once_with("cadet-1")
     assert level == "success"
     assert message == "Unassigned 1 cadet(s)."
+
+
+def test_load_roster_snapshot_uses_three_projected_queries():
+    cadet_id, user_id, flight_id = ObjectId(), ObjectId(), ObjectId()
+    cadets, users, flights = MagicMock(), MagicMock(), MagicMock()
+    cadets.find.return_value = [{"_id": cadet_id, "user_id": user_id}]
+    users.find.return_value = [{"_id": user_id, "first_name": "Jordan"}]
+    flights.find.return_value = [{"_id": flight_id, "name": "Alpha Flight"}]
+    collections = {"cadets": cadets, "users": users, "flights": flights}
+
+    with patch(
+        "utils.db_schema_crud.get_collection", side_effect=collections.get
+    ) as get_collection:
+        snapshot = load_roster_snapshot()
+
+    assert get_collection.call_count == 3
+    assert "email" not in cadets.find.call_args[0][1]
+    users.find.assert_called_once_with(
+        {"_id": {"$in": [user_id]}},
+        {"first_name": 1, "last_name": 1, "email": 1},
+    )
+    assert snapshot["cadets_by_id"] == {str(cadet_id): cadets.find.return_value[0]}
+    assert snapshot["users_by_id"] == {user_id: users.find.return_value[0]}
+    assert snapshot["flights"] == flights.find.return_value
+
+
+def test_get_roster_snapshot_is_reused_until_an_assignment_invalidates_it():
+    cadet_id = ObjectId()
+    with patch(
+        "services.flight_management.load_roster_snapshot",
+        side_effect=lambda: build_roster_snapshot([], [], []),
+    ) as load:
+        first = get_roster_snapshot()
+        assert get_roster_snapshot() is first
+        assert load.call_count == 1
+
+        with patch("utils.db_schema_crud.get_collection", return_value=MagicMock()):
+            unassign_cadet_from_flight(cadet_id)
+
+        assert get_roster_snapshot() is not first
+        assert load.call_count == 2
+
+
+def test_get_commander_display_map_labels_cadets_with_users():
+    cadet_id, user_id = ObjectId(), ObjectId()
+    snapshot = build_roster_snapshot(
+        [
+            {"_id": cadet_id, "user_id": user_id, "rank": "300"},
+            {"_id": ObjectId(), "user_id": ObjectId(), "rank": "100"},
+        ],
+        [{"_id": user_id, "first_name": "Taylor", "last_name": "Smith"}],
+        [],
+    )
+
+    assert get_commander_display_map(snapshot=snapshot) == {
+        "Taylor Smith (300)": str(cadet_id)
+    }
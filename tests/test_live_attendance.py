@@ -0,0 +1,192 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+import services.live_attendance as live_mod
+from services.live_attendance import (
+    _EventFeed,
+    get_live_attendance,
+    get_live_checkin_view,
+    refresh_live_attendance,
+    stop_live_attendance,
+)
+
+EVENT_ID = ObjectId()
+
+
+def _record(status="present", **fields):
+    now = datetime.now(timezone.utc)
+    return {
+        "_id": ObjectId(),
+        "event_id": EVENT_ID,
+        "cadet_id": ObjectId(),
+        "status": status,
+        "created_at": now,
+        "updated_at": now,
+        **fields,
+    }
+
+
+class _FakeAttendance:
+    """attendance_records stand-in without change streams (standalone server)."""
+
+    def __init__(self, records):
+        self.records = list(records)
+        self.queries = []
+
+    def find(self, query):
+        self.queries.append(query)
+        since = query.get("updated_at", {}).get("$gte")
+        return [
+            r
+            for r in self.records
+            if r["event_id"] == query["event_id"]
+            and (since is None or r["updated_at"] >= since)
+        ]
+
+    def watch(self, *args, **kwargs):
+        raise OperationFailure(
+            "The $changeStream stage is only supported on replica sets"
+        )
+
+
+@pytest.fixture
+def fake_col(monkeypatch):
+    col = _FakeAttendance([_record()])
+    monkeypatch.setattr(live_mod, "get_collection", lambda name: col)
+    monkeypatch.setattr(live_mod, "LIVE_ATTENDANCE_POLL_SECONDS", 0.01)
+    yield col
+    stop_live_attendance()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_viewers_share_one_watcher_that_polls_by_watermark(fake_col):
+    first = get_live_attendance(EVENT_ID)
+    second = get_live_attendance(str(EVENT_ID))
+
+    assert first == second == fake_col.records
+    assert list(live_mod._feeds) == [EVENT_ID]
+    assert fake_col.queries[0] == {"event_id": EVENT_ID}
+
+    late = _record(status="absent")
+    fake_col.records.append(late)
+
+    assert _wait_for(lambda: late in get_live_attendance(EVENT_ID))
+    assert all("updated_at" in q for q in fake_col.queries[1:])
+    assert live_mod._feeds[EVENT_ID].mode == "poll"
+
+
+def test_refresh_applies_own_write_before_next_poll(fake_col, monkeypatch):
+    monkeypatch.setattr(live_mod, "LIVE_ATTENDANCE_POLL_SECONDS", 60)
+    get_live_attendance(EVENT_ID)
+    original = fake_col.records[0]
+    updated = {
+        **original,
+        "status": "absent",
+        "updated_at": original["updated_at"] + timedelta(seconds=1),
+    }
+    fake_col.records[0] = updated
+
+    refresh_live_attendance(EVENT_ID)
+
+    assert get_live_attendance(EVENT_ID) == [updated]
+
+
+def test_idle_watcher_retires(fake_col, monkeypatch):
+    monkeypatch.setattr(live_mod, "LIVE_ATTENDANCE_IDLE_SECONDS", 0.05)
+    get_live_attendance(EVENT_ID)
+
+    assert _wait_for(lambda: EVENT_ID not in live_mod._feeds)
+
+
+def test_no_database_reads_nothing():
+    assert get_live_attendance(EVENT_ID) == []
+    assert live_mod._feeds == {}
+
+
+def test_change_stream_events_update_the_map():
+    feed = _EventFeed(EVENT_ID)
+    kept, dropped = _record(), _record()
+    feed.apply_records([kept, dropped])
+    newer = {**kept, "status": "absent", "updated_at": kept["updated_at"]}
+    stale = {
+        **kept,
+        "status": "excused",
+        "updated_at": kept["updated_at"] - timedelta(minutes=1),
+    }
+
+    feed.apply_change({"operationType": "update", "fullDocument": newer})
+    feed.apply_change({"operationType": "replace", "fullDocument": stale})
+    feed.apply_change(
+        {"operationType": "delete", "documentKey": {"_id": dropped["_id"]}}
+    )
+    feed.apply_change({"operationType": "update", "fullDocument": None})
+
+    assert feed.snapshot() == [newer]
+
+
+def test_changes_since_coalesces_and_falls_back_to_snapshot(monkeypatch):
+    monkeypatch.setattr(live_mod, "LIVE_ATTENDANCE_CHANGE_LOG_SIZE", 3)
+    kept, dropped = _record(), _record()
+    feed = _EventFeed(EVENT_ID)
+    feed.load(_FakeAttendance([kept, dropped]))
+    start, _, _ = feed.changes_since(None)
+
+    transient = _record()
+    feed.apply_records([transient, {**kept, "status": "absent"}])
+    feed.apply_change(
+        {"operationType": "delete", "documentKey": {"_id": dropped["_id"]}}
+    )
+
+    version, delta, records = feed.changes_since(start)
+    assert delta == {
+        "inserted": [transient],
+        "updated": [{**kept, "status": "absent"}],
+        "deleted": [dropped["_id"]],
+    }
+    assert records == []
+
+    feed.apply_change(
+        {"operationType": "delete", "documentKey": {"_id": transient["_id"]}}
+    )
+    assert feed.changes_since(version)[1] == {
+        "inserted": [],
+        "updated": [],
+        "deleted": [transient["_id"]],
+    }
+    # The first three changes have left the log.
+    _, delta, records = feed.changes_since(start)
+    assert delta is None
+    assert records == [{**kept, "status": "absent"}]
+
+
+def test_session_checkin_view_is_fed_deltas(fake_col):
+    cadet = {"_id": fake_col.records[0]["cadet_id"]}
+    late_cadet = {"_id": ObjectId()}
+    event = {"_id": EVENT_ID}
+    session: dict = {}
+
+    view = get_live_checkin_view(event, [cadet, late_cadet], session)
+    assert view.checked_in_count == 1
+
+    fake_col.records.append(_record(cadet_id=late_cadet["_id"]))
+
+    assert _wait_for(
+        lambda: (
+            get_live_checkin_view(event, [cadet, late_cadet], session).checked_in_count
+            == 2
+        )
+    )
+    assert get_live_checkin_view(event, [cadet, late_cadet], session) is view
+    assert get_live_checkin_view(event, [cadet], session) is not view
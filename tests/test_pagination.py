@@ -1,7 +1,15 @@
+from datetime import datetime, timezone
+
 import pytest
+from bson import ObjectId
 
 from utils.pagination import (
+    build_keyset_page,
     build_pagination_metadata,
+    decode_cursor,
+    encode_cursor,
+    keyset_match,
+    keyset_sort,
     normalize_page_size,
     paginate_list,
 )
@@ -75,3 +83,65 @@ def test_paginate_list_returns_multi_page_slice_and_metadata():
     assert paginated["total_pages"] == 3
     assert paginated["skip"] == 25
     assert [item["value"] for item in paginated["items"]] == list(range(25, 50))
+
+
+def test_cursor_round_trips_position_and_direction():
+    doc = {
+        "_id": ObjectId(),
+        "created_at": datetime(2026, 4, 24, 12, 0, tzinfo=timezone.utc),
+    }
+
+    cursor = decode_cursor(encode_cursor(doc, "next"))
+
+    assert cursor == {
+        "direction": "next",
+        "created_at": doc["created_at"],
+        "_id": doc["_id"],
+    }
+
+
+@pytest.mark.parametrize("token", [None, "", "not-a-cursor", "e30"])
+def test_decode_cursor_rejects_malformed_tokens(token):
+    assert decode_cursor(token) is None
+
+
+def test_keyset_match_and_sort_follow_cursor_direction():
+    created_at = datetime(2026, 4, 24, tzinfo=timezone.utc)
+    object_id = ObjectId()
+    prev = {"direction": "prev", "created_at": created_at, "_id": object_id}
+
+    assert keyset_match(None) == {}
+    assert keyset_sort(None) == {"created_at": -1, "_id": -1}
+    assert keyset_match(prev) == {
+        "$or": [
+            {"created_at": {"$gt": created_at}},
+            {"created_at": created_at, "_id": {"$gt": object_id}},
+        ]
+    }
+    assert keyset_sort(prev) == {"created_at": 1, "_id": 1}
+
+
+def test_build_keyset_page_trims_probe_row_and_sets_cursors():
+    docs = [{"_id": ObjectId(), "created_at": None} for _ in range(3)]
+
+    page = build_keyset_page(docs, cursor=None, page=5, page_size=2, total_count=3)
+
+    assert page["items"] == docs[:2]
+    assert page["page"] == 1
+    assert page["total_pages"] == 2
+    assert page["prev_cursor"] is None
+    decoded = decode_cursor(page["next_cursor"])
+    assert decoded is not None
+    assert decoded["_id"] == docs[1]["_id"]
+
+
+def test_build_keyset_page_reverses_rows_fetched_backwards():
+    docs = [{"_id": ObjectId(), "created_at": None} for _ in range(2)]
+    cursor = {"direction": "prev", "created_at": None, "_id": ObjectId()}
+
+    page = build_keyset_page(docs, cursor=cursor, page=1, page_size=2)
+
+    assert page["items"] == docs[::-1]
+    assert page["page"] == 1
+    assert page["prev_cursor"] is None
+    assert page["next_cursor"] is not None
@@ -1,4 +1,7 @@
-from utils.password import hash_password, verify_password
+import threading
+
+import utils.password as password_mod
+from utils.password import hash_password, hash_passwords, verify_password
 
 
 def test_hash_returns_string():
@@ -40,3 +43,34 @@ def test_verify_is_consistent_across_calls():
     hashed = hash_password("mypassword")
     assert verify_password("mypassword", hashed) is True
     assert verify_password("mypassword", hashed) is True
+
+
+def test_hash_uses_configured_cost_factor(monkeypatch):
+    monkeypatch.setattr(password_mod, "BCRYPT_ROUNDS", 5)
+
+    assert hash_password("secret").startswith("$2b$05$")
+    assert hash_password("secret", rounds=4).startswith("$2b$04$")
+
+
+def test_hash_passwords_keeps_order_on_the_pool(monkeypatch):
+    monkeypatch.setattr(password_mod, "PASSWORD_HASH_WORKERS", 2)
+    threads = set()
+    real_hashpw = password_mod.bcrypt.hashpw
+
+    def _hashpw(password, salt):
+        threads.add(threading.current_thread().name)
+        return real_hashpw(password, salt)
+
+    monkeypatch.setattr(password_mod.bcrypt, "hashpw", _hashpw)
+    passwords = ["alpha", "bravo", "charlie"]
+
+    hashes = hash_passwords(passwords, rounds=4)
+
+    assert all(verify_password(p, h) for p, h in zip(passwords, hashes))
+    assert all(name.startswith("password-hash") for name in threads)
+
+
+def test_hash_passwords_single_password_stays_on_caller_thread():
+    assert hash_passwords([]) == []
+    [hashed] = hash_passwords(["solo"], rounds=4)
+    assert verify_password("solo", hashed)
@@ -1,8 +1,12 @@
 import io
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import openpyxl
+import pytest
+from bson import ObjectId
 
+import services.cadets as cadets_service
 from services.cadets import (
     CLASS_TO_RANK,
     DEFAULT_ROSTER_IMPORT_ACTIONS,
@@ -172,118 +176,157 @@ def test_class_to_rank_mapping_complete():
 # -- import_cadets_from_roster tests
 
 
-@patch("services.cadets.get_user_by_email")
-@patch("services.cadets.create_cadet")
-@patch("utils.db_schema_crud.get_cadet_by_user_id")
-def test_import_skips_existing_user(mock_get_cadet, mock_create_cadet, mock_get_user):
-    from bson import ObjectId
+def _row(email="jdoe@kent.edu", **fields):
+    return {
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": email,
+        "rank": "100/150 (freshman)",
+        **fields,
+    }
 
-    existing_id = ObjectId()
-    mock_get_user.return_value = {"_id": existing_id}
-    mock_get_cadet.return_value = {"_id": ObjectId(), "user_id": existing_id}
-    result = import_cadets_from_roster(
-        [
-            {
-                "first_name": "John",
-                "last_name": "Doe",
-                "email": "jdoe@kent.edu",
-                "rank": "100/150 (freshman)",
-            }
-        ]
+
+@pytest.fixture
+def roster_db(monkeypatch):
+    """Replace the batched lookups and writes behind the roster import."""
+    db = SimpleNamespace(
+        get_users_by_emails=MagicMock(return_value={}),
+        get_cadets_by_user_ids_map=MagicMock(return_value={}),
+        get_users_by_ids=MagicMock(return_value=[]),
+        get_cadets_by_ids=MagicMock(return_value=[]),
+        bulk_insert_users=MagicMock(return_value={}),
+        bulk_insert_cadets=MagicMock(return_value={}),
+        bulk_update_users=MagicMock(return_value={}),
+        bulk_update_cadets=MagicMock(return_value={}),
+        log_data_changes=MagicMock(),
+        send_temporary_password_email=MagicMock(return_value=True),
+    )
+    for name, mock in vars(db).items():
+        monkeypatch.setattr(cadets_service, name, mock)
+    monkeypatch.setattr(
+        cadets_service,
+        "hash_passwords",
+        lambda passwords: [f"hashed:{pw}" for pw in passwords],
     )
+    return db
+
+
+def _inserted(mock) -> list[dict]:
+    return mock.call_args[0][0]
+
+
+def _audit(db) -> list[dict]:
+    return db.log_data_changes.call_args[0][0]
+
+
+def test_import_skips_existing_user(roster_db):
+    existing_id = ObjectId()
+    roster_db.get_users_by_emails.return_value = {"jdoe@kent.edu": {"_id": existing_id}}
+    roster_db.get_cadets_by_user_ids_map.return_value = {
+        str(existing_id): {"_id": ObjectId(), "user_id": existing_id}
+    }
+
+    result = import_cadets_from_roster([_row()])
+
     assert len(result["skipped"]) == 1
     assert result["created"] == []
-    mock_create_cadet.assert_not_called()
-
-
-@patch("services.cadets.get_user_by_email")
-@patch("services.cadets.create_cadet")
-@patch("services.cadets.get_cadet_by_id")
-@patch("services.cadets.get_user_by_id")
-@patch("services.cadets.log_data_change")
-@patch("services.cadets.update_user")
-@patch("utils.db_schema_crud.create_user")
-def test_import_creates_user_and_cadet(
-    mock_create_user,
-    mock_update_user,
-    mock_log_data_change,
-    mock_get_user_by_id,
-    mock_get_cadet_by_id,
-    mock_create_cadet,
-    mock_get_user,
-):
-    mock_get_user.return_value = None
-    inserted = MagicMock()
-    inserted.inserted_id = MagicMock()
-    created_cadet_result = MagicMock()
-    created_cadet_result.inserted_id = MagicMock()
-    mock_create_cadet.return_value = created_cadet_result
-    mock_create_user.return_value = inserted
-    mock_get_user_by_id.return_value = {
-        "_id": inserted.inserted_id,
-        "email": "jdoe@kent.edu",
-    }
-    mock_get_cadet_by_id.return_value = {
-        "_id": created_cadet_result.inserted_id,
-        "email": "jdoe@kent.edu",
-    }
-    result = import_cadets_from_roster(
-        [
-            {
-                "first_name": "John",
-                "last_name": "Doe",
-                "email": "jdoe@kent.edu",
-                "rank": "100/150 (freshman)",
-            }
-        ]
-    )
+    roster_db.bulk_insert_cadets.assert_not_called()
+
+
+def test_import_adds_cadet_to_existing_user_without_one(roster_db):
+    existing_id = ObjectId()
+    roster_db.get_users_by_emails.return_value = {"jdoe@kent.edu": {"_id": existing_id}}
+
+    result = import_cadets_from_roster([_row(email="JDoe@kent.edu")])
+
+    assert result["created"][0]["temp_password"] == "(existing account)"
+    assert _inserted(roster_db.bulk_insert_cadets)[0]["user_id"] == existing_id
+    roster_db.bulk_insert_users.assert_not_called()
+
+
+def test_import_creates_user_and_cadet(roster_db):
+    result = import_cadets_from_roster([_row()])
+
     assert len(result["created"]) == 1
-    assert result["created"][0]["email"] == "jdoe@kent.edu"
-    assert "temp_password" in result["created"][0]
+    created = result["created"][0]
+    assert created["email"] == "jdoe@kent.edu"
+    assert created["emailed"] is False
     assert result["skipped"] == []
     assert result["errors"] == []
     assert result["email_failures"] == []
-    assert mock_log_data_change.call_count == 2
-    mock_update_user.assert_called_once()
-    call_args = mock_update_user.call_args
-    assert call_args[0][1] == {"force_password_change": True}
-
-
-@patch("services.cadets.get_user_by_email")
-@patch("utils.db_schema_crud.create_user")
-def test_import_handles_db_error(mock_create_user, mock_get_user):
-    mock_get_user.return_value = None
-    mock_create_user.side_effect = Exception("DB error")
-    result = import_cadets_from_roster(
-        [
-            {
-                "first_name": "John",
-                "last_name": "Doe",
-                "email": "jdoe@kent.edu",
-                "rank": "100/150 (freshman)",
-            }
-        ]
-    )
+
+    [user_doc] = _inserted(roster_db.bulk_insert_users)
+    assert user_doc["password_hash"] == f"hashed:{created['temp_password']}"
+    assert user_doc["force_password_change"] is True
+    assert user_doc["roles"] == ["cadet"]
+    [cadet_doc] = _inserted(roster_db.bulk_insert_cadets)
+    assert cadet_doc["user_id"] == user_doc["_id"]
+    assert [(e["target_collection"], e["target_id"]) for e in _audit(roster_db)] == [
+        ("users", user_doc["_id"]),
+        ("cadets", cadet_doc["_id"]),
+    ]
+
+
+def test_import_batches_rows_and_keeps_roster_order(roster_db):
+    roster_db.bulk_insert_users.return_value = {1: "E11000 duplicate key error"}
+    rows = [_row(email=f"cadet{n}@kent.edu", first_name=f"C{n}") for n in range(3)]
+
+    result = import_cadets_from_roster(rows)
+
+    roster_db.bulk_insert_users.assert_called_once()
+    roster_db.bulk_insert_cadets.assert_called_once()
+    roster_db.log_data_changes.assert_called_once()
+    assert [c["email"] for c in result["created"]] == [
+        "cadet0@kent.edu",
+        "cadet2@kent.edu",
+    ]
+    assert len(_inserted(roster_db.bulk_insert_cadets)) == 2
+    assert result["errors"] == [
+        {
+            "name": "C1 Doe",
+            "email": "cadet1@kent.edu",
+            "reason": "Failed to create account: E11000 duplicate key error",
+        }
+    ]
+
+
+def test_import_handles_db_error(roster_db):
+    roster_db.bulk_insert_cadets.return_value = {0: "DB error"}
+
+    result = import_cadets_from_roster([_row()])
+
+    assert result["created"] == []
     assert len(result["errors"]) == 1
     assert "DB error" in result["errors"][0]["reason"]
 
 
-@patch("services.cadets.get_user_by_email")
-@patch("utils.db_schema_crud.create_user")
-def test_import_returns_none_user_goes_to_errors(mock_create_user, mock_get_user):
-    mock_get_user.return_value = None
-    mock_create_user.return_value = None
-    result = import_cadets_from_roster(
-        [
-            {
-                "first_name": "John",
-                "last_name": "Doe",
-                "email": "jdoe@kent.edu",
-                "rank": "100/150 (freshman)",
-            }
-        ]
+def test_import_returns_none_user_goes_to_errors(roster_db):
+    roster_db.bulk_insert_users.return_value = None
+
+    result = import_cadets_from_roster([_row()])
+
+    assert result["errors"] == [
+        {
+            "name": "John Doe",
+            "email": "jdoe@kent.edu",
+            "reason": "Database error creating user",
+        }
+    ]
+    roster_db.bulk_insert_cadets.assert_not_called()
+
+
+def test_import_create_as_new_rejects_email_in_use(roster_db):
+    roster_db.get_users_by_emails.return_value = {"jdoe@kent.edu": {"_id": ObjectId()}}
+    row = _row(
+        conflict_type="name_exists",
+        existing_user={"_id": ObjectId()},
+        existing_cadet=None,
     )
-    assert len(result["errors"]) == 1
+
+    result = import_cadets_from_roster([row], actions=["Create as New"])
+
+    assert "Email already in use" in result["errors"][0]["reason"]
+    roster_db.bulk_insert_users.assert_not_called()
 
 
 # -- analyze_roster_for_import tests
@@ -386,86 +429,75 @@ def test_analyze_no_conflict(mock_get_emails, mock_get_names, mock_get_cadets):
 # -- import with explicit actions
 
 
-@patch("services.cadets.update_user")
-@patch("services.cadets.update_cadet")
-@patch("services.cadets.get_cadet_by_id")
-@patch("services.cadets.get_user_by_id")
-@patch("services.cadets.log_data_change")
-def test_import_update_existing(
-    mock_log_data_change,
-    mock_get_user_by_id,
-    mock_get_cadet_by_id,
-    mock_update_cadet,
-    mock_update_user,
-):
-    from bson import ObjectId
-
+def test_import_update_existing(roster_db):
     existing_id = ObjectId()
     cadet_id = ObjectId()
-    mock_get_user_by_id.side_effect = [
-        {"_id": existing_id, "email": "old@kent.edu"},
-        {"_id": existing_id, "email": "jdoe@kent.edu"},
+    roster_db.get_users_by_ids.return_value = [
+        {"_id": existing_id, "email": "old@kent.edu"}
     ]
-    mock_get_cadet_by_id.side_effect = [
-        {"_id": cadet_id, "user_id": existing_id, "rank": "100/150 (freshman)"},
-        {"_id": cadet_id, "user_id": existing_id, "rank": "200/250/500 (sophomore)"},
+    roster_db.get_cadets_by_ids.return_value = [
+        {"_id": cadet_id, "user_id": existing_id, "rank": "100/150 (freshman)"}
     ]
-    row = {
-        "first_name": "John",
-        "last_name": "Doe",
-        "email": "jdoe@kent.edu",
-        "rank": "200/250/500 (sophomore)",
-        "conflict_type": "email_exists",
-        "existing_user": {"_id": existing_id},
-        "existing_cadet": {"_id": cadet_id, "user_id": existing_id},
-    }
+    row = _row(
+        rank="200/250/500 (sophomore)",
+        conflict_type="email_exists",
+        existing_user={"_id": existing_id},
+        existing_cadet={"_id": cadet_id, "user_id": existing_id},
+    )
+
     result = import_cadets_from_roster([row], actions=["Update"])
+
     assert len(result["updated"]) == 1
     assert result["updated"][0]["email"] == "jdoe@kent.edu"
-    mock_update_user.assert_called_once()
-    mock_update_cadet.assert_called_once()
-    assert mock_log_data_change.call_count == 2
-
-
-@patch("services.cadets.create_cadet")
-@patch("services.cadets.update_user")
-@patch("services.cadets.get_cadet_by_id")
-@patch("services.cadets.get_user_by_id")
-@patch("services.cadets.log_data_change")
-def test_import_update_existing_user_no_cadet(
-    mock_log_data_change,
-    mock_get_user_by_id,
-    mock_get_cadet_by_id,
-    mock_update_user,
-    mock_create_cadet,
-):
-    from bson import ObjectId
+    roster_db.bulk_update_users.assert_called_once()
+    assert _inserted(roster_db.bulk_update_cadets) == [
+        (
+            cadet_id,
+            {
+                "first_name": "John",
+                "last_name": "Doe",
+                "email": "jdoe@kent.edu",
+                "rank": "200/250/500 (sophomore)",
+            },
+        )
+    ]
+    user_entry, cadet_entry = _audit(roster_db)
+    assert user_entry["before"]["email"] == "old@kent.edu"
+    assert user_entry["after"]["email"] == "jdoe@kent.edu"
+    assert cadet_entry["after"]["rank"] == "200/250/500 (sophomore)"
 
+
+def test_import_update_existing_user_no_cadet(roster_db):
     existing_id = ObjectId()
-    created_cadet_id = ObjectId()
-    mock_get_user_by_id.side_effect = [
-        {"_id": existing_id, "email": "old@kent.edu"},
-        {"_id": existing_id, "email": "jdoe@kent.edu"},
+    roster_db.get_users_by_ids.return_value = [
+        {"_id": existing_id, "email": "old@kent.edu"}
     ]
-    mock_create_cadet.return_value = MagicMock(inserted_id=created_cadet_id)
-    mock_get_cadet_by_id.return_value = {
-        "_id": created_cadet_id,
-        "user_id": existing_id,
-        "rank": "100/150 (freshman)",
-    }
-    row = {
-        "first_name": "John",
-        "last_name": "Doe",
-        "email": "jdoe@kent.edu",
-        "rank": "100/150 (freshman)",
-        "conflict_type": "email_exists",
-        "existing_user": {"_id": existing_id},
-        "existing_cadet": None,
-    }
+    row = _row(
+        conflict_type="email_exists",
+        existing_user={"_id": existing_id},
+        existing_cadet=None,
+    )
+
     result = import_cadets_from_roster([row], actions=["Update"])
+
     assert len(result["updated"]) == 1
-    mock_create_cadet.assert_called_once()
-    assert mock_log_data_change.call_count == 2
+    assert _inserted(roster_db.bulk_insert_cadets)[0]["user_id"] == existing_id
+    assert [e["action"] for e in _audit(roster_db)] == ["update", "create"]
+
+
+def test_import_update_reports_rejected_user_write(roster_db):
+    roster_db.bulk_update_users.return_value = {0: "write conflict"}
+    row = _row(
+        conflict_type="email_exists",
+        existing_user={"_id": ObjectId()},
+        existing_cadet={"_id": ObjectId()},
+    )
+
+    result = import_cadets_from_roster([row], actions=["Update"])
+
+    assert result["updated"] == []
+    assert result["errors"][0]["reason"] == "Failed to update account: write conflict"
+    roster_db.bulk_update_cadets.assert_not_called()
 
 
 def test_import_skip_via_action():
@@ -500,146 +532,33 @@ def test_roster_import_action_config_exports():
 # -- email temp passwords on import
 
 
-@patch("services.cadets.get_user_by_email")
-@patch("services.cadets.create_cadet")
-@patch("services.cadets.get_cadet_by_id")
-@patch("services.cadets.get_user_by_id")
-@patch("services.cadets.log_data_change")
-@patch("services.cadets.update_user")
-@patch("services.cadets.send_temporary_password_email")
-@patch("utils.db_schema_crud.create_user")
-def test_import_does_not_email_when_flag_false(
-    mock_create_user,
-    mock_send_email,
-    mock_update_user,
-    mock_log_data_change,
-    mock_get_user_by_id,
-    mock_get_cadet_by_id,
-    mock_create_cadet,
-    mock_get_user,
-):
-    mock_get_user.return_value = None
-    inserted = MagicMock()
-    inserted.inserted_id = MagicMock()
-    created_cadet_result = MagicMock()
-    created_cadet_result.inserted_id = MagicMock()
-    mock_create_cadet.return_value = created_cadet_result
-    mock_create_user.return_value = inserted
-    mock_get_user_by_id.return_value = {"_id": inserted.inserted_id, "email": "jdoe@kent.edu"}
-    mock_get_cadet_by_id.return_value = {
-        "_id": created_cadet_result.inserted_id,
-        "email": "jdoe@kent.edu",
-    }
-    result = import_cadets_from_roster(
-        [
-            {
-                "first_name": "John",
-                "last_name": "Doe",
-                "email": "jdoe@kent.edu",
-                "rank": "100/150 (freshman)",
-            }
-        ],
-        email_temp_passwords=False,
-    )
+def test_import_does_not_email_when_flag_false(roster_db):
+    result = import_cadets_from_roster([_row()], email_temp_passwords=False)
+
     assert len(result["created"]) == 1
-    mock_send_email.assert_not_called()
+    roster_db.send_temporary_password_email.assert_not_called()
     assert result["email_failures"] == []
 
 
-@patch("services.cadets.get_user_by_email")
-@patch("services.cadets.create_cadet")
-@patch("services.cadets.get_cadet_by_id")
-@patch("services.cadets.get_user_by_id")
-@patch("services.cadets.log_data_change")
-@patch("services.cadets.update_user")
-@patch("services.cadets.send_temporary_password_email")
-@patch("utils.db_schema_crud.create_user")
-def test_import_emails_temp_password_when_flag_true(
-    mock_create_user,
-    mock_send_email,
-    mock_update_user,
-    mock_log_data_change,
-    mock_get_user_by_id,
-    mock_get_cadet_by_id,
-    mock_create_cadet,
-    mock_get_user,
-):
-    mock_get_user.return_value = None
-    inserted = MagicMock()
-    inserted.inserted_id = MagicMock()
-    created_cadet_result = MagicMock()
-    created_cadet_result.inserted_id = MagicMock()
-    mock_create_cadet.return_value = created_cadet_result
-    mock_create_user.return_value = inserted
-    mock_get_user_by_id.return_value = {"_id": inserted.inserted_id, "email": "jdoe@kent.edu"}
-    mock_get_cadet_by_id.return_value = {
-        "_id": created_cadet_result.inserted_id,
-        "email": "jdoe@kent.edu",
-    }
-    mock_send_email.return_value = True
-    result = import_cadets_from_roster(
-        [
-            {
-                "first_name": "John",
-                "last_name": "Doe",
-                "email": "jdoe@kent.edu",
-                "rank": "100/150 (freshman)",
-            }
-        ],
-        email_temp_passwords=True,
-    )
+def test_import_emails_temp_password_when_flag_true(roster_db):
+    result = import_cadets_from_roster([_row()], email_temp_passwords=True)
+
     assert len(result["created"]) == 1
-    mock_send_email.assert_called_once()
-    call_kwargs = mock_send_email.call_args.kwargs
+    assert result["created"][0]["emailed"] is True
+    roster_db.send_temporary_password_email.assert_called_once()
+    call_kwargs = roster_db.send_temporary_password_email.call_args.kwargs
     assert call_kwargs["to_email"] == "jdoe@kent.edu"
-    assert "temporary_password" in call_kwargs
+    assert call_kwargs["temporary_password"] == result["created"][0]["temp_password"]
     assert call_kwargs["subject"] is not None
     assert call_kwargs["body"] is not None
     assert result["email_failures"] == []
 
 
-@patch("services.cadets.get_user_by_email")
-@patch("services.cadets.create_cadet")
-@patch("services.cadets.get_cadet_by_id")
-@patch("services.cadets.get_user_by_id")
-@patch("services.cadets.log_data_change")
-@patch("services.cadets.update_user")
-@patch("services.cadets.send_temporary_password_email")
-@patch("utils.db_schema_crud.create_user")
-def test_import_collects_email_failures(
-    mock_create_user,
-    mock_send_email,
-    mock_update_user,
-    mock_log_data_change,
-    mock_get_user_by_id,
-    mock_get_cadet_by_id,
-    mock_create_cadet,
-    mock_get_user,
-):
-    mock_get_user.return_value = None
-    inserted = MagicMock()
-    inserted.inserted_id = MagicMock()
-    created_cadet_result = MagicMock()
-    created_cadet_result.inserted_id = MagicMock()
-    mock_create_cadet.return_value = created_cadet_result
-    mock_create_user.return_value = inserted
-    mock_get_user_by_id.return_value = {"_id": inserted.inserted_id, "email": "jdoe@kent.edu"}
-    mock_get_cadet_by_id.return_value = {
-        "_id": created_cadet_result.inserted_id,
-        "email": "jdoe@kent.edu",
-    }
-    mock_send_email.return_value = False
-    result = import_cadets_from_roster(
-        [
-            {
-                "first_name": "John",
-                "last_name": "Doe",
-                "email": "jdoe@kent.edu",
-                "rank": "100/150 (freshman)",
-            }
-        ],
-        email_temp_passwords=True,
-    )
+def test_import_collects_email_failures(roster_db):
+    roster_db.send_temporary_password_email.return_value = False
+
+    result = import_cadets_from_roster([_row()], email_temp_passwords=True)
+
     assert len(result["created"]) == 1
     assert len(result["email_failures"]) == 1
     assert result["email_failures"][0]["email"] == "jdoe@kent.edu"
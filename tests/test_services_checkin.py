@@ -0,0 +1,246 @@
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+import services.checkin as checkin_svc
+from services.checkin import (
+    CHECKIN_CONTEXT_SESSION_KEY,
+    get_checkin_context,
+    lookup_checkin_event,
+    resolve_checkin_context,
+    submit_checkin,
+)
+
+NOW = datetime(2026, 3, 2, 6, 0, tzinfo=timezone.utc)
+
+
+def _patch_identity(monkeypatch, *, user=None, cadet=None, flight=None):
+    calls = {"user": 0, "cadet": 0, "flight": 0}
+
+    def _user(email):
+        calls["user"] += 1
+        return user
+
+    def _cadet(user_id):
+        calls["cadet"] += 1
+        return cadet
+
+    def _flights(c):
+        calls["flight"] += 1
+        return [flight] if flight else []
+
+    monkeypatch.setattr(checkin_svc, "get_user_by_email", _user)
+    monkeypatch.setattr(checkin_svc, "get_cadet_by_user_id", _cadet)
+    monkeypatch.setattr(checkin_svc, "load_cadet_flights", _flights)
+    return calls
+
+
+def _identity():
+    flight = {"_id": ObjectId(), "name": "Alpha"}
+    user = {"_id": ObjectId(), "email": "cadet@example.com", "roles": ["cadet"]}
+    cadet = {"_id": ObjectId(), "user_id": user["_id"], "flight_id": flight["_id"]}
+    return user, cadet, flight
+
+
+# -- context ------------------------------------------------------------------
+
+
+def test_resolve_checkin_context_returns_none_for_unknown_user(monkeypatch):
+    _patch_identity(monkeypatch)
+
+    assert resolve_checkin_context("nobody@example.com") is None
+
+
+def test_resolve_checkin_context_includes_flight_label(monkeypatch):
+    user, cadet, flight = _identity()
+    _patch_identity(monkeypatch, user=user, cadet=cadet, flight=flight)
+
+    context = resolve_checkin_context(" cadet@example.com ")
+
+    assert context is not None
+    assert context["email"] == "cadet@example.com"
+    assert context["cadet"] is cadet
+    assert context["flight_label"] == "Alpha"
+
+
+def test_get_checkin_context_resolves_once_per_session(monkeypatch):
+    user, cadet, flight = _identity()
+    calls = _patch_identity(monkeypatch, user=user, cadet=cadet, flight=flight)
+    session: dict = {}
+
+    first = get_checkin_context("cadet@example.com", session)
+    second = get_checkin_context("cadet@example.com", session)
+
+    assert first is second
+    assert calls == {"user": 1, "cadet": 1, "flight": 1}
+    assert session[CHECKIN_CONTEXT_SESSION_KEY] is first
+
+
+def test_get_checkin_context_re_resolves_for_a_different_email(monkeypatch):
+    user, cadet, flight = _identity()
+    calls = _patch_identity(monkeypatch, user=user, cadet=cadet, flight=flight)
+    session: dict = {}
+
+    get_checkin_context("cadet@example.com", session)
+    get_checkin_context("other@example.com", session)
+
+    assert calls["user"] == 2
+
+
+def test_get_checkin_context_does_not_cache_accounts_without_cadet(monkeypatch):
+    user, _, _ = _identity()
+    calls = _patch_identity(monkeypatch, user=user, cadet=None)
+    session: dict = {}
+
+    context = get_checkin_context("admin@example.com", session)
+    get_checkin_context("admin@example.com", session)
+
+    assert context is not None
+    assert context["cadet"] is None
+    assert CHECKIN_CONTEXT_SESSION_KEY not in session
+    assert calls["user"] == 2
+
+
+# -- lookup -------------------------------------------------------------------
+
+
+def _patch_lookup(monkeypatch, *, event_code, event, existing=None, window=15):
+    lookups = []
+
+    def _existing(event_id, cadet_id):
+        lookups.append((event_id, cadet_id))
+        return existing
+
+    monkeypatch.setattr(checkin_svc, "validate_code", lambda code: event_code)
+    monkeypatch.setattr(checkin_svc, "get_event_by_id", lambda eid: event)
+    monkeypatch.setattr(checkin_svc, "get_checkin_window_minutes", lambda: window)
+    monkeypatch.setattr(checkin_svc, "get_attendance_record_by_event_cadet", _existing)
+    return lookups
+
+
+def _event(start=NOW):
+    return {"_id": ObjectId(), "event_name": "PT", "start_date": start}
+
+
+def test_lookup_checkin_event_invalid_code(monkeypatch):
+    _patch_lookup(monkeypatch, event_code=None, event=None)
+
+    result = lookup_checkin_event("000000", ObjectId(), now=NOW)
+
+    assert result["outcome"] == "invalid_code"
+    assert result["event_code"] is None
+
+
+def test_lookup_checkin_event_missing_event_is_invalid(monkeypatch):
+    _patch_lookup(monkeypatch, event_code={"event_id": ObjectId()}, event=None)
+
+    result = lookup_checkin_event("123456", ObjectId(), now=NOW)
+
+    assert result["outcome"] == "invalid_code"
+
+
+def test_lookup_checkin_event_outside_window(monkeypatch):
+    event = _event(start=NOW + timedelta(hours=2))
+    lookups = _patch_lookup(
+        monkeypatch, event_code={"event_id": event["_id"]}, event=event
+    )
+
+    result = lookup_checkin_event("123456", ObjectId(), now=NOW)
+
+    assert result["outcome"] == "outside_window"
+    assert result["window_minutes"] == 15
+    assert lookups == []
+
+
+def test_lookup_checkin_event_checks_single_event_cadet_pair(monkeypatch):
+    event = _event()
+    cadet_id = ObjectId()
+    lookups = _patch_lookup(
+        monkeypatch, event_code={"event_id": event["_id"]}, event=event
+    )
+
+    result = lookup_checkin_event("123456", cadet_id, now=NOW)
+
+    assert result["outcome"] == "ok"
+    assert result["event"] is event
+    assert lookups == [(event["_id"], cadet_id)]
+
+
+def test_lookup_checkin_event_already_checked_in(monkeypatch):
+    event = _event()
+    _patch_lookup(
+        monkeypatch,
+        event_code={"event_id": event["_id"]},
+        event=event,
+        existing={"_id": ObjectId(), "status": "present"},
+    )
+
+    result = lookup_checkin_event("123456", ObjectId(), now=NOW)
+
+    assert result["outcome"] == "already_checked_in"
+
+
+# -- submit -------------------------------------------------------------------
+
+
+class _InsertResult:
+    inserted_id = ObjectId()
+
+
+def _context():
+    user, cadet, _ = _identity()
+    return {"user": user, "cadet": cadet}
+
+
+def test_submit_checkin_writes_record_and_audit_entry(monkeypatch):
+    created, logged = [], []
+    monkeypatch.setattr(
+        checkin_svc,
+        "create_attendance_record",
+        lambda **kw: created.append(kw) or _InsertResult(),
+    )
+    monkeypatch.setattr(
+        checkin_svc, "log_checkin_attempt", lambda **kw: logged.append(kw)
+    )
+    context = _context()
+    event_id = ObjectId()
+
+    outcome = submit_checkin(context, {"event_id": event_id}, location_unavailable=True)
+
+    assert outcome == "success"
+    assert created[0]["status"] == "present"
+    assert created[0]["cadet_id"] == context["cadet"]["_id"]
+    assert created[0]["recorded_by_roles"] == ["cadet"]
+    assert created[0]["location_unavailable"] is True
+    assert logged == [
+        {
+            "cadet_id": context["cadet"]["_id"],
+            "outcome": "success",
+            "event_id": event_id,
+            "user_id": context["user"]["_id"],
+            "source": "attendance_submission",
+            "search_docs": (context["user"], context["cadet"], None),
+        }
+    ]
+
+
+def test_submit_checkin_reports_duplicate_from_unique_index(monkeypatch):
+    logged = []
+
+    def _raise(**kw):
+        raise DuplicateKeyError("dupe")
+
+    monkeypatch.setattr(checkin_svc, "create_attendance_record", _raise)
+    monkeypatch.setattr(
+        checkin_svc, "log_checkin_attempt", lambda **kw: logged.append(kw)
+    )
+
+    assert submit_checkin(_context(), {"event_id": ObjectId()}) == "duplicate"
+    assert logged == []
+
+
+def test_submit_checkin_db_unavailable(monkeypatch):
+    monkeypatch.setattr(checkin_svc, "create_attendance_record", lambda **kw: None)
+
+    assert submit_checkin(_context(), {"event_id": ObjectId()}) == "db_unavailable"
@@ -0,0 +1,84 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from utils.ttl_cache import cache_stats, clear_cache, get_or_load, invalidate
+
+
+def test_second_read_within_ttl_is_a_hit():
+    loader = MagicMock(return_value={"a": 1})
+
+    first = get_or_load("k", loader, ttl_seconds=60)
+    second = get_or_load("k", loader, ttl_seconds=60)
+
+    assert first == second == {"a": 1}
+    loader.assert_called_once()
+    assert cache_stats("k") == {"hits": 1, "misses": 1, "invalidations": 0}
+
+
+def test_expired_entry_is_reloaded():
+    loader = MagicMock(side_effect=[1, 2])
+
+    assert get_or_load("k", loader, ttl_seconds=0) == 1
+    assert get_or_load("k", loader, ttl_seconds=0) == 2
+
+    assert loader.call_count == 2
+
+
+def test_invalidate_forces_reload():
+    loader = MagicMock(side_effect=["old", "new"])
+
+    get_or_load("k", loader, ttl_seconds=60)
+    invalidate("k")
+
+    assert get_or_load("k", loader, ttl_seconds=60) == "new"
+    assert cache_stats("k")["invalidations"] == 1
+
+
+def test_keys_are_independent():
+    get_or_load("a", lambda: 1, ttl_seconds=60)
+    invalidate("b")
+
+    assert get_or_load("a", lambda: 2, ttl_seconds=60) == 1
+
+
+def test_value_loaded_during_invalidation_is_not_cached():
+    def loader():
+        invalidate("k")
+        return "stale"
+
+    assert get_or_load("k", loader, ttl_seconds=60) == "stale"
+    assert get_or_load("k", lambda: "fresh", ttl_seconds=60) == "fresh"
+
+
+def test_concurrent_misses_share_one_load():
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(get_or_load("k", slow_loader, ttl_seconds=60))
+        )
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+
+def test_clear_cache_drops_entries_and_counters():
+    get_or_load("k", lambda: 1, ttl_seconds=60)
+
+    clear_cache()
+
+    assert cache_stats("k") == {"hits": 0, "misses": 0, "invalidations": 0}
+    assert get_or_load("k", lambda: 2, ttl_seconds=60) == 2
@@ -1,6 +1,6 @@
 import pytest
 
-from utils.validators import is_valid_email, is_valid_name
+from utils.validators import is_valid_email, is_valid_name, normalize_email
 
 
 @pytest.mark.parametrize(
@@ -55,3 +55,16 @@ def test_valid_names_are_accepted(name: str) -> None:
 )
 def test_invalid_names_are_rejected(name: str) -> None:
     assert is_valid_name(name) is False
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("Cadet.Name@AF.mil", "cadet.name@af.mil"),
+        ("  user@example.com \n", "user@example.com"),
+        ("", ""),
+        (None, ""),
+    ],
+)
+def test_normalize_email(raw, expected) -> None:
+    assert normalize_email(raw) == expected
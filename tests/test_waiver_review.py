@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
 from typing import cast
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
+from bson import ObjectId
 
 from services.waiver_review import (
     get_flight_options,
@@ -185,6 +186,92 @@ def test_get_paginated_waiver_review_rows_paginates_fallback_rows():
     assert len(cast(list, result["items"])) == 5
 
 
+def _view_row(day: int, **fields) -> dict:
+    return {
+        "_id": ObjectId(),
+        "status": "pending",
+        "created_at": datetime(2026, 3, day, tzinfo=timezone.utc),
+        "cadet_name": "Tyler Brooks",
+        "cadet_email": "tyler@rollcall.local",
+        "flight_name": "Alpha Flight",
+        "event_name": "PT Session",
+        "event_date": "2026-03-01",
+        "event_type": "pt",
+        **fields,
+    }
+
+
+def _view_col(rows: list[dict]) -> MagicMock:
+    col = MagicMock()
+    col.estimated_document_count.return_value = len(rows)
+    col.count_documents.return_value = len(rows)
+    col.find.return_value.sort.return_value.limit.return_value = rows
+    col.find.return_value.sort.return_value.__iter__.return_value = iter(rows)
+    return col
+
+
+def test_get_paginated_waiver_review_rows_is_one_find_on_the_view():
+    view = _view_col([_view_row(3), _view_row(2), _view_row(1)])
+
+    with patch("services.waiver_review.get_collection", return_value=view):
+        result = get_paginated_waiver_review_rows(
+            status_filter="pending",
+            flight_filter="All flights",
+            cadet_search="",
+            viewer_roles=["cadre"],
+            page_size=2,
+        )
+
+    view.find.assert_called_once_with({"status": "pending"})
+    view.find.return_value.sort.assert_called_once_with(
+        [("created_at", -1), ("_id", -1)]
+    )
+    view.find.return_value.sort.return_value.limit.assert_called_once_with(3)
+    view.count_documents.assert_called_once_with({"status": "pending"})
+    items = cast(list[dict], result["items"])
+    assert len(items) == 2
+    assert items[0]["cadet_name"] == "Tyler Brooks"
+    assert result["total_count"] == 3
+    assert result["next_cursor"] is not None
+
+
+def test_get_paginated_waiver_review_rows_filters_on_view_fields():
+    first = [_view_row(3), _view_row(2), _view_row(1)]
+    view = _view_col(first)
+
+    with patch("services.waiver_review.get_collection", return_value=view):
+        page_one = get_paginated_waiver_review_rows(
+            status_filter="all",
+            flight_filter="Alpha Flight",
+            cadet_search="Tyler B",
+            viewer_roles=["waiver_reviewer"],
+            page_size=2,
+        )
+        view.find.return_value.sort.return_value.limit.return_value = first[2:]
+        page_two = get_paginated_waiver_review_rows(
+            status_filter="all",
+            flight_filter="Alpha Flight",
+            cadet_search="Tyler B",
+            viewer_roles=["waiver_reviewer"],
+            page_size=2,
+            page=2,
+            cursor=cast(str, page_one["next_cursor"]),
+        )
+
+    query = view.find.call_args[0][0]
+    assert query["flight_name"] == "Alpha Flight"
+    assert query["cadre_only"] == {"$ne": True}
+    assert query["$and"] == [
+        {"cadet_search_tokens": {"$regex": "^tyler"}},
+        {"cadet_search_tokens": {"$regex": "^b"}},
+    ]
+    assert query["$or"][0] == {"created_at": {"$lt": first[1]["created_at"]}}
+    view.aggregate.assert_not_called()
+    assert page_two["page"] == 2
+    assert page_two["next_cursor"] is None
+    assert len(cast(list, page_two["items"])) == 1
+
+
 # ------------------------- test get_waiver_context -----------------------------------------
 
 
@@ -0,0 +1,149 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from bson import ObjectId
+
+import utils.waiver_review_view as view_mod
+from utils.db_schema_crud import update_flight
+
+NOW = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+def _joined_waiver(**fields) -> dict:
+    user_id, cadet_id, flight_id, event_id = (ObjectId() for _ in range(4))
+    return {
+        "_id": ObjectId(),
+        "status": "pending",
+        "reason": "sick",
+        "submitted_by_user_id": user_id,
+        "created_at": NOW,
+        "attendance_record": {"_id": ObjectId(), "event_id": event_id},
+        "cadet": {"_id": cadet_id, "user_id": user_id, "flight_id": flight_id},
+        "cadet_user": {
+            "_id": user_id,
+            "first_name": "Tyler",
+            "last_name": "Brooks",
+            "email": "tyler@rollcall.local",
+        },
+        "flight": {"_id": flight_id, "name": "Alpha Flight"},
+        "event": {
+            "_id": event_id,
+            "event_name": "PT Session",
+            "event_type": "pt",
+            "start_date": NOW,
+        },
+        **fields,
+    }
+
+
+def _patch_collections(**collections):
+    return patch.object(
+        view_mod, "get_collection", side_effect=lambda name: collections.get(name)
+    )
+
+
+def test_view_row_flattens_joined_waiver():
+    doc = _joined_waiver()
+
+    row = view_mod.build_waiver_review_view_row(doc, now=NOW)
+
+    assert row["_id"] == doc["_id"]
+    assert row["cadet_name"] == "Tyler Brooks"
+    assert row["cadet_email"] == "tyler@rollcall.local"
+    assert row["flight_name"] == "Alpha Flight"
+    assert row["event_name"] == "PT Session"
+    assert row["event_date"] == "2026-03-02"
+    assert row["event_type"] == "pt"
+    assert row["cadet_id"] == doc["cadet"]["_id"]
+    assert row["user_ids"] == [doc["submitted_by_user_id"]]
+    assert row["flight_id"] == doc["flight"]["_id"]
+    assert row["event_id"] == doc["event"]["_id"]
+    assert row["cadet_search_tokens"] == ["tyler", "brooks", "rollcall", "local"]
+
+
+def test_view_row_labels_standing_and_unlinked_waivers():
+    doc = _joined_waiver(
+        is_standing=True,
+        event_types=["pt"],
+        start_date=datetime(2026, 1, 5),
+        end_date=datetime(2026, 5, 1),
+    )
+    doc.pop("flight")
+    doc.pop("cadet_user")
+
+    row = view_mod.build_waiver_review_view_row(doc, now=NOW)
+
+    assert row["event_name"] == "Standing waiver (PT)"
+    assert row["event_date"] == "2026-01-05 → 2026-05-01"
+    assert row["event_type"] == "standing"
+    assert row["flight_name"] == "Unassigned"
+    assert row["cadet_name"] == "Unknown cadet"
+
+
+def test_search_query_prefix_matches_each_token():
+    assert view_mod.waiver_review_search_query("  ") == {}
+    assert view_mod.waiver_review_search_query("Tyler b.") == {
+        "$and": [
+            {"cadet_search_tokens": {"$regex": "^tyler"}},
+            {"cadet_search_tokens": {"$regex": "^b"}},
+        ]
+    }
+
+
+def test_refresh_recomputes_rows_referring_to_a_flight_and_drops_deleted():
+    kept, gone = _joined_waiver(), _joined_waiver()
+    flight_id = kept["flight"]["_id"]
+    view, waivers = MagicMock(), MagicMock()
+    view.find.return_value = [{"_id": kept["_id"]}, {"_id": gone["_id"]}]
+    waivers.aggregate.return_value = [kept]
+
+    with _patch_collections(waiver_review_view=view, waivers=waivers):
+        view_mod.refresh_waiver_review_view(flight_ids=[str(flight_id)])
+
+    view.find.assert_called_once_with(
+        {"$or": [{"flight_id": {"$in": [flight_id]}}]}, {"_id": 1}
+    )
+    pipeline = waivers.aggregate.call_args[0][0]
+    assert set(pipeline[0]["$match"]["_id"]["$in"]) == {kept["_id"], gone["_id"]}
+    ops = view.bulk_write.call_args[0][0]
+    assert [op._doc["_id"] for op in ops] == [kept["_id"]]
+    view.delete_many.assert_called_once_with({"_id": {"$in": [gone["_id"]]}})
+
+
+def test_refresh_without_matches_does_no_work():
+    view, waivers = MagicMock(), MagicMock()
+    view.find.return_value = []
+
+    with _patch_collections(waiver_review_view=view, waivers=waivers):
+        view_mod.refresh_waiver_review_view(user_ids=[ObjectId()])
+        view_mod.refresh_waiver_review_view()
+
+    assert view.find.call_count == 1
+    waivers.aggregate.assert_not_called()
+    view.bulk_write.assert_not_called()
+
+
+def test_rebuild_writes_in_batches_and_removes_stale_rows():
+    docs = [_joined_waiver() for _ in range(3)]
+    view, waivers = MagicMock(), MagicMock()
+    waivers.aggregate.return_value = iter(docs)
+
+    with _patch_collections(waiver_review_view=view, waivers=waivers):
+        count = view_mod.rebuild_waiver_review_view(batch_size=2)
+
+    assert count == 3
+    assert [len(c[0][0]) for c in view.bulk_write.call_args_list] == [2, 1]
+    view.delete_many.assert_called_once_with(
+        {"_id": {"$nin": [doc["_id"] for doc in docs]}}
+    )
+
+
+def test_flight_rename_refreshes_view_rows():
+    flight_id = ObjectId()
+    with (
+        patch("utils.db_schema_crud.get_collection", return_value=MagicMock()),
+        patch("utils.db_schema_crud.refresh_waiver_review_view") as refresh,
+    ):
+        update_flight(flight_id, {"name": "Bravo Flight"})
+
+    refresh.assert_called_once_with(flight_ids=[flight_id])
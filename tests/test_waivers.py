@@ -886,3 +886,57 @@ def test_revert_singular_leaves_present_alone():
 
     assert n == 0
     mock_upsert.assert_not_called()
+
+
+def test_revert_standing_keeps_events_another_standing_waiver_covers():
+    cadet_id = ObjectId("b" * 24)
+    cadet = {"_id": cadet_id, "user_id": ObjectId("f" * 24)}
+    covered = {
+        "_id": ObjectId("c" * 24),
+        "event_type": "pt",
+        "start_date": datetime(2026, 4, 28, 6, tzinfo=timezone.utc),
+    }
+    uncovered = {
+        "_id": ObjectId("d" * 24),
+        "event_type": "lab",
+        "start_date": datetime(2026, 4, 30, 15, tzinfo=timezone.utc),
+    }
+    records = [
+        {
+            "_id": ObjectId(),
+            "cadet_id": cadet_id,
+            "event_id": e["_id"],
+            "status": "excused",
+        }
+        for e in (covered, uncovered)
+    ]
+    denied = _standing_waiver()
+    other = {
+        **_standing_waiver(event_types=["pt"]),
+        "_id": ObjectId(),
+        "status": "approved",
+    }
+
+    with (
+        patch("services.waivers.get_cadet_by_user_id", return_value=cadet),
+        patch(
+            "services.waivers.get_events_by_date_range",
+            return_value=[covered, uncovered],
+        ),
+        patch(
+            "services.waivers.get_attendance_records_for_cadet_in_events",
+            return_value=records,
+        ),
+        patch(
+            "services.waivers.get_standing_waivers_by_user",
+            return_value=[{**denied, "status": "approved"}, other],
+        ),
+        patch("services.waivers.bulk_upsert_attendance_status") as mock_bulk,
+        patch("services.waivers.log_attendance_modification"),
+    ):
+        n = revert_excused_status(denied, ObjectId("d" * 24))
+
+    assert n == 1
+    [written] = mock_bulk.call_args[0][0]
+    assert written["event_id"] == uncovered["_id"]
+    assert written["status"] == "absent"
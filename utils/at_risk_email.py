@@ -12,10 +12,11 @@ from utils.db_schema_crud import (
     get_flight_by_commander,
     set_at_risk_email_sent,
     get_user_by_id,
+    get_users_by_ids,
     get_cadet_absence_stats,
 )
 from utils.names import format_full_name
-from utils.email_utils import send_with_retry
+from utils.email_utils import send_batch, send_with_retry
 from services.event_config import get_absence_thresholds, is_email_enabled
 
 
@@ -115,6 +116,8 @@ def build_email(
     to_email: str,
     cadets: list[dict],
     recipient_name: str = "",
+    *,
+    table: str | None = None,
 ) -> MIMEMultipart:
     pt_threshold, llab_threshold = get_absence_thresholds()
     template = get_email_template("at_risk_cadre")
@@ -123,7 +126,7 @@ def build_email(
         recipient_name=f" {recipient_name}" if recipient_name else "",
         pt_threshold=pt_threshold,
         llab_threshold=llab_threshold,
-        table=build_table(cadets),
+        table=table if table is not None else build_table(cadets),
     )
 
     msg = MIMEMultipart("alternative")
@@ -209,19 +212,86 @@ def send_to_student(
     return False
 
 
-def send_to_cadre(at_risk: list[dict], sent: int, failed: int) -> tuple[int, int]:
-    if not is_email_enabled():
-        return sent, failed
+def build_cadre_messages(at_risk: list[dict]) -> list[tuple[str, MIMEMultipart]]:
+    table = build_table(at_risk)
+    messages = []
     for cadre in get_users_by_role("cadre"):
         email = cadre.get("email")
         if not email:
             continue
-        msg = build_email(email, at_risk, cadre.get("first_name", ""))
-        if send_email(email, msg):
-            sent += 1
-        else:
-            failed += 1
-    return sent, failed
+        messages.append(
+            (
+                email,
+                build_email(email, at_risk, cadre.get("first_name", ""), table=table),
+            )
+        )
+    return messages
+
+
+def build_flight_commander_messages(
+    at_risk: list[dict],
+) -> list[tuple[str, MIMEMultipart]]:
+    messages = []
+    for fc in get_users_by_role("flight_commander"):
+        email, flight_cadets = get_fc_flight_cadets(fc, at_risk)
+        if not email or not flight_cadets:
+            continue
+        messages.append(
+            (email, build_email(email, flight_cadets, fc.get("first_name", "")))
+        )
+    return messages
+
+
+def build_student_messages(
+    at_risk: list[dict],
+) -> list[tuple[str, MIMEMultipart, tuple]]:
+    """Return `(to_email, msg, (cadet_id, pt, llab))` for at-risk cadets.
+
+    Like `send_to_student`, cadets already emailed for their current counts
+    are skipped; the trailing tuple is what `set_at_risk_email_sent` records
+    once the message is delivered.
+    """
+    pending = []
+    for c in at_risk:
+        cadet = c["cadet"]
+        if (
+            cadet.get("at_risk_email_last_pt", -1) == c["pt_absences"]
+            and cadet.get("at_risk_email_last_llab", -1) == c["llab_absences"]
+        ):
+            continue
+        pending.append(c)
+
+    user_ids = [c["cadet"]["user_id"] for c in pending if c["cadet"].get("user_id")]
+    email_by_user_id = {
+        u["_id"]: u.get("email")
+        for u in get_users_by_ids(user_ids, projection={"email": 1})
+    }
+
+    messages = []
+    for c in pending:
+        cadet = c["cadet"]
+        email = email_by_user_id.get(cadet.get("user_id")) or cadet.get("email")
+        if not email:
+            continue
+        msg = build_email_for_student(email, c["pt_absences"], c["llab_absences"])
+        messages.append(
+            (email, msg, (cadet["_id"], c["pt_absences"], c["llab_absences"]))
+        )
+    return messages
+
+
+def _tally(outcomes: list[dict], sent: int, failed: int) -> tuple[int, int]:
+    delivered = sum(1 for o in outcomes if o["sent"])
+    return sent + delivered, failed + len(outcomes) - delivered
+
+
+def send_to_cadre(at_risk: list[dict], sent: int, failed: int) -> tuple[int, int]:
+    if not is_email_enabled():
+        return sent, failed
+    if not SENDER_EMAIL or not SENDER_PASSWORD:
+        return sent, failed
+    outcomes = send_batch(SENDER_EMAIL, SENDER_PASSWORD, build_cadre_messages(at_risk))
+    return _tally(outcomes, sent, failed)
 
 
 def send_to_flight_commander(
@@ -229,29 +299,49 @@ def send_to_flight_commander(
 ) -> tuple[int, int]:
     if not is_email_enabled():
         return sent, failed
-    for fc in get_users_by_role("flight_commander"):
-        email, flight_cadets = get_fc_flight_cadets(fc, at_risk)
-        if not email or not flight_cadets:
-            continue
-        msg = build_email(email, flight_cadets, fc.get("first_name", ""))
-        if send_email(email, msg):
-            sent += 1
-        else:
-            failed += 1
-    return sent, failed
+    if not SENDER_EMAIL or not SENDER_PASSWORD:
+        return sent, failed
+    outcomes = send_batch(
+        SENDER_EMAIL, SENDER_PASSWORD, build_flight_commander_messages(at_risk)
+    )
+    return _tally(outcomes, sent, failed)
 
 
-def send_at_risk_emails() -> tuple[int, int]:
+def dispatch_at_risk_emails() -> list[dict]:
+    """Email cadre, flight commanders and at-risk cadets in one pooled batch.
+
+    Returns the per-message outcomes from `send_batch`, each tagged with a
+    `recipient_type` of "cadre", "flight_commander" or "student".
+    """
     if not is_email_enabled():
-        return 0, 0
+        return []
+    if not SENDER_EMAIL or not SENDER_PASSWORD:
+        return []
     at_risk = get_at_risk_cadets()
     if not at_risk:
-        return 0, 0
-
-    sent = 0
-    failed = 0
+        return []
+
+    tagged: list[tuple[str, str, MIMEMultipart, tuple | None]] = [
+        ("cadre", to, msg, None) for to, msg in build_cadre_messages(at_risk)
+    ]
+    tagged += [
+        ("flight_commander", to, msg, None)
+        for to, msg in build_flight_commander_messages(at_risk)
+    ]
+    tagged += [
+        ("student", to, msg, counts)
+        for to, msg, counts in build_student_messages(at_risk)
+    ]
+
+    outcomes = send_batch(
+        SENDER_EMAIL, SENDER_PASSWORD, [(to, msg) for _, to, msg, _ in tagged]
+    )
+    for (recipient_type, _, _, counts), outcome in zip(tagged, outcomes):
+        outcome["recipient_type"] = recipient_type
+        if counts is not None and outcome["sent"]:
+            set_at_risk_email_sent(*counts)
+    return outcomes
 
-    sent, failed = send_to_cadre(at_risk, sent, failed)
-    sent, failed = send_to_flight_commander(at_risk, sent, failed)
 
-    return sent, failed
+def send_at_risk_emails() -> tuple[int, int]:
+    return _tally(dispatch_at_risk_emails(), 0, 0)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
 
 from bson import ObjectId
-from pymongo.results import InsertOneResult
+from pymongo import UpdateOne
+from pymongo.results import InsertManyResult, InsertOneResult
 
 from utils.checkin_codes import _sha256_hex, _utcnow
 from utils.db import get_collection
@@ -121,7 +123,157 @@ def build_audit_changes(
     return _collect_changes(before or {}, after or {})
 
 
-def log_data_change(
+# -- Search tokens
+#
+# Each entry carries lowercase word tokens for who acted and what was acted on,
+# so the audit viewer can match "smi" or "week 3" with anchored prefix regexes
+# on the multikey `actor_search_tokens` / `target_search_tokens` indexes.
+
+ACTOR_SEARCH_TOKENS_FIELD = "actor_search_tokens"
+TARGET_SEARCH_TOKENS_FIELD = "target_search_tokens"
+_SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_PERSON_NAME_FIELDS = ("first_name", "last_name", "name", "email")
+_SEARCH_PROJECTIONS = {
+    "users": {field: 1 for field in _PERSON_NAME_FIELDS},
+    "cadets": {field: 1 for field in _PERSON_NAME_FIELDS},
+    "events": {"event_name": 1},
+}
+
+
+def search_tokens(*values: Any) -> list[str]:
+    """Split `values` into unique lowercase alphanumeric tokens, in order."""
+    tokens: dict[str, None] = {}
+    for value in values:
+        if value is None:
+            continue
+        for token in _SEARCH_TOKEN_RE.findall(str(value).lower()):
+            tokens.setdefault(token, None)
+    return list(tokens)
+
+
+def _person_terms(person: dict[str, Any] | None) -> list[Any]:
+    if not person:
+        return []
+    return [person.get(field) for field in _PERSON_NAME_FIELDS]
+
+
+def _search_refs(doc: dict[str, Any]) -> dict[str, set[Any]]:
+    refs: dict[str, set[Any]] = {"users": set(), "cadets": set(), "events": set()}
+    for key in ("actor_user_id", "user_id"):
+        if isinstance(doc.get(key), ObjectId):
+            refs["users"].add(doc[key])
+    if isinstance(doc.get("cadet_id"), ObjectId):
+        refs["cadets"].add(doc["cadet_id"])
+    if isinstance(doc.get("event_id"), ObjectId):
+        refs["events"].add(doc["event_id"])
+    target_collection = doc.get("target_collection")
+    if target_collection in ("users", "cadets") and isinstance(
+        doc.get("target_id"), ObjectId
+    ):
+        refs[target_collection].add(doc["target_id"])
+    return refs
+
+
+def _load_search_refs(
+    docs: Iterable[dict[str, Any]],
+    known: Iterable[dict[str, Any] | None] = (),
+) -> dict[Any, dict[str, Any]]:
+    """Fetch the users, cadets and events named by `docs` with one `$in` each.
+
+    Documents in `known` (e.g. the user and cadet a page already holds) are
+    used as-is instead of being read again.
+    """
+    by_id = {d["_id"]: d for d in known if d and d.get("_id") is not None}
+    wanted: dict[str, set[Any]] = {name: set() for name in _SEARCH_PROJECTIONS}
+    for doc in docs:
+        for name, ids in _search_refs(doc).items():
+            wanted[name].update(i for i in ids if i not in by_id)
+
+    for name, ids in wanted.items():
+        col = get_collection(name) if ids else None
+        if col is None:
+            continue
+        for found in col.find({"_id": {"$in": list(ids)}}, _SEARCH_PROJECTIONS[name]):
+            by_id[found["_id"]] = found
+    return by_id
+
+
+def build_search_tokens(
+    doc: dict[str, Any], refs: dict[Any, dict[str, Any]]
+) -> dict[str, list[str]]:
+    """Return the actor and target token fields for an audit entry.
+
+    `refs` maps ids to the user, cadet and event documents the entry points
+    at, as returned by `_load_search_refs`.
+    """
+    actor_id = doc.get("actor_user_id") or doc.get("user_id")
+    actor = search_tokens(
+        doc.get("actor_email"),
+        actor_id,
+        doc.get("actor_user_id_raw"),
+        *_person_terms(refs.get(actor_id)),
+    )
+
+    target_terms: list[Any] = [doc.get("target_label"), doc.get("target_id")]
+    if doc.get("target_collection") in ("users", "cadets"):
+        target_terms.extend(_person_terms(refs.get(doc.get("target_id"))))
+    cadet_id = doc.get("cadet_id")
+    if cadet_id is not None:
+        target_terms.extend([cadet_id, *_person_terms(refs.get(cadet_id))])
+    event_id = doc.get("event_id")
+    if event_id is not None:
+        event = refs.get(event_id) or {}
+        target_terms.extend([event_id, event.get("event_name")])
+
+    return {
+        ACTOR_SEARCH_TOKENS_FIELD: actor,
+        TARGET_SEARCH_TOKENS_FIELD: search_tokens(*target_terms),
+    }
+
+
+def _with_search_tokens(
+    docs: list[dict[str, Any]],
+    known: Iterable[dict[str, Any] | None] = (),
+) -> list[dict[str, Any]]:
+    refs = _load_search_refs(docs, known)
+    for doc in docs:
+        doc.update(build_search_tokens(doc, refs))
+    return docs
+
+
+def backfill_audit_search_tokens(*, batch_size: int = 500) -> int:
+    """Add search token fields to audit entries written before they existed.
+
+    Walks the entries in `_id` order, resolving names one batch at a time.
+    Returns the number of entries updated. Safe to re-run.
+    """
+    col = get_collection("audit_log")
+    if col is None:
+        return 0
+
+    updated = 0
+    last_id = None
+    while True:
+        query: dict[str, Any] = {ACTOR_SEARCH_TOKENS_FIELD: {"$exists": False}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = list(col.find(query).sort("_id", 1).limit(batch_size))
+        if not batch:
+            return updated
+        last_id = batch[-1]["_id"]
+
+        refs = _load_search_refs(batch)
+        col.bulk_write(
+            [
+                UpdateOne({"_id": doc["_id"]}, {"$set": build_search_tokens(doc, refs)})
+                for doc in batch
+            ],
+            ordered=False,
+        )
+        updated += len(batch)
+
+
+def _data_change_doc(
     *,
     source: str,
     action: str,
@@ -135,13 +287,7 @@ def log_data_change(
     after: dict[str, Any] | None = None,
     now: datetime | None = None,
     metadata: dict[str, Any] | None = None,
-) -> InsertOneResult | None:
-    """Write a generic data-change audit entry with redacted snapshots."""
-
-    col = get_collection("audit_log")
-    if col is None:
-        return None
-
+) -> dict[str, Any]:
     redacted_before = redact_audit_document(before)
     redacted_after = redact_audit_document(after)
 
@@ -171,10 +317,69 @@ def log_data_change(
 
     if metadata:
         doc["metadata"] = redact_audit_value(dict(metadata))
+    return doc
+
+
+def log_data_change(
+    *,
+    source: str,
+    action: str,
+    target_collection: str,
+    target_id: str | ObjectId | None,
+    actor_user_id: str | ObjectId | None = None,
+    actor_email: str | None = None,
+    actor_roles: list[str] | None = None,
+    target_label: str | None = None,
+    before: dict[str, Any] | None = None,
+    after: dict[str, Any] | None = None,
+    now: datetime | None = None,
+    metadata: dict[str, Any] | None = None,
+) -> InsertOneResult | None:
+    """Write a generic data-change audit entry with redacted snapshots."""
 
+    col = get_collection("audit_log")
+    if col is None:
+        return None
+
+    doc = _data_change_doc(
+        source=source,
+        action=action,
+        target_collection=target_collection,
+        target_id=target_id,
+        actor_user_id=actor_user_id,
+        actor_email=actor_email,
+        actor_roles=actor_roles,
+        target_label=target_label,
+        before=before,
+        after=after,
+        now=now,
+        metadata=metadata,
+    )
+    _with_search_tokens([doc])
     return col.insert_one(doc)
 
 
+def log_data_changes(
+    entries: list[dict[str, Any]],
+    *,
+    now: datetime | None = None,
+) -> InsertManyResult | None:
+    """Write many data-change audit entries with one insert.
+
+    Each entry takes the keyword arguments of `log_data_change`; all entries
+    share one `created_at`. Names for the search tokens are resolved once for
+    the whole batch.
+    """
+
+    col = get_collection("audit_log")
+    if col is None or not entries:
+        return None
+
+    created_at = now or _utcnow()
+    docs = [_data_change_doc(**entry, now=created_at) for entry in entries]
+    return col.insert_many(_with_search_tokens(docs), ordered=True)
+
+
 def log_checkin_attempt(
     *,
     cadet_id: str | ObjectId,
@@ -185,6 +390,7 @@ def log_checkin_attempt(
     source: str = "checkin",
     now: datetime | None = None,
     metadata: dict[str, Any] | None = None,
+    search_docs: Iterable[dict[str, Any] | None] = (),
 ) -> InsertOneResult | None:
     """Write a check-in attempt audit entry.
 
@@ -197,6 +403,8 @@ def log_checkin_attempt(
     - ``attempted_code`` is stored only as a SHA-256 hash for troubleshooting
       without retaining the raw code.
     - If MongoDB is unavailable, this returns None (best-effort logging).
+    - ``search_docs`` are user/cadet/event documents the caller already has;
+      they name the entry for search without being read again.
     """
 
     col = get_collection("audit_log")
@@ -225,10 +433,11 @@ def log_checkin_attempt(
         # Keep metadata shallow/JSON-ish; don't enforce schema here.
         doc["metadata"] = dict(metadata)
 
+    _with_search_tokens([doc], search_docs)
     return col.insert_one(doc)
 
 
-def log_attendance_modification(
+def _attendance_modification_doc(
     *,
     event_id: str | ObjectId,
     cadet_id: str | ObjectId,
@@ -239,13 +448,7 @@ def log_attendance_modification(
     source: str = "attendance_modification",
     now: datetime | None = None,
     metadata: dict[str, Any] | None = None,
-) -> InsertOneResult | None:
-    """Write an attendance modification audit entry."""
-
-    col = get_collection("audit_log")
-    if col is None:
-        return None
-
+) -> dict[str, Any]:
     doc: dict[str, Any] = {
         "created_at": now or _utcnow(),
         "event_id": ObjectId(event_id),
@@ -261,5 +464,60 @@ def log_attendance_modification(
 
     if metadata:
         doc["metadata"].update(dict(metadata))
+    return doc
+
 
+def log_attendance_modification(
+    *,
+    event_id: str | ObjectId,
+    cadet_id: str | ObjectId,
+    user_id: str | ObjectId,
+    outcome: str,
+    old_status: str | None,
+    new_status: str | None,
+    source: str = "attendance_modification",
+    now: datetime | None = None,
+    metadata: dict[str, Any] | None = None,
+    search_docs: Iterable[dict[str, Any] | None] = (),
+) -> InsertOneResult | None:
+    """Write an attendance modification audit entry."""
+
+    col = get_collection("audit_log")
+    if col is None:
+        return None
+
+    doc = _attendance_modification_doc(
+        event_id=event_id,
+        cadet_id=cadet_id,
+        user_id=user_id,
+        outcome=outcome,
+        old_status=old_status,
+        new_status=new_status,
+        source=source,
+        now=now,
+        metadata=metadata,
+    )
+    _with_search_tokens([doc], search_docs)
     return col.insert_one(doc)
+
+
+def log_attendance_modifications(
+    entries: list[dict[str, Any]],
+    *,
+    now: datetime | None = None,
+    search_docs: Iterable[dict[str, Any] | None] = (),
+) -> InsertManyResult | None:
+    """Write many attendance modification audit entries with one insert.
+
+    Each entry takes the keyword arguments of `log_attendance_modification`;
+    all entries share one `created_at`. Names for the search tokens are
+    resolved once for the whole batch.
+    """
+
+    col = get_collection("audit_log")
+    if col is None or not entries:
+        return None
+
+    created_at = now or _utcnow()
+    docs = [_attendance_modification_doc(**entry, now=created_at) for entry in entries]
+    return col.insert_many(_with_search_tokens(docs, search_docs), ordered=True)
@@ -1,3 +1,4 @@
+import itertools
 import logging
 from datetime import datetime
 
@@ -13,13 +14,32 @@ from utils.auth_logic import (
     user_has_any_role,
 )
 from utils.db import get_collection
-from utils.db_schema_crud import get_user_by_email
+from utils.db_schema_crud import USER_CREDENTIALS_CACHE_KEY, get_user_by_email
 from utils.names import format_full_name
+from utils.ttl_cache import get_or_load
 
 _COOKIE_NAME = "rollcall_auth"
 
+# User writes in this process invalidate the snapshot immediately; the TTL
+# bounds how long writes from other processes (e.g. seed scripts) take to
+# show up.
+_CREDENTIALS_TTL_SECONDS = 60
+_credential_versions = itertools.count(1)
 
-def _load_credentials() -> tuple[dict[str, dict[str, str]], dict]:
+
+def _read_credential_snapshot(collection) -> tuple[int, dict, dict]:
+    credentials, raw = build_credentials_from_docs(
+        list(collection.find({}, {"_id": 0}))
+    )
+    return next(_credential_versions), credentials, raw
+
+
+def _credential_snapshot() -> tuple[int, dict, dict]:
+    """Return the process-wide `(version, credentials, raw)` snapshot.
+
+    Every session shares it, so it must not be mutated; use
+    `_session_copy` before handing it to anything that writes.
+    """
     collection = get_collection("users")
     if collection is None:
         st.error("Database unavailable — cannot authenticate.")
@@ -27,12 +47,36 @@ def _load_credentials() -> tuple[dict[str, dict[str, str]], dict]:
 
     assert collection is not None
 
-    return build_credentials_from_docs(list(collection.find({}, {"_id": 0})))
+    return get_or_load(
+        USER_CREDENTIALS_CACHE_KEY,
+        lambda: _read_credential_snapshot(collection),
+        ttl_seconds=_CREDENTIALS_TTL_SECONDS,
+    )
+
+
+def _session_copy(store: dict) -> dict:
+    # streamlit-authenticator and Account Settings write into the per-user
+    # dicts, so each session gets its own.
+    return {"usernames": {k: dict(v) for k, v in store["usernames"].items()}}
+
+
+def _load_credentials() -> tuple[dict, dict]:
+    _, credentials, raw = _credential_snapshot()
+    return _session_copy(credentials), _session_copy(raw)
 
 
 def _get_or_create_authenticator() -> stauth.Authenticate:
-    credentials, raw = _load_credentials()
-    st.session_state["_raw_users"] = raw
+    version, shared_credentials, shared_raw = _credential_snapshot()
+    if (
+        "authenticator" in st.session_state
+        and "_raw_users" in st.session_state
+        and st.session_state.get("_credentials_version") == version
+    ):
+        return st.session_state["authenticator"]
+
+    credentials = _session_copy(shared_credentials)
+    st.session_state["_raw_users"] = _session_copy(shared_raw)
+    st.session_state["_credentials_version"] = version
 
     assert AUTH_COOKIE_KEY is not None
 
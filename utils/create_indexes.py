@@ -1,7 +1,13 @@
-from pymongo import ASCENDING, IndexModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pymongo.errors import OperationFailure
 
 from utils.db import get_db
+from utils.db_schema_crud import (
+    backfill_email_normalized,
+    rebuild_cadet_attendance_stats,
+    run_migration_once,
+)
+from utils.waiver_review_view import rebuild_waiver_review_view
 
 
 def _drop_if_exists(collection, index_name: str) -> None:
@@ -23,10 +29,23 @@ def create_indexes() -> None:
     _drop_if_exists(db["waivers"], "submitted_by_user_id")
     _drop_if_exists(db["waivers"], "attendance_record_id_unique")
     _drop_if_exists(db["waivers"], "attendance_record_id_active_unique")
+    # Waiver review pages now read waiver_review_view.
+    _drop_if_exists(db["waivers"], "status_created_at_id")
+    _drop_if_exists(db["waivers"], "created_at_id")
 
+    # Lookups by email match on email_normalized, so users written before
+    # the field existed must have it before the index is relied on.
+    backfill_email_normalized()
     db["users"].create_indexes(
         [
             IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+            IndexModel(
+                [("email_normalized", ASCENDING)],
+                name="email_normalized_unique",
+                unique=True,
+                # Users with a case-only email clash stay unset until resolved.
+                partialFilterExpression={"email_normalized": {"$type": "string"}},
+            ),
             IndexModel([("disabled", ASCENDING)], name="disabled"),
         ]
     )
@@ -75,6 +94,21 @@ def create_indexes() -> None:
             IndexModel(
                 [("recorded_by_user_id", ASCENDING)], name="recorded_by_user_id"
             ),
+            IndexModel(
+                [("cadet_id", ASCENDING), ("status", ASCENDING)],
+                name="cadet_id_status",
+            ),
+            IndexModel(
+                [("event_id", ASCENDING), ("updated_at", ASCENDING)],
+                name="event_id_updated_at",
+            ),
+        ]
+    )
+
+    db["cadet_attendance_stats"].create_indexes(
+        [
+            IndexModel([("cadet_id", ASCENDING)], name="cadet_id_unique", unique=True),
+            IndexModel([("total_absences", DESCENDING)], name="total_absences"),
         ]
     )
 
@@ -89,6 +123,10 @@ def create_indexes() -> None:
                     "status": {"$in": ["pending", "approved", "denied", "auto_denied"]},
                 },
             ),
+            IndexModel(
+                [("attendance_record_id", ASCENDING), ("_id", DESCENDING)],
+                name="attendance_record_id_latest",
+            ),
             IndexModel(
                 [
                     ("submitted_by_user_id", ASCENDING),
@@ -100,6 +138,42 @@ def create_indexes() -> None:
         ]
     )
 
+    db["waiver_review_view"].create_indexes(
+        [
+            # Waiver review keyset pages, newest first.
+            IndexModel(
+                [
+                    ("status", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ],
+                name="status_created_at_id",
+            ),
+            IndexModel(
+                [
+                    ("flight_name", ASCENDING),
+                    ("status", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ],
+                name="flight_name_status_created_at_id",
+            ),
+            IndexModel(
+                [("cadet_search_tokens", ASCENDING), ("created_at", DESCENDING)],
+                name="cadet_search_tokens_created_at",
+            ),
+            IndexModel(
+                [("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="created_at_id",
+            ),
+            # Row refreshes from cadet, user, flight and event writes.
+            IndexModel([("cadet_id", ASCENDING)], name="cadet_id"),
+            IndexModel([("user_ids", ASCENDING)], name="user_ids"),
+            IndexModel([("flight_id", ASCENDING)], name="flight_id"),
+            IndexModel([("event_id", ASCENDING)], name="event_id"),
+        ]
+    )
+
     db["waiver_approvals"].create_indexes(
         [
             IndexModel([("waiver_id", ASCENDING)], name="waiver_id"),
@@ -120,12 +194,29 @@ def create_indexes() -> None:
                 [("event_id", ASCENDING), ("active", ASCENDING)],
                 name="event_id_active",
             ),
+            IndexModel(
+                [
+                    ("code", ASCENDING),
+                    ("active", ASCENDING),
+                    ("expires_at", ASCENDING),
+                ],
+                name="code_active_expires_at",
+            ),
+            IndexModel(
+                [("active", ASCENDING), ("expires_at", ASCENDING)],
+                name="active_expires_at",
+            ),
         ]
     )
 
     db["audit_log"].create_indexes(
         [
             IndexModel([("created_at", ASCENDING)], name="created_at"),
+            # Audit log keyset pages, newest first.
+            IndexModel(
+                [("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="created_at_id",
+            ),
             IndexModel(
                 [("cadet_id", ASCENDING), ("created_at", ASCENDING)],
                 name="cadet_created_at",
@@ -154,6 +245,15 @@ def create_indexes() -> None:
                 ],
                 name="target_collection_id_created_at",
             ),
+            # Audit log viewer actor/target search (prefix regex on tokens).
+            IndexModel(
+                [("actor_search_tokens", ASCENDING), ("created_at", DESCENDING)],
+                name="actor_search_tokens_created_at",
+            ),
+            IndexModel(
+                [("target_search_tokens", ASCENDING), ("created_at", DESCENDING)],
+                name="target_search_tokens_created_at",
+            ),
             IndexModel(
                 [
                     ("source", ASCENDING),
@@ -195,3 +295,9 @@ def create_indexes() -> None:
             ),
         ]
     )
+
+    # Write helpers only refresh the stats rows of cadets they touch, so the
+    # table must be built in full once before those partial refreshes count.
+    run_migration_once("cadet_attendance_stats_built", rebuild_cadet_attendance_stats)
+    # Likewise, waiver writes only refresh their own waiver_review_view rows.
+    run_migration_once("waiver_review_view_built", rebuild_waiver_review_view)
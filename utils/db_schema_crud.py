@@ -1,14 +1,68 @@
 import re
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 from bson import ObjectId
-from pymongo import UpdateOne
+from pymongo import DeleteOne, InsertOne, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 from pymongo.results import DeleteResult, InsertOneResult, UpdateResult
 
 from utils.db import get_collection
 from utils.names import format_full_name
 from utils.password import hash_password
+from utils.ttl_cache import invalidate
+from utils.validators import normalize_email
+from utils.waiver_review_view import refresh_waiver_review_view
+
+# Process-wide login credential snapshot built by utils.auth from every user
+# document; dropped by every user write below.
+USER_CREDENTIALS_CACHE_KEY = "user_credentials"
+
+# Process-wide cadet/user/flight snapshot behind the Flight Management page;
+# dropped by every cadet, flight and user write below.
+ROSTER_SNAPSHOT_CACHE_KEY = "flight_roster_snapshot"
+
+# Fields copied into waiver_review_view rows; writes touching them refresh
+# the affected rows.
+_WAIVER_VIEW_USER_FIELDS = {"first_name", "last_name", "email"}
+_WAIVER_VIEW_EVENT_FIELDS = {"event_name", "event_type", "start_date"}
+
+
+def _bulk_write_failures(col, ops: list) -> dict[int, str]:
+    """Run `ops` as one unordered bulk_write; return {op index: error message}
+    for the operations that were not applied."""
+    if not ops:
+        return {}
+    try:
+        col.bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        return {
+            error["index"]: str(error.get("errmsg", "write failed"))
+            for error in e.details.get("writeErrors", [])
+        }
+    except PyMongoError as e:
+        return dict.fromkeys(range(len(ops)), str(e))
+    return {}
+
+
+def build_user_doc(
+    first_name: str,
+    last_name: str,
+    email: str,
+    password_hash: str,
+    roles: list[str],
+) -> dict:
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "name": format_full_name({"first_name": first_name, "last_name": last_name}),
+        "email": email,
+        "email_normalized": normalize_email(email),
+        "password_hash": password_hash,
+        "roles": roles,
+        "disabled": False,
+        "created_at": datetime.now(timezone.utc),
+    }
 
 
 def create_user(
@@ -21,20 +75,27 @@ def create_user(
     col = get_collection("users")
     if col is None:
         return None
-    return col.insert_one(
-        {
-            "first_name": first_name,
-            "last_name": last_name,
-            "name": format_full_name(
-                {"first_name": first_name, "last_name": last_name}
-            ),
-            "email": email,
-            "password_hash": hash_password(password),
-            "roles": roles,
-            "disabled": False,
-            "created_at": datetime.now(timezone.utc),
-        }
+    result = col.insert_one(
+        build_user_doc(first_name, last_name, email, hash_password(password), roles)
     )
+    invalidate(USER_CREDENTIALS_CACHE_KEY)
+    return result
+
+
+def bulk_insert_users(docs: list[dict]) -> dict[int, str] | None:
+    """Insert prepared user documents in one unordered bulk write.
+
+    Documents should carry their own `_id`. Returns {index: error} for the
+    documents that were rejected (e.g. a duplicate email), or None when the
+    database is unavailable.
+    """
+    col = get_collection("users")
+    if col is None:
+        return None
+    failures = _bulk_write_failures(col, [InsertOne(doc) for doc in docs])
+    invalidate(USER_CREDENTIALS_CACHE_KEY)
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    return failures
 
 
 def get_user_by_id(user_id: str | ObjectId) -> dict | None:
@@ -48,7 +109,7 @@ def get_user_by_email(email: str) -> dict | None:
     col = get_collection("users")
     if col is None:
         return None
-    return col.find_one({"email": {"$regex": f"^{re.escape(email)}$", "$options": "i"}})
+    return col.find_one({"email_normalized": normalize_email(email)})
 
 
 def get_users_by_role(role: str, *, include_disabled: bool = False) -> list[dict]:
@@ -61,12 +122,16 @@ def get_users_by_role(role: str, *, include_disabled: bool = False) -> list[dict
     return list(col.find(query))
 
 
-def get_users_by_ids(user_ids: list[str | ObjectId]) -> list[dict]:
+def get_users_by_ids(
+    user_ids: list[str | ObjectId],
+    *,
+    projection: dict | None = None,
+) -> list[dict]:
     col = get_collection("users")
     if col is None:
         return []
     object_ids = [ObjectId(u_id) for u_id in user_ids]
-    return list(col.find({"_id": {"$in": object_ids}}))
+    return list(col.find({"_id": {"$in": object_ids}}, projection))
 
 
 def get_users_by_emails(emails: list[str]) -> dict[str, dict]:
@@ -75,12 +140,9 @@ def get_users_by_emails(emails: list[str]) -> dict[str, dict]:
     col = get_collection("users")
     if col is None:
         return {}
-    conditions = [
-        {"email": {"$regex": f"^{re.escape(email)}$", "$options": "i"}}
-        for email in emails
-    ]
-    users = col.find({"$or": conditions})
-    return {u["email"].lower().strip(): u for u in users}
+    normalized = list({normalize_email(email) for email in emails})
+    users = col.find({"email_normalized": {"$in": normalized}})
+    return {normalize_email(u["email"]): u for u in users}
 
 
 def get_users_by_names(names: list[tuple[str, str]]) -> dict[tuple[str, str], dict]:
@@ -122,7 +184,84 @@ def update_user(user_id: str | ObjectId, updates: dict) -> UpdateResult | None:
     col = get_collection("users")
     if col is None:
         return None
-    return col.update_one({"_id": ObjectId(user_id)}, {"$set": updates})
+    if "email" in updates:
+        updates = {**updates, "email_normalized": normalize_email(updates["email"])}
+    result = col.update_one({"_id": ObjectId(user_id)}, {"$set": updates})
+    invalidate(USER_CREDENTIALS_CACHE_KEY)
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    if _WAIVER_VIEW_USER_FIELDS & updates.keys():
+        refresh_waiver_review_view(user_ids=[user_id])
+    return result
+
+
+def bulk_update_users(
+    updates: list[tuple[str | ObjectId, dict]],
+) -> dict[int, str] | None:
+    """Apply `(user_id, $set fields)` pairs in one unordered bulk write.
+
+    Returns {index: error} for the updates that were rejected, or None when
+    the database is unavailable.
+    """
+    col = get_collection("users")
+    if col is None:
+        return None
+    ops = []
+    for user_id, fields in updates:
+        if "email" in fields:
+            fields = {**fields, "email_normalized": normalize_email(fields["email"])}
+        ops.append(UpdateOne({"_id": ObjectId(user_id)}, {"$set": fields}))
+    failures = _bulk_write_failures(col, ops)
+    invalidate(USER_CREDENTIALS_CACHE_KEY)
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    view_user_ids = [
+        user_id
+        for index, (user_id, fields) in enumerate(updates)
+        if index not in failures and _WAIVER_VIEW_USER_FIELDS & fields.keys()
+    ]
+    if view_user_ids:
+        refresh_waiver_review_view(user_ids=view_user_ids)
+    return failures
+
+
+# Server-side equivalent of `normalize_email` for pipeline updates.
+_NORMALIZED_EMAIL_EXPR = {"$toLower": {"$trim": {"input": {"$ifNull": ["$email", ""]}}}}
+
+
+def find_email_normalized_conflicts() -> list[dict]:
+    """Return `{email_normalized, user_ids}` for emails shared ignoring case.
+
+    These users cannot all receive `email_normalized` under its unique
+    index and need merging or renaming by an admin.
+    """
+    col = get_collection("users")
+    if col is None:
+        return []
+    pipeline = [
+        {"$group": {"_id": _NORMALIZED_EMAIL_EXPR, "user_ids": {"$push": "$_id"}}},
+        {"$match": {"user_ids.1": {"$exists": True}}},
+        {"$project": {"_id": 0, "email_normalized": "$_id", "user_ids": 1}},
+        {"$sort": {"email_normalized": 1}},
+    ]
+    return list(col.aggregate(pipeline))
+
+
+def backfill_email_normalized() -> int:
+    """Set `email_normalized` on users missing it, in one server-side update.
+
+    Users caught in `find_email_normalized_conflicts` are left alone so the
+    unique index can still be built. Returns the number of users updated.
+    """
+    col = get_collection("users")
+    if col is None:
+        return 0
+    conflicts = [c["email_normalized"] for c in find_email_normalized_conflicts()]
+    query: dict[str, Any] = {"email_normalized": {"$exists": False}}
+    if conflicts:
+        query["$expr"] = {"$not": [{"$in": [_NORMALIZED_EMAIL_EXPR, conflicts]}]}
+    result = col.update_many(
+        query, [{"$set": {"email_normalized": _NORMALIZED_EMAIL_EXPR}}]
+    )
+    return result.modified_count
 
 
 def delete_user(user_id: str | ObjectId) -> DeleteResult | None:
@@ -135,24 +274,24 @@ def delete_user(user_id: str | ObjectId) -> DeleteResult | None:
     if cadet is not None:
         delete_cadet(cadet["_id"])
 
-    return col.delete_one({"_id": user_object_id})
+    result = col.delete_one({"_id": user_object_id})
+    invalidate(USER_CREDENTIALS_CACHE_KEY)
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    refresh_waiver_review_view(user_ids=[user_object_id])
+    return result
 
 
 # -- Cadets
 
 
-def create_cadet(
+def build_cadet_doc(
     user_id: str | ObjectId,
     rank: str,
     first_name: str,
     last_name: str,
     email: str = "",
     flight_id: str | ObjectId | None = None,
-) -> InsertOneResult | None:
-    col = get_collection("cadets")
-    if col is None:
-        return None
-
+) -> dict:
     cadet_doc = {
         "user_id": ObjectId(user_id),
         "rank": rank,
@@ -163,8 +302,45 @@ def create_cadet(
 
     if flight_id:
         cadet_doc["flight_id"] = ObjectId(flight_id)
+    return cadet_doc
+
+
+def create_cadet(
+    user_id: str | ObjectId,
+    rank: str,
+    first_name: str,
+    last_name: str,
+    email: str = "",
+    flight_id: str | ObjectId | None = None,
+) -> InsertOneResult | None:
+    col = get_collection("cadets")
+    if col is None:
+        return None
+
+    result = col.insert_one(
+        build_cadet_doc(user_id, rank, first_name, last_name, email, flight_id)
+    )
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    refresh_waiver_review_view(user_ids=[user_id])
+    return result
 
-    return col.insert_one(cadet_doc)
+
+def bulk_insert_cadets(docs: list[dict]) -> dict[int, str] | None:
+    """Insert prepared cadet documents in one unordered bulk write.
+
+    Documents should carry their own `_id`. Returns {index: error} for the
+    documents that were rejected (e.g. a second cadet for one user), or None
+    when the database is unavailable.
+    """
+    col = get_collection("cadets")
+    if col is None:
+        return None
+    failures = _bulk_write_failures(col, [InsertOne(doc) for doc in docs])
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    user_ids = [doc["user_id"] for i, doc in enumerate(docs) if i not in failures]
+    if user_ids:
+        refresh_waiver_review_view(user_ids=user_ids)
+    return failures
 
 
 def get_cadet_by_id(cadet_id: str | ObjectId) -> dict | None:
@@ -174,11 +350,11 @@ def get_cadet_by_id(cadet_id: str | ObjectId) -> dict | None:
     return col.find_one({"_id": ObjectId(cadet_id)})
 
 
-def get_all_cadets() -> list[dict]:
+def get_all_cadets(*, projection: dict | None = None) -> list[dict]:
     col = get_collection("cadets")
     if col is None:
         return []
-    return list(col.find())
+    return list(col.find({}, projection))
 
 
 def get_cadets_by_ids(cadet_ids: list[str | ObjectId]) -> list[dict]:
@@ -217,7 +393,37 @@ def update_cadet(cadet_id: str | ObjectId, updates: dict) -> UpdateResult | None
     col = get_collection("cadets")
     if col is None:
         return None
-    return col.update_one({"_id": ObjectId(cadet_id)}, {"$set": updates})
+    result = col.update_one({"_id": ObjectId(cadet_id)}, {"$set": updates})
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    refresh_waiver_review_view(cadet_ids=[cadet_id])
+    return result
+
+
+def bulk_update_cadets(
+    updates: list[tuple[str | ObjectId, dict]],
+) -> dict[int, str] | None:
+    """Apply `(cadet_id, $set fields)` pairs in one unordered bulk write.
+
+    Returns {index: error} for the updates that were rejected, or None when
+    the database is unavailable.
+    """
+    col = get_collection("cadets")
+    if col is None:
+        return None
+    failures = _bulk_write_failures(
+        col,
+        [
+            UpdateOne({"_id": ObjectId(cadet_id)}, {"$set": fields})
+            for cadet_id, fields in updates
+        ],
+    )
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    cadet_ids = [
+        cadet_id for index, (cadet_id, _) in enumerate(updates) if index not in failures
+    ]
+    if cadet_ids:
+        refresh_waiver_review_view(cadet_ids=cadet_ids)
+    return failures
 
 
 def delete_cadet(cadet_id: str | ObjectId) -> DeleteResult | None:
@@ -226,7 +432,10 @@ def delete_cadet(cadet_id: str | ObjectId) -> DeleteResult | None:
         return None
     cadet_object_id = ObjectId(cadet_id)
     _remove_cadet_flight_references(cadet_object_id)
-    return col.delete_one({"_id": cadet_object_id})
+    result = col.delete_one({"_id": cadet_object_id})
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    refresh_waiver_review_view(cadet_ids=[cadet_object_id])
+    return result
 
 
 def _remove_cadet_flight_references(cadet_id: str | ObjectId) -> None:
@@ -263,12 +472,15 @@ def create_cadet_if_not_exists(
     if existing:
         return None
 
-    return col.insert_one(
+    result = col.insert_one(
         {
             "user_id": ObjectId(user_id),
             "rank": rank,
         }
     )
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    refresh_waiver_review_view(user_ids=[user_id])
+    return result
 
 
 # -- Events
@@ -338,8 +550,13 @@ def get_events_by_date_range(
     *,
     event_types: list[str] | None = None,
     include_archived: bool = False,
+    projection: dict | None = None,
 ) -> list[dict]:
-    """Return events whose start_date falls within [start, end] inclusive."""
+    """Return events whose start_date falls within [start, end] inclusive.
+
+    Results are sorted by start_date. With `event_types` set this is served
+    by the `archived_event_type_start_date` index.
+    """
     col = get_collection("events")
     if col is None:
         return []
@@ -348,14 +565,21 @@ def get_events_by_date_range(
         query["event_type"] = {"$in": list(event_types)}
     if not include_archived:
         query["archived"] = {"$ne": True}
-    return list(col.find(query))
+    return list(col.find(query, projection).sort("start_date", 1))
 
 
 def update_event(event_id: str | ObjectId, updates: dict) -> UpdateResult | None:
     col = get_collection("events")
     if col is None:
         return None
-    return col.update_one({"_id": ObjectId(event_id)}, {"$set": updates})
+    result = col.update_one({"_id": ObjectId(event_id)}, {"$set": updates})
+    if "event_type" in updates:
+        refresh_cadet_attendance_stats(
+            [r["cadet_id"] for r in get_attendance_by_event(event_id)]
+        )
+    if _WAIVER_VIEW_EVENT_FIELDS & updates.keys():
+        refresh_waiver_review_view(event_ids=[event_id])
+    return result
 
 
 # -- Event Assignments
@@ -424,12 +648,14 @@ def create_attendance_record(
     col = get_collection("attendance_records")
     if col is None:
         return None
+    now = datetime.now(timezone.utc)
     doc: dict[str, Any] = {
         "event_id": ObjectId(event_id),
         "cadet_id": ObjectId(cadet_id),
         "status": status,
         "recorded_by_user_id": ObjectId(recorded_by_user_id),
-        "created_at": datetime.now(timezone.utc),
+        "created_at": now,
+        "updated_at": now,
     }
     if recorded_by_roles is not None:
         doc["recorded_by_roles"] = list(recorded_by_roles)
@@ -440,7 +666,10 @@ def create_attendance_record(
         doc["location_outside_fence"] = True
     if location_unavailable:
         doc["location_unavailable"] = True
-    return col.insert_one(doc)
+    result = col.insert_one(doc)
+    if status == "absent":
+        refresh_cadet_attendance_stats([cadet_id])
+    return result
 
 
 def get_attendance_record_by_id(record_id: str | ObjectId) -> dict | None:
@@ -465,6 +694,27 @@ def get_attendance_by_events(events_ids: list[str | ObjectId]) -> list[dict]:
     return list(col.find({"event_id": {"$in": object_ids}}))
 
 
+def iter_attendance_batches_by_events(
+    event_ids: list[str | ObjectId],
+    *,
+    events_per_query: int = 25,
+    projection: dict | None = None,
+) -> Iterator[list[dict]]:
+    """Yield attendance records for many events, one batch per query.
+
+    Each query covers at most `events_per_query` events so the `$in` list
+    stays short and the caller can process records batch by batch instead
+    of holding one result for every event at once.
+    """
+    col = get_collection("attendance_records")
+    if col is None or not event_ids:
+        return
+    object_ids = [ObjectId(e_id) for e_id in event_ids]
+    for i in range(0, len(object_ids), events_per_query):
+        chunk = object_ids[i : i + events_per_query]
+        yield list(col.find({"event_id": {"$in": chunk}}, projection))
+
+
 def get_attendance_by_cadet(cadet_id: str | ObjectId) -> list[dict]:
     col = get_collection("attendance_records")
     if col is None:
@@ -547,6 +797,7 @@ def bulk_upsert_attendance_status(
         )
 
     result = col.bulk_write(ops, ordered=False)
+    refresh_cadet_attendance_stats([u["cadet_id"] for u in updates])
     return (result.modified_count or 0) + (result.upserted_count or 0)
 
 
@@ -572,7 +823,7 @@ def upsert_attendance_record(
     }
     if recorded_by_roles is not None:
         set_doc["recorded_by_roles"] = list(recorded_by_roles)
-    return col.update_one(
+    result = col.update_one(
         {
             "event_id": ObjectId(event_id),
             "cadet_id": ObjectId(cadet_id),
@@ -585,6 +836,64 @@ def upsert_attendance_record(
         },
         upsert=True,
     )
+    refresh_cadet_attendance_stats([cadet_id])
+    return result
+
+
+def bulk_set_attendance_states(
+    event_id: str | ObjectId,
+    statuses: dict[ObjectId, str | None],
+    recorded_by_user_id: str | ObjectId,
+    recorded_by_roles: list[str] | None = None,
+) -> dict[ObjectId, dict] | None:
+    """Set many cadets' attendance for one event and return the after-state.
+
+    `statuses` maps cadet id to the new status, or None to delete the record.
+    All changes go out as one ordered bulk_write, and the resulting records
+    are read back with a single `$in` query. Returns the records keyed by
+    cadet id (deleted cadets are absent), or None if the database is down.
+    """
+    col = get_collection("attendance_records")
+    if col is None:
+        return None
+    event_object_id = ObjectId(event_id)
+    cadet_ids = [ObjectId(c_id) for c_id in statuses]
+    if not cadet_ids:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    set_base: dict[str, Any] = {
+        "recorded_by_user_id": ObjectId(recorded_by_user_id),
+        "updated_at": now,
+    }
+    if recorded_by_roles is not None:
+        set_base["recorded_by_roles"] = list(recorded_by_roles)
+
+    ops: list[UpdateOne | DeleteOne] = []
+    for cadet_id, status in zip(cadet_ids, statuses.values()):
+        pair = {"event_id": event_object_id, "cadet_id": cadet_id}
+        if status is None:
+            ops.append(DeleteOne(pair))
+            continue
+        ops.append(
+            UpdateOne(
+                pair,
+                {
+                    "$set": {**set_base, "status": status},
+                    "$setOnInsert": {"created_at": now},
+                },
+                upsert=True,
+            )
+        )
+
+    col.bulk_write(ops, ordered=True)
+    refresh_cadet_attendance_stats(cadet_ids)
+    return {
+        record["cadet_id"]: record
+        for record in col.find(
+            {"event_id": event_object_id, "cadet_id": {"$in": cadet_ids}}
+        )
+    }
 
 
 def update_attendance_record(
@@ -593,23 +902,38 @@ def update_attendance_record(
     col = get_collection("attendance_records")
     if col is None:
         return None
-    return col.update_one({"_id": ObjectId(record_id)}, {"$set": updates})
+    record_object_id = ObjectId(record_id)
+    result = col.update_one(
+        {"_id": record_object_id},
+        {"$set": {**updates, "updated_at": datetime.now(timezone.utc)}},
+    )
+    if "status" in updates or "event_id" in updates:
+        refresh_cadet_attendance_stats(
+            _cadet_ids_for_attendance_records([record_object_id])
+        )
+    return result
 
 
 def delete_attendance_record(record_id: str | ObjectId) -> DeleteResult | None:
     col = get_collection("attendance_records")
     if col is None:
         return None
-    return col.delete_one({"_id": ObjectId(record_id)})
+    record_object_id = ObjectId(record_id)
+    cadet_ids = _cadet_ids_for_attendance_records([record_object_id])
+    result = col.delete_one({"_id": record_object_id})
+    refresh_cadet_attendance_stats(cadet_ids)
+    return result
 
 
-def get_cadet_absence_stats() -> list[dict]:
-    col = get_collection("attendance_records")
-    if col is None:
-        return []
+def _cadet_absence_stats_pipeline(
+    cadet_ids: list[ObjectId] | None = None,
+) -> list[dict]:
+    match: dict[str, Any] = {"status": "absent"}
+    if cadet_ids is not None:
+        match["cadet_id"] = {"$in": cadet_ids}
 
-    pipeline = [
-        {"$match": {"status": "absent"}},
+    return [
+        {"$match": match},
         {
             "$lookup": {
                 "from": "events",
@@ -673,7 +997,154 @@ def get_cadet_absence_stats() -> list[dict]:
         {"$sort": {"total_absences": -1}},
     ]
 
-    return list(col.aggregate(pipeline))
+
+def compute_cadet_absence_stats(
+    cadet_ids: Iterable[str | ObjectId] | None = None,
+) -> list[dict]:
+    """Aggregate absence stats from attendance_records, bypassing the stats table.
+
+    Cadets with no unwaived PT/LLAB absences are omitted from the result.
+    """
+    col = get_collection("attendance_records")
+    if col is None:
+        return []
+    object_ids = (
+        [ObjectId(c_id) for c_id in cadet_ids] if cadet_ids is not None else None
+    )
+    return list(col.aggregate(_cadet_absence_stats_pipeline(object_ids)))
+
+
+def get_cadet_absence_stats() -> list[dict]:
+    """Return per-cadet absence stats from the `cadet_attendance_stats` table.
+
+    The table is kept current by the attendance and waiver write helpers in
+    this module, after `create_indexes` has built it once at startup.
+    """
+    col = get_collection("cadet_attendance_stats")
+    if col is None:
+        return []
+
+    return list(
+        col.find(
+            {"total_absences": {"$gt": 0}},
+            {"_id": 0, "updated_at": 0},
+        ).sort("total_absences", -1)
+    )
+
+
+# -- Cadet Attendance Stats
+
+
+def _empty_absence_stats(cadet_id: ObjectId) -> dict[str, Any]:
+    return {
+        "cadet_id": cadet_id,
+        "pt_absences": 0,
+        "llab_absences": 0,
+        "total_absences": 0,
+        "approved_waivers": 0,
+        "pending_waivers": 0,
+    }
+
+
+def _replace_absence_stats(stats_by_cadet: dict[ObjectId, dict]) -> None:
+    col = get_collection("cadet_attendance_stats")
+    if col is None or not stats_by_cadet:
+        return
+    now = datetime.now(timezone.utc)
+    col.bulk_write(
+        [
+            ReplaceOne(
+                {"cadet_id": cadet_id},
+                {**stats, "cadet_id": cadet_id, "updated_at": now},
+                upsert=True,
+            )
+            for cadet_id, stats in stats_by_cadet.items()
+        ],
+        ordered=False,
+    )
+
+
+def refresh_cadet_attendance_stats(cadet_ids: Iterable[str | ObjectId]) -> None:
+    """Recompute the stats rows of the given cadets only.
+
+    Served by the `cadet_id_status` index on attendance_records, so the cost
+    scales with those cadets' absences rather than the whole collection.
+    """
+    object_ids = list({ObjectId(c_id) for c_id in cadet_ids})
+    if not object_ids or get_collection("cadet_attendance_stats") is None:
+        return
+    stats_by_cadet = {c_id: _empty_absence_stats(c_id) for c_id in object_ids}
+    for stats in compute_cadet_absence_stats(object_ids):
+        stats_by_cadet[stats["cadet_id"]] = stats
+    _replace_absence_stats(stats_by_cadet)
+
+
+def rebuild_cadet_attendance_stats() -> int:
+    """Recompute the whole stats table from scratch. Returns rows written."""
+    col = get_collection("cadet_attendance_stats")
+    if col is None:
+        return 0
+    stats_by_cadet = {s["cadet_id"]: s for s in compute_cadet_absence_stats()}
+    _replace_absence_stats(stats_by_cadet)
+    col.delete_many({"cadet_id": {"$nin": list(stats_by_cadet)}})
+    return len(stats_by_cadet)
+
+
+def verify_cadet_attendance_stats() -> list[dict]:
+    """Compare the stats table against a fresh aggregation.
+
+    Returns one entry per cadet whose stored counters disagree, with the
+    `stored` and `expected` rows (either may be None).
+    """
+    col = get_collection("cadet_attendance_stats")
+    if col is None:
+        return []
+    counters = (
+        "pt_absences",
+        "llab_absences",
+        "total_absences",
+        "approved_waivers",
+        "pending_waivers",
+    )
+    expected_by_cadet = {s["cadet_id"]: s for s in compute_cadet_absence_stats()}
+    stored_by_cadet = {
+        s["cadet_id"]: s
+        for s in col.find({"total_absences": {"$gt": 0}}, {"_id": 0, "updated_at": 0})
+    }
+
+    mismatches = []
+    for cadet_id in expected_by_cadet.keys() | stored_by_cadet.keys():
+        stored = stored_by_cadet.get(cadet_id)
+        expected = expected_by_cadet.get(cadet_id)
+        if stored is not None and expected is not None:
+            if all(stored.get(k) == expected.get(k) for k in counters):
+                continue
+        mismatches.append(
+            {"cadet_id": cadet_id, "stored": stored, "expected": expected}
+        )
+    return mismatches
+
+
+def _cadet_ids_for_attendance_records(record_ids: list[ObjectId]) -> list[ObjectId]:
+    col = get_collection("attendance_records")
+    if col is None or not record_ids:
+        return []
+    return [
+        r["cadet_id"]
+        for r in col.find({"_id": {"$in": record_ids}}, {"cadet_id": 1})
+        if r.get("cadet_id") is not None
+    ]
+
+
+def _refresh_stats_for_waiver(waiver_id: ObjectId) -> None:
+    col = get_collection("waivers")
+    if col is None:
+        return
+    waiver = col.find_one({"_id": waiver_id}, {"attendance_record_id": 1})
+    record_id = (waiver or {}).get("attendance_record_id")
+    if record_id is None:
+        return
+    refresh_cadet_attendance_stats(_cadet_ids_for_attendance_records([record_id]))
 
 
 # -- Waivers
@@ -713,7 +1184,9 @@ def create_waiver(
         doc["start_date"] = start_date
         doc["end_date"] = end_date
         doc["event_types"] = list(event_types or ["pt", "lab"])
-        return col.insert_one(doc)
+        result = col.insert_one(doc)
+        refresh_waiver_review_view(waiver_ids=[result.inserted_id])
+        return result
 
     if attendance_record_id is None:
         return None
@@ -746,6 +1219,8 @@ def create_waiver(
             comments=f"Auto-denied: {why}",
         )
 
+    refresh_cadet_attendance_stats(_cadet_ids_for_attendance_records([attendance_oid]))
+    refresh_waiver_review_view(waiver_ids=[result.inserted_id])
     return result
 
 
@@ -812,6 +1287,29 @@ def get_standing_waivers_by_user(user_id: str | ObjectId) -> list[dict]:
     )
 
 
+def get_approved_standing_waivers(
+    start: datetime,
+    end: datetime,
+    *,
+    projection: dict | None = None,
+) -> list[dict]:
+    """Return approved standing waivers whose range overlaps [start, end]."""
+    col = get_collection("waivers")
+    if col is None:
+        return []
+    return list(
+        col.find(
+            {
+                "is_standing": True,
+                "status": "approved",
+                "start_date": {"$lte": end},
+                "end_date": {"$gte": start},
+            },
+            projection,
+        )
+    )
+
+
 def get_approved_waivers_by_user(user_id: str | ObjectId) -> list[dict]:
     col = get_collection("waivers")
     if col is None:
@@ -826,6 +1324,20 @@ def get_approved_waivers_by_user(user_id: str | ObjectId) -> list[dict]:
     )
 
 
+def count_approved_waivers_by_submitter(*, min_count: int = 1) -> dict[Any, int]:
+    """Return `{submitted_by_user_id: approved waiver count}` in one `$group`,
+    keeping only submitters with at least `min_count` approved waivers."""
+    col = get_collection("waivers")
+    if col is None:
+        return {}
+    pipeline = [
+        {"$match": {"status": "approved"}},
+        {"$group": {"_id": "$submitted_by_user_id", "count": {"$sum": 1}}},
+        {"$match": {"_id": {"$ne": None}, "count": {"$gte": min_count}}},
+    ]
+    return {row["_id"]: row["count"] for row in col.aggregate(pipeline)}
+
+
 def get_waiver_by_id(waiver_id: str | ObjectId) -> dict | None:
     col = get_collection("waivers")
     if col is None:
@@ -854,14 +1366,22 @@ def get_waivers_by_status(status: str) -> list[dict]:
     return list(col.find({"status": status}))
 
 
-def get_waivers_by_attendance_records(record_ids: list[str | ObjectId]) -> list[dict]:
+def get_waivers_by_attendance_records(
+    record_ids: list[str | ObjectId],
+    *,
+    status: str | None = None,
+    projection: dict | None = None,
+) -> list[dict]:
     if not record_ids:
         return []
     col = get_collection("waivers")
     if col is None:
         return []
     object_ids = [ObjectId(r_id) for r_id in record_ids]
-    return list(col.find({"attendance_record_id": {"$in": object_ids}}))
+    query: dict = {"attendance_record_id": {"$in": object_ids}}
+    if status is not None:
+        query["status"] = status
+    return list(col.find(query, projection))
 
 
 def get_all_waivers() -> list[dict]:
@@ -875,14 +1395,25 @@ def update_waiver(waiver_id: str | ObjectId, updates: dict) -> UpdateResult | No
     col = get_collection("waivers")
     if col is None:
         return None
-    return col.update_one({"_id": ObjectId(waiver_id)}, {"$set": updates})
+    waiver_object_id = ObjectId(waiver_id)
+    result = col.update_one({"_id": waiver_object_id}, {"$set": updates})
+    if "status" in updates:
+        _refresh_stats_for_waiver(waiver_object_id)
+    refresh_waiver_review_view(waiver_ids=[waiver_object_id])
+    return result
 
 
 def delete_waiver(waiver_id: str | ObjectId) -> DeleteResult | None:
     col = get_collection("waivers")
     if col is None:
         return None
-    return col.delete_one({"_id": ObjectId(waiver_id)})
+    waiver = col.find_one({"_id": ObjectId(waiver_id)}, {"attendance_record_id": 1})
+    result = col.delete_one({"_id": ObjectId(waiver_id)})
+    record_id = (waiver or {}).get("attendance_record_id")
+    if record_id is not None:
+        refresh_cadet_attendance_stats(_cadet_ids_for_attendance_records([record_id]))
+    refresh_waiver_review_view(waiver_ids=[waiver_id])
+    return result
 
 
 # -- Waiver Approvals
@@ -984,12 +1515,14 @@ def create_flight(name: str, commander_cadet_id: str | ObjectId):
 
     _validate_flight_association(commander_cadet_id)
 
-    return col.insert_one(
+    result = col.insert_one(
         {
             "name": name,
             "commander_cadet_id": ObjectId(commander_cadet_id),
         }
     )
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    return result
 
 
 def get_all_flights():
@@ -1021,14 +1554,21 @@ def update_flight(flight_id: str | ObjectId, updates: dict):
     if "commander_cadet_id" in updates:
         _validate_flight_association(updates["commander_cadet_id"], flight_id)
 
-    return col.update_one({"_id": ObjectId(flight_id)}, {"$set": updates})
+    result = col.update_one({"_id": ObjectId(flight_id)}, {"$set": updates})
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    if "name" in updates:
+        refresh_waiver_review_view(flight_ids=[flight_id])
+    return result
 
 
 def delete_flight(flight_id: str | ObjectId):
     col = get_collection("flights")
     if col is None:
         return None
-    return col.delete_one({"_id": ObjectId(flight_id)})
+    result = col.delete_one({"_id": ObjectId(flight_id)})
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    refresh_waiver_review_view(flight_ids=[flight_id])
+    return result
 
 
 # -- Event Codes
@@ -1094,6 +1634,15 @@ def get_event_codes_by_event(event_id: str | ObjectId) -> list[dict]:
     return list(col.find({"event_id": ObjectId(event_id)}).sort("created_at", -1))
 
 
+def get_active_event_codes() -> list[dict]:
+    """Return every active, unexpired event code (usually a handful)."""
+    col = get_collection("event_codes")
+    if col is None:
+        return []
+    now = datetime.now(timezone.utc)
+    return list(col.find({"active": True, "expires_at": {"$gt": now}}))
+
+
 def find_active_event_code_by_value(code: str) -> dict | None:
     col = get_collection("event_codes")
     if col is None:
@@ -1115,10 +1664,13 @@ def assign_cadet_to_flight(cadet_id: str | ObjectId, flight_id: str | ObjectId):
 
     _validate_flight_association(cadet_id, flight_id)
 
-    return col.update_one(
+    result = col.update_one(
         {"_id": ObjectId(cadet_id)},
         {"$set": {"flight_id": ObjectId(flight_id)}},
     )
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    refresh_waiver_review_view(cadet_ids=[cadet_id])
+    return result
 
 
 def unassign_all_cadets_from_flight(flight_id: str | ObjectId):
@@ -1126,10 +1678,13 @@ def unassign_all_cadets_from_flight(flight_id: str | ObjectId):
     if col is None:
         return None
 
-    return col.update_many(
+    result = col.update_many(
         {"flight_id": ObjectId(flight_id)},
         {"$unset": {"flight_id": ""}},
     )
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    refresh_waiver_review_view(flight_ids=[flight_id])
+    return result
 
 
 def unassign_cadet_from_flight(cadet_id: str | ObjectId):
@@ -1137,7 +1692,34 @@ def unassign_cadet_from_flight(cadet_id: str | ObjectId):
     if col is None:
         return None
 
-    return col.update_one(
+    result = col.update_one(
         {"_id": ObjectId(cadet_id)},
         {"$unset": {"flight_id": ""}},
     )
+    invalidate(ROSTER_SNAPSHOT_CACHE_KEY)
+    refresh_waiver_review_view(cadet_ids=[cadet_id])
+    return result
+
+
+# -- Migrations
+
+# One document per completed one-off data migration, keyed by its name.
+MIGRATIONS_COLLECTION = "migrations"
+
+
+def run_migration_once(name: str, migrate: Callable[[], Any]) -> bool:
+    """Run `migrate` unless `name` is already recorded as completed.
+
+    The marker is written only after `migrate` returns, so an interrupted
+    run is retried on the next startup. Returns True if `migrate` ran.
+    """
+    col = get_collection(MIGRATIONS_COLLECTION)
+    if col is None or col.find_one({"_id": name}, {"_id": 1}) is not None:
+        return False
+    migrate()
+    col.update_one(
+        {"_id": name},
+        {"$set": {"completed_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+    return True
@@ -1,8 +1,48 @@
 import logging
+import os
+import queue
 import smtplib
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 
+# Point these at a local stand-in (e.g. `python -m aiosmtpd -n -l
+# localhost:1025` with SMTP_USE_SSL=false) to exercise mail without Gmail.
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").strip().lower() != "false"
+
+DEFAULT_SEND_WORKERS = 4
+
+
+def _connect(sender_email: str, sender_password: str) -> smtplib.SMTP:
+    if SMTP_USE_SSL:
+        server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=30)
+    else:
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+    try:
+        server.ehlo()
+        # Local debugging servers do not offer AUTH.
+        if server.has_extn("auth"):
+            server.login(sender_email, sender_password)
+    except Exception:
+        _close(server)
+        raise
+    return server
+
+
+def _close(server: smtplib.SMTP | None) -> None:
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
 
 def send_with_retry(
     sender_email: str,
@@ -13,9 +53,11 @@ def send_with_retry(
 ) -> bool:
     for attempt in range(1, max_attempts + 1):
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(sender_email, sender_password)
+            server = _connect(sender_email, sender_password)
+            try:
                 server.sendmail(sender_email, to_email, msg.as_string())
+            finally:
+                _close(server)
             return True
         except smtplib.SMTPAuthenticationError:
             logging.warning(
@@ -42,3 +84,100 @@ def send_with_retry(
                     exc,
                 )
     return False
+
+
+def send_batch(
+    sender_email: str,
+    sender_password: str,
+    messages: list[tuple[str, MIMEMultipart]],
+    *,
+    max_workers: int = DEFAULT_SEND_WORKERS,
+    max_attempts: int = 3,
+    retry_delay: float = 1.0,
+) -> list[dict]:
+    """Send `(to_email, msg)` pairs over a few reused SMTP connections.
+
+    Up to `max_workers` workers each log in once and keep their connection
+    for every message they take. A failed message is retried on a fresh
+    connection with exponential backoff on the worker thread; a refused
+    recipient is not retried, and an authentication failure stops the batch.
+
+    Returns one `{"to", "sent", "attempts", "error"}` dict per message, in
+    input order.
+    """
+    outcomes = [
+        {"to": to_email, "sent": False, "attempts": 0, "error": None}
+        for to_email, _ in messages
+    ]
+    if not messages:
+        return outcomes
+
+    pending: queue.SimpleQueue[int] = queue.SimpleQueue()
+    for index in range(len(messages)):
+        pending.put(index)
+    auth_failed = threading.Event()
+
+    def _send_one(server: smtplib.SMTP | None, index: int) -> smtplib.SMTP | None:
+        to_email, msg = messages[index]
+        outcome = outcomes[index]
+        for attempt in range(1, max_attempts + 1):
+            outcome["attempts"] = attempt
+            try:
+                if server is None:
+                    server = _connect(sender_email, sender_password)
+                server.sendmail(sender_email, to_email, msg.as_string())
+                outcome["sent"] = True
+                outcome["error"] = None
+                return server
+            except smtplib.SMTPAuthenticationError as exc:
+                logging.warning("SMTP authentication failed — stopping batch")
+                auth_failed.set()
+                outcome["error"] = f"authentication failed: {exc}"
+                return server
+            except smtplib.SMTPRecipientsRefused as exc:
+                logging.warning("Email to %s refused: %s", to_email, exc)
+                outcome["error"] = f"recipient refused: {exc}"
+                return server
+            except Exception as exc:
+                outcome["error"] = str(exc) or type(exc).__name__
+                _close(server)
+                server = None
+                if attempt < max_attempts:
+                    delay = retry_delay * 2 ** (attempt - 1)
+                    logging.warning(
+                        "Email to %s failed (attempt %d/%d): %s — retrying in %.1fs",
+                        to_email,
+                        attempt,
+                        max_attempts,
+                        exc,
+                        delay,
+                    )
+                    time.sleep(delay)
+        logging.warning(
+            "Email to %s failed after %d attempts: %s",
+            to_email,
+            max_attempts,
+            outcome["error"],
+        )
+        return server
+
+    def _worker() -> None:
+        server: smtplib.SMTP | None = None
+        try:
+            while True:
+                try:
+                    index = pending.get_nowait()
+                except queue.Empty:
+                    return
+                if auth_failed.is_set():
+                    outcomes[index]["error"] = "not sent: SMTP authentication failed"
+                    continue
+                server = _send_one(server, index)
+        finally:
+            _close(server)
+
+    workers = max(1, min(max_workers, len(messages)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(_worker) for _ in range(workers)]:
+            future.result()
+    return outcomes
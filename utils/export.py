@@ -1,6 +1,10 @@
-from io import BytesIO
-from typing import cast
+import csv
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime, timezone
+from io import BytesIO, TextIOWrapper
+from typing import IO, Any, cast
 import pandas as pd
+from openpyxl import Workbook
 from pandas._typing import WriteExcelBuffer
 
 
@@ -9,3 +13,50 @@ def to_excel(df: pd.DataFrame) -> bytes:
     with pd.ExcelWriter(cast(WriteExcelBuffer, buf), engine="openpyxl") as writer:
         df.to_excel(writer, index=False)
     return buf.getvalue()
+
+
+def write_csv_rows(
+    rows: Iterable[Mapping[str, Any]], columns: Sequence[str], out: IO[bytes]
+) -> int:
+    """Write dict rows to a binary file as UTF-8 CSV, one row at a time."""
+    text = TextIOWrapper(out, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(
+            ["" if row.get(col) is None else row.get(col) for col in columns]
+        )
+        count += 1
+    text.flush()
+    text.detach()
+    return count
+
+
+def _excel_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime):
+        # Excel has no timezone support; store UTC wall time.
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    return str(value)
+
+
+def write_excel_rows(
+    rows: Iterable[Mapping[str, Any]], columns: Sequence[str], out: IO[bytes]
+) -> int:
+    """Write dict rows to a binary file as .xlsx using openpyxl's write-only mode.
+
+    Rows are streamed to disk as they arrive rather than kept in a worksheet.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(list(columns))
+    count = 0
+    for row in rows:
+        sheet.append([_excel_value(row.get(col)) for col in columns])
+        count += 1
+    workbook.save(out)
+    return count
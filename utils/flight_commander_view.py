@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import itertools
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
 
 from services.attendance_merge import merge_attendance_records
 from utils.datetime_utils import ensure_utc
@@ -104,3 +105,130 @@ def build_checkin_view(
         "checked_in": checked_in,
         "missing": missing,
     }
+
+
+class CheckinView:
+    """Checked-in vs missing cadets of one event, updated by record deltas.
+
+    Holds every record of the event per cadet together with the merged
+    (`merge_attendance_records`) record that decides each cadet's status, so
+    `apply` only re-merges the cadets a delta touches. Counts are kept as
+    the deltas arrive; the ordered lists follow `flight_cadets` order and are
+    rebuilt only after membership changed. Records must carry an `_id`.
+    """
+
+    def __init__(
+        self,
+        flight_cadets: list[dict[str, Any]],
+        event: dict[str, Any],
+        attendance_records: Iterable[dict[str, Any]] = (),
+    ) -> None:
+        self.event = event
+        self._event_id = event.get("_id")
+        self._flight_cadets = list(flight_cadets)
+        self._flight_cadet_ids = {c.get("_id") for c in self._flight_cadets}
+        self._records_by_cadet: dict[Any, dict[Any, dict[str, Any]]] = {}
+        self._cadet_by_record: dict[Any, Any] = {}
+        self._merged: dict[Any, dict[str, Any]] = {}
+        self._checked_in_ids: set[Any] = set()
+        self._outside_fence_ids: set[Any] = set()
+        self._lists: tuple[list[dict[str, Any]], list[dict[str, Any]]] | None = None
+        self.apply(inserted=attendance_records)
+
+    def apply(
+        self,
+        inserted: Iterable[dict[str, Any]] = (),
+        updated: Iterable[dict[str, Any]] = (),
+        deleted: Iterable[Any] = (),
+    ) -> None:
+        """Apply inserted and updated records and deleted record ids."""
+        touched: set[Any] = set()
+        for record in itertools.chain(inserted, updated):
+            record_id = record["_id"]
+            touched.update(self._drop_record(record_id))
+            if record.get("event_id") != self._event_id:
+                continue
+            cadet_id = record.get("cadet_id")
+            self._records_by_cadet.setdefault(cadet_id, {})[record_id] = record
+            self._cadet_by_record[record_id] = cadet_id
+            touched.add(cadet_id)
+        for record_id in deleted:
+            touched.update(self._drop_record(record_id))
+
+        for cadet_id in touched:
+            self._remerge(cadet_id)
+
+    def _drop_record(self, record_id: Any) -> list[Any]:
+        if record_id not in self._cadet_by_record:
+            return []
+        cadet_id = self._cadet_by_record.pop(record_id)
+        records = self._records_by_cadet.get(cadet_id, {})
+        records.pop(record_id, None)
+        if not records:
+            self._records_by_cadet.pop(cadet_id, None)
+        return [cadet_id]
+
+    def _remerge(self, cadet_id: Any) -> None:
+        records = self._records_by_cadet.get(cadet_id)
+        merged = (
+            merge_attendance_records(list(records.values()), key_fields=("cadet_id",))
+            if records
+            else []
+        )
+        if merged:
+            self._merged[cadet_id] = merged[0]
+        else:
+            self._merged.pop(cadet_id, None)
+        record = merged[0] if merged else {}
+
+        if record.get("location_outside_fence"):
+            self._outside_fence_ids.add(cadet_id)
+        else:
+            self._outside_fence_ids.discard(cadet_id)
+
+        if cadet_id not in self._flight_cadet_ids:
+            return
+        was_checked_in = cadet_id in self._checked_in_ids
+        if _checked_in_status(record.get("status")):
+            self._checked_in_ids.add(cadet_id)
+        else:
+            self._checked_in_ids.discard(cadet_id)
+        if was_checked_in != (cadet_id in self._checked_in_ids):
+            self._lists = None
+
+    def record_for(self, cadet_id: Any) -> dict[str, Any] | None:
+        """Return the merged record deciding the cadet's status, if any."""
+        return self._merged.get(cadet_id)
+
+    @property
+    def checked_in_count(self) -> int:
+        return len(self._checked_in_ids)
+
+    @property
+    def missing_count(self) -> int:
+        return len(self._flight_cadets) - len(self._checked_in_ids)
+
+    @property
+    def outside_fence_count(self) -> int:
+        """Cadets of the event, in any flight, whose record is outside the fence."""
+        return len(self._outside_fence_ids)
+
+    def _split(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        if self._lists is None:
+            checked_in: list[dict[str, Any]] = []
+            missing: list[dict[str, Any]] = []
+            for cadet in self._flight_cadets:
+                if cadet.get("_id") in self._checked_in_ids:
+                    checked_in.append(cadet)
+                else:
+                    missing.append(cadet)
+            self._lists = (checked_in, missing)
+        return self._lists
+
+    @property
+    def checked_in(self) -> list[dict[str, Any]]:
+        return list(self._split()[0])
+
+    @property
+    def missing(self) -> list[dict[str, Any]]:
+        return list(self._split()[1])
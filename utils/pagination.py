@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import base64
+import json
+from datetime import datetime
 from math import ceil
 from typing import Any, Mapping
 
 import streamlit as st
+from bson import ObjectId
 
 PAGE_SIZE_OPTIONS: tuple[int, ...] = (25, 50, 100)
 DEFAULT_PAGE_SIZE = PAGE_SIZE_OPTIONS[0]
 
+# Estimated counts stop counting here and are shown as "1000+".
+ESTIMATED_COUNT_LIMIT = 1000
 
-def _coerce_page_size(value: Any, *, default: int = DEFAULT_PAGE_SIZE) -> int:
+
+def coerce_page_size(value: Any, *, default: int = DEFAULT_PAGE_SIZE) -> int:
     try:
         page_size = int(value)
     except (TypeError, ValueError):
@@ -44,7 +51,7 @@ def build_pagination_metadata(
     page_size: Any,
     total_count: Any,
 ) -> dict[str, int]:
-    normalized_page_size = _coerce_page_size(page_size)
+    normalized_page_size = coerce_page_size(page_size)
     normalized_total_count = max(int(total_count or 0), 0)
     total_pages = max(1, ceil(normalized_total_count / normalized_page_size))
     normalized_page = min(normalize_page(page), total_pages)
@@ -75,6 +82,112 @@ def paginate_list(
     return {**pagination, "items": items[start:end]}
 
 
+# -- Keyset pagination
+#
+# Pages are ordered newest first on (created_at, _id). A cursor names the
+# first or last row of the page the user is leaving, so fetching the next
+# page is an index seek rather than a skip over everything before it.
+
+
+def encode_cursor(doc: Mapping[str, Any], direction: str) -> str:
+    """Return an opaque token for the page after ("next") or before ("prev") `doc`."""
+    created_at = doc.get("created_at")
+    payload = {
+        "d": direction,
+        "t": created_at.isoformat() if isinstance(created_at, datetime) else None,
+        "id": str(doc.get("_id", "")),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> dict[str, Any] | None:
+    """Decode a token from `encode_cursor`; None for missing or malformed ones."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        direction = payload["d"]
+        if direction not in ("next", "prev"):
+            return None
+        created_at = payload["t"]
+        return {
+            "direction": direction,
+            "created_at": datetime.fromisoformat(created_at) if created_at else None,
+            "_id": ObjectId(payload["id"]),
+        }
+    except Exception:
+        return None
+
+
+def keyset_match(cursor: Mapping[str, Any] | None) -> dict[str, Any]:
+    """Return the filter selecting rows past `cursor` in its direction."""
+    if cursor is None:
+        return {}
+    op = "$lt" if cursor["direction"] == "next" else "$gt"
+    created_at, object_id = cursor["created_at"], cursor["_id"]
+    if created_at is None:
+        return {"created_at": None, "_id": {op: object_id}}
+    return {
+        "$or": [
+            {"created_at": {op: created_at}},
+            {"created_at": created_at, "_id": {op: object_id}},
+        ]
+    }
+
+
+def keyset_sort(cursor: Mapping[str, Any] | None) -> dict[str, int]:
+    """Return the sort for fetching the page past `cursor` (newest first by default)."""
+    order = 1 if cursor is not None and cursor["direction"] == "prev" else -1
+    return {"created_at": order, "_id": order}
+
+
+def build_keyset_page(
+    docs: list[dict[str, Any]],
+    *,
+    cursor: Mapping[str, Any] | None,
+    page: Any,
+    page_size: int,
+    total_count: int | None = None,
+    count_is_estimate: bool = False,
+) -> dict[str, Any]:
+    """Turn up to `page_size + 1` docs fetched with `keyset_sort` into a page.
+
+    The extra doc only signals that another page exists in the fetch
+    direction. The result carries the usual pagination keys plus
+    `prev_cursor`/`next_cursor` tokens (None at either end).
+    """
+    has_more = len(docs) > page_size
+    docs = docs[:page_size]
+    if cursor is None:
+        normalized_page, has_prev, has_next = 1, False, has_more
+    elif cursor["direction"] == "next":
+        normalized_page = max(normalize_page(page), 2)
+        has_prev, has_next = True, has_more
+    else:
+        docs.reverse()
+        has_prev, has_next = has_more, True
+        normalized_page = normalize_page(page) if has_prev else 1
+
+    count = max(int(total_count or 0), 0)
+    return {
+        "items": docs,
+        "page": normalized_page,
+        "page_size": page_size,
+        "total_count": count,
+        "total_pages": max(1, ceil(count / page_size)),
+        "count_is_estimate": count_is_estimate,
+        "prev_cursor": encode_cursor(docs[0], "prev") if has_prev and docs else None,
+        "next_cursor": encode_cursor(docs[-1], "next") if has_next and docs else None,
+    }
+
+
+def pagination_cursor(prefix: str) -> str | None:
+    """Return the keyset cursor stored by `render_pagination_controls`."""
+    return st.session_state.get(f"{prefix}_cursor")
+
+
 def init_pagination_state(
     prefix: str,
     *,
@@ -100,6 +213,7 @@ def init_pagination_state(
     if reset_token is not None and st.session_state.get(reset_key) != reset_token:
         st.session_state[reset_key] = reset_token
         st.session_state[page_key] = 1
+        st.session_state.pop(f"{prefix}_cursor", None)
 
     return st.session_state[page_key], st.session_state[page_size_key]
 
@@ -117,6 +231,10 @@ def render_pagination_controls(
     *,
     rerun_scope: str | None = None,
 ) -> None:
+    if "next_cursor" in pagination:
+        _render_keyset_controls(prefix, pagination)
+        return
+
     page_key = f"{prefix}_page"
     page_size_key = f"{prefix}_page_size"
     page_value = int(pagination.get("page", 1) or 1)
@@ -164,3 +282,58 @@ def render_pagination_controls(
         on_click=_go_to_page,
         args=(page_value + 1,),
     )
+
+
+def _render_keyset_controls(prefix: str, pagination: Mapping[str, Any]) -> None:
+    """Previous/Next controls for pages from `build_keyset_page`.
+
+    Keyset pages cannot jump to an arbitrary page, so there is no page
+    picker; the page number is only a running counter.
+    """
+    page_key = f"{prefix}_page"
+    page_size_key = f"{prefix}_page_size"
+    cursor_key = f"{prefix}_cursor"
+    page_value = int(pagination.get("page", 1) or 1)
+    total_count = max(int(pagination.get("total_count", 0) or 0), 0)
+    total_label = (
+        f"{total_count}+" if pagination.get("count_is_estimate") else str(total_count)
+    )
+
+    def _reset_to_first_page() -> None:
+        st.session_state[page_key] = 1
+        st.session_state.pop(cursor_key, None)
+
+    def _go_to_cursor(cursor: str | None, next_page: int) -> None:
+        st.session_state[page_key] = max(next_page, 1)
+        if cursor is None or next_page <= 1:
+            st.session_state.pop(cursor_key, None)
+        else:
+            st.session_state[cursor_key] = cursor
+
+    summary_col, page_size_col, prev_col, next_col = st.columns([4, 1, 1, 1])
+    summary_col.caption(f"Page {page_value} • {total_label} total")
+    page_size_col.selectbox(
+        "Page size",
+        options=list(PAGE_SIZE_OPTIONS),
+        key=page_size_key,
+        label_visibility="collapsed",
+        on_change=_reset_to_first_page,
+    )
+
+    prev_col.button(
+        "Previous",
+        key=f"{prefix}_prev",
+        disabled=pagination.get("prev_cursor") is None,
+        width="stretch",
+        on_click=_go_to_cursor,
+        args=(pagination.get("prev_cursor"), page_value - 1),
+    )
+
+    next_col.button(
+        "Next",
+        key=f"{prefix}_next",
+        disabled=pagination.get("next_cursor") is None,
+        width="stretch",
+        on_click=_go_to_cursor,
+        args=(pagination.get("next_cursor"), page_value + 1),
+    )
@@ -1,10 +1,49 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import bcrypt
-from streamlit_authenticator import Hasher
 
+# bcrypt cost factor for new hashes. Existing hashes carry their own cost,
+# so changing this never affects verification.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Upper bound on concurrent hashes for `hash_passwords`. bcrypt releases the
+# GIL, so threads hash in parallel across cores.
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))
+)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _hash_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, PASSWORD_HASH_WORKERS),
+                thread_name_prefix="password-hash",
+            )
+        return _executor
 
-def hash_password(password: str) -> str:
+
+def hash_password(password: str, *, rounds: int | None = None) -> str:
     """Hash a plaintext password using bcrypt."""
-    return Hasher.hash(password)
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode(), salt).decode()
+
+
+def hash_passwords(passwords: list[str], *, rounds: int | None = None) -> list[str]:
+    """Hash many passwords on the shared hashing pool, preserving order.
+
+    Concurrency across all callers is capped at `PASSWORD_HASH_WORKERS`.
+    """
+    if len(passwords) <= 1 or PASSWORD_HASH_WORKERS <= 1:
+        return [hash_password(password, rounds=rounds) for password in passwords]
+    return list(_hash_executor().map(partial(hash_password, rounds=rounds), passwords))
 
 
 def verify_password(password: str, hashed: str) -> bool:
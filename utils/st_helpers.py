@@ -1,10 +1,20 @@
-from typing import TypeVar
+from typing import Any, Protocol, TypeVar
 
 import streamlit as st
 
 T = TypeVar("T")
 
 
+class SessionStore(Protocol):
+    """What the per-session caches need from `st.session_state`; a dict works too."""
+
+    def get(self, key: str, /) -> Any: ...
+
+    def __getitem__(self, key: str, /) -> Any: ...
+
+    def __setitem__(self, key: str, value: Any, /) -> None: ...
+
+
 def require(val: T | None, message: str) -> T:
     if val is None:
         st.error(message)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Process-wide, shared by every Streamlit session and background thread.
+# key -> (expires_at monotonic seconds, value)
+_entries: dict[str, tuple[float, Any]] = {}
+_generations: dict[str, int] = {}
+_key_locks: dict[str, threading.Lock] = {}
+_stats: dict[str, dict[str, int]] = {}
+_registry_lock = threading.Lock()
+
+
+def _key_lock(key: str) -> threading.Lock:
+    with _registry_lock:
+        lock = _key_locks.get(key)
+        if lock is None:
+            lock = _key_locks[key] = threading.Lock()
+        return lock
+
+
+def _count(key: str, field: str) -> None:
+    with _registry_lock:
+        counters = _stats.setdefault(key, {"hits": 0, "misses": 0, "invalidations": 0})
+        counters[field] += 1
+
+
+def _fresh_entry(key: str) -> tuple[float, Any] | None:
+    entry = _entries.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry
+
+
+def get_or_load(key: str, loader: Callable[[], T], *, ttl_seconds: float) -> T:
+    """Return the cached value for `key`, calling `loader` when missing or expired.
+
+    Concurrent misses on the same key wait for a single load instead of each
+    hitting the database. A value loaded while `invalidate(key)` ran is
+    returned to its caller but not cached.
+    """
+    entry = _fresh_entry(key)
+    if entry is not None:
+        _count(key, "hits")
+        return entry[1]
+
+    with _key_lock(key):
+        entry = _fresh_entry(key)
+        if entry is not None:
+            _count(key, "hits")
+            return entry[1]
+
+        _count(key, "misses")
+        generation = _generations.get(key, 0)
+        value = loader()
+        with _registry_lock:
+            if _generations.get(key, 0) == generation:
+                _entries[key] = (time.monotonic() + ttl_seconds, value)
+        return value
+
+
+def invalidate(key: str) -> None:
+    """Drop `key` so the next read goes back to the loader."""
+    with _registry_lock:
+        _entries.pop(key, None)
+        _generations[key] = _generations.get(key, 0) + 1
+    _count(key, "invalidations")
+
+
+def cache_stats(key: str) -> dict[str, int]:
+    """Return hit/miss/invalidation counters for `key`."""
+    with _registry_lock:
+        return dict(_stats.get(key, {"hits": 0, "misses": 0, "invalidations": 0}))
+
+
+def clear_cache() -> None:
+    """Drop every entry and counter. Intended for tests and admin tooling."""
+    with _registry_lock:
+        for key in list(_entries):
+            _generations[key] = _generations.get(key, 0) + 1
+        _entries.clear()
+        _stats.clear()
@@ -8,5 +8,10 @@ def is_valid_email(email: str) -> bool:
     return bool(_EMAIL_RE.match(email))
 
 
+def normalize_email(email: str | None) -> str:
+    """Return the trimmed, lowercased form stored in `users.email_normalized`."""
+    return str(email or "").strip().lower()
+
+
 def is_valid_name(name: str) -> bool:
     return bool(_NAME_RE.fullmatch(name))
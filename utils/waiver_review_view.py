@@ -0,0 +1,290 @@
+"""Denormalized `waiver_review_view` read model behind the Waiver Review page.
+
+One row per waiver, keyed by the waiver `_id`, holding the cadet, flight and
+event fields the page filters on and displays, so a page is a single indexed
+find instead of a lookup pipeline. The waiver, cadet, user, flight and event
+write helpers call `refresh_waiver_review_view` for the rows they touch;
+`rebuild_waiver_review_view` recomputes the whole collection, once at startup
+via `create_indexes` and on demand from scripts/rebuild_waiver_review_view.py.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from bson import ObjectId
+from pymongo import ReplaceOne
+
+from utils.audit_log import search_tokens
+from utils.db import get_collection
+from utils.names import format_full_name
+
+WAIVER_REVIEW_VIEW_COLLECTION = "waiver_review_view"
+CADET_SEARCH_TOKENS_FIELD = "cadet_search_tokens"
+
+
+def _fmt_date(dt: object) -> str:
+    if isinstance(dt, datetime):
+        return dt.strftime("%Y-%m-%d")
+    return "Unknown date"
+
+
+def _object_ids(values: Iterable[Any]) -> list[ObjectId]:
+    object_ids: list[ObjectId] = []
+    for value in values:
+        try:
+            object_ids.append(ObjectId(value))
+        except Exception:
+            continue
+    return object_ids
+
+
+def _waiver_lookup_stages() -> list[dict]:
+    return [
+        {
+            "$lookup": {
+                "from": "attendance_records",
+                "localField": "attendance_record_id",
+                "foreignField": "_id",
+                "as": "attendance_record",
+            }
+        },
+        {
+            "$unwind": {
+                "path": "$attendance_record",
+                "preserveNullAndEmptyArrays": True,
+            }
+        },
+        {
+            "$lookup": {
+                "from": "cadets",
+                "localField": "attendance_record.cadet_id",
+                "foreignField": "_id",
+                "as": "cadet_via_record",
+            }
+        },
+        {
+            "$unwind": {
+                "path": "$cadet_via_record",
+                "preserveNullAndEmptyArrays": True,
+            }
+        },
+        {
+            "$lookup": {
+                "from": "cadets",
+                "localField": "submitted_by_user_id",
+                "foreignField": "user_id",
+                "as": "cadet_via_submitter",
+            }
+        },
+        {
+            "$unwind": {
+                "path": "$cadet_via_submitter",
+                "preserveNullAndEmptyArrays": True,
+            }
+        },
+        {
+            "$addFields": {
+                "cadet": {"$ifNull": ["$cadet_via_record", "$cadet_via_submitter"]}
+            }
+        },
+        {
+            "$lookup": {
+                "from": "users",
+                "localField": "cadet.user_id",
+                "foreignField": "_id",
+                "as": "cadet_user",
+            }
+        },
+        {
+            "$unwind": {
+                "path": "$cadet_user",
+                "preserveNullAndEmptyArrays": True,
+            }
+        },
+        {
+            "$lookup": {
+                "from": "flights",
+                "localField": "cadet.flight_id",
+                "foreignField": "_id",
+                "as": "flight",
+            }
+        },
+        {
+            "$unwind": {
+                "path": "$flight",
+                "preserveNullAndEmptyArrays": True,
+            }
+        },
+        {
+            "$lookup": {
+                "from": "events",
+                "localField": "attendance_record.event_id",
+                "foreignField": "_id",
+                "as": "event",
+            }
+        },
+        {
+            "$unwind": {
+                "path": "$event",
+                "preserveNullAndEmptyArrays": True,
+            }
+        },
+    ]
+
+
+def _standing_event_label(doc: dict) -> tuple[str, str, str]:
+    """Return (event_name, event_date, event_type) for a standing waiver row."""
+    types = doc.get("event_types") or ["pt", "lab"]
+    type_label = "/".join(t.upper() if t == "pt" else "LLAB" for t in types)
+    start_str = _fmt_date(doc.get("start_date"))
+    end_str = _fmt_date(doc.get("end_date"))
+    return (
+        f"Standing waiver ({type_label})",
+        f"{start_str} → {end_str}",
+        "standing",
+    )
+
+
+def build_waiver_review_view_row(doc: dict, *, now: datetime) -> dict:
+    """Flatten one waiver joined by `_waiver_lookup_stages` into a view row."""
+    cadet_user = doc.get("cadet_user") or {}
+    cadet = doc.get("cadet") or {}
+    event = doc.get("event") or {}
+    flight = doc.get("flight") or {}
+    record = doc.get("attendance_record") or {}
+
+    cadet_name = format_full_name(cadet_user)
+    if not cadet_name:
+        first = str(cadet.get("first_name", "") or "").strip()
+        last = str(cadet.get("last_name", "") or "").strip()
+        cadet_name = f"{first} {last}".strip() or "Unknown cadet"
+    cadet_email = str(cadet_user.get("email") or cadet.get("email") or "")
+
+    if doc.get("is_standing"):
+        event_name, event_date, event_type = _standing_event_label(doc)
+    else:
+        event_name = str(event.get("event_name") or "Unknown event")
+        event_date = _fmt_date(event.get("start_date"))
+        event_type = (event.get("event_type") or "") or "unknown"
+
+    user_ids = [cadet.get("user_id"), doc.get("submitted_by_user_id")]
+    return {
+        "_id": doc["_id"],
+        "status": doc.get("status"),
+        "waiver_type": doc.get("waiver_type") or "non-medical",
+        "attachments": doc.get("attachments") or [],
+        "reason": doc.get("reason", ""),
+        "cadre_only": bool(doc.get("cadre_only", False)),
+        "is_standing": bool(doc.get("is_standing", False)),
+        "created_at": doc.get("created_at"),
+        "cadet_id": cadet.get("_id"),
+        "user_ids": list(dict.fromkeys(u for u in user_ids if u is not None)),
+        "flight_id": cadet.get("flight_id"),
+        "event_id": record.get("event_id"),
+        "cadet_name": cadet_name,
+        "cadet_email": cadet_email,
+        "flight_name": str(flight.get("name") or "Unassigned"),
+        "event_name": event_name,
+        "event_date": event_date,
+        "event_type": event_type,
+        CADET_SEARCH_TOKENS_FIELD: search_tokens(cadet_name, cadet_email),
+        "updated_at": now,
+    }
+
+
+def waiver_review_search_query(cadet_search: str) -> dict[str, Any]:
+    """Match view rows whose cadet name or email has a word starting with
+    each searched token, served by the `cadet_search_tokens` index."""
+    tokens = search_tokens(cadet_search)
+    if not tokens:
+        return {}
+    return {
+        "$and": [
+            {CADET_SEARCH_TOKENS_FIELD: {"$regex": f"^{re.escape(token)}"}}
+            for token in tokens
+        ]
+    }
+
+
+def _iter_view_rows(match: dict) -> Iterable[dict]:
+    waivers = get_collection("waivers")
+    if waivers is None:
+        return []
+    now = datetime.now(timezone.utc)
+    pipeline = [{"$match": match}, *_waiver_lookup_stages()]
+    return (
+        build_waiver_review_view_row(doc, now=now)
+        for doc in waivers.aggregate(pipeline)
+    )
+
+
+def _replace_view_rows(view, rows: list[dict]) -> None:
+    if not rows:
+        return
+    view.bulk_write(
+        [ReplaceOne({"_id": row["_id"]}, row, upsert=True) for row in rows],
+        ordered=False,
+    )
+
+
+def refresh_waiver_review_view(
+    *,
+    waiver_ids: Iterable[Any] = (),
+    cadet_ids: Iterable[Any] = (),
+    user_ids: Iterable[Any] = (),
+    flight_ids: Iterable[Any] = (),
+    event_ids: Iterable[Any] = (),
+) -> None:
+    """Recompute the view rows of the given waivers and of every waiver that
+    refers to the given cadets, users, flights or events.
+
+    Rows whose waiver no longer exists are removed.
+    """
+    view = get_collection(WAIVER_REVIEW_VIEW_COLLECTION)
+    if view is None:
+        return
+
+    ids = set(_object_ids(waiver_ids))
+    clauses = []
+    for field, values in (
+        ("cadet_id", cadet_ids),
+        ("user_ids", user_ids),
+        ("flight_id", flight_ids),
+        ("event_id", event_ids),
+    ):
+        object_ids = _object_ids(values)
+        if object_ids:
+            clauses.append({field: {"$in": object_ids}})
+    if clauses:
+        ids.update(row["_id"] for row in view.find({"$or": clauses}, {"_id": 1}))
+    if not ids:
+        return
+
+    rows = list(_iter_view_rows({"_id": {"$in": list(ids)}}))
+    _replace_view_rows(view, rows)
+    gone = ids - {row["_id"] for row in rows}
+    if gone:
+        view.delete_many({"_id": {"$in": list(gone)}})
+
+
+def rebuild_waiver_review_view(*, batch_size: int = 500) -> int:
+    """Recompute the whole view from the waivers collection. Returns rows written."""
+    view = get_collection(WAIVER_REVIEW_VIEW_COLLECTION)
+    if view is None or get_collection("waivers") is None:
+        return 0
+
+    written: list[ObjectId] = []
+    batch: list[dict] = []
+    for row in _iter_view_rows({}):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            _replace_view_rows(view, batch)
+            written.extend(r["_id"] for r in batch)
+            batch = []
+    _replace_view_rows(view, batch)
+    written.extend(r["_id"] for r in batch)
+    view.delete_many({"_id": {"$nin": written}})
+    return len(written)